@@ -0,0 +1,334 @@
+"""Benchmark of the overhead of the clients, offline.
+
+The requests are answered by `MockRevolut` through an `httpx.MockTransport`, so
+the measurements only cover the client: preparing the request, httpx, decoding,
+validation and dumping. Run with:
+
+    python -m benchmarks.client_overhead --calls 1000 --baseline <previous results>
+"""
+
+from typing import Annotated, Any, Callable
+import asyncio
+import time
+import tracemalloc
+from uuid import uuid4
+
+import typer
+
+from pyrevolut.client import AsyncClient, Client
+from pyrevolut.testing import MockRevolut, discover_endpoints, fake_credentials
+
+from benchmarks.common import (
+    compare,
+    default_output,
+    latency_stats,
+    print_table,
+    write_results,
+)
+
+app = typer.Typer()
+
+RETURN_TYPES = ["raw", "dict", "model"]
+KEYS = ("scenario", "client", "return_type", "route", "method", "page_size")
+
+
+def _calls(client: Client | AsyncClient, page_size: int, all_endpoints: bool):
+    """The calls of the benchmark for a client
+
+    Parameters
+    ----------
+    client : Client | AsyncClient
+        The client
+    page_size : int
+        The page size of the list endpoints
+    all_endpoints : bool
+        Whether to call every endpoint, or only the list of transactions
+
+    Returns
+    -------
+    list[tuple[dict[str, Any], Callable]]
+        The description of each scenario and the function making one call
+    """
+    scenarios = [
+        (
+            {
+                "scenario": "get_all_transactions",
+                "route": "/1.0/transactions",
+                "method": "GET",
+            },
+            lambda: client.Transactions.get_all_transactions(limit=page_size),
+        )
+    ]
+    if not all_endpoints:
+        return scenarios
+
+    for spec in discover_endpoints():
+        if spec.response_model is None:
+            continue
+        path = spec.route.format_map(_AnyId())
+        send = getattr(client, spec.method.lower())
+        scenarios.append(
+            (
+                {"scenario": "endpoint", "route": spec.route, "method": spec.method},
+                # Bind the loop variables
+                lambda send=send, path=path, spec=spec: send(
+                    path=path, response_model=spec.response_model
+                ),
+            )
+        )
+    return scenarios
+
+
+class _AnyId(dict):
+    """Formats every route parameter as a new UUID"""
+
+    def __missing__(self, key: str) -> str:
+        return str(uuid4())
+
+
+def _allocations(call: Callable[[], Any], calls: int) -> float:
+    """The mean peak of memory allocated by a call, in KiB
+
+    Parameters
+    ----------
+    call : Callable[[], Any]
+        The function making one (blocking) call
+    calls : int
+        The number of calls measured
+
+    Returns
+    -------
+    float
+        The mean allocation peak in KiB
+    """
+    tracemalloc.start()
+    try:
+        total = 0
+        for _ in range(calls):
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            call()
+            total += tracemalloc.get_traced_memory()[1] - before
+    finally:
+        tracemalloc.stop()
+    return round(total / calls / 1024, 2)
+
+
+async def _allocations_async(call: Callable[[], Any], calls: int) -> float:
+    """The mean peak of memory allocated by an async call, in KiB
+
+    Parameters
+    ----------
+    call : Callable[[], Any]
+        The function returning the awaitable of one call
+    calls : int
+        The number of calls measured
+
+    Returns
+    -------
+    float
+        The mean allocation peak in KiB
+    """
+    tracemalloc.start()
+    try:
+        total = 0
+        for _ in range(calls):
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            await call()
+            total += tracemalloc.get_traced_memory()[1] - before
+    finally:
+        tracemalloc.stop()
+    return round(total / calls / 1024, 2)
+
+
+def run_sync(
+    return_type: str,
+    page_size: int,
+    calls: int,
+    all_endpoints: bool,
+    allocations: bool,
+) -> list[dict[str, Any]]:
+    """Benchmark the synchronous client
+
+    Parameters
+    ----------
+    return_type : str
+        The return type of the client
+    page_size : int
+        The page size of the list endpoints
+    calls : int
+        The number of calls per scenario
+    all_endpoints : bool
+        Whether to benchmark every endpoint
+    allocations : bool
+        Whether to measure the allocations
+
+    Returns
+    -------
+    list[dict[str, Any]]
+        The result rows
+    """
+    mock = MockRevolut(page_size=page_size)
+    client = Client(
+        creds=fake_credentials(), return_type=return_type, transport=mock.transport()
+    )
+    results = []
+    with client:
+        for scenario, call in _calls(client, page_size, all_endpoints):
+            call()  # Warm up (and generate the payloads)
+            latencies = []
+            start = time.perf_counter()
+            for _ in range(calls):
+                call_start = time.perf_counter()
+                call()
+                latencies.append(time.perf_counter() - call_start)
+            elapsed = time.perf_counter() - start
+            row = {
+                **scenario,
+                "client": "sync",
+                "return_type": return_type,
+                "page_size": page_size,
+                **latency_stats(latencies, elapsed),
+            }
+            if allocations:
+                row["alloc_peak_kib"] = _allocations(call, max(calls // 10, 10))
+            results.append(row)
+    return results
+
+
+def run_async(
+    return_type: str,
+    page_size: int,
+    calls: int,
+    all_endpoints: bool,
+    allocations: bool,
+) -> list[dict[str, Any]]:
+    """Benchmark the asynchronous client, one call at a time
+
+    Parameters
+    ----------
+    return_type : str
+        The return type of the client
+    page_size : int
+        The page size of the list endpoints
+    calls : int
+        The number of calls per scenario
+    all_endpoints : bool
+        Whether to benchmark every endpoint
+    allocations : bool
+        Whether to measure the allocations
+
+    Returns
+    -------
+    list[dict[str, Any]]
+        The result rows
+    """
+
+    async def run() -> list[dict[str, Any]]:
+        mock = MockRevolut(page_size=page_size)
+        client = AsyncClient(
+            creds=fake_credentials(),
+            return_type=return_type,
+            transport=mock.transport(),
+        )
+        results = []
+        async with client:
+            for scenario, call in _calls(client, page_size, all_endpoints):
+                await call()
+                latencies = []
+                start = time.perf_counter()
+                for _ in range(calls):
+                    call_start = time.perf_counter()
+                    await call()
+                    latencies.append(time.perf_counter() - call_start)
+                elapsed = time.perf_counter() - start
+                row = {
+                    **scenario,
+                    "client": "async",
+                    "return_type": return_type,
+                    "page_size": page_size,
+                    **latency_stats(latencies, elapsed),
+                }
+                if allocations:
+                    row["alloc_peak_kib"] = await _allocations_async(
+                        call, max(calls // 10, 10)
+                    )
+                results.append(row)
+        return results
+
+    return asyncio.run(run())
+
+
+@app.command()
+def main(
+    calls: Annotated[int, typer.Option(help="Calls per scenario.")] = 500,
+    page_sizes: Annotated[
+        str, typer.Option(help="Comma-separated page sizes.")
+    ] = "1,10,100,1000",
+    return_types: Annotated[
+        str, typer.Option(help="Comma-separated return types.")
+    ] = "raw,dict,model",
+    clients: Annotated[
+        str, typer.Option(help="Comma-separated clients (sync, async).")
+    ] = "sync,async",
+    all_endpoints: Annotated[
+        bool, typer.Option(help="Also benchmark every endpoint.")
+    ] = False,
+    allocations: Annotated[
+        bool, typer.Option(help="Measure the allocations with tracemalloc.")
+    ] = True,
+    output: Annotated[str, typer.Option(help="The JSON results file.")] = "",
+    baseline: Annotated[
+        str, typer.Option(help="JSON results of a previous run to compare with.")
+    ] = "",
+    threshold: Annotated[
+        float, typer.Option(help="Throughput drop reported as a regression.")
+    ] = 0.1,
+):
+    """
+    Benchmark the throughput, latency and allocations of the clients against
+    a mock of the Revolut API.
+    """
+    results = []
+    for client in clients.split(","):
+        run = run_sync if client.strip() == "sync" else run_async
+        for return_type in return_types.split(","):
+            for page_size in page_sizes.split(","):
+                results += run(
+                    return_type=return_type.strip(),
+                    page_size=int(page_size),
+                    calls=calls,
+                    all_endpoints=all_endpoints,
+                    allocations=allocations,
+                )
+
+    print_table(
+        results,
+        columns=list(KEYS)
+        + ["calls_per_second", "p50_ms", "p99_ms"]
+        + (["alloc_peak_kib"] if allocations else []),
+    )
+    path = write_results(
+        path=output or default_output("client_overhead"),
+        name="client_overhead",
+        results=results,
+    )
+    print(f"\nResults written to {path}")
+
+    if baseline:
+        regressions = compare(
+            results=results,
+            baseline_path=baseline,
+            keys=KEYS,
+            metric="calls_per_second",
+            threshold=threshold,
+        )
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            raise typer.Exit(code=1)
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,204 @@
+from typing import Any
+import json
+import math
+import os
+import platform
+import sys
+
+import httpx
+import pendulum
+import pydantic
+
+import pyrevolut
+
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+
+def percentile(values: list[float], q: float) -> float:
+    """The q-th percentile of values (nearest rank)
+
+    Parameters
+    ----------
+    values : list[float]
+        The values, in any order
+    q : float
+        The percentile, between 0 and 100
+
+    Returns
+    -------
+    float
+        The percentile, 0 if there are no values
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(math.ceil(q / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def latency_stats(latencies: list[float], elapsed: float) -> dict[str, float]:
+    """The throughput and latency percentiles of a run
+
+    Parameters
+    ----------
+    latencies : list[float]
+        The latency of each call in seconds
+    elapsed : float
+        The duration of the run in seconds
+
+    Returns
+    -------
+    dict[str, float]
+        The calls, calls per second and the mean, p50, p95, p99 and max latency
+        in ms
+    """
+    return {
+        "calls": len(latencies),
+        "calls_per_second": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "mean_ms": (
+            round(sum(latencies) / len(latencies) * 1000, 4) if latencies else 0.0
+        ),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 4),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 4),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 4),
+        "max_ms": round(max(latencies, default=0.0) * 1000, 4),
+    }
+
+
+def environment() -> dict[str, str]:
+    """The versions and platform the benchmarks ran on
+
+    Returns
+    -------
+    dict[str, str]
+        The environment
+    """
+    return {
+        "pyrevolut": pyrevolut.__version__,
+        "pydantic": pydantic.VERSION,
+        "httpx": httpx.__version__,
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "timestamp": pendulum.now(tz="UTC").to_iso8601_string(),
+    }
+
+
+def default_output(name: str) -> str:
+    """The default path of the results of a benchmark, per pyrevolut version
+
+    Parameters
+    ----------
+    name : str
+        The name of the benchmark
+
+    Returns
+    -------
+    str
+        The path, such as "benchmarks/results/client_overhead-0.9.1.json"
+    """
+    return os.path.join(RESULTS_DIR, f"{name}-{pyrevolut.__version__}.json")
+
+
+def write_results(path: str, name: str, results: list[dict[str, Any]]) -> str:
+    """Write the results of a benchmark as JSON, with its environment
+
+    Parameters
+    ----------
+    path : str
+        The path of the JSON file
+    name : str
+        The name of the benchmark
+    results : list[dict[str, Any]]
+        The result rows
+
+    Returns
+    -------
+    str
+        The path of the JSON file
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w") as file:
+        json.dump(
+            {"benchmark": name, "environment": environment(), "results": results},
+            file,
+            indent=2,
+        )
+    return path
+
+
+def compare(
+    results: list[dict[str, Any]],
+    baseline_path: str,
+    keys: tuple[str, ...],
+    metric: str,
+    higher_is_better: bool = True,
+    threshold: float = 0.1,
+) -> list[str]:
+    """Compare results with those of a baseline run and describe the regressions
+
+    Parameters
+    ----------
+    results : list[dict[str, Any]]
+        The result rows of this run
+    baseline_path : str
+        The path of the JSON results of the baseline run
+    keys : tuple[str, ...]
+        The fields identifying a row in both runs
+    metric : str
+        The field compared
+    higher_is_better : bool, optional
+        Whether a higher metric is better, by default True
+    threshold : float, optional
+        The relative change reported as a regression, by default 0.1 (10%)
+
+    Returns
+    -------
+    list[str]
+        A description of each regression
+    """
+    with open(baseline_path) as file:
+        baseline = {
+            tuple(row.get(key) for key in keys): row
+            for row in json.load(file)["results"]
+        }
+
+    regressions = []
+    for row in results:
+        before = baseline.get(tuple(row.get(key) for key in keys))
+        if before is None or not before.get(metric):
+            continue
+        change = (row[metric] - before[metric]) / before[metric]
+        if (change < -threshold) if higher_is_better else (change > threshold):
+            label = " ".join(str(row.get(key)) for key in keys)
+            regressions.append(
+                f"{label}: {metric} {before[metric]} -> {row[metric]} ({change:+.1%})"
+            )
+    return regressions
+
+
+def print_table(results: list[dict[str, Any]], columns: list[str]):
+    """Print result rows as an aligned table
+
+    Parameters
+    ----------
+    results : list[dict[str, Any]]
+        The result rows
+    columns : list[str]
+        The fields printed
+
+    Returns
+    -------
+    None
+    """
+    rows = [[str(row.get(column, "")) for column in columns] for row in results]
+    widths = [
+        max([len(column)] + [len(row[i]) for row in rows])
+        for i, column in enumerate(columns)
+    ]
+    print("  ".join(column.ljust(width) for column, width in zip(columns, widths)))
+    for row in rows:
+        print("  ".join(value.ljust(width) for value, width in zip(row, widths)))
@@ -0,0 +1,326 @@
+"""Benchmark of the memory used by the client, offline.
+
+The transactions are synthetic payloads generated from `ResourceTransaction` and
+served by `MockRevolut`. For each return type, the benchmark measures the peak
+RSS and the allocations (tracemalloc) of:
+
+- list: one page of transactions
+- walk: a long paginated walk through the transactions, dropping each page
+- backfill: the same walk keeping every transaction, as a backfill does
+- webhook: parsing TransactionCreated webhook payloads
+
+The peak RSS is measured before and after a single run of the scenario, in a new
+process that has not run it yet (so it includes the costs of the first call), as
+the peak set by an earlier run would hide the growth. The allocations are measured
+after a warm-up run, in another new process. The growth and the allocations are
+reported per 1,000 transactions. Run with:
+
+    python -m benchmarks.memory --walk-items 100000 --baseline <previous results>
+"""
+
+from typing import Annotated, Any
+from concurrent.futures import ProcessPoolExecutor
+import gc
+import json
+import multiprocessing
+import resource
+import sys
+import tracemalloc
+
+import typer
+
+from pyrevolut.api.transactions.resources import ResourceTransaction
+from pyrevolut.api.webhooks.resources.webhook_payload import ResourceWebhookPayload
+from pyrevolut.client import Client
+from pyrevolut.testing import MockRevolut, PayloadGenerator, fake_credentials
+
+from benchmarks.common import compare, default_output, print_table, write_results
+
+app = typer.Typer()
+
+SCENARIOS = ["list", "walk", "backfill", "webhook"]
+RETURN_TYPES = ["raw", "dict", "model"]
+KEYS = ("scenario", "return_type", "items", "page_size")
+
+
+def _peak_rss_kib() -> float:
+    """The peak resident set size of the process, in KiB
+
+    Returns
+    -------
+    float
+        The peak RSS
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / 1024 if sys.platform == "darwin" else float(peak)
+
+
+def _created_at(item: Any) -> Any:
+    """The creation date of a transaction, whatever the return type of the client"""
+    return item["created_at"] if isinstance(item, dict) else item.created_at
+
+
+def _workload(scenario: str, return_type: str, items: int, page_size: int):
+    """Prepare a scenario
+
+    Parameters
+    ----------
+    scenario : str
+        The scenario
+    return_type : str
+        The return type of the client
+    items : int
+        The number of transactions
+    page_size : int
+        The number of transactions per page
+
+    Returns
+    -------
+    tuple[Callable[[], Any], Callable[[], None]]
+        The function running the scenario, returning what it keeps, and
+        the function cleaning up
+    """
+    if scenario == "webhook":
+        generator = PayloadGenerator(seed=0)
+        payloads = [
+            json.dumps(
+                {
+                    "event": "TransactionCreated",
+                    "timestamp": transaction["created_at"],
+                    "data": transaction,
+                }
+            ).encode()
+            for transaction in generator.generate_many(ResourceTransaction, items)
+        ]
+        return (
+            lambda: [ResourceWebhookPayload.from_raw(raw) for raw in payloads],
+            lambda: None,
+        )
+
+    client = Client(
+        creds=fake_credentials(),
+        return_type=return_type,
+        transport=MockRevolut(page_size=page_size).transport(),
+    )
+    client.open()
+
+    def walk(keep: bool) -> list[Any]:
+        kept = []
+        to_datetime = None
+        for _ in range(items // page_size):
+            page = client.Transactions.get_all_transactions(
+                to_datetime=to_datetime, limit=page_size
+            )
+            to_datetime = _created_at(page[-1])
+            if keep:
+                kept.extend(page)
+        return kept
+
+    run = {
+        "list": lambda: client.Transactions.get_all_transactions(limit=page_size),
+        "walk": lambda: walk(keep=False),
+        "backfill": lambda: walk(keep=True),
+    }[scenario]
+    return run, client.close
+
+
+def _measure_rss(scenario: str, return_type: str, items: int, page_size: int) -> dict:
+    """Measure the peak RSS before and after a single run of a scenario, without
+    warming up. It must run in a new process, in which nothing has set the peak yet.
+
+    Parameters
+    ----------
+    scenario : str
+        The scenario
+    return_type : str
+        The return type of the client
+    items : int
+        The number of transactions
+    page_size : int
+        The number of transactions per page
+
+    Returns
+    -------
+    dict
+        The RSS columns of the result row
+    """
+    run, close = _workload(scenario, return_type, items, page_size)
+    try:
+        rss_before = _peak_rss_kib()
+        kept = run()
+        rss_after = _peak_rss_kib()
+        del kept
+    finally:
+        close()
+
+    return {
+        "rss_before_mib": round(rss_before / 1024, 1),
+        "rss_after_mib": round(rss_after / 1024, 1),
+        "rss_growth_kib_per_1k": round((rss_after - rss_before) * 1000 / items, 1),
+    }
+
+
+def _measure_allocations(
+    scenario: str, return_type: str, items: int, page_size: int
+) -> dict:
+    """Measure the allocations of a scenario with tracemalloc, after a warm-up run
+
+    Parameters
+    ----------
+    scenario : str
+        The scenario
+    return_type : str
+        The return type of the client
+    items : int
+        The number of transactions
+    page_size : int
+        The number of transactions per page
+
+    Returns
+    -------
+    dict
+        The allocation columns of the result row
+    """
+    run, close = _workload(scenario, return_type, items, page_size)
+    try:
+        run()  # Warm up
+
+        gc.collect()
+        tracemalloc.start()
+        try:
+            before = tracemalloc.get_traced_memory()[0]
+            kept = run()
+            peak = tracemalloc.get_traced_memory()[1]
+            # Only count what is still reachable, not the garbage in cycles
+            gc.collect()
+            current = tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+        del kept
+    finally:
+        close()
+
+    per_1k = 1000 / items
+    return {
+        "alloc_peak_kib": round((peak - before) / 1024, 1),
+        "alloc_peak_kib_per_1k": round((peak - before) / 1024 * per_1k, 1),
+        "retained_kib_per_1k": round((current - before) / 1024 * per_1k, 1),
+    }
+
+
+def measure(scenario: str, return_type: str, items: int, page_size: int) -> dict:
+    """Measure the memory of a scenario, each measurement in a new process
+
+    Parameters
+    ----------
+    scenario : str
+        The scenario
+    return_type : str
+        The return type of the client
+    items : int
+        The number of transactions
+    page_size : int
+        The number of transactions per page
+
+    Returns
+    -------
+    dict
+        The result row
+    """
+    result = {
+        "scenario": scenario,
+        "return_type": return_type,
+        "items": items,
+        "page_size": page_size,
+    }
+    context = multiprocessing.get_context("spawn")
+    for function in (_measure_rss, _measure_allocations):
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            result.update(
+                executor.submit(
+                    function, scenario, return_type, items, page_size
+                ).result()
+            )
+    return result
+
+
+@app.command()
+def main(
+    scenarios: Annotated[
+        str, typer.Option(help=f"Comma-separated scenarios ({', '.join(SCENARIOS)}).")
+    ] = ",".join(SCENARIOS),
+    return_types: Annotated[
+        str, typer.Option(help="Comma-separated return types.")
+    ] = ",".join(RETURN_TYPES),
+    items: Annotated[
+        int, typer.Option(help="Transactions of the list and webhook scenarios.")
+    ] = 1000,
+    walk_items: Annotated[
+        int, typer.Option(help="Transactions of the walk and backfill scenarios.")
+    ] = 20_000,
+    page_size: Annotated[int, typer.Option(help="Transactions per page.")] = 1000,
+    output: Annotated[str, typer.Option(help="The JSON results file.")] = "",
+    baseline: Annotated[
+        str, typer.Option(help="JSON results of a previous run to compare with.")
+    ] = "",
+    threshold: Annotated[
+        float, typer.Option(help="Allocation increase reported as a regression.")
+    ] = 0.1,
+):
+    """
+    Benchmark the peak RSS and allocations per 1,000 transactions of the client
+    and of the webhook payloads.
+    """
+    runs = []
+    for scenario in scenarios.split(","):
+        scenario = scenario.strip()
+        if scenario not in SCENARIOS:
+            raise typer.BadParameter(f"Unknown scenario {scenario}")
+        if scenario == "webhook":
+            runs.append((scenario, "model", items, items))
+            continue
+        for return_type in return_types.split(","):
+            if scenario == "list":
+                runs.append((scenario, return_type.strip(), items, items))
+            else:
+                runs.append((scenario, return_type.strip(), walk_items, page_size))
+
+    results = [measure(*run) for run in runs]
+
+    print_table(
+        results,
+        columns=[
+            "scenario",
+            "return_type",
+            "items",
+            "rss_before_mib",
+            "rss_after_mib",
+            "rss_growth_kib_per_1k",
+            "alloc_peak_kib",
+            "alloc_peak_kib_per_1k",
+            "retained_kib_per_1k",
+        ],
+    )
+    path = write_results(
+        path=output or default_output("memory"), name="memory", results=results
+    )
+    print(f"\nResults written to {path}")
+
+    if baseline:
+        regressions = compare(
+            results=results,
+            baseline_path=baseline,
+            keys=KEYS,
+            metric="alloc_peak_kib_per_1k",
+            higher_is_better=False,
+            threshold=threshold,
+        )
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            raise typer.Exit(code=1)
+
+
+if __name__ == "__main__":
+    app()
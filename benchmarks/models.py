@@ -0,0 +1,221 @@
+"""Micro-benchmark of the validation and serialization of the models.
+
+Every Response and Body model of the endpoints in
+`pyrevolut/api/<resource>/{get,post,patch,delete}` is validated and dumped with
+a realistic payload generated from its fields, and the benchmark reports the
+time per operation of:
+
+- validate: `model_validate` of the decoded JSON payload
+- validate_json: `model_validate_json` of the raw JSON payload
+- dump: `model_dump(mode="json", by_alias=True, exclude_none=True)`, as the
+  clients serialize the bodies
+- dump_json: `model_dump_json(by_alias=True, exclude_none=True)`
+
+The slowest models are flagged, to target the optimization work. Run with:
+
+    python -m benchmarks.models --top 10 --baseline <previous results>
+"""
+
+from typing import Annotated, Any, Callable
+import gc
+import json
+import time
+
+import typer
+from pydantic import BaseModel
+
+from pyrevolut.testing import discover_endpoints, generate_payload
+
+from benchmarks.common import compare, default_output, print_table, write_results
+
+app = typer.Typer()
+
+OPERATIONS = ["validate", "validate_json", "dump", "dump_json"]
+KEYS = ("model",)
+
+
+def _time_per_call(fn: Callable[[], Any], min_time: float, repeat: int) -> float:
+    """The best time of a call, in µs
+
+    Parameters
+    ----------
+    fn : Callable[[], Any]
+        The function making one call
+    min_time : float
+        The minimum duration in seconds of each timed batch of calls
+    repeat : int
+        The number of timed batches
+
+    Returns
+    -------
+    float
+        The time per call of the fastest batch, in µs
+    """
+    # As timeit does, keep the collections of other allocations out of the timings
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        number = 1
+        while True:
+            start = time.perf_counter()
+            for _ in range(number):
+                fn()
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_time:
+                break
+            number *= 2 if elapsed == 0 else max(2, int(min_time / elapsed) + 1)
+
+        best = elapsed
+        for _ in range(repeat - 1):
+            start = time.perf_counter()
+            for _ in range(number):
+                fn()
+            best = min(best, time.perf_counter() - start)
+    finally:
+        if enabled:
+            gc.enable()
+    return best / number * 1e6
+
+
+def measure_model(
+    model: type[BaseModel], list_size: int, min_time: float, repeat: int, seed: int
+) -> dict[str, Any]:
+    """Measure the validation and serialization of a model
+
+    Parameters
+    ----------
+    model : type[BaseModel]
+        The model
+    list_size : int
+        The number of items of the list fields of the payload
+    min_time : float
+        The minimum duration in seconds of each timed batch of calls
+    repeat : int
+        The number of timed batches per operation
+    seed : int
+        The seed of the payload
+
+    Returns
+    -------
+    dict[str, Any]
+        The payload size and the time per operation in µs
+    """
+    payload = generate_payload(model=model, seed=seed, list_size=list_size)
+    raw = json.dumps(payload).encode()
+    instance = model.model_validate(payload)
+
+    calls = {
+        "validate": lambda: model.model_validate(payload),
+        "validate_json": lambda: model.model_validate_json(raw),
+        "dump": lambda: instance.model_dump(
+            mode="json", by_alias=True, exclude_none=True
+        ),
+        "dump_json": lambda: instance.model_dump_json(by_alias=True, exclude_none=True),
+    }
+    row: dict[str, Any] = {"payload_bytes": len(raw)}
+    for operation, call in calls.items():
+        row[f"{operation}_us"] = round(_time_per_call(call, min_time, repeat), 2)
+    row["total_us"] = round(sum(row[f"{operation}_us"] for operation in calls), 2)
+    return row
+
+
+@app.command()
+def main(
+    resources: Annotated[
+        str, typer.Option(help="Comma-separated resources, empty for all.")
+    ] = "",
+    kinds: Annotated[
+        str, typer.Option(help="Comma-separated models (Response, Body).")
+    ] = "Response,Body",
+    list_size: Annotated[
+        int, typer.Option(help="Items of the list fields of the payloads.")
+    ] = 2,
+    min_time: Annotated[
+        float, typer.Option(help="Minimum duration of a timed batch (s).")
+    ] = 0.02,
+    repeat: Annotated[int, typer.Option(help="Timed batches per operation.")] = 3,
+    top: Annotated[int, typer.Option(help="Number of slowest models flagged.")] = 10,
+    seed: Annotated[int, typer.Option(help="Seed of the payloads.")] = 0,
+    output: Annotated[str, typer.Option(help="The JSON results file.")] = "",
+    baseline: Annotated[
+        str, typer.Option(help="JSON results of a previous run to compare with.")
+    ] = "",
+    threshold: Annotated[
+        float, typer.Option(help="Time increase reported as a regression.")
+    ] = 0.1,
+):
+    """
+    Benchmark the validation and serialization of the Response and Body models
+    of every endpoint, and flag the slowest ones.
+    """
+    selected = {resource.strip() for resource in resources.split(",") if resource}
+    results = []
+    for spec in discover_endpoints():
+        if selected and spec.resource not in selected:
+            continue
+        for kind in kinds.split(","):
+            kind = kind.strip()
+            model = getattr(spec.endpoint, kind, None)
+            if model is None or not model.model_fields:
+                continue
+            row = {
+                "model": f"{spec.resource}.{spec.name}.{kind}",
+                "resource": spec.resource,
+                "kind": kind,
+            }
+            try:
+                row.update(
+                    measure_model(
+                        model=model,
+                        list_size=list_size,
+                        min_time=min_time,
+                        repeat=repeat,
+                        seed=seed,
+                    )
+                )
+            except ValueError as exc:
+                print(f"SKIPPED {row['model']}: {exc}")
+                continue
+            results.append(row)
+
+    results.sort(key=lambda row: row["total_us"], reverse=True)
+    for rank, row in enumerate(results, start=1):
+        row["rank"] = rank
+        row["slowest"] = rank <= top
+
+    print_table(
+        results,
+        columns=["rank", "model", "payload_bytes"]
+        + [f"{operation}_us" for operation in OPERATIONS]
+        + ["total_us"],
+    )
+    if results:
+        print(f"\nSlowest {min(top, len(results))} models:")
+        for row in results[:top]:
+            print(
+                f"  {row['model']}: {row['total_us']} µs "
+                f"({row['payload_bytes']} bytes payload)"
+            )
+
+    path = write_results(
+        path=output or default_output("models"), name="models", results=results
+    )
+    print(f"\nResults written to {path}")
+
+    if baseline:
+        regressions = compare(
+            results=results,
+            baseline_path=baseline,
+            keys=KEYS,
+            metric="total_us",
+            higher_is_better=False,
+            threshold=threshold,
+        )
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            raise typer.Exit(code=1)
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,317 @@
+"""Benchmark of the client on traffic recorded from the Revolut sandbox.
+
+A scenario of calls (accounts, transactions, counterparties and webhooks) is
+first recorded against the sandbox with real credentials to a cassette, with the
+secrets redacted:
+
+    python -m benchmarks.replay record --creds-loc credentials/creds.json
+
+The cassette is then replayed offline, with fake credentials and no or the
+original latency, so the CPU time, allocations and time spent in
+`process_response` and in the endpoint layer can be compared exactly between
+versions of pyrevolut:
+
+    python -m benchmarks.replay run --cassette <cassette> --baseline <previous results>
+"""
+
+from typing import Annotated, Any
+import asyncio
+import cProfile
+import logging
+import os
+import pstats
+import time
+import tracemalloc
+
+import typer
+
+from pyrevolut.client import AsyncClient, Client
+from pyrevolut.testing import fake_credentials
+from pyrevolut.testing.cassette import Cassette, RecordingTransport, ReplayTransport
+
+from benchmarks.common import (
+    RESULTS_DIR,
+    compare,
+    default_output,
+    print_table,
+    write_results,
+)
+
+app = typer.Typer()
+
+RETURN_TYPES = ["raw", "dict", "model"]
+KEYS = ("client", "return_type", "latency")
+
+
+def _id(item: Any) -> str:
+    """The ID of a resource, whatever the return type of the client
+
+    Parameters
+    ----------
+    item : Any
+        The resource, as a dictionary or a model
+
+    Returns
+    -------
+    str
+        The ID
+    """
+    return str(item["id"] if isinstance(item, dict) else item.id)
+
+
+def scenario(client: Client):
+    """The calls recorded and replayed, with the synchronous client
+
+    Parameters
+    ----------
+    client : Client
+        The client
+
+    Returns
+    -------
+    None
+    """
+    accounts = client.Accounts.get_all_accounts()
+    for account in accounts[:3]:
+        client.Accounts.get_account(account_id=_id(account))
+    transactions = client.Transactions.get_all_transactions(limit=100)
+    for transaction in transactions[:10]:
+        client.Transactions.get_transaction(transaction_id=_id(transaction))
+    client.Counterparties.get_all_counterparties(limit=50)
+    client.Webhooks.get_all_webhooks()
+
+
+async def scenario_async(client: AsyncClient):
+    """The calls recorded and replayed, with the asynchronous client
+
+    Parameters
+    ----------
+    client : AsyncClient
+        The client
+
+    Returns
+    -------
+    None
+    """
+    accounts = await client.Accounts.get_all_accounts()
+    for account in accounts[:3]:
+        await client.Accounts.get_account(account_id=_id(account))
+    transactions = await client.Transactions.get_all_transactions(limit=100)
+    for transaction in transactions[:10]:
+        await client.Transactions.get_transaction(transaction_id=_id(transaction))
+    await client.Counterparties.get_all_counterparties(limit=50)
+    await client.Webhooks.get_all_webhooks()
+
+
+def _profile(stats: pstats.Stats) -> dict[str, float]:
+    """The time spent processing the responses and in the endpoint layer
+
+    Parameters
+    ----------
+    stats : pstats.Stats
+        The profile of the replay
+
+    Returns
+    -------
+    dict[str, float]
+        The cumulative time of `process_response` and the own time of the
+        endpoint methods, in ms
+    """
+    process_response = endpoints = 0.0
+    endpoint_dir = os.path.join("pyrevolut", "api")
+    for (filename, _, name), (_, _, tottime, cumtime, _) in stats.stats.items():
+        if name == "process_response" and filename.endswith(
+            os.path.join("pyrevolut", "client", "base.py")
+        ):
+            process_response += cumtime
+        elif endpoint_dir in filename and f"{os.sep}endpoint{os.sep}" in filename:
+            endpoints += tottime
+    return {
+        "process_response_ms": round(process_response * 1000, 3),
+        "endpoint_self_ms": round(endpoints * 1000, 3),
+    }
+
+
+def run_replay(
+    cassette: Cassette,
+    client: str,
+    return_type: str,
+    latency: str,
+    repeat: int,
+) -> dict[str, Any]:
+    """Replay the scenario several times
+
+    Parameters
+    ----------
+    cassette : Cassette
+        The recorded cassette
+    client : str
+        The client, "sync" or "async"
+    return_type : str
+        The return type of the client
+    latency : str
+        The latency of the replay, "zero" or "original"
+    repeat : int
+        The number of times the scenario is replayed
+
+    Returns
+    -------
+    dict[str, Any]
+        The result row
+    """
+    transport = ReplayTransport(cassette=cassette, latency=latency)
+    kwargs = {
+        "creds": fake_credentials(),
+        "return_type": return_type,
+        "transport": transport,
+    }
+    profiler = cProfile.Profile()
+
+    if client == "sync":
+        with Client(**kwargs) as sync_client:
+            scenario(sync_client)  # Warm up
+            transport.rewind()
+            tracemalloc.start()
+            cpu, wall = time.process_time(), time.perf_counter()
+            profiler.enable()
+            for _ in range(repeat):
+                scenario(sync_client)
+            profiler.disable()
+            cpu, wall = time.process_time() - cpu, time.perf_counter() - wall
+    else:
+
+        async def run():
+            async with AsyncClient(**kwargs) as async_client:
+                await scenario_async(async_client)
+                transport.rewind()
+                tracemalloc.start()
+                cpu, wall = time.process_time(), time.perf_counter()
+                profiler.enable()
+                for _ in range(repeat):
+                    await scenario_async(async_client)
+                profiler.disable()
+                return time.process_time() - cpu, time.perf_counter() - wall
+
+        cpu, wall = asyncio.run(run())
+
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    requests = transport.replayed
+    return {
+        "client": client,
+        "return_type": return_type,
+        "latency": latency,
+        "repeat": repeat,
+        "requests": requests,
+        "cpu_ms": round(cpu * 1000, 3),
+        "wall_ms": round(wall * 1000, 3),
+        "cpu_us_per_request": round(cpu / requests * 1e6, 2) if requests else 0.0,
+        "alloc_peak_kib": round(peak / 1024, 2),
+        **_profile(pstats.Stats(profiler)),
+    }
+
+
+@app.command()
+def record(
+    creds_loc: Annotated[
+        str, typer.Option(help="The credentials of the sandbox.")
+    ] = "credentials/creds.json",
+    cassette: Annotated[str, typer.Option(help="The cassette file.")] = os.path.join(
+        RESULTS_DIR, "sandbox.jsonl.gz"
+    ),
+):
+    """
+    Record the scenario against the Revolut sandbox to a cassette, with the
+    secrets redacted.
+    """
+    transport = RecordingTransport()
+    with Client(creds_loc=creds_loc, sandbox=True, transport=transport) as client:
+        scenario(client)
+    os.makedirs(os.path.dirname(cassette) or ".", exist_ok=True)
+    transport.cassette.save(cassette)
+    print(f"{len(transport.cassette)} exchanges recorded to {cassette}")
+
+
+@app.command()
+def run(
+    cassette: Annotated[str, typer.Option(help="The cassette file.")] = os.path.join(
+        RESULTS_DIR, "sandbox.jsonl.gz"
+    ),
+    repeat: Annotated[int, typer.Option(help="Replays of the scenario.")] = 50,
+    return_types: Annotated[
+        str, typer.Option(help="Comma-separated return types.")
+    ] = ",".join(RETURN_TYPES),
+    clients: Annotated[
+        str, typer.Option(help="Comma-separated clients (sync, async).")
+    ] = "sync,async",
+    latency: Annotated[
+        str, typer.Option(help="Latency of the replay (zero, original).")
+    ] = "zero",
+    output: Annotated[str, typer.Option(help="The JSON results file.")] = "",
+    baseline: Annotated[
+        str, typer.Option(help="JSON results of a previous run to compare with.")
+    ] = "",
+    threshold: Annotated[
+        float, typer.Option(help="CPU time increase reported as a regression.")
+    ] = 0.1,
+):
+    """
+    Replay a recorded cassette and measure the CPU time, allocations and time
+    spent processing the responses.
+    """
+    # The replayed error responses, if any, are expected
+    logging.disable(logging.ERROR)
+
+    recorded = Cassette.load(cassette)
+    print(
+        f"Replaying {len(recorded)} exchanges recorded on {recorded.recorded_at} "
+        f"with pyrevolut {recorded.pyrevolut_version}\n"
+    )
+    results = [
+        run_replay(
+            cassette=recorded,
+            client=client.strip(),
+            return_type=return_type.strip(),
+            latency=latency,
+            repeat=repeat,
+        )
+        for client in clients.split(",")
+        for return_type in return_types.split(",")
+    ]
+
+    print_table(
+        results,
+        columns=[
+            "client",
+            "return_type",
+            "requests",
+            "cpu_ms",
+            "wall_ms",
+            "cpu_us_per_request",
+            "alloc_peak_kib",
+            "process_response_ms",
+            "endpoint_self_ms",
+        ],
+    )
+    path = write_results(
+        path=output or default_output("replay"), name="replay", results=results
+    )
+    print(f"\nResults written to {path}")
+
+    if baseline:
+        regressions = compare(
+            results=results,
+            baseline_path=baseline,
+            keys=KEYS,
+            metric="cpu_us_per_request",
+            higher_is_better=False,
+            threshold=threshold,
+        )
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            raise typer.Exit(code=1)
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,253 @@
+"""Benchmark of the client against a degraded Revolut API, offline.
+
+The requests are answered by `MockRevolut` through a `FaultInjectingTransport`
+that adds latency and injects connection resets, timeouts, 429, 500 and 503
+responses. Concurrent workers list transactions with the retry helpers of the
+package (and optionally a rate limiter), and the benchmark reports, per fault
+profile, the goodput (successful calls per second), the success rate, the retries
+and the tail latency of the successful calls, retries included. Run with:
+
+    python -m benchmarks.resilience --calls 2000 --concurrency 20
+"""
+
+from typing import Annotated, Any
+from collections import Counter
+import asyncio
+import logging
+import time
+
+import typer
+
+from pyrevolut.client import AsyncClient
+from pyrevolut.testing import MockRevolut, fake_credentials
+from pyrevolut.testing.faults import (
+    FaultInjectingTransport,
+    lognormal_latency,
+    pareto_latency,
+)
+from pyrevolut.utils import RateLimiter
+from pyrevolut.utils.retry import retry_async
+
+from benchmarks.common import (
+    compare,
+    default_output,
+    latency_stats,
+    print_table,
+    write_results,
+)
+
+app = typer.Typer()
+
+PROFILES: dict[str, dict[str, Any]] = {
+    "healthy": {"latency": lognormal_latency(median=0.01, sigma=0.3)},
+    "slow_tail": {"latency": pareto_latency(minimum=0.005, alpha=1.5)},
+    "degraded": {
+        "latency": lognormal_latency(median=0.01, sigma=0.5),
+        "reset_rate": 0.01,
+        "timeout_rate": 0.01,
+        "rate_limited_rate": 0.02,
+        "server_error_rate": 0.02,
+        "unavailable_rate": 0.03,
+    },
+    "rate_limited": {
+        "latency": lognormal_latency(median=0.01, sigma=0.3),
+        "rate_limited_rate": 0.2,
+    },
+    "outage": {
+        "latency": lognormal_latency(median=0.01, sigma=0.3),
+        "unavailable_rate": 0.5,
+    },
+}
+"""The fault profiles, as the arguments of FaultInjectingTransport"""
+
+KEYS = ("profile", "concurrency", "max_retries", "rate")
+
+
+async def run_profile(
+    profile: str,
+    calls: int,
+    concurrency: int,
+    max_retries: int,
+    backoff: float,
+    rate: float | None,
+    page_size: int,
+    seed: int,
+) -> dict[str, Any]:
+    """Run the calls of a fault profile
+
+    Parameters
+    ----------
+    profile : str
+        The name of the fault profile
+    calls : int
+        The number of calls
+    concurrency : int
+        The number of concurrent workers
+    max_retries : int
+        The maximum number of retries of a call
+    backoff : float
+        The base delay in seconds of the exponential backoff
+    rate : float | None
+        The maximum number of requests per second, None for no rate limiter
+    page_size : int
+        The number of transactions returned by each call
+    seed : int
+        The seed of the latencies and faults
+
+    Returns
+    -------
+    dict[str, Any]
+        The result row of the profile
+    """
+    transport = FaultInjectingTransport(
+        transport=MockRevolut(page_size=page_size).transport(),
+        seed=seed,
+        **PROFILES[profile],
+    )
+    limiter = (
+        RateLimiter(rate=rate, burst=concurrency, name="resilience") if rate else None
+    )
+    client = AsyncClient(
+        creds=fake_credentials(), return_type="model", transport=transport
+    )
+
+    async def call():
+        if limiter is not None:
+            await limiter.acquire()
+        return await client.Transactions.get_all_transactions(limit=page_size)
+
+    latencies: list[float] = []
+    attempts: list[int] = []
+    errors: Counter[str] = Counter()
+    remaining = iter(range(calls))
+
+    async def worker():
+        for _ in remaining:
+            start = time.perf_counter()
+            try:
+                _, attempt = await retry_async(
+                    fn=call, max_retries=max_retries, backoff=backoff
+                )
+            except Exception as exc:
+                errors[type(exc).__name__] += 1
+                attempts.append(max_retries + 1)
+                continue
+            latencies.append(time.perf_counter() - start)
+            attempts.append(attempt)
+
+    async with client:
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    stats = latency_stats(latencies, elapsed)
+    return {
+        "profile": profile,
+        "concurrency": concurrency,
+        "max_retries": max_retries,
+        "rate": rate or 0,
+        "calls": calls,
+        "succeeded": len(latencies),
+        "success_rate": round(len(latencies) / calls, 4),
+        "goodput": stats["calls_per_second"],
+        "requests_per_second": round(transport.requests / elapsed, 2),
+        "retries_per_call": round(sum(attempts) / calls - 1, 4),
+        "p50_ms": stats["p50_ms"],
+        "p95_ms": stats["p95_ms"],
+        "p99_ms": stats["p99_ms"],
+        "max_ms": stats["max_ms"],
+        "errors": dict(errors),
+        "injected": dict(transport.injected),
+    }
+
+
+@app.command()
+def main(
+    profiles: Annotated[
+        str,
+        typer.Option(help=f"Comma-separated fault profiles ({', '.join(PROFILES)})."),
+    ] = ",".join(PROFILES),
+    calls: Annotated[int, typer.Option(help="Calls per profile.")] = 1000,
+    concurrency: Annotated[int, typer.Option(help="Concurrent workers.")] = 10,
+    max_retries: Annotated[int, typer.Option(help="Retries per call.")] = 3,
+    backoff: Annotated[
+        float, typer.Option(help="Base delay of the exponential backoff (s).")
+    ] = 0.05,
+    rate: Annotated[
+        float, typer.Option(help="Rate limit in requests per second, 0 for none.")
+    ] = 0.0,
+    page_size: Annotated[int, typer.Option(help="Transactions per call.")] = 10,
+    seed: Annotated[int, typer.Option(help="Seed of the latencies and faults.")] = 0,
+    output: Annotated[str, typer.Option(help="The JSON results file.")] = "",
+    baseline: Annotated[
+        str, typer.Option(help="JSON results of a previous run to compare with.")
+    ] = "",
+    threshold: Annotated[
+        float, typer.Option(help="Goodput drop reported as a regression.")
+    ] = 0.1,
+):
+    """
+    Benchmark the goodput and tail latency of the client, with retries and rate
+    limiting, against a mock of the Revolut API injecting faults.
+    """
+    # The client logs every error response, which are expected here
+    logging.disable(logging.ERROR)
+
+    results = []
+    for profile in profiles.split(","):
+        profile = profile.strip()
+        if profile not in PROFILES:
+            raise typer.BadParameter(f"Unknown profile {profile}")
+        results.append(
+            asyncio.run(
+                run_profile(
+                    profile=profile,
+                    calls=calls,
+                    concurrency=concurrency,
+                    max_retries=max_retries,
+                    backoff=backoff,
+                    rate=rate or None,
+                    page_size=page_size,
+                    seed=seed,
+                )
+            )
+        )
+
+    print_table(
+        results,
+        columns=[
+            "profile",
+            "success_rate",
+            "goodput",
+            "requests_per_second",
+            "retries_per_call",
+            "p50_ms",
+            "p95_ms",
+            "p99_ms",
+            "max_ms",
+            "errors",
+        ],
+    )
+    path = write_results(
+        path=output or default_output("resilience"),
+        name="resilience",
+        results=results,
+    )
+    print(f"\nResults written to {path}")
+
+    if baseline:
+        regressions = compare(
+            results=results,
+            baseline_path=baseline,
+            keys=KEYS,
+            metric="goodput",
+            threshold=threshold,
+        )
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            raise typer.Exit(code=1)
+
+
+if __name__ == "__main__":
+    app()
@@ -36,6 +36,7 @@ class EndpointAccountsSync(BaseEndpointSync):
 
         return self.client.get(
             path=path,
+            route=endpoint.ROUTE,
             response_model=endpoint.Response,
             params=params,
             **kwargs,
@@ -65,6 +66,7 @@ class EndpointAccountsSync(BaseEndpointSync):
 
         return self.client.get(
             path=path,
+            route=endpoint.ROUTE,
             response_model=endpoint.Response,
             params=params,
             **kwargs,
@@ -94,6 +96,7 @@ class EndpointAccountsSync(BaseEndpointSync):
 
         return self.client.get(
             path=path,
+            route=endpoint.ROUTE,
             response_model=endpoint.Response,
             params=params,
             **kwargs,
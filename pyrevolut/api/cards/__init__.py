@@ -9,3 +9,4 @@ Reference link: https://developer.revolut.com/docs/business/cards
 
 # flake8: noqa: F401
 from .endpoint import EndpointCardsSync, EndpointCardsAsync
+from .bulk import ModelCardFilter, ModelBulkCardResult
@@ -0,0 +1,183 @@
+from typing import Annotated, Literal
+from uuid import UUID, uuid4
+
+from pydantic import BaseModel, Field
+
+from pyrevolut.utils.retry import as_dict
+from pyrevolut.api.common import EnumCardState
+
+BulkCardOperation = Literal["create", "freeze", "unfreeze", "update", "delete"]
+
+
+class ModelCardFilter(BaseModel):
+    """Selects the cards of a bulk card operation. All the fields that are set
+    must match."""
+
+    state: Annotated[
+        EnumCardState | None,
+        Field(description="The state of the cards."),
+    ] = None
+    holder_id: Annotated[
+        UUID | None,
+        Field(description="The ID of the team member who is the holder of the cards."),
+    ] = None
+    label: Annotated[
+        str | None,
+        Field(description="The label of the cards (exact match)."),
+    ] = None
+    virtual: Annotated[
+        bool | None,
+        Field(description="Whether the cards are virtual (true) or physical (false)."),
+    ] = None
+    account_id: Annotated[
+        UUID | None,
+        Field(description="The ID of an account linked to the cards."),
+    ] = None
+
+    def matches(self, card: dict) -> bool:
+        """Whether a card matches the filter
+
+        Parameters
+        ----------
+        card : dict
+            The card, as returned by `get_all_cards` (as a dictionary).
+
+        Returns
+        -------
+        bool
+            True if the card matches all the fields that are set.
+        """
+        if self.state is not None and card["state"] != self.state:
+            return False
+        if self.holder_id is not None and str(card.get("holder_id")) != str(
+            self.holder_id
+        ):
+            return False
+        if self.label is not None and card.get("label") != self.label:
+            return False
+        if self.virtual is not None and card["virtual"] != self.virtual:
+            return False
+        if self.account_id is not None and str(self.account_id) not in {
+            str(account) for account in card.get("accounts") or []
+        }:
+            return False
+        return True
+
+
+class ModelBulkCardResult(BaseModel):
+    """The result of a bulk card operation for a single card."""
+
+    operation: Annotated[
+        BulkCardOperation, Field(description="The operation applied to the card.")
+    ]
+    card_id: Annotated[
+        UUID | None,
+        Field(description="The ID of the card, None if a card could not be created."),
+    ] = None
+    request_id: Annotated[
+        str | None,
+        Field(description="The request ID the card was created with."),
+    ] = None
+    status: Annotated[
+        Literal["succeeded", "failed"],
+        Field(description="Whether the operation succeeded."),
+    ]
+    card: Annotated[
+        dict | None,
+        Field(description="The card details returned by a create or an update."),
+    ] = None
+    error: Annotated[
+        str | None, Field(description="The error if the operation failed.")
+    ] = None
+    attempts: Annotated[int, Field(description="The number of requests made.")] = 0
+
+
+def _bulk_card_items(
+    operation: BulkCardOperation,
+    card_ids: list[UUID | str] | None,
+    cards: list[dict] | None,
+    kwargs: dict,
+) -> list[tuple[UUID | None, str | None, dict]]:
+    """The cards of a bulk operation with the keyword arguments of each call
+
+    Parameters
+    ----------
+    operation : BulkCardOperation
+        The operation
+    card_ids : list[UUID | str] | None
+        The IDs of the cards to freeze, unfreeze, update or delete
+    cards : list[dict] | None
+        The keyword arguments of `create_card` of the cards to create
+    kwargs : dict
+        The keyword arguments shared by all calls
+
+    Returns
+    -------
+    list[tuple[UUID | None, str | None, dict]]
+        The card ID (None for a creation), the request ID (None unless a creation)
+        and the keyword arguments of each call
+    """
+    if operation == "create":
+        items = []
+        for card in cards:
+            request_id = card.get("request_id") or str(uuid4())
+            items.append(
+                (None, request_id, {**kwargs, **card, "request_id": request_id})
+            )
+        return items
+    return [
+        (UUID(str(card_id)), None, {**kwargs, "card_id": card_id})
+        for card_id in dict.fromkeys(card_ids)
+    ]
+
+
+def _bulk_card_result(
+    operation: BulkCardOperation,
+    card_id: UUID | None,
+    request_id: str | None,
+    response=None,
+    error: Exception | None = None,
+    attempts: int = 0,
+) -> ModelBulkCardResult:
+    """The result of a bulk card operation for a single card
+
+    Parameters
+    ----------
+    operation : BulkCardOperation
+        The operation
+    card_id : UUID | None
+        The ID of the card
+    request_id : str | None
+        The request ID of a creation
+    response : Any, optional
+        The response of the call
+    error : Exception | None, optional
+        The error if the call failed
+    attempts : int, optional
+        The number of requests made
+
+    Returns
+    -------
+    ModelBulkCardResult
+        The result
+    """
+    if error is not None:
+        return ModelBulkCardResult(
+            operation=operation,
+            card_id=card_id,
+            request_id=request_id,
+            status="failed",
+            error=f"{type(error).__name__}: {error}",
+            attempts=attempts,
+        )
+    card = as_dict(response) or None
+    if card is not None and card_id is None:
+        card_id = card.get("id")
+    return ModelBulkCardResult(
+        operation=operation,
+        card_id=card_id,
+        request_id=request_id,
+        status="succeeded",
+        card=card if operation in ("create", "update") else None,
+        attempts=attempts,
+    )
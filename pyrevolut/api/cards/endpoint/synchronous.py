@@ -1,10 +1,12 @@
-from typing import Literal, Type
+from typing import Iterable, Literal, Type
 from uuid import UUID
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 
 from pydantic import BaseModel
 
 from pyrevolut.utils import DateTime
+from pyrevolut.utils.retry import retry_sync, as_dict
 from pyrevolut.exceptions import PyRevolutInvalidEnvironment
 from pyrevolut.api.common import BaseEndpointSync, EnumMerchantCategory
 from pyrevolut.api.cards.get import (
@@ -15,6 +17,13 @@ from pyrevolut.api.cards.get import (
 from pyrevolut.api.cards.post import CreateCard, FreezeCard, UnfreezeCard
 from pyrevolut.api.cards.patch import UpdateCardDetails
 from pyrevolut.api.cards.delete import TerminateCard
+from pyrevolut.api.cards.bulk import (
+    BulkCardOperation,
+    ModelCardFilter,
+    ModelBulkCardResult,
+    _bulk_card_items,
+    _bulk_card_result,
+)
 
 
 class EndpointCardsSync(BaseEndpointSync):
@@ -65,6 +74,7 @@ class EndpointCardsSync(BaseEndpointSync):
 
         return self.client.get(
             path=path,
+            route=endpoint.ROUTE,
             response_model=endpoint.Response,
             params=params,
             **kwargs,
@@ -95,6 +105,7 @@ class EndpointCardsSync(BaseEndpointSync):
 
         return self.client.get(
             path=path,
+            route=endpoint.ROUTE,
             response_model=endpoint.Response,
             params=params,
             **kwargs,
@@ -126,6 +137,7 @@ class EndpointCardsSync(BaseEndpointSync):
 
         return self.client.get(
             path=path,
+            route=endpoint.ROUTE,
             response_model=endpoint.Response,
             params=params,
             **kwargs,
@@ -302,6 +314,7 @@ class EndpointCardsSync(BaseEndpointSync):
 
         return self.client.post(
             path=path,
+            route=endpoint.ROUTE,
             response_model=endpoint.Response,
             body=body,
             **kwargs,
@@ -336,6 +349,7 @@ class EndpointCardsSync(BaseEndpointSync):
 
         return self.client.post(
             path=path,
+            route=endpoint.ROUTE,
             response_model=endpoint.Response,
             body=body,
             **kwargs,
@@ -370,6 +384,7 @@ class EndpointCardsSync(BaseEndpointSync):
 
         self.client.post(
             path=path,
+            route=endpoint.ROUTE,
             response_model=endpoint.Response,
             body=body,
             **kwargs,
@@ -532,6 +547,7 @@ class EndpointCardsSync(BaseEndpointSync):
 
         return self.client.patch(
             path=path,
+            route=endpoint.ROUTE,
             response_model=endpoint.Response,
             body=body,
             **kwargs,
@@ -566,11 +582,308 @@ class EndpointCardsSync(BaseEndpointSync):
 
         return self.client.delete(
             path=path,
+            route=endpoint.ROUTE,
             response_model=endpoint.Response,
             params=params,
             **kwargs,
         )
 
+    def create_cards(
+        self,
+        cards: Iterable[dict],
+        max_concurrency: int = 5,
+        max_retries: int = 3,
+        backoff: float = 1.0,
+        **kwargs,
+    ) -> list[ModelBulkCardResult]:
+        """
+        Create many cards concurrently from a pool of threads, for example for an onboarding batch.
+
+        Every card is created with its own request ID, generated if not provided,
+        so a card is never created twice when a request is retried.
+
+        Parameters
+        ----------
+        cards : Iterable[dict]
+            The cards, each as the keyword arguments of `create_card`.
+            The request_id is optional.
+        max_concurrency : int, optional
+            The maximum number of requests in flight, by default 5.
+        max_retries : int, optional
+            The maximum number of retries of a card on transient errors, by default 3.
+        backoff : float, optional
+            The base delay in seconds of the exponential backoff, by default 1.0.
+
+        Returns
+        -------
+        list[ModelBulkCardResult]
+            The result for each card with its request ID, in the order of the input.
+        """
+        self.__check_sandbox()
+        return self.__run_bulk(
+            operation="create",
+            items=_bulk_card_items("create", None, list(cards), kwargs),
+            max_concurrency=max_concurrency,
+            max_retries=max_retries,
+            backoff=backoff,
+        )
+
+    def freeze_cards(
+        self,
+        card_ids: Iterable[UUID | str] | None = None,
+        card_filter: ModelCardFilter | dict | None = None,
+        max_concurrency: int = 5,
+        max_retries: int = 3,
+        backoff: float = 1.0,
+        **kwargs,
+    ) -> list[ModelBulkCardResult]:
+        """
+        Freeze many cards concurrently.
+
+        Parameters
+        ----------
+        card_ids : Iterable[UUID | str], optional
+            The IDs of the cards. Use either card_ids or card_filter.
+        card_filter : ModelCardFilter | dict, optional
+            The filter selecting the cards among all the cards of the business,
+            e.g. `{"state": "active", "holder_id": ...}`.
+        max_concurrency : int, optional
+            The maximum number of requests in flight, by default 5.
+        max_retries : int, optional
+            The maximum number of retries of a card on transient errors, by default 3.
+        backoff : float, optional
+            The base delay in seconds of the exponential backoff, by default 1.0.
+
+        Returns
+        -------
+        list[ModelBulkCardResult]
+            The result for each card.
+        """
+        return self.__run_bulk_on_cards(
+            operation="freeze",
+            card_ids=card_ids,
+            card_filter=card_filter,
+            max_concurrency=max_concurrency,
+            max_retries=max_retries,
+            backoff=backoff,
+            kwargs=kwargs,
+        )
+
+    def unfreeze_cards(
+        self,
+        card_ids: Iterable[UUID | str] | None = None,
+        card_filter: ModelCardFilter | dict | None = None,
+        max_concurrency: int = 5,
+        max_retries: int = 3,
+        backoff: float = 1.0,
+        **kwargs,
+    ) -> list[ModelBulkCardResult]:
+        """
+        Unfreeze many cards concurrently.
+
+        Parameters
+        ----------
+        card_ids : Iterable[UUID | str], optional
+            The IDs of the cards. Use either card_ids or card_filter.
+        card_filter : ModelCardFilter | dict, optional
+            The filter selecting the cards among all the cards of the business,
+            e.g. `{"state": "frozen"}`.
+        max_concurrency : int, optional
+            The maximum number of requests in flight, by default 5.
+        max_retries : int, optional
+            The maximum number of retries of a card on transient errors, by default 3.
+        backoff : float, optional
+            The base delay in seconds of the exponential backoff, by default 1.0.
+
+        Returns
+        -------
+        list[ModelBulkCardResult]
+            The result for each card.
+        """
+        return self.__run_bulk_on_cards(
+            operation="unfreeze",
+            card_ids=card_ids,
+            card_filter=card_filter,
+            max_concurrency=max_concurrency,
+            max_retries=max_retries,
+            backoff=backoff,
+            kwargs=kwargs,
+        )
+
+    def update_cards(
+        self,
+        card_ids: Iterable[UUID | str] | None = None,
+        card_filter: ModelCardFilter | dict | None = None,
+        max_concurrency: int = 5,
+        max_retries: int = 3,
+        backoff: float = 1.0,
+        **kwargs,
+    ) -> list[ModelBulkCardResult]:
+        """
+        Apply the same update to many cards concurrently,
+        e.g. set the spending limits of all the cards of a team member.
+
+        Parameters
+        ----------
+        card_ids : Iterable[UUID | str], optional
+            The IDs of the cards. Use either card_ids or card_filter.
+        card_filter : ModelCardFilter | dict, optional
+            The filter selecting the cards among all the cards of the business,
+            e.g. `{"holder_id": ...}`.
+        max_concurrency : int, optional
+            The maximum number of requests in flight, by default 5.
+        max_retries : int, optional
+            The maximum number of retries of a card on transient errors, by default 3.
+        backoff : float, optional
+            The base delay in seconds of the exponential backoff, by default 1.0.
+        **kwargs
+            The keyword arguments of `update_card`, e.g. `day_limit_amount=100`
+            and `day_limit_currency="GBP"`.
+
+        Returns
+        -------
+        list[ModelBulkCardResult]
+            The result for each card, with the updated card details.
+        """
+        return self.__run_bulk_on_cards(
+            operation="update",
+            card_ids=card_ids,
+            card_filter=card_filter,
+            max_concurrency=max_concurrency,
+            max_retries=max_retries,
+            backoff=backoff,
+            kwargs=kwargs,
+        )
+
+    def delete_cards(
+        self,
+        card_ids: Iterable[UUID | str] | None = None,
+        card_filter: ModelCardFilter | dict | None = None,
+        max_concurrency: int = 5,
+        max_retries: int = 3,
+        backoff: float = 1.0,
+        **kwargs,
+    ) -> list[ModelBulkCardResult]:
+        """
+        Terminate many cards concurrently.
+
+        Parameters
+        ----------
+        card_ids : Iterable[UUID | str], optional
+            The IDs of the cards. Use either card_ids or card_filter.
+        card_filter : ModelCardFilter | dict, optional
+            The filter selecting the cards among all the cards of the business,
+            e.g. `{"holder_id": ...}`.
+        max_concurrency : int, optional
+            The maximum number of requests in flight, by default 5.
+        max_retries : int, optional
+            The maximum number of retries of a card on transient errors, by default 3.
+        backoff : float, optional
+            The base delay in seconds of the exponential backoff, by default 1.0.
+
+        Returns
+        -------
+        list[ModelBulkCardResult]
+            The result for each card.
+        """
+        return self.__run_bulk_on_cards(
+            operation="delete",
+            card_ids=card_ids,
+            card_filter=card_filter,
+            max_concurrency=max_concurrency,
+            max_retries=max_retries,
+            backoff=backoff,
+            kwargs=kwargs,
+        )
+
+    def __run_bulk_on_cards(
+        self,
+        operation: BulkCardOperation,
+        card_ids: Iterable[UUID | str] | None,
+        card_filter: ModelCardFilter | dict | None,
+        max_concurrency: int,
+        max_retries: int,
+        backoff: float,
+        kwargs: dict,
+    ) -> list[ModelBulkCardResult]:
+        """
+        Select the cards of a bulk operation and run it.
+        """
+        assert (card_ids is None) != (
+            card_filter is None
+        ), "Provide either card_ids or card_filter"
+        self.__check_sandbox()
+
+        if card_filter is not None:
+            if not isinstance(card_filter, ModelCardFilter):
+                card_filter = ModelCardFilter(**card_filter)
+            card_ids = []
+            created_before = None
+            while True:
+                page, _ = retry_sync(
+                    lambda: self.get_all_cards(
+                        created_before=created_before, limit=100
+                    ),
+                    max_retries=max_retries,
+                    backoff=backoff,
+                )
+                page = as_dict(page)
+                card_ids.extend(
+                    card["id"] for card in page if card_filter.matches(card)
+                )
+                if len(page) < 100:
+                    break
+                created_before = page[-1]["created_at"]
+
+        return self.__run_bulk(
+            operation=operation,
+            items=_bulk_card_items(operation, list(card_ids), None, kwargs),
+            max_concurrency=max_concurrency,
+            max_retries=max_retries,
+            backoff=backoff,
+        )
+
+    def __run_bulk(
+        self,
+        operation: BulkCardOperation,
+        items: list[tuple[UUID | None, str | None, dict]],
+        max_concurrency: int,
+        max_retries: int,
+        backoff: float,
+    ) -> list[ModelBulkCardResult]:
+        """
+        Run a bulk operation in a pool of threads with retries.
+        """
+        assert max_concurrency >= 1, "max_concurrency must be at least 1"
+        method = {
+            "create": self.create_card,
+            "freeze": self.freeze_card,
+            "unfreeze": self.unfreeze_card,
+            "update": self.update_card,
+            "delete": self.delete_card,
+        }[operation]
+
+        def run(card_id: UUID | None, request_id: str | None, call_kwargs: dict):
+            attempts = 0
+
+            def call():
+                nonlocal attempts
+                attempts += 1
+                return method(**call_kwargs)
+
+            try:
+                response, _ = retry_sync(call, max_retries=max_retries, backoff=backoff)
+            except Exception as exc:
+                return _bulk_card_result(
+                    operation, card_id, request_id, error=exc, attempts=attempts
+                )
+            return _bulk_card_result(
+                operation, card_id, request_id, response=response, attempts=attempts
+            )
+
+        with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+            return list(executor.map(lambda item: run(*item), items))
+
     def __process_limit_model(
         self,
         model: Type[BaseModel],
@@ -19,3 +19,5 @@ Reference link: https://developer.revolut.com/docs/business/counterparties
 
 # flake8: noqa: F401
 from .endpoint import EndpointCounterpartiesSync, EndpointCounterpartiesAsync
+from .registry import CounterpartyRegistry, ModelResolvedCounterparty, normalize_name
+from .name_check import AccountNameCache, ModelAccountNameCheck
@@ -1,8 +1,12 @@
+from typing import TYPE_CHECKING, Iterable, Iterator
 from uuid import UUID
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, Future, as_completed
 
 from pyrevolut.api.common import BaseEndpointSync, EnumProfileType
 from pyrevolut.utils import DateTime
+from pyrevolut.utils.rate_limit import RateLimiter
+from pyrevolut.utils.retry import retry_sync, as_dict
 
 from pyrevolut.api.counterparties.get import (
     RetrieveListOfCounterparties,
@@ -10,6 +14,14 @@ from pyrevolut.api.counterparties.get import (
 )
 from pyrevolut.api.counterparties.post import CreateCounterparty, ValidateAccountName
 from pyrevolut.api.counterparties.delete import DeleteCounterparty
+from pyrevolut.api.counterparties.name_check import (
+    AccountNameCache,
+    ModelAccountNameCheck,
+    _account_name_check,
+)
+
+if TYPE_CHECKING:
+    from pyrevolut.client import Client
 
 
 class EndpointCounterpartiesSync(BaseEndpointSync):
@@ -32,6 +44,17 @@ class EndpointCounterpartiesSync(BaseEndpointSync):
     Test User 9 & john9pvki
     """
 
+    def __init__(self, client: "Client"):
+        """Create a new Counterparties endpoint handler
+
+        Parameters
+        ----------
+        client : Client
+            The client to use for the endpoint
+        """
+        super().__init__(client=client)
+        self.account_name_cache = AccountNameCache()
+
     def get_all_counterparties(
         self,
         name: str | None = None,
@@ -95,6 +118,7 @@ class EndpointCounterpartiesSync(BaseEndpointSync):
 
         return self.client.get(
             path=path,
+            route=endpoint.ROUTE,
             response_model=endpoint.Response,
             params=params,
             **kwargs,
@@ -123,6 +147,7 @@ class EndpointCounterpartiesSync(BaseEndpointSync):
 
         return self.client.get(
             path=path,
+            route=endpoint.ROUTE,
             response_model=endpoint.Response,
             params=params,
             **kwargs,
@@ -265,6 +290,7 @@ class EndpointCounterpartiesSync(BaseEndpointSync):
 
         return self.client.post(
             path=path,
+            route=endpoint.ROUTE,
             response_model=endpoint.Response,
             body=body,
             **kwargs,
@@ -337,11 +363,103 @@ class EndpointCounterpartiesSync(BaseEndpointSync):
 
         return self.client.post(
             path=path,
+            route=endpoint.ROUTE,
             response_model=endpoint.Response,
             body=body,
             **kwargs,
         )
 
+    def validate_account_names(
+        self,
+        recipients: Iterable[dict],
+        max_concurrency: int = 5,
+        rate: float | None = None,
+        cache: AccountNameCache | None = None,
+        max_retries: int = 3,
+        backoff: float = 1.0,
+        **kwargs,
+    ) -> Iterator[ModelAccountNameCheck]:
+        """
+        Run Confirmation of Payee (CoP) checks for a batch of UK recipients,
+        yielding the result of each recipient as soon as it arrives.
+
+        The checks are run from a pool of at most `max_concurrency` threads,
+        optionally limited to `rate` requests per second, and transient errors
+        are retried with backoff.
+        Results are cached (see `AccountNameCache`) by account number, sort code
+        and normalized name, so repeated checks of the same recipient are not sent
+        again until the cached result expires. Recipients with the same details
+        within a batch share a single check.
+
+        Parameters
+        ----------
+        recipients : Iterable[dict]
+            The recipients, each as the keyword arguments of `validate_account_name`:
+            account_no, sort_code and either company_name or
+            individual_first_name and individual_last_name.
+        max_concurrency : int, optional
+            The maximum number of checks in flight, by default 5.
+        rate : float, optional
+            The maximum number of checks per second, by default no limit.
+        cache : AccountNameCache, optional
+            The cache of the results, by default the cache of the endpoint
+            (`account_name_cache`, with a TTL of a day).
+        max_retries : int, optional
+            The maximum number of retries of a check on transient errors, by default 3.
+        backoff : float, optional
+            The base delay in seconds of the exponential backoff, by default 1.0.
+
+        Yields
+        ------
+        ModelAccountNameCheck
+            The result of each recipient, with the result and reason codes.
+        """
+        assert max_concurrency >= 1, "max_concurrency must be at least 1"
+
+        cache = self.account_name_cache if cache is None else cache
+        rate_limiter = (
+            RateLimiter(rate=rate, name="validate_account_names")
+            if rate is not None
+            else None
+        )
+        rows: dict[tuple, list[tuple[int, dict]]] = {}
+        futures: set[Future] = set()
+
+        def check(key: tuple, recipient: dict) -> tuple[tuple, dict | None, str]:
+            def call():
+                if rate_limiter is not None:
+                    rate_limiter.acquire_sync()
+                return self.validate_account_name(**recipient, **kwargs)
+
+            try:
+                result, _ = retry_sync(call, max_retries=max_retries, backoff=backoff)
+            except Exception as exc:
+                return key, None, f"{type(exc).__name__}: {exc}"
+            result = as_dict(result)
+            cache.set(key, result)
+            return key, result, None
+
+        executor = ThreadPoolExecutor(max_workers=max_concurrency)
+        try:
+            for row, recipient in enumerate(recipients):
+                key = AccountNameCache.key(**recipient)
+                if key in rows:
+                    rows[key].append((row, recipient))
+                    continue
+                result = cache.get(key)
+                if result is not None:
+                    yield _account_name_check(row, recipient, result, cached=True)
+                    continue
+                rows[key] = [(row, recipient)]
+                futures.add(executor.submit(check, key, recipient))
+
+            for future in as_completed(futures):
+                key, result, error = future.result()
+                for row, recipient in rows[key]:
+                    yield _account_name_check(row, recipient, result, error=error)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
     def delete_counterparty(
         self,
         counterparty_id: UUID,
@@ -366,6 +484,7 @@ class EndpointCounterpartiesSync(BaseEndpointSync):
 
         return self.client.delete(
             path=path,
+            route=endpoint.ROUTE,
             response_model=endpoint.Response,
             params=params,
             **kwargs,
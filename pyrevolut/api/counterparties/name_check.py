@@ -0,0 +1,218 @@
+from typing import Annotated
+from collections import OrderedDict
+import threading
+import time
+
+from pydantic import BaseModel, Field
+
+from pyrevolut.api.common import (
+    EnumAccountNameMatchCode,
+    EnumAccountNameMatchReasonCode,
+)
+from pyrevolut.api.counterparties.registry import normalize_name, _normalize_code
+
+
+class ModelAccountNameCheck(BaseModel):
+    """The result of the Confirmation of Payee check of a single recipient."""
+
+    row: Annotated[
+        int,
+        Field(description="The 0-based index of the recipient in the input list."),
+    ]
+    account_no: Annotated[
+        str, Field(description="The account number of the recipient.")
+    ]
+    sort_code: Annotated[str, Field(description="The sort code of the recipient.")]
+    result_code: Annotated[
+        EnumAccountNameMatchCode | None,
+        Field(description="The result of the check, None if the check failed."),
+    ] = None
+    reason_code: Annotated[
+        EnumAccountNameMatchReasonCode | None,
+        Field(description="The code which explains why the result was returned."),
+    ] = None
+    company_name: Annotated[
+        str | None,
+        Field(description="The actual name of the business, on a close match."),
+    ] = None
+    individual_first_name: Annotated[
+        str | None,
+        Field(description="The actual first name of the individual, on a close match."),
+    ] = None
+    individual_last_name: Annotated[
+        str | None,
+        Field(description="The actual last name of the individual, on a close match."),
+    ] = None
+    cached: Annotated[
+        bool, Field(description="Whether the result was served from the cache.")
+    ] = False
+    error: Annotated[
+        str | None, Field(description="The error if the check could not be made.")
+    ] = None
+
+
+class AccountNameCache:
+    """A thread-safe cache of Confirmation of Payee results with a time to live,
+    keyed by account number, sort code and normalized name.
+
+    Results of `temporarily_unavailable` are never cached, as the check
+    should be retried later.
+    """
+
+    def __init__(self, ttl: float = 86400.0, max_size: int = 100_000):
+        """Create a new cache
+
+        Parameters
+        ----------
+        ttl : float, optional
+            The number of seconds a result is kept, by default 86400 (a day).
+        max_size : int, optional
+            The maximum number of results kept, by default 100,000.
+            The oldest results are evicted first.
+        """
+        assert ttl >= 0, "ttl must not be negative"
+        assert max_size >= 1, "max_size must be at least 1"
+
+        self.ttl = ttl
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._results: OrderedDict[tuple, tuple[float, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(
+        account_no: str,
+        sort_code: str,
+        company_name: str | None = None,
+        individual_first_name: str | None = None,
+        individual_last_name: str | None = None,
+        **kwargs,
+    ) -> tuple:
+        """The cache key of a recipient
+
+        Parameters
+        ----------
+        account_no : str
+            The account number of the recipient.
+        sort_code : str
+            The sort code of the recipient.
+        company_name : str, optional
+            The name of the business recipient.
+        individual_first_name : str, optional
+            The first name of the individual recipient.
+        individual_last_name : str, optional
+            The last name of the individual recipient.
+        **kwargs
+            Other details of the recipient, which are ignored.
+
+        Returns
+        -------
+        tuple
+            The key
+        """
+        if company_name is not None:
+            name = ("company", normalize_name(company_name))
+        else:
+            name = (
+                "individual",
+                normalize_name(individual_first_name or ""),
+                normalize_name(individual_last_name or ""),
+            )
+        return (_normalize_code(account_no), _normalize_code(sort_code), *name)
+
+    def get(self, key: tuple) -> dict | None:
+        """Get a result from the cache
+
+        Parameters
+        ----------
+        key : tuple
+            The cache key of the recipient.
+
+        Returns
+        -------
+        dict | None
+            The result (as a dictionary), or None if it is not cached or expired.
+        """
+        with self._lock:
+            entry = self._results.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    del self._results[key]
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: tuple, result: dict):
+        """Add a result to the cache
+
+        Parameters
+        ----------
+        key : tuple
+            The cache key of the recipient.
+        result : dict
+            The result (as a dictionary) of `validate_account_name`.
+
+        Returns
+        -------
+        None
+        """
+        if (
+            result.get("result_code")
+            == EnumAccountNameMatchCode.TEMPORARILY_UNAVAILABLE
+        ):
+            return
+        with self._lock:
+            self._results[key] = (time.monotonic() + self.ttl, result)
+            self._results.move_to_end(key)
+            while len(self._results) > self.max_size:
+                self._results.popitem(last=False)
+
+    def clear(self):
+        """Remove all results from the cache"""
+        with self._lock:
+            self._results.clear()
+
+
+def _account_name_check(
+    row: int,
+    recipient: dict,
+    result: dict | None = None,
+    cached: bool = False,
+    error: str | None = None,
+) -> ModelAccountNameCheck:
+    """Build the check of a recipient from a result of `validate_account_name`
+
+    Parameters
+    ----------
+    row : int
+        The index of the recipient
+    recipient : dict
+        The recipient
+    result : dict | None, optional
+        The result as a dictionary, None if the check failed
+    cached : bool, optional
+        Whether the result was served from the cache
+    error : str | None, optional
+        The error if the check failed
+
+    Returns
+    -------
+    ModelAccountNameCheck
+        The check of the recipient
+    """
+    result = result or {}
+    individual_name = result.get("individual_name") or {}
+    return ModelAccountNameCheck(
+        row=row,
+        account_no=recipient["account_no"],
+        sort_code=recipient["sort_code"],
+        result_code=result.get("result_code"),
+        reason_code=(result.get("reason") or {}).get("code"),
+        company_name=result.get("company_name"),
+        individual_first_name=individual_name.get("first_name"),
+        individual_last_name=individual_name.get("last_name"),
+        cached=cached,
+        error=error,
+    )
@@ -0,0 +1,494 @@
+from typing import TYPE_CHECKING, Annotated, Iterable
+from uuid import UUID
+import asyncio
+import logging
+import re
+import unicodedata
+
+from pydantic import BaseModel, Field
+
+from pyrevolut.exceptions import PyRevolutConflict
+from pyrevolut.utils.rate_limit import RateLimiter
+from pyrevolut.utils.retry import retry_async, as_dict
+
+if TYPE_CHECKING:
+    from pyrevolut.client import AsyncClient
+
+
+class ModelResolvedCounterparty(BaseModel):
+    """The counterparty resolved for a single recipient by the `CounterpartyRegistry`."""
+
+    row: Annotated[
+        int,
+        Field(description="The 0-based index of the recipient in the input list."),
+    ]
+    counterparty_id: Annotated[
+        UUID | None,
+        Field(
+            description="The ID of the counterparty, None if it could not be resolved."
+        ),
+    ] = None
+    account_id: Annotated[
+        UUID | None,
+        Field(
+            description="""
+            The ID of the counterparty's account matching the recipient's bank details,
+            if the recipient was resolved by IBAN or account number.
+            """
+        ),
+    ] = None
+    created: Annotated[
+        bool,
+        Field(description="Whether the counterparty was created by this call."),
+    ] = False
+    error: Annotated[
+        str | None,
+        Field(description="The error if the counterparty could not be resolved."),
+    ] = None
+
+
+class CounterpartyRegistry:
+    """A local index of all counterparties of the business, to resolve recipients
+    to counterparty IDs without an API call per recipient.
+
+    The counterparties are loaded once through pagination and indexed by IBAN,
+    by account number with sort code (or routing number), by Revtag and by
+    normalized name. Recipients that are not found are created concurrently,
+    and recipients with the same bank details are created only once.
+
+    Example
+    -------
+    ```python
+    async with AsyncClient(creds_loc="path/to/creds.json") as client:
+        registry = CounterpartyRegistry(client=client)
+        await registry.load()
+        results = await registry.resolve(
+            [
+                {
+                    "company_name": "Acme Ltd",
+                    "bank_country": "GB",
+                    "currency": "GBP",
+                    "account_no": "12345678",
+                    "sort_code": "223344",
+                },
+            ]
+        )
+    ```
+    """
+
+    def __init__(
+        self,
+        client: "AsyncClient",
+        max_concurrency: int = 10,
+        rate: float | None = None,
+        max_retries: int = 3,
+        backoff: float = 1.0,
+    ):
+        """Create a new (empty) counterparty registry
+
+        Parameters
+        ----------
+        client : AsyncClient
+            The (open) async client used to call the API.
+        max_concurrency : int, optional
+            The maximum number of counterparties created at once, by default 10.
+        rate : float, optional
+            The maximum number of requests per second, by default no limit.
+        max_retries : int, optional
+            The maximum number of retries of a request on transient errors, by default 3.
+        backoff : float, optional
+            The base delay in seconds of the exponential backoff, by default 1.0.
+        """
+        assert max_concurrency >= 1, "max_concurrency must be at least 1"
+
+        self.client = client
+        self.max_concurrency = max_concurrency
+        self.rate_limiter = (
+            RateLimiter(rate=rate, name="counterparty_registry")
+            if rate is not None
+            else None
+        )
+        self.max_retries = max_retries
+        self.backoff = backoff
+
+        self.counterparties: dict[str, dict] = {}
+        self._accounts: dict[tuple, tuple[str, str | None]] = {}
+        self._names: dict[str, set[str]] = {}
+
+    async def load(self, page_size: int = 100) -> int:
+        """Load all the counterparties of the business into the registry,
+        page by page.
+
+        Parameters
+        ----------
+        page_size : int, optional
+            The number of counterparties per page, by default 100 (the maximum).
+
+        Returns
+        -------
+        int
+            The number of counterparties loaded.
+        """
+        created_before = None
+        n_loaded = 0
+        while True:
+            page, _ = await self.__call(
+                lambda: self.client.Counterparties.get_all_counterparties(
+                    created_before=created_before, limit=page_size
+                )
+            )
+            page = as_dict(page)
+            for counterparty in page:
+                self.add(counterparty)
+            n_loaded += len(page)
+            if len(page) < page_size:
+                return n_loaded
+            created_before = page[-1]["created_at"]
+
+    def add(self, counterparty: dict | BaseModel):
+        """Add a counterparty to the registry (or update it)
+
+        Parameters
+        ----------
+        counterparty : dict | BaseModel
+            The counterparty, as returned by the Counterparties API.
+
+        Returns
+        -------
+        None
+        """
+        counterparty = as_dict(counterparty)
+        counterparty_id = str(counterparty["id"])
+        self.counterparties[counterparty_id] = counterparty
+
+        if counterparty.get("revtag"):
+            self._accounts[("revtag", counterparty["revtag"].lower())] = (
+                counterparty_id,
+                None,
+            )
+        for account in counterparty.get("accounts") or []:
+            for key in _account_keys(**account):
+                self._accounts[key] = (counterparty_id, str(account["id"]))
+        self._names.setdefault(normalize_name(counterparty["name"]), set()).add(
+            counterparty_id
+        )
+
+    def lookup(
+        self,
+        iban: str | None = None,
+        account_no: str | None = None,
+        sort_code: str | None = None,
+        routing_number: str | None = None,
+        revtag: str | None = None,
+        **kwargs,
+    ) -> tuple[str, str | None] | None:
+        """Find a counterparty by its bank details (or Revtag) in the registry
+
+        Parameters
+        ----------
+        iban : str, optional
+            The IBAN of the counterparty's account.
+        account_no : str, optional
+            The account number of the counterparty's account, used with
+            the sort code or the routing number.
+        sort_code : str, optional
+            The sort code of the counterparty's account.
+        routing_number : str, optional
+            The routing number of the counterparty's account.
+        revtag : str, optional
+            The Revtag of the counterparty.
+        **kwargs
+            Other details of the recipient, which are ignored.
+
+        Returns
+        -------
+        tuple[str, str | None] | None
+            The ID of the counterparty and of its matching account,
+            or None if there is no match.
+        """
+        keys = _account_keys(
+            iban=iban,
+            account_no=account_no,
+            sort_code=sort_code,
+            routing_number=routing_number,
+        )
+        if revtag:
+            keys.append(("revtag", revtag.lower()))
+        for key in keys:
+            if key in self._accounts:
+                return self._accounts[key]
+        return None
+
+    def find_by_name(self, name: str) -> list[dict]:
+        """Find the counterparties with a name, ignoring case, accents,
+        punctuation and extra whitespace.
+
+        Parameters
+        ----------
+        name : str
+            The name of the counterparty.
+
+        Returns
+        -------
+        list[dict]
+            The counterparties with the name.
+        """
+        return [
+            self.counterparties[counterparty_id]
+            for counterparty_id in self._names.get(normalize_name(name), ())
+        ]
+
+    async def resolve(
+        self,
+        recipients: Iterable[dict],
+        create_missing: bool = True,
+    ) -> list[ModelResolvedCounterparty]:
+        """Resolve recipients to counterparties, creating the missing ones.
+
+        A recipient is resolved by its bank details (IBAN, account number with
+        sort code or routing number) or its Revtag. A recipient without any of
+        these is resolved by name if exactly one counterparty has that name.
+        The missing counterparties are created concurrently; recipients with the
+        same bank details share a single creation.
+
+        Parameters
+        ----------
+        recipients : Iterable[dict]
+            The recipients, each as the keyword arguments of `create_counterparty`.
+        create_missing : bool, optional
+            Whether to create the counterparties that are not in the registry,
+            by default True.
+
+        Returns
+        -------
+        list[ModelResolvedCounterparty]
+            The resolved counterparty of each recipient, in the order of the input.
+        """
+        results: list[ModelResolvedCounterparty] = []
+        creations: dict[tuple, asyncio.Task] = {}
+        pending: list[tuple[ModelResolvedCounterparty, asyncio.Task]] = []
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        for row, recipient in enumerate(recipients):
+            result = ModelResolvedCounterparty(row=row)
+            results.append(result)
+
+            match = self.lookup(**recipient)
+            if match is None and not _account_keys(**recipient):
+                if not recipient.get("revtag"):
+                    names = self._names.get(
+                        normalize_name(_recipient_name(recipient)), set()
+                    )
+                    if len(names) == 1:
+                        match = (next(iter(names)), None)
+            if match is not None:
+                result.counterparty_id, result.account_id = match
+                continue
+            if not create_missing:
+                result.error = "Counterparty not found"
+                continue
+
+            key = _identity(recipient)
+            if key not in creations:
+                creations[key] = asyncio.create_task(
+                    self.__create(recipient, semaphore)
+                )
+            pending.append((result, creations[key]))
+
+        for result, task in pending:
+            try:
+                result.counterparty_id, result.account_id, result.created = await task
+            except Exception as exc:
+                result.error = f"{type(exc).__name__}: {exc}"
+        return results
+
+    async def __create(
+        self, recipient: dict, semaphore: asyncio.Semaphore
+    ) -> tuple[str, str | None, bool]:
+        """Create a counterparty and add it to the registry.
+        If it already exists, it is retrieved instead.
+
+        Parameters
+        ----------
+        recipient : dict
+            The keyword arguments of `create_counterparty`
+        semaphore : asyncio.Semaphore
+            The semaphore bounding the number of concurrent creations
+
+        Returns
+        -------
+        tuple[str, str | None, bool]
+            The ID of the counterparty and of its matching account,
+            and whether the counterparty was created
+        """
+        created = True
+        async with semaphore:
+            try:
+                counterparty, _ = await self.__call(
+                    lambda: self.client.Counterparties.create_counterparty(**recipient)
+                )
+                counterparties = [counterparty]
+            except PyRevolutConflict:
+                created = False
+                logging.info(
+                    "Counterparty already exists, retrieving it: %s",
+                    _recipient_name(recipient),
+                )
+                filters = {
+                    name: recipient.get(name)
+                    for name in ("iban", "bic", "account_no", "sort_code")
+                    if recipient.get(name)
+                }
+                counterparties, _ = await self.__call(
+                    lambda: self.client.Counterparties.get_all_counterparties(**filters)
+                )
+        for counterparty in as_dict(counterparties):
+            self.add(counterparty)
+
+        match = self.lookup(**recipient)
+        if match is None:
+            counterparty = as_dict(counterparties[0])
+            match = (str(counterparty["id"]), None)
+        return *match, created
+
+    async def __call(self, fn):
+        """Call the API with the rate limit and retries of the registry
+
+        Parameters
+        ----------
+        fn : Callable[[], Awaitable]
+            The coroutine function calling the API
+
+        Returns
+        -------
+        tuple[Any, int]
+            The response and the number of attempts it took
+        """
+
+        async def call():
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire()
+            return await fn()
+
+        return await retry_async(
+            call, max_retries=self.max_retries, backoff=self.backoff
+        )
+
+
+def normalize_name(name: str) -> str:
+    """Normalize a name for matching: lowercase, without accents, punctuation
+    or extra whitespace.
+
+    Parameters
+    ----------
+    name : str
+        The name
+
+    Returns
+    -------
+    str
+        The normalized name
+    """
+    name = unicodedata.normalize("NFKD", name)
+    name = "".join(char for char in name if not unicodedata.combining(char))
+    name = re.sub(r"[^\w\s]", " ", name.casefold())
+    return " ".join(name.split())
+
+
+def _normalize_code(code: str | None) -> str | None:
+    """Normalize a bank code (IBAN, account number, sort code, ...) for matching
+
+    Parameters
+    ----------
+    code : str | None
+        The code
+
+    Returns
+    -------
+    str | None
+        The code in upper case without spaces and dashes
+    """
+    if not code:
+        return None
+    return re.sub(r"[\s-]", "", code).upper()
+
+
+def _account_keys(
+    iban: str | None = None,
+    account_no: str | None = None,
+    sort_code: str | None = None,
+    routing_number: str | None = None,
+    **kwargs,
+) -> list[tuple]:
+    """The index keys of a bank account
+
+    Parameters
+    ----------
+    iban : str | None
+        The IBAN
+    account_no : str | None
+        The account number
+    sort_code : str | None
+        The sort code
+    routing_number : str | None
+        The routing number
+
+    Returns
+    -------
+    list[tuple]
+        The keys of the account
+    """
+    keys = []
+    iban = _normalize_code(iban)
+    account_no = _normalize_code(account_no)
+    if iban:
+        keys.append(("iban", iban))
+    if account_no and sort_code:
+        keys.append(("sort_code", account_no, _normalize_code(sort_code)))
+    if account_no and routing_number:
+        keys.append(("routing_number", account_no, _normalize_code(routing_number)))
+    return keys
+
+
+def _recipient_name(recipient: dict) -> str:
+    """The name of a recipient given as the keyword arguments of `create_counterparty`
+
+    Parameters
+    ----------
+    recipient : dict
+        The recipient
+
+    Returns
+    -------
+    str
+        The name of the recipient
+    """
+    if recipient.get("company_name"):
+        return recipient["company_name"]
+    if recipient.get("name"):
+        return recipient["name"]
+    return " ".join(
+        recipient.get(name) or ""
+        for name in ("individual_first_name", "individual_last_name")
+    )
+
+
+def _identity(recipient: dict) -> tuple:
+    """The key used to create recipients with the same details only once
+
+    Parameters
+    ----------
+    recipient : dict
+        The recipient
+
+    Returns
+    -------
+    tuple
+        The bank details of the recipient, or its Revtag or name if it has none
+    """
+    keys = _account_keys(**recipient)
+    if keys:
+        return keys[0]
+    if recipient.get("revtag"):
+        return ("revtag", recipient["revtag"].lower())
+    return ("name", normalize_name(_recipient_name(recipient)))
@@ -5,3 +5,5 @@ Reference link: https://developer.revolut.com/docs/business/foreign-exchange
 
 # flake8: noqa: F401
 from .endpoint import EndpointForeignExchangeSync, EndpointForeignExchangeAsync
+from .cache import ExchangeRateCache
+from .matrix import CrossRateMatrix, ModelCrossRateCheck
@@ -0,0 +1,123 @@
+from typing import Any
+import threading
+import time
+
+
+class ExchangeRateCache:
+    """A thread-safe cache of exchange rate quotes with a maximum age.
+
+    Quotes are keyed by currency pair and exact amount (to the cent), so a cached
+    quote always has the amounts and fee of the amount that is requested.
+    """
+
+    def __init__(self, max_age: float = 60.0, max_size: int = 10_000):
+        """Create a new cache
+
+        Parameters
+        ----------
+        max_age : float, optional
+            The maximum age of a cached quote in seconds, by default 60.
+        max_size : int, optional
+            The maximum number of quotes kept, by default 10,000.
+        """
+        assert max_age >= 0, "max_age must not be negative"
+        assert max_size >= 1, "max_size must be at least 1"
+
+        self.max_age = max_age
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._quotes: dict[tuple, tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(
+        from_currency: str, to_currency: str, amount: float | None = None
+    ) -> tuple[str, str, float]:
+        """The cache key of a quote
+
+        Parameters
+        ----------
+        from_currency : str
+            The currency that you exchange from in ISO 4217 format.
+        to_currency : str
+            The currency that you exchange to in ISO 4217 format.
+        amount : float | None, optional
+            The amount of the currency to exchange from, by default 1.00
+            (as the API defaults to).
+
+        Returns
+        -------
+        tuple[str, str, float]
+            The currency pair and the amount, rounded to the cent.
+        """
+        amount = 1.0 if amount is None else round(float(amount), 2)
+        return from_currency.upper(), to_currency.upper(), amount
+
+    def get(self, key: tuple, max_age: float | None = None) -> Any | None:
+        """Get a quote from the cache
+
+        Parameters
+        ----------
+        key : tuple
+            The cache key of the quote.
+        max_age : float | None, optional
+            The maximum age of the quote in seconds, by default the max_age of the cache.
+
+        Returns
+        -------
+        Any | None
+            The quote, or None if it is not cached or too old.
+        """
+        max_age = self.max_age if max_age is None else max_age
+        with self._lock:
+            entry = self._quotes.get(key)
+            if entry is None or time.monotonic() - entry[0] > max_age:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: tuple, quote: Any):
+        """Add a quote to the cache
+
+        Parameters
+        ----------
+        key : tuple
+            The cache key of the quote.
+        quote : Any
+            The quote, as returned by `get_exchange_rate`.
+
+        Returns
+        -------
+        None
+        """
+        with self._lock:
+            self._quotes.pop(key, None)
+            self._quotes[key] = (time.monotonic(), quote)
+            if len(self._quotes) > self.max_size:
+                now = time.monotonic()
+                self._quotes = {
+                    key: entry
+                    for key, entry in self._quotes.items()
+                    if now - entry[0] <= self.max_age
+                }
+                while len(self._quotes) > self.max_size:
+                    del self._quotes[next(iter(self._quotes))]
+
+    def clear(self):
+        """Remove all quotes from the cache"""
+        with self._lock:
+            self._quotes.clear()
+
+    @property
+    def hit_ratio(self) -> float:
+        """The ratio of lookups served from the cache
+
+        Returns
+        -------
+        float
+            The number of hits over the number of lookups, 0 if there were none
+        """
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
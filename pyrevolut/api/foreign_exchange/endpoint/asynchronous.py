@@ -1,9 +1,16 @@
+from typing import TYPE_CHECKING, Iterable
 from uuid import UUID
+import asyncio
 
 from pyrevolut.api.common import BaseEndpointAsync
 
 from pyrevolut.api.foreign_exchange.get import GetExchangeRate
 from pyrevolut.api.foreign_exchange.post import ExchangeMoney
+from pyrevolut.api.foreign_exchange.cache import ExchangeRateCache
+from pyrevolut.api.foreign_exchange.matrix import CrossRateMatrix
+
+if TYPE_CHECKING:
+    from pyrevolut.client import AsyncClient
 
 
 class EndpointForeignExchangeAsync(BaseEndpointAsync):
@@ -12,6 +19,18 @@ class EndpointForeignExchangeAsync(BaseEndpointAsync):
     Retrieve information on exchange rates between currencies, buy and sell currencies.
     """
 
+    def __init__(self, client: "AsyncClient"):
+        """Create a new Foreign Exchange endpoint handler
+
+        Parameters
+        ----------
+        client : AsyncClient
+            The client to use for the endpoint
+        """
+        super().__init__(client=client)
+        self.rate_cache = ExchangeRateCache()
+        self.__in_flight: dict[tuple, asyncio.Task] = {}
+
     async def get_exchange_rate(
         self,
         from_currency: str,
@@ -47,11 +66,180 @@ class EndpointForeignExchangeAsync(BaseEndpointAsync):
 
         return await self.client.get(
             path=path,
+            route=endpoint.ROUTE,
             response_model=endpoint.Response,
             params=params,
             **kwargs,
         )
 
+    async def get_cached_exchange_rate(
+        self,
+        from_currency: str,
+        to_currency: str,
+        amount: float | None = None,
+        max_age: float | None = None,
+        **kwargs,
+    ) -> dict | GetExchangeRate.Response:
+        """
+        Get the sell exchange rate between two currencies from the rate cache
+        of the endpoint (`rate_cache`), fetching it if it is missing or too old.
+
+        Quotes are cached per currency pair and amount (see `ExchangeRateCache`),
+        so the amounts and fee of the quote are those of the requested amount.
+        Concurrent requests for the same currency pair and amount share a single
+        API call.
+
+        Parameters
+        ----------
+        from_currency : str
+            The currency that you exchange from in ISO 4217 format.
+        to_currency : str
+            The currency that you exchange to in ISO 4217 format.
+        amount : float | None
+            The amount of the currency to exchange from.
+            The default value is 1.00 if not provided.
+        max_age : float | None
+            The maximum age of a cached rate in seconds,
+            by default the max_age of the rate cache.
+
+        Returns
+        -------
+        dict | GetExchangeRate.Response
+            A dict with the information about the exchange rate.
+        """
+        key = ExchangeRateCache.key(from_currency, to_currency, amount)
+        quote = self.rate_cache.get(key, max_age=max_age)
+        if quote is not None:
+            return quote
+
+        task = self.__in_flight.get(key)
+        if task is None:
+
+            async def fetch():
+                try:
+                    quote = await self.get_exchange_rate(
+                        from_currency=from_currency,
+                        to_currency=to_currency,
+                        amount=amount,
+                        **kwargs,
+                    )
+                    self.rate_cache.set(key, quote)
+                    return quote
+                finally:
+                    self.__in_flight.pop(key, None)
+
+            task = self.__in_flight[key] = asyncio.ensure_future(fetch())
+        return await asyncio.shield(task)
+
+    async def get_exchange_rates(
+        self,
+        pairs: Iterable[tuple[str, str]],
+        amount: float | None = None,
+        max_age: float | None = None,
+        max_concurrency: int = 10,
+        **kwargs,
+    ) -> dict[tuple[str, str], dict | GetExchangeRate.Response]:
+        """
+        Get the sell exchange rates of many currency pairs, serving them from
+        the rate cache of the endpoint and fetching the missing ones concurrently.
+
+        Parameters
+        ----------
+        pairs : Iterable[tuple[str, str]]
+            The (from_currency, to_currency) pairs in ISO 4217 format.
+        amount : float | None
+            The amount of the currency to exchange from.
+            The default value is 1.00 if not provided.
+        max_age : float | None
+            The maximum age of a cached rate in seconds,
+            by default the max_age of the rate cache.
+        max_concurrency : int
+            The maximum number of requests in flight, by default 10.
+
+        Returns
+        -------
+        dict[tuple[str, str], dict | GetExchangeRate.Response]
+            The exchange rate of each pair.
+        """
+        assert max_concurrency >= 1, "max_concurrency must be at least 1"
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def get(pair: tuple[str, str]):
+            async with semaphore:
+                return pair, await self.get_cached_exchange_rate(
+                    from_currency=pair[0],
+                    to_currency=pair[1],
+                    amount=amount,
+                    max_age=max_age,
+                    **kwargs,
+                )
+
+        return dict(await asyncio.gather(*(get(pair) for pair in dict.fromkeys(pairs))))
+
+    async def get_cross_rate_matrix(
+        self,
+        currencies: Iterable[str],
+        pivot: str | None = None,
+        verify_sample: int = 0,
+        seed: int | None = None,
+        max_age: float | None = None,
+        max_concurrency: int = 10,
+        **kwargs,
+    ) -> CrossRateMatrix:
+        """
+        Get the matrix of sell rates between all the currencies with one quote
+        per currency against a pivot currency (N - 1 quotes instead of N x (N - 1)),
+        deriving the cross rates with NumPy.
+
+        The quotes are fetched concurrently through the rate cache of the endpoint
+        (see `get_exchange_rates`).
+
+        Parameters
+        ----------
+        currencies : Iterable[str]
+            The currencies in ISO 4217 format.
+        pivot : str | None
+            The pivot currency, by default the first currency.
+        verify_sample : int
+            The number of derived pairs checked against a direct quote, by default 0.
+            The checks are kept in the `checks` of the matrix.
+        seed : int | None
+            The seed of the random sample of the pairs to verify.
+        max_age : float | None
+            The maximum age of a cached rate in seconds,
+            by default the max_age of the rate cache.
+        max_concurrency : int
+            The maximum number of requests in flight, by default 10.
+
+        Returns
+        -------
+        CrossRateMatrix
+            The matrix of the rates, backed by NumPy arrays, with the date of each rate.
+        """
+        currencies = [currency.upper() for currency in currencies]
+        pivot = (pivot or currencies[0]).upper()
+
+        quotes = await self.get_exchange_rates(
+            pairs=[(pivot, currency) for currency in currencies if currency != pivot],
+            max_age=max_age,
+            max_concurrency=max_concurrency,
+            **kwargs,
+        )
+        matrix = CrossRateMatrix.from_pivot_quotes(
+            pivot=pivot,
+            quotes={to_currency: quote for (_, to_currency), quote in quotes.items()},
+        )
+
+        if verify_sample > 0:
+            direct_quotes = await self.get_exchange_rates(
+                pairs=matrix.sample_pairs(n=verify_sample, seed=seed),
+                max_age=max_age,
+                max_concurrency=max_concurrency,
+                **kwargs,
+            )
+            matrix.verify(direct_quotes=direct_quotes)
+        return matrix
+
     async def exchange_money(
         self,
         request_id: str,
@@ -126,6 +314,7 @@ class EndpointForeignExchangeAsync(BaseEndpointAsync):
 
         return await self.client.post(
             path=path,
+            route=endpoint.ROUTE,
             response_model=endpoint.Response,
             body=body,
             **kwargs,
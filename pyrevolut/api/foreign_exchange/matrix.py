@@ -0,0 +1,280 @@
+from typing import TYPE_CHECKING, Annotated, Any
+import random
+
+from pydantic import BaseModel, Field
+import pendulum
+
+from pyrevolut.utils.retry import as_dict
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+class ModelCrossRateCheck(BaseModel):
+    """The check of a derived cross rate against a direct quote."""
+
+    from_currency: Annotated[str, Field(description="The currency sold.")]
+    to_currency: Annotated[str, Field(description="The currency bought.")]
+    derived_rate: Annotated[
+        float, Field(description="The rate derived from the pivot quotes.")
+    ]
+    direct_rate: Annotated[float, Field(description="The rate quoted directly.")]
+    deviation: Annotated[
+        float,
+        Field(
+            description="The relative deviation of the derived rate from the direct rate."
+        ),
+    ]
+
+
+class CrossRateMatrix:
+    """A matrix of sell rates between currencies, derived from one quote per
+    currency against a pivot currency.
+
+    `rates[i, j]` is the number of units of `currencies[j]` received for one unit
+    of `currencies[i]`, and `timestamps[i, j]` is the date of the older of the two
+    quotes it was derived from. Derived cross rates include the spread of both
+    pivot quotes, so they are slightly lower than direct quotes; use the
+    verification sample to measure the difference.
+    """
+
+    def __init__(
+        self,
+        currencies: list[str],
+        pivot: str,
+        rates: "np.ndarray",
+        timestamps: "np.ndarray",
+        checks: list[ModelCrossRateCheck] | None = None,
+    ):
+        """Create a new cross rate matrix
+
+        Parameters
+        ----------
+        currencies : list[str]
+            The currencies of the rows and columns of the matrix.
+        pivot : str
+            The pivot currency the rates were derived from.
+        rates : np.ndarray
+            The N x N float64 array of rates.
+        timestamps : np.ndarray
+            The N x N datetime64[ms] array of the dates of the rates (in UTC).
+        checks : list[ModelCrossRateCheck], optional
+            The checks of a sample of derived rates against direct quotes.
+        """
+        self.currencies = currencies
+        self.pivot = pivot
+        self.rates = rates
+        self.timestamps = timestamps
+        self.checks = checks or []
+        self._index = {currency: i for i, currency in enumerate(currencies)}
+
+    @classmethod
+    def from_pivot_quotes(
+        cls, pivot: str, quotes: dict[str, dict | BaseModel]
+    ) -> "CrossRateMatrix":
+        """Derive the matrix from the quotes of the pivot currency
+        against every other currency.
+
+        Parameters
+        ----------
+        pivot : str
+            The pivot currency in ISO 4217 format.
+        quotes : dict[str, dict | BaseModel]
+            The quote (as returned by `get_exchange_rate`) of the pivot currency
+            to each currency.
+
+        Returns
+        -------
+        CrossRateMatrix
+            The matrix of the pivot currency and the quoted currencies.
+        """
+        np = _numpy()
+        pivot = pivot.upper()
+        currencies = [pivot] + [
+            currency.upper() for currency in quotes if currency.upper() != pivot
+        ]
+
+        # Units of each currency per unit of the pivot, and the date of its quote
+        per_pivot = np.ones(len(currencies), dtype=np.float64)
+        dates = np.full(len(currencies), np.datetime64("9999-12-31", "ms"))
+        for currency, quote in quotes.items():
+            currency = currency.upper()
+            if currency == pivot:
+                continue
+            quote = as_dict(quote)
+            i = currencies.index(currency)
+            per_pivot[i] = quote["rate"]
+            dates[i] = _datetime64(quote["rate_date"])
+
+        # The pivot needs no quote, so its (sentinel) date never is the minimum
+        rates = per_pivot[np.newaxis, :] / per_pivot[:, np.newaxis]
+        timestamps = np.minimum(dates[np.newaxis, :], dates[:, np.newaxis])
+        timestamps[0, 0] = (
+            dates[1:].min() if len(dates) > 1 else np.datetime64("now", "ms")
+        )
+        return cls(
+            currencies=currencies, pivot=pivot, rates=rates, timestamps=timestamps
+        )
+
+    def rate(self, from_currency: str, to_currency: str) -> float:
+        """The sell rate between two currencies
+
+        Parameters
+        ----------
+        from_currency : str
+            The currency sold.
+        to_currency : str
+            The currency bought.
+
+        Returns
+        -------
+        float
+            The number of units of to_currency per unit of from_currency.
+        """
+        return float(
+            self.rates[
+                self._index[from_currency.upper()], self._index[to_currency.upper()]
+            ]
+        )
+
+    def timestamp(self, from_currency: str, to_currency: str) -> pendulum.DateTime:
+        """The date of the sell rate between two currencies
+
+        Parameters
+        ----------
+        from_currency : str
+            The currency sold.
+        to_currency : str
+            The currency bought.
+
+        Returns
+        -------
+        pendulum.DateTime
+            The date of the older of the quotes the rate was derived from.
+        """
+        value = self.timestamps[
+            self._index[from_currency.upper()], self._index[to_currency.upper()]
+        ]
+        return pendulum.from_timestamp(value.astype("int64") / 1000, tz="UTC")
+
+    def sample_pairs(self, n: int, seed: int | None = None) -> list[tuple[str, str]]:
+        """A random sample of derived pairs, i.e. pairs not involving the pivot
+
+        Parameters
+        ----------
+        n : int
+            The number of pairs.
+        seed : int, optional
+            The seed of the random sample.
+
+        Returns
+        -------
+        list[tuple[str, str]]
+            The (from_currency, to_currency) pairs.
+        """
+        pairs = [
+            (from_currency, to_currency)
+            for from_currency in self.currencies[1:]
+            for to_currency in self.currencies[1:]
+            if from_currency != to_currency
+        ]
+        return random.Random(seed).sample(pairs, min(n, len(pairs)))
+
+    def verify(
+        self, direct_quotes: dict[tuple[str, str], dict | BaseModel]
+    ) -> list[ModelCrossRateCheck]:
+        """Check derived rates against direct quotes and keep the checks
+
+        Parameters
+        ----------
+        direct_quotes : dict[tuple[str, str], dict | BaseModel]
+            The direct quote (as returned by `get_exchange_rate`) of each pair.
+
+        Returns
+        -------
+        list[ModelCrossRateCheck]
+            The checks of the pairs.
+        """
+        for (from_currency, to_currency), quote in direct_quotes.items():
+            derived_rate = self.rate(from_currency, to_currency)
+            direct_rate = float(as_dict(quote)["rate"])
+            self.checks.append(
+                ModelCrossRateCheck(
+                    from_currency=from_currency,
+                    to_currency=to_currency,
+                    derived_rate=derived_rate,
+                    direct_rate=direct_rate,
+                    deviation=abs(derived_rate - direct_rate) / direct_rate,
+                )
+            )
+        return self.checks
+
+    @property
+    def max_deviation(self) -> float | None:
+        """The largest relative deviation of the checked pairs
+
+        Returns
+        -------
+        float | None
+            The largest deviation, or None if no pair was checked
+        """
+        if not self.checks:
+            return None
+        return max(check.deviation for check in self.checks)
+
+    def to_dict(self) -> dict[str, dict[str, float]]:
+        """The matrix as nested dictionaries
+
+        Returns
+        -------
+        dict[str, dict[str, float]]
+            The rate of each from_currency (outer key) to each to_currency (inner key)
+        """
+        return {
+            from_currency: {
+                to_currency: float(self.rates[i, j])
+                for j, to_currency in enumerate(self.currencies)
+            }
+            for i, from_currency in enumerate(self.currencies)
+        }
+
+
+def _numpy() -> Any:
+    """Import NumPy, which is needed for the cross rate matrix
+
+    Returns
+    -------
+    module
+        The numpy module
+
+    Raises
+    ------
+    ImportError
+        If NumPy is not installed
+    """
+    try:
+        import numpy
+    except ImportError as exc:
+        raise ImportError(
+            "NumPy is required for the cross rate matrix. "
+            "Install it with `pip install numpy`."
+        ) from exc
+    return numpy
+
+
+def _datetime64(value: Any) -> "np.datetime64":
+    """Convert a quote date to a NumPy datetime in UTC
+
+    Parameters
+    ----------
+    value : Any
+        The date as a string or a datetime
+
+    Returns
+    -------
+    np.datetime64
+        The date with millisecond precision
+    """
+    np = _numpy()
+    date = pendulum.parse(str(value)).in_tz("UTC")
+    return np.datetime64(date.naive().isoformat(), "ms")
@@ -10,3 +10,9 @@ Reference link: https://developer.revolut.com/docs/business/payment-drafts
 
 # flake8: noqa: F401
 from .endpoint import EndpointPaymentDraftsSync, EndpointPaymentDraftsAsync
+from .bulk import (
+    MAX_PAYMENTS_PER_DRAFT,
+    ModelBulkPaymentDraftRow,
+    chunk_payments,
+    match_payment_ids,
+)
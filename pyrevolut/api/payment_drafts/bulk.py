@@ -0,0 +1,173 @@
+from typing import Annotated, Iterable
+from collections import defaultdict, deque
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+from pyrevolut.exceptions import PyRevolutTooManyRequests, PyRevolutServerUnavailable
+from pyrevolut.utils.retry import as_dict
+from pyrevolut.api.payment_drafts.post import CreatePaymentDraft
+
+MAX_PAYMENTS_PER_DRAFT = 100
+"""The default number of payments per draft of a bulk creation.
+Revolut does not document a maximum, so lower it if drafts of this size are rejected."""
+
+DRAFT_RETRYABLE_ERRORS = (PyRevolutTooManyRequests, PyRevolutServerUnavailable)
+"""The errors after which a chunk is created again. Payment drafts have no request ID,
+so errors after which the draft may have been created (timeouts, network errors, 500)
+are not retried by default: retrying them could create a duplicate draft."""
+
+
+class ModelBulkPaymentDraftRow(BaseModel):
+    """The outcome of a single payment of a bulk payment draft creation."""
+
+    row: Annotated[
+        int, Field(description="The 0-based index of the payment in the input list.")
+    ]
+    draft_id: Annotated[
+        UUID | None,
+        Field(description="The ID of the payment draft the payment was added to."),
+    ] = None
+    payment_id: Annotated[
+        UUID | None,
+        Field(
+            description="""
+            The ID of the payment within the draft.
+            None if the draft was not created or the payment IDs were not resolved.
+            """
+        ),
+    ] = None
+    error: Annotated[
+        str | None,
+        Field(
+            description="""
+            The error if the draft could not be created, or if the draft was created
+            (draft_id is set) but its payment IDs could not be resolved.
+            """
+        ),
+    ] = None
+    attempts: Annotated[
+        int, Field(description="The number of requests made to create the draft.")
+    ] = 0
+
+
+def chunk_payments(
+    payments: Iterable[CreatePaymentDraft.Body.ModelPayment | dict],
+    chunk_size: int = MAX_PAYMENTS_PER_DRAFT,
+) -> list[list[tuple[int, CreatePaymentDraft.Body.ModelPayment]]]:
+    """Split a list of payments into the chunks of a bulk payment draft creation.
+
+    A draft can only pay from a single account, so the payments are grouped by
+    account ID first and each group is split into chunks of at most `chunk_size`
+    payments, keeping the input order within each chunk.
+
+    Parameters
+    ----------
+    payments : Iterable[CreatePaymentDraft.Body.ModelPayment | dict]
+        The payments.
+    chunk_size : int, optional
+        The maximum number of payments per chunk, by default MAX_PAYMENTS_PER_DRAFT.
+
+    Returns
+    -------
+    list[list[tuple[int, CreatePaymentDraft.Body.ModelPayment]]]
+        The chunks of (row, payment) pairs, where row is the index of the payment
+        in the input.
+    """
+    assert chunk_size >= 1, "chunk_size must be at least 1"
+
+    by_account: dict[UUID, list] = defaultdict(list)
+    for row, payment in enumerate(payments):
+        if not isinstance(payment, CreatePaymentDraft.Body.ModelPayment):
+            payment = CreatePaymentDraft.Body.ModelPayment(**payment)
+        by_account[payment.account_id].append((row, payment))
+
+    return [
+        group[i : i + chunk_size]
+        for group in by_account.values()
+        for i in range(0, len(group), chunk_size)
+    ]
+
+
+def match_payment_ids(
+    chunk: list[tuple[int, CreatePaymentDraft.Body.ModelPayment]],
+    draft: dict,
+) -> list[UUID | None]:
+    """Map the payments of a chunk to the payments of the created draft.
+
+    The payments are matched on their receiver, amount, currency and reference.
+    Identical payments are matched in order.
+
+    Parameters
+    ----------
+    chunk : list[tuple[int, CreatePaymentDraft.Body.ModelPayment]]
+        The (row, payment) pairs the draft was created with.
+    draft : dict
+        The draft, as returned by `get_payment_draft` (as a dictionary).
+
+    Returns
+    -------
+    list[UUID | None]
+        The payment ID of each payment of the chunk, or None if there was no match.
+    """
+    ids: dict[tuple, deque] = defaultdict(deque)
+    for payment in draft.get("payments", []):
+        receiver = payment["receiver"]
+        key = (
+            str(receiver["counterparty_id"]),
+            str(receiver.get("account_id") or receiver.get("card_id") or ""),
+            round(float(payment["amount"]["amount"]), 2),
+            str(payment["amount"]["currency"]),
+            payment.get("reference") or "",
+        )
+        ids[key].append(UUID(str(payment["id"])))
+
+    payment_ids = []
+    for _, payment in chunk:
+        key = (
+            str(payment.receiver.counterparty_id),
+            str(payment.receiver.account_id or payment.receiver.card_id or ""),
+            round(payment.amount, 2),
+            str(payment.currency),
+            payment.reference or "",
+        )
+        payment_ids.append(ids[key].popleft() if ids[key] else None)
+    return payment_ids
+
+
+def _chunk_title(title: str | None, index: int, n_chunks: int) -> str | None:
+    """The title of the draft of a chunk, numbered if there are several chunks
+
+    Parameters
+    ----------
+    title : str | None
+        The title of the drafts
+    index : int
+        The 0-based index of the chunk
+    n_chunks : int
+        The number of chunks
+
+    Returns
+    -------
+    str | None
+        The title of the draft
+    """
+    if title is None or n_chunks == 1:
+        return title
+    return f"{title} ({index + 1}/{n_chunks})"
+
+
+def _draft_id(response: dict | BaseModel) -> UUID:
+    """The ID of a created payment draft in any of the client return types
+
+    Parameters
+    ----------
+    response : dict | BaseModel
+        The response of `create_payment_draft`
+
+    Returns
+    -------
+    UUID
+        The ID of the draft
+    """
+    return UUID(str(as_dict(response)["id"]))
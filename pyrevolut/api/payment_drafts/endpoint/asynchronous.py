@@ -1,7 +1,10 @@
+from typing import Iterable
 from uuid import UUID
 from datetime import date
+import asyncio
 
 from pyrevolut.utils import Date
+from pyrevolut.utils.retry import retry_async, as_dict
 from pyrevolut.api.common import BaseEndpointAsync
 
 from pyrevolut.api.payment_drafts.get import (
@@ -10,6 +13,15 @@ from pyrevolut.api.payment_drafts.get import (
 )
 from pyrevolut.api.payment_drafts.post import CreatePaymentDraft
 from pyrevolut.api.payment_drafts.delete import DeletePaymentDraft
+from pyrevolut.api.payment_drafts.bulk import (
+    MAX_PAYMENTS_PER_DRAFT,
+    DRAFT_RETRYABLE_ERRORS,
+    ModelBulkPaymentDraftRow,
+    chunk_payments,
+    match_payment_ids,
+    _chunk_title,
+    _draft_id,
+)
 
 
 class EndpointPaymentDraftsAsync(BaseEndpointAsync):
@@ -45,6 +57,7 @@ class EndpointPaymentDraftsAsync(BaseEndpointAsync):
 
         return await self.client.get(
             path=path,
+            route=endpoint.ROUTE,
             response_model=endpoint.Response,
             params=params,
             **kwargs,
@@ -74,6 +87,7 @@ class EndpointPaymentDraftsAsync(BaseEndpointAsync):
 
         return await self.client.get(
             path=path,
+            route=endpoint.ROUTE,
             response_model=endpoint.Response,
             params=params,
             **kwargs,
@@ -172,11 +186,139 @@ class EndpointPaymentDraftsAsync(BaseEndpointAsync):
 
         return await self.client.post(
             path=path,
+            route=endpoint.ROUTE,
             response_model=endpoint.Response,
             body=body,
             **kwargs,
         )
 
+    async def create_payment_drafts(
+        self,
+        payments: Iterable[CreatePaymentDraft.Body.ModelPayment | dict],
+        title: str | None = None,
+        schedule_for: date | Date | str | None = None,
+        chunk_size: int = MAX_PAYMENTS_PER_DRAFT,
+        max_concurrency: int = 5,
+        max_retries: int = 3,
+        backoff: float = 1.0,
+        retry_on: tuple[type[Exception], ...] = DRAFT_RETRYABLE_ERRORS,
+        resolve_payment_ids: bool = True,
+        **kwargs,
+    ) -> list[ModelBulkPaymentDraftRow]:
+        """
+        Create payment drafts for an arbitrarily long list of payments.
+
+        The payments are grouped by the account they are paid from and split into
+        drafts of at most `chunk_size` payments, which are created concurrently.
+        A chunk that fails with one of the `retry_on` errors is created again with
+        exponential backoff. After a draft is created, it is retrieved to map each
+        payment to its payment ID within the draft.
+
+        Parameters
+        ----------
+        payments : Iterable[CreatePaymentDraft.Body.ModelPayment | dict]
+            The payments, each with the account to pay from, the receiver, the amount,
+            the currency and the reference.
+        title : str, optional
+            The title of the payment drafts. If the payments are split into several
+            drafts, the titles are numbered, e.g. "Payroll (2/5)".
+        schedule_for : date | Date | str, optional
+            The scheduled date of the payment drafts in ISO 8601 format.
+        chunk_size : int, optional
+            The maximum number of payments per draft, by default MAX_PAYMENTS_PER_DRAFT.
+        max_concurrency : int, optional
+            The maximum number of drafts created at once, by default 5.
+        max_retries : int, optional
+            The maximum number of retries of a chunk, by default 3.
+        backoff : float, optional
+            The base delay in seconds of the exponential backoff, by default 1.0.
+        retry_on : tuple[type[Exception], ...], optional
+            The errors after which a chunk is created again, by default
+            DRAFT_RETRYABLE_ERRORS (429 and 503). Payment drafts have no request ID,
+            so retrying on errors after which the draft may have been created
+            (e.g. timeouts) can create duplicate drafts.
+        resolve_payment_ids : bool, optional
+            Whether to retrieve each created draft to map the payments to their
+            payment IDs, by default True.
+
+        Returns
+        -------
+        list[ModelBulkPaymentDraftRow]
+            The outcome of each payment, in the order of the input.
+        """
+        assert max_concurrency >= 1, "max_concurrency must be at least 1"
+
+        chunks = chunk_payments(payments=payments, chunk_size=chunk_size)
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def create(index: int, chunk: list) -> list[ModelBulkPaymentDraftRow]:
+            attempts = 0
+
+            async def post():
+                nonlocal attempts
+                attempts += 1
+                return await self.create_payment_draft(
+                    account_id=chunk[0][1].account_id,
+                    counterparty_ids=[p.receiver.counterparty_id for _, p in chunk],
+                    counterparty_account_ids=[p.receiver.account_id for _, p in chunk],
+                    counterparty_card_ids=[p.receiver.card_id for _, p in chunk],
+                    amounts=[p.amount for _, p in chunk],
+                    currencies=[p.currency for _, p in chunk],
+                    references=[p.reference for _, p in chunk],
+                    title=_chunk_title(title, index, len(chunks)),
+                    schedule_for=schedule_for,
+                    **kwargs,
+                )
+
+            async with semaphore:
+                try:
+                    response, _ = await retry_async(
+                        post,
+                        max_retries=max_retries,
+                        backoff=backoff,
+                        retry_on=retry_on,
+                    )
+                except Exception as exc:
+                    return [
+                        ModelBulkPaymentDraftRow(
+                            row=row,
+                            error=f"{type(exc).__name__}: {exc}",
+                            attempts=attempts,
+                        )
+                        for row, _ in chunk
+                    ]
+
+                draft_id = _draft_id(response)
+                payment_ids, error = [None] * len(chunk), None
+                if resolve_payment_ids:
+                    try:
+                        draft, _ = await retry_async(
+                            lambda: self.get_payment_draft(
+                                payment_draft_id=draft_id, **kwargs
+                            ),
+                            max_retries=max_retries,
+                            backoff=backoff,
+                        )
+                        payment_ids = match_payment_ids(chunk, as_dict(draft))
+                    except Exception as exc:
+                        error = f"{type(exc).__name__}: {exc}"
+
+            return [
+                ModelBulkPaymentDraftRow(
+                    row=row,
+                    draft_id=draft_id,
+                    payment_id=payment_id,
+                    error=error,
+                    attempts=attempts,
+                )
+                for (row, _), payment_id in zip(chunk, payment_ids)
+            ]
+
+        results = await asyncio.gather(
+            *(create(index, chunk) for index, chunk in enumerate(chunks))
+        )
+        return sorted((row for rows in results for row in rows), key=lambda r: r.row)
+
     async def delete_payment_draft(
         self,
         payment_draft_id: UUID,
@@ -202,6 +344,7 @@ class EndpointPaymentDraftsAsync(BaseEndpointAsync):
 
         return await self.client.delete(
             path=path,
+            route=endpoint.ROUTE,
             response_model=endpoint.Response,
             params=params,
             **kwargs,
@@ -91,6 +91,7 @@ class EndpointPayoutLinksAsync(BaseEndpointAsync):
 
         return await self.client.get(
             path=path,
+            route=endpoint.ROUTE,
             response_model=endpoint.Response,
             params=params,
             **kwargs,
@@ -124,6 +125,7 @@ class EndpointPayoutLinksAsync(BaseEndpointAsync):
 
         return await self.client.get(
             path=path,
+            route=endpoint.ROUTE,
             response_model=endpoint.Response,
             params=params,
             **kwargs,
@@ -223,6 +225,7 @@ class EndpointPayoutLinksAsync(BaseEndpointAsync):
 
         return await self.client.post(
             path=path,
+            route=endpoint.ROUTE,
             response_model=endpoint.Response,
             body=body,
             **kwargs,
@@ -258,6 +261,7 @@ class EndpointPayoutLinksAsync(BaseEndpointAsync):
 
         return await self.client.post(
             path=path,
+            route=endpoint.ROUTE,
             response_model=endpoint.Response,
             body=body,
             **kwargs,
@@ -91,6 +91,7 @@ class EndpointPayoutLinksSync(BaseEndpointSync):
 
         return self.client.get(
             path=path,
+            route=endpoint.ROUTE,
             response_model=endpoint.Response,
             params=params,
             **kwargs,
@@ -124,6 +125,7 @@ class EndpointPayoutLinksSync(BaseEndpointSync):
 
         return self.client.get(
             path=path,
+            route=endpoint.ROUTE,
             response_model=endpoint.Response,
             params=params,
             **kwargs,
@@ -225,6 +227,7 @@ class EndpointPayoutLinksSync(BaseEndpointSync):
 
         return self.client.post(
             path=path,
+            route=endpoint.ROUTE,
             response_model=endpoint.Response,
             body=body,
             **kwargs,
@@ -260,6 +263,7 @@ class EndpointPayoutLinksSync(BaseEndpointSync):
 
         return self.client.post(
             path=path,
+            route=endpoint.ROUTE,
             response_model=endpoint.Response,
             body=body,
             **kwargs,
@@ -9,3 +9,4 @@ Reference link: https://developer.revolut.com/docs/business/team-members
 
 # flake8: noqa: F401
 from .endpoint import EndpointTransactionsSync, EndpointTransactionsAsync
+from .projection import TransactionStateProjection, TERMINAL_TRANSACTION_STATES
@@ -1,16 +1,27 @@
+from typing import AsyncIterator, Iterable, Literal
 from uuid import UUID
 from datetime import datetime
+import asyncio
+import time
 
 from pyrevolut.utils import DateTime
+from pyrevolut.utils.retry import RETRYABLE_ERRORS
+from pyrevolut.exceptions import PyRevolutNotFound
 from pyrevolut.api.common import (
     BaseEndpointAsync,
     EnumTransactionType,
+    EnumTransactionState,
 )
 
 from pyrevolut.api.transactions.get import (
     RetrieveListOfTransactions,
     RetrieveTransaction,
 )
+from pyrevolut.api.transactions.projection import TERMINAL_TRANSACTION_STATES
+from pyrevolut.api.transactions.waiter import (
+    TransactionPollScheduler,
+    _transaction_state,
+)
 
 
 class EndpointTransactionsAsync(BaseEndpointAsync):
@@ -97,6 +108,7 @@ class EndpointTransactionsAsync(BaseEndpointAsync):
 
         return await self.client.get(
             path=path,
+            route=endpoint.ROUTE,
             response_model=endpoint.Response,
             params=params,
             **kwargs,
@@ -151,7 +163,145 @@ class EndpointTransactionsAsync(BaseEndpointAsync):
 
         return await self.client.get(
             path=path,
+            route=endpoint.ROUTE,
             response_model=endpoint.Response,
             params=params,
             **kwargs,
         )
+
+    async def wait_for_transactions(
+        self,
+        ids: Iterable[UUID | str],
+        target_states: Iterable[EnumTransactionState] = TERMINAL_TRANSACTION_STATES,
+        id_type: Literal["transaction_id", "request_id"] = "transaction_id",
+        max_concurrency: int = 10,
+        initial_interval: float = 1.0,
+        max_interval: float = 60.0,
+        backoff_factor: float = 2.0,
+        not_found_timeout: float = 60.0,
+        timeout: float | None = None,
+        **kwargs,
+    ) -> AsyncIterator[tuple[UUID | str, dict | RetrieveTransaction.Response | None]]:
+        """
+        Wait for a batch of transactions to reach one of the target states,
+        yielding each transaction as soon as it does.
+
+        The transactions are polled with at most `max_concurrency` concurrent requests.
+        Each transaction has its own exponential backoff: the interval between polls
+        grows by `backoff_factor` while its state is unchanged, up to `max_interval`,
+        and is reset to `initial_interval` when its state changes. When more
+        transactions are due than can be polled at once, the most recently changed
+        transactions go first.
+
+        A transaction that reaches a terminal state (completed, declined, failed,
+        reverted or cancelled) is no longer polled and is yielded, even if the
+        state is not one of the target states.
+
+        Transactions that are not found yet are polled for up to `not_found_timeout`
+        seconds, after which they are yielded with None as the details.
+        Transient errors (timeouts, network errors, 429, 500 and 503) are retried
+        with backoff.
+
+        Parameters
+        ----------
+        ids : Iterable[UUID | str]
+            The IDs (or request IDs) of the transactions to wait for.
+        target_states : Iterable[EnumTransactionState], optional
+            The states to wait for, by default the terminal states.
+        id_type : Literal["transaction_id", "request_id"], optional
+            Whether the ids are transaction IDs or request IDs, by default "transaction_id".
+        max_concurrency : int, optional
+            The maximum number of concurrent requests, by default 10.
+        initial_interval : float, optional
+            The number of seconds between polls after a state change, by default 1.0.
+        max_interval : float, optional
+            The maximum number of seconds between polls, by default 60.0.
+        backoff_factor : float, optional
+            The factor the interval grows by after each unchanged poll, by default 2.0.
+        not_found_timeout : float, optional
+            The number of seconds a transaction is polled while it is not found,
+            by default 60.0.
+        timeout : float, optional
+            The maximum number of seconds to wait in total, by default no limit.
+
+        Raises
+        ------
+        TimeoutError
+            If not all transactions are done within the timeout.
+
+        Yields
+        ------
+        tuple[UUID | str, dict | RetrieveTransaction.Response | None]
+            The ID (or request ID) as passed in and the transaction details,
+            or None if the transaction was not found.
+        """
+        assert max_concurrency >= 1, "max_concurrency must be at least 1"
+        assert id_type in (
+            "transaction_id",
+            "request_id",
+        ), "id_type must be 'transaction_id' or 'request_id'"
+
+        start = time.monotonic()
+        scheduler = TransactionPollScheduler(
+            keys=ids,
+            target_states=target_states,
+            initial_interval=initial_interval,
+            max_interval=max_interval,
+            backoff_factor=backoff_factor,
+            not_found_timeout=not_found_timeout,
+            now=start,
+        )
+        in_flight: set[asyncio.Task] = set()
+
+        async def poll(key: UUID | str):
+            try:
+                transaction = await self.get_transaction(**{id_type: key}, **kwargs)
+            except PyRevolutNotFound:
+                return key, None, False
+            except RETRYABLE_ERRORS:
+                return key, None, True
+            return key, transaction, False
+
+        try:
+            while scheduler.remaining:
+                now = time.monotonic()
+                if timeout is not None and now - start >= timeout:
+                    raise TimeoutError(
+                        f"{scheduler.remaining} transactions did not reach "
+                        f"the target states within {timeout} seconds."
+                    )
+
+                for key in scheduler.due(
+                    now=now, limit=max_concurrency - len(in_flight)
+                ):
+                    in_flight.add(asyncio.create_task(poll(key)))
+
+                wait_time = scheduler.next_due_in(now=now)
+                if len(in_flight) >= max_concurrency:
+                    wait_time = None
+                if timeout is not None:
+                    remaining_time = timeout - (now - start)
+                    wait_time = (
+                        remaining_time
+                        if wait_time is None
+                        else min(wait_time, remaining_time)
+                    )
+
+                if not in_flight:
+                    await asyncio.sleep(wait_time)
+                    continue
+                done, in_flight = await asyncio.wait(
+                    in_flight, timeout=wait_time, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    key, transaction, failed = task.result()
+                    if scheduler.record(
+                        key=key,
+                        state=_transaction_state(transaction),
+                        now=time.monotonic(),
+                        failed=failed,
+                    ):
+                        yield key, transaction
+        finally:
+            for task in in_flight:
+                task.cancel()
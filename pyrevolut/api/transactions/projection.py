@@ -0,0 +1,447 @@
+from typing import Iterable
+from collections import OrderedDict
+from uuid import UUID
+import asyncio
+import datetime
+import json
+import os
+import time
+
+from pyrevolut.utils.datetime import to_datetime
+from pyrevolut.api.common import EnumTransactionState, EnumWebhookEvent
+from pyrevolut.api.webhooks.resources import (
+    ResourceWebhookPayload,
+    ResourceTransactionCreated,
+    ResourceTransactionStateChanged,
+)
+from pyrevolut.api.webhooks.registry import WebhookHandlerRegistry
+
+TERMINAL_TRANSACTION_STATES = frozenset(
+    {
+        EnumTransactionState.COMPLETED,
+        EnumTransactionState.DECLINED,
+        EnumTransactionState.FAILED,
+        EnumTransactionState.REVERTED,
+        EnumTransactionState.CANCELLED,
+    }
+)
+"""The transaction states after which a transaction is no longer processed."""
+
+
+class TransactionStateProjection:
+    """In-memory projection of the current state of transactions, fed by the
+    `TransactionCreated` and `TransactionStateChanged` webhook events.
+
+    The projection keeps a compact `transaction ID -> (state, updated_at)` map,
+    where `updated_at` is a timestamp in milliseconds. An update is only applied
+    if it is not older than the stored state, so events that arrive out of order
+    are resolved by their timestamp. On equal timestamps, a transaction never
+    moves back out of a terminal state.
+
+    Transactions in a terminal state are evicted `terminal_ttl` seconds after
+    they reached it, so the projection only holds the transactions in flight
+    (and the recently finished ones).
+
+    Example
+    -------
+    ```python
+    projection = TransactionStateProjection(snapshot_loc="transactions.json")
+    projection.register(receiver.registry)
+
+    state = await projection.wait_for(
+        transaction_id, states={EnumTransactionState.COMPLETED}, timeout=60
+    )
+    ```
+    """
+
+    def __init__(
+        self, snapshot_loc: str | None = None, terminal_ttl: float | None = 60 * 60
+    ):
+        """Create a new transaction state projection.
+        If the snapshot file exists, the projection is restored from it.
+
+        Parameters
+        ----------
+        snapshot_loc : str | None, optional
+            The location of the snapshot JSON file, by default None.
+        terminal_ttl : float | None, optional
+            The number of seconds a transaction is kept after it reached a
+            terminal state, by default 1 hour (covering Revolut's delivery retries).
+            If None, transactions are only removed through `discard`.
+        """
+        assert terminal_ttl is None or terminal_ttl >= 0, "terminal_ttl must be >= 0"
+
+        self.snapshot_loc = snapshot_loc
+        self.terminal_ttl = terminal_ttl
+        self._states: dict[UUID, tuple[EnumTransactionState, int]] = {}
+        self._request_ids: dict[str, UUID] = {}
+        self._request_id_of: dict[UUID, str] = {}
+        self._terminal_since: OrderedDict[UUID, float] = OrderedDict()
+        self._waiters: dict[
+            UUID, list[tuple[frozenset[EnumTransactionState], asyncio.Future]]
+        ] = {}
+
+        if snapshot_loc is not None and os.path.exists(snapshot_loc):
+            self.load(snapshot_loc)
+
+    def __len__(self) -> int:
+        """The number of tracked transactions"""
+        return len(self._states)
+
+    def __contains__(self, transaction_id: UUID) -> bool:
+        """Whether a transaction is tracked"""
+        return transaction_id in self._states
+
+    def get(self, transaction_id: UUID) -> tuple[EnumTransactionState, int] | None:
+        """Get the state of a transaction.
+
+        Parameters
+        ----------
+        transaction_id : UUID
+            The ID of the transaction.
+
+        Returns
+        -------
+        tuple[EnumTransactionState, int] | None
+            The state and the update timestamp in milliseconds,
+            or None if the transaction is not tracked.
+        """
+        return self._states.get(transaction_id)
+
+    def state(self, transaction_id: UUID) -> EnumTransactionState | None:
+        """Get the current state of a transaction.
+
+        Parameters
+        ----------
+        transaction_id : UUID
+            The ID of the transaction.
+
+        Returns
+        -------
+        EnumTransactionState | None
+            The state, or None if the transaction is not tracked.
+        """
+        entry = self._states.get(transaction_id)
+        return entry[0] if entry is not None else None
+
+    def get_transaction_id(self, request_id: str) -> UUID | None:
+        """Get the ID of a transaction from the request ID it was created with.
+
+        Parameters
+        ----------
+        request_id : str
+            The request ID of the transaction.
+
+        Returns
+        -------
+        UUID | None
+            The ID of the transaction, or None if it is not tracked.
+        """
+        return self._request_ids.get(request_id)
+
+    def update(
+        self,
+        transaction_id: UUID,
+        state: EnumTransactionState,
+        updated_at: datetime.datetime | str | int,
+        request_id: str | None = None,
+    ) -> bool:
+        """Update the state of a transaction, unless the stored state is newer.
+
+        Parameters
+        ----------
+        transaction_id : UUID
+            The ID of the transaction.
+        state : EnumTransactionState
+            The state of the transaction.
+        updated_at : datetime.datetime | str | int
+            The time of the update. An int is a timestamp in milliseconds.
+        request_id : str, optional
+            The request ID of the transaction, by default None.
+
+        Returns
+        -------
+        bool
+            True if the update was applied, False if the stored state is newer
+            (or equally new and terminal).
+        """
+        if not isinstance(updated_at, int):
+            updated_at = int(to_datetime(updated_at).timestamp() * 1000)
+        state = EnumTransactionState(state)
+        self.evict_expired()
+        if request_id is not None:
+            self._request_ids[request_id] = transaction_id
+            self._request_id_of[transaction_id] = request_id
+
+        current = self._states.get(transaction_id)
+        if current is not None:
+            current_state, current_updated_at = current
+            if current_updated_at > updated_at:
+                return False
+            if current_updated_at == updated_at and (
+                current_state == state
+                or (
+                    current_state in TERMINAL_TRANSACTION_STATES
+                    and state not in TERMINAL_TRANSACTION_STATES
+                )
+            ):
+                return False
+        self._states[transaction_id] = (state, updated_at)
+
+        if state in TERMINAL_TRANSACTION_STATES:
+            self._terminal_since[transaction_id] = time.monotonic()
+            self._terminal_since.move_to_end(transaction_id)
+        else:
+            self._terminal_since.pop(transaction_id, None)
+
+        waiters = self._waiters.get(transaction_id)
+        if waiters:
+            remaining = []
+            for states, future in waiters:
+                if state in states:
+                    _resolve(future, state)
+                else:
+                    remaining.append((states, future))
+            if remaining:
+                self._waiters[transaction_id] = remaining
+            else:
+                del self._waiters[transaction_id]
+        return True
+
+    def apply(
+        self,
+        payload: (
+            ResourceWebhookPayload
+            | ResourceTransactionCreated
+            | ResourceTransactionStateChanged
+        ),
+        timestamp: datetime.datetime | str | int | None = None,
+    ) -> bool:
+        """Apply a transaction webhook event to the projection.
+        Payout link events are ignored.
+
+        Parameters
+        ----------
+        payload : ResourceWebhookPayload | ResourceTransactionCreated | ResourceTransactionStateChanged
+            The webhook payload, or its transaction data.
+        timestamp : datetime.datetime | str | int, optional
+            The time of the event, by default the timestamp of the webhook payload
+            (or the `updated_at` of the transaction). Required when passing
+            `ResourceTransactionStateChanged` data on its own.
+
+        Returns
+        -------
+        bool
+            True if the event changed the projection.
+        """
+        if isinstance(payload, ResourceWebhookPayload):
+            if payload.event not in (
+                EnumWebhookEvent.TRANSACTION_CREATED,
+                EnumWebhookEvent.TRANSACTION_STATE_CHANGED,
+            ):
+                return False
+            if timestamp is None:
+                timestamp = payload.timestamp
+            payload = payload.data
+
+        if isinstance(payload, ResourceTransactionCreated):
+            return self.update(
+                transaction_id=payload.id,
+                state=payload.state,
+                updated_at=timestamp if timestamp is not None else payload.updated_at,
+                request_id=payload.request_id,
+            )
+
+        assert timestamp is not None, "timestamp is required for state changes"
+        return self.update(
+            transaction_id=payload.id,
+            state=payload.new_state,
+            updated_at=timestamp,
+            request_id=payload.request_id,
+        )
+
+    def register(self, registry: WebhookHandlerRegistry):
+        """Register the projection as a handler of the transaction events.
+
+        Parameters
+        ----------
+        registry : WebhookHandlerRegistry
+            The registry of the webhook receiver (or recovery).
+
+        Returns
+        -------
+        None
+        """
+        registry.on(
+            EnumWebhookEvent.TRANSACTION_CREATED,
+            EnumWebhookEvent.TRANSACTION_STATE_CHANGED,
+        )(self.__handle)
+
+    async def wait_for(
+        self,
+        transaction_id: UUID,
+        states: Iterable[EnumTransactionState] = TERMINAL_TRANSACTION_STATES,
+        timeout: float | None = None,
+    ) -> EnumTransactionState:
+        """Wait until a transaction reaches one of the given states.
+
+        Parameters
+        ----------
+        transaction_id : UUID
+            The ID of the transaction.
+        states : Iterable[EnumTransactionState], optional
+            The states to wait for, by default the terminal states.
+        timeout : float, optional
+            The maximum number of seconds to wait, by default no limit.
+
+        Raises
+        ------
+        TimeoutError
+            If the transaction did not reach any of the states within the timeout.
+
+        Returns
+        -------
+        EnumTransactionState
+            The state the transaction reached.
+        """
+        states = frozenset(EnumTransactionState(state) for state in states)
+        current = self.state(transaction_id)
+        if current in states:
+            return current
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(transaction_id, []).append((states, future))
+        try:
+            return await asyncio.wait_for(future, timeout=timeout)
+        finally:
+            waiters = self._waiters.get(transaction_id, [])
+            self._waiters[transaction_id] = [w for w in waiters if w[1] is not future]
+            if not self._waiters[transaction_id]:
+                del self._waiters[transaction_id]
+
+    def discard(self, transaction_id: UUID):
+        """Stop tracking a transaction.
+
+        Parameters
+        ----------
+        transaction_id : UUID
+            The ID of the transaction.
+
+        Returns
+        -------
+        None
+        """
+        self._states.pop(transaction_id, None)
+        self._terminal_since.pop(transaction_id, None)
+        request_id = self._request_id_of.pop(transaction_id, None)
+        if request_id is not None:
+            self._request_ids.pop(request_id, None)
+
+    def evict_expired(self):
+        """Evict the transactions that reached a terminal state
+        more than `terminal_ttl` seconds ago.
+
+        Returns
+        -------
+        None
+        """
+        if self.terminal_ttl is None:
+            return
+        expired_before = time.monotonic() - self.terminal_ttl
+        while self._terminal_since:
+            transaction_id, terminal_since = next(iter(self._terminal_since.items()))
+            if terminal_since > expired_before:
+                break
+            self.discard(transaction_id)
+
+    def snapshot(self, location: str | None = None):
+        """Atomically write the projection to a JSON snapshot file.
+
+        Parameters
+        ----------
+        location : str, optional
+            The location of the snapshot file, by default `snapshot_loc`.
+
+        Returns
+        -------
+        None
+        """
+        location = location or self.snapshot_loc
+        assert location is not None, "No snapshot location provided"
+        self.evict_expired()
+        request_ids = self._request_id_of
+        data = {
+            "transactions": {
+                str(transaction_id): [
+                    state.value,
+                    updated_at,
+                    request_ids.get(transaction_id),
+                ]
+                for transaction_id, (state, updated_at) in self._states.items()
+            }
+        }
+        tmp_location = f"{location}.tmp"
+        with open(tmp_location, "w") as file:
+            json.dump(data, file, separators=(",", ":"))
+        os.replace(tmp_location, location)
+
+    def load(self, location: str | None = None):
+        """Restore the projection from a JSON snapshot file.
+        Newer states already in the projection are kept.
+
+        Parameters
+        ----------
+        location : str, optional
+            The location of the snapshot file, by default `snapshot_loc`.
+
+        Returns
+        -------
+        None
+        """
+        location = location or self.snapshot_loc
+        assert location is not None, "No snapshot location provided"
+        with open(location, "r") as file:
+            data = json.load(file)
+        for transaction_id, (state, updated_at, request_id) in data[
+            "transactions"
+        ].items():
+            self.update(
+                transaction_id=UUID(transaction_id),
+                state=state,
+                updated_at=updated_at,
+                request_id=request_id,
+            )
+
+    async def __handle(self, payload: ResourceWebhookPayload):
+        """The webhook handler that applies the events to the projection"""
+        self.apply(payload)
+
+
+def _resolve(future: asyncio.Future, state: EnumTransactionState):
+    """Resolve a waiter future from any thread
+
+    Parameters
+    ----------
+    future : asyncio.Future
+        The future to resolve
+    state : EnumTransactionState
+        The state to resolve the future with
+
+    Returns
+    -------
+    None
+    """
+
+    def set_result():
+        if not future.done():
+            future.set_result(state)
+
+    loop = future.get_loop()
+    try:
+        running_loop = asyncio.get_running_loop()
+    except RuntimeError:
+        running_loop = None
+    if running_loop is loop:
+        set_result()
+    else:
+        loop.call_soon_threadsafe(set_result)
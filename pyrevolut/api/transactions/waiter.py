@@ -0,0 +1,255 @@
+from typing import Any, Hashable, Iterable
+import heapq
+import itertools
+import random
+
+from pydantic import BaseModel
+
+from pyrevolut.api.common import EnumTransactionState
+from pyrevolut.api.transactions.projection import TERMINAL_TRANSACTION_STATES
+
+
+class TransactionPollScheduler:
+    """Schedules the polling of a batch of transactions until they reach a target state.
+
+    Every transaction is polled with its own exponential backoff: the interval
+    grows by `backoff_factor` each time a poll returns an unchanged state (or fails),
+    up to `max_interval`. A transaction whose state changed is polled again after
+    `initial_interval`, and when more transactions are due than can be polled at
+    once, the ones that changed most recently go first. A transaction is done once
+    it reaches one of the target states or a terminal state, or once it has not
+    been found for `not_found_timeout` seconds (a transaction that was just
+    submitted may not be found yet, but a wrong ID is never found).
+
+    The scheduler only keeps the schedule, the polling itself is done by
+    `wait_for_transactions` on the sync and async Transactions endpoints.
+    """
+
+    def __init__(
+        self,
+        keys: Iterable[Hashable],
+        target_states: Iterable[EnumTransactionState] = TERMINAL_TRANSACTION_STATES,
+        initial_interval: float = 1.0,
+        max_interval: float = 60.0,
+        backoff_factor: float = 2.0,
+        jitter: float = 0.1,
+        not_found_timeout: float = 60.0,
+        now: float = 0.0,
+    ):
+        """Create a new poll scheduler
+
+        Parameters
+        ----------
+        keys : Iterable[Hashable]
+            The transaction IDs (or request IDs) to poll.
+        target_states : Iterable[EnumTransactionState], optional
+            The states to wait for, by default the terminal states.
+        initial_interval : float, optional
+            The number of seconds between polls after a state change, by default 1.0.
+        max_interval : float, optional
+            The maximum number of seconds between polls, by default 60.0.
+        backoff_factor : float, optional
+            The factor the interval grows by after each unchanged poll, by default 2.0.
+        jitter : float, optional
+            The maximum relative random deviation of each interval, by default 0.1.
+            Spreads the polls of transactions submitted at the same time.
+        not_found_timeout : float, optional
+            The number of seconds a transaction is polled while it is not found,
+            by default 60.0.
+        now : float, optional
+            The current (monotonic) time, by default 0.0.
+            All keys are due immediately.
+        """
+        assert initial_interval > 0, "initial_interval must be positive"
+        assert (
+            max_interval >= initial_interval
+        ), "max_interval must be >= initial_interval"
+        assert backoff_factor >= 1, "backoff_factor must be at least 1"
+        assert 0 <= jitter < 1, "jitter must be between 0 and 1"
+        assert not_found_timeout >= 0, "not_found_timeout must not be negative"
+
+        self.target_states = frozenset(EnumTransactionState(s) for s in target_states)
+        self.initial_interval = initial_interval
+        self.max_interval = max_interval
+        self.backoff_factor = backoff_factor
+        self.jitter = jitter
+        self.not_found_timeout = not_found_timeout
+
+        self._states: dict[Hashable, EnumTransactionState | None] = {}
+        self._intervals: dict[Hashable, float] = {}
+        self._changed_at: dict[Hashable, float] = {}
+        self._missing_since: dict[Hashable, float] = {}
+        self._counter = itertools.count()
+        self._heap: list[tuple[float, float, int, Hashable]] = []
+        for key in dict.fromkeys(keys):
+            self._states[key] = None
+            self._intervals[key] = initial_interval
+            self._changed_at[key] = now
+            self._heap.append((now, -now, next(self._counter), key))
+        heapq.heapify(self._heap)
+
+    @property
+    def remaining(self) -> int:
+        """The number of transactions that are not done yet (scheduled or in flight)
+
+        Returns
+        -------
+        int
+            The number of transactions not done yet
+        """
+        return len(self._states)
+
+    def is_done(self, state: EnumTransactionState | None) -> bool:
+        """Whether a transaction in the given state no longer needs polling
+
+        Parameters
+        ----------
+        state : EnumTransactionState | None
+            The state of the transaction
+
+        Returns
+        -------
+        bool
+            True if the state is a target or a terminal state
+        """
+        return state in self.target_states or state in TERMINAL_TRANSACTION_STATES
+
+    def due(self, now: float, limit: int) -> list[Hashable]:
+        """Take the transactions that are due for polling.
+        The taken transactions are not scheduled again until they are recorded.
+
+        Parameters
+        ----------
+        now : float
+            The current (monotonic) time.
+        limit : int
+            The maximum number of transactions to take.
+
+        Returns
+        -------
+        list[Hashable]
+            The keys of the due transactions, most recently changed first.
+        """
+        if limit <= 0:
+            return []
+        due: list[tuple[float, float, int, Hashable]] = []
+        while self._heap and self._heap[0][0] <= now:
+            due.append(heapq.heappop(self._heap))
+        due.sort(key=lambda entry: (entry[1], entry[2]))
+        for entry in due[limit:]:
+            heapq.heappush(self._heap, entry)
+        return [entry[3] for entry in due[:limit]]
+
+    def next_due_in(self, now: float) -> float | None:
+        """The number of seconds until the next transaction is due
+
+        Parameters
+        ----------
+        now : float
+            The current (monotonic) time.
+
+        Returns
+        -------
+        float | None
+            The number of seconds (0 if one is due already),
+            or None if no transaction is scheduled.
+        """
+        if not self._heap:
+            return None
+        return max(0.0, self._heap[0][0] - now)
+
+    def record(
+        self,
+        key: Hashable,
+        state: EnumTransactionState | None,
+        now: float,
+        failed: bool = False,
+    ) -> bool:
+        """Record the result of a poll and schedule the next one if needed.
+
+        Parameters
+        ----------
+        key : Hashable
+            The key of the polled transaction.
+        state : EnumTransactionState | None
+            The polled state, or None if the transaction was not found
+            or the poll failed.
+        now : float
+            The current (monotonic) time.
+        failed : bool, optional
+            Whether the poll failed with a transient error, by default False.
+            A failed poll does not count as the transaction not being found.
+
+        Returns
+        -------
+        bool
+            True if the transaction is done and will not be polled again.
+        """
+        if state is not None:
+            self._missing_since.pop(key, None)
+        elif not failed:
+            missing_since = self._missing_since.setdefault(key, now)
+            if now - missing_since >= self.not_found_timeout:
+                self.__finish(key)
+                return True
+
+        if state is not None and self.is_done(state):
+            self.__finish(key)
+            return True
+
+        if state is not None and state != self._states[key]:
+            self._states[key] = state
+            self._changed_at[key] = now
+            interval = self.initial_interval
+        else:
+            interval = min(
+                self._intervals[key] * self.backoff_factor, self.max_interval
+            )
+        self._intervals[key] = interval
+
+        interval *= 1 + random.uniform(-self.jitter, self.jitter)
+        heapq.heappush(
+            self._heap,
+            (now + interval, -self._changed_at[key], next(self._counter), key),
+        )
+        return False
+
+    def __finish(self, key: Hashable):
+        """Stop tracking a transaction
+
+        Parameters
+        ----------
+        key : Hashable
+            The key of the transaction
+
+        Returns
+        -------
+        None
+        """
+        self._states.pop(key)
+        self._intervals.pop(key)
+        self._changed_at.pop(key)
+        self._missing_since.pop(key, None)
+
+
+def _transaction_state(transaction: Any) -> EnumTransactionState | None:
+    """Get the state of a transaction in any of the client return types
+
+    Parameters
+    ----------
+    transaction : Any
+        The transaction as a raw dict, a dict or a Pydantic model,
+        or an error response.
+
+    Returns
+    -------
+    EnumTransactionState | None
+        The state of the transaction, or None if it has no state.
+    """
+    if isinstance(transaction, BaseModel):
+        state = getattr(transaction, "state", None)
+    elif isinstance(transaction, dict):
+        state = transaction.get("state")
+    else:
+        state = None
+    return EnumTransactionState(state) if state is not None else None
@@ -6,3 +6,15 @@ Reference link: https://developer.revolut.com/docs/business/transfers
 
 # flake8: noqa: F401
 from .endpoint import EndpointTransfersSync, EndpointTransfersAsync
+from .bulk import (
+    BulkTransferEngine,
+    BulkTransferJournal,
+    ModelBulkTransfer,
+    ModelBulkTransferOutcome,
+)
+from .validation import (
+    iter_batch_errors,
+    validate_batch_file,
+    ModelBatchRowError,
+    ModelBatchValidationSummary,
+)
@@ -0,0 +1,538 @@
+from typing import (
+    TYPE_CHECKING,
+    Annotated,
+    AsyncIterable,
+    AsyncIterator,
+    Iterable,
+    Literal,
+)
+from uuid import UUID, uuid5, NAMESPACE_URL
+import asyncio
+import hashlib
+import json
+import os
+import time
+
+from pydantic import BaseModel, Field
+from pydantic_extra_types.currency_code import Currency
+import pendulum
+
+from pyrevolut.exceptions import PyRevolutConflict
+from pyrevolut.utils.rate_limit import RateLimiter
+from pyrevolut.utils.retry import retry_async, as_dict
+from pyrevolut.api.common import (
+    EnumChargeBearer,
+    EnumTransactionState,
+    EnumTransferReasonCode,
+)
+
+if TYPE_CHECKING:
+    from pyrevolut.client import AsyncClient
+
+
+class ModelBulkTransfer(BaseModel):
+    """A single transfer to a counterparty submitted by the `BulkTransferEngine`."""
+
+    key: Annotated[
+        str,
+        Field(
+            description="""
+            The unique key of the transfer in your system, for example the row
+            number of the batch file or your payout ID. The journal tracks the
+            transfers by this key.
+            """
+        ),
+    ]
+    account_id: Annotated[
+        UUID, Field(description="The ID of the account that you send the funds from.")
+    ]
+    counterparty_id: Annotated[
+        UUID, Field(description="The ID of the receiving counterparty.")
+    ]
+    amount: Annotated[
+        float, Field(description="The amount of the funds to be transferred.", gt=0)
+    ]
+    currency: Annotated[
+        Currency,
+        Field(description="The ISO 4217 currency of the funds to be transferred."),
+    ]
+    counterparty_account_id: Annotated[
+        UUID | None,
+        Field(description="The ID of the receiving counterparty's account."),
+    ] = None
+    counterparty_card_id: Annotated[
+        UUID | None,
+        Field(description="The ID of the receiving counterparty's card."),
+    ] = None
+    reference: Annotated[
+        str | None, Field(description="The reference for the transaction.")
+    ] = None
+    charge_bearer: Annotated[
+        EnumChargeBearer | None,
+        Field(description="The party to which any transaction fees are charged."),
+    ] = None
+    transfer_reason_code: Annotated[
+        EnumTransferReasonCode | None,
+        Field(description="The reason code for the transaction."),
+    ] = None
+    request_id: Annotated[
+        str | None,
+        Field(
+            description="""
+            The request ID of the transfer. By default a stable ID derived from the
+            batch, the key and the transfer itself, so a resubmitted transfer is never
+            processed twice by Revolut.
+            """,
+            max_length=40,
+        ),
+    ] = None
+
+    def fingerprint(self) -> str:
+        """A hash of what the transfer pays: everything but its key and request ID.
+
+        Returns
+        -------
+        str
+            The SHA-256 hex digest of the transfer
+        """
+        spec = self.model_dump_json(exclude={"key", "request_id"})
+        return hashlib.sha256(spec.encode()).hexdigest()
+
+    def stable_request_id(self, namespace: str = "") -> str:
+        """The request ID of the transfer, if not provided derived from the
+        namespace of its batch, its key and its fingerprint. The same transfer of
+        the same batch always gets the same ID, while a key reused by another batch
+        (or for another payment) gets a new one.
+
+        Parameters
+        ----------
+        namespace : str, optional
+            The namespace of the batch, such as a batch ID or the journal location,
+            by default "".
+
+        Returns
+        -------
+        str
+            The request ID
+        """
+        if self.request_id is not None:
+            return self.request_id
+        return str(
+            uuid5(
+                NAMESPACE_URL,
+                f"pyrevolut:bulk-transfer:{namespace}:{self.key}:{self.fingerprint()}",
+            )
+        )
+
+    def matches(self, transaction: dict) -> bool:
+        """Whether a transaction (as a dictionary) is the payment of this transfer:
+        same amount, currency, counterparty and reference.
+
+        Parameters
+        ----------
+        transaction : dict
+            The transaction, as returned by `get_transaction`.
+
+        Returns
+        -------
+        bool
+            True if the transaction pays this transfer
+        """
+        legs = transaction.get("legs") or []
+        if not legs:
+            return False
+        leg = legs[0]
+        counterparty = leg.get("counterparty") or {}
+        return (
+            abs(abs(float(leg["amount"])) - self.amount) < 1e-9
+            and str(leg["currency"]) == str(self.currency)
+            and str(counterparty.get("id")) == str(self.counterparty_id)
+            and (transaction.get("reference") or None) == (self.reference or None)
+        )
+
+
+class ModelBulkTransferOutcome(BaseModel):
+    """The outcome of a single transfer of a bulk run."""
+
+    key: Annotated[str, Field(description="The key of the transfer.")]
+    request_id: Annotated[str, Field(description="The request ID of the transfer.")]
+    status: Annotated[
+        Literal["succeeded", "failed", "skipped"],
+        Field(
+            description="""
+            succeeded:
+                The transfer was created.
+            failed:
+                The transfer could not be created.
+            skipped:
+                The journal shows the transfer was already handled by a previous run.
+            """
+        ),
+    ]
+    transfer_id: Annotated[
+        str | None, Field(description="The ID of the created transaction.")
+    ] = None
+    state: Annotated[
+        EnumTransactionState | None,
+        Field(description="The state of the created transaction."),
+    ] = None
+    error: Annotated[
+        str | None, Field(description="The error if the transfer failed.")
+    ] = None
+    attempts: Annotated[
+        int, Field(description="The number of requests made in this run.")
+    ] = 0
+    completed: Annotated[
+        int, Field(description="The number of outcomes of the run so far.")
+    ] = 0
+    throughput: Annotated[
+        float,
+        Field(description="The number of outcomes per second of the run so far."),
+    ] = 0.0
+
+
+class BulkTransferJournal:
+    """Append-only JSONL journal of the submissions and results of bulk transfers.
+
+    Every transfer is journaled as `submitted` before its request is sent and as
+    `succeeded` or `failed` after, so a run that crashed can be resumed:
+    transfers that succeeded are skipped and transfers that were submitted without
+    a result are resubmitted with the same request ID.
+    """
+
+    def __init__(self, location: str = "bulk_transfers.jsonl", fsync: bool = False):
+        """Open (or create) a journal
+
+        Parameters
+        ----------
+        location : str, optional
+            The location of the journal file, by default "bulk_transfers.jsonl".
+        fsync : bool, optional
+            Whether to fsync the file after every record, by default False.
+            Slower, but no record is lost if the machine crashes.
+        """
+        self.location = location
+        self.fsync = fsync
+        self.records: dict[str, dict] = {}
+        if os.path.exists(location):
+            with open(location, "r") as file:
+                for line in file:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A torn last line from a crash
+                        continue
+                    self.records[record["key"]] = record
+        self._file = open(location, "a")
+
+    def append(self, record: dict):
+        """Append a record to the journal
+
+        Parameters
+        ----------
+        record : dict
+            The record, with at least the key, request_id and event
+
+        Returns
+        -------
+        None
+        """
+        record = {"at": pendulum.now(tz="UTC").isoformat(), **record}
+        self.records[record["key"]] = record
+        self._file.write(json.dumps(record, separators=(",", ":")) + "\n")
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+
+    def close(self):
+        """Close the journal file"""
+        self._file.close()
+
+
+class BulkTransferEngine:
+    """Submits many transfers to counterparties concurrently through an `AsyncClient`.
+
+    The transfers are consumed lazily from any (async) iterable and at most
+    `max_concurrency` are in flight at once, optionally limited to `rate` requests
+    per second. Transient errors are retried with backoff. Every transfer gets a
+    stable request ID and is written to an append-only journal, so a crashed run
+    can be started again with the same input without paying anyone twice.
+
+    Example
+    -------
+    ```python
+    async with AsyncClient(creds_loc="path/to/creds.json") as client:
+        engine = BulkTransferEngine(client=client, journal_loc="payouts.jsonl")
+        async for outcome in engine.run(transfers):
+            print(outcome.key, outcome.status, f"{outcome.throughput:.1f}/s")
+    ```
+    """
+
+    def __init__(
+        self,
+        client: "AsyncClient",
+        journal_loc: str = "bulk_transfers.jsonl",
+        max_concurrency: int = 10,
+        rate: float | None = None,
+        max_retries: int = 3,
+        backoff: float = 1.0,
+        retry_failed: bool = False,
+        batch_id: str | None = None,
+    ):
+        """Create a new bulk transfer engine
+
+        Parameters
+        ----------
+        client : AsyncClient
+            The (open) async client used to call the API.
+        journal_loc : str, optional
+            The location of the journal file, by default "bulk_transfers.jsonl".
+        max_concurrency : int, optional
+            The maximum number of requests in flight, by default 10.
+        rate : float, optional
+            The maximum number of requests per second, by default no limit.
+        max_retries : int, optional
+            The maximum number of retries of a transfer on transient errors, by default 3.
+        backoff : float, optional
+            The base delay in seconds of the exponential backoff, by default 1.0.
+        retry_failed : bool, optional
+            Whether to resubmit the transfers the journal shows as failed,
+            by default False.
+        batch_id : str, optional
+            The namespace of the request IDs of the transfers, by default the
+            absolute location of the journal. Use a new batch ID (or journal) for
+            every batch, so a key reused by a later batch is a new payment.
+        """
+        assert max_concurrency >= 1, "max_concurrency must be at least 1"
+
+        self.client = client
+        self.journal_loc = journal_loc
+        self.max_concurrency = max_concurrency
+        self.rate_limiter = (
+            RateLimiter(rate=rate, name="bulk_transfers") if rate is not None else None
+        )
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.retry_failed = retry_failed
+        self.batch_id = (
+            batch_id if batch_id is not None else os.path.abspath(journal_loc)
+        )
+
+    async def run(
+        self,
+        transfers: (
+            Iterable[ModelBulkTransfer | dict] | AsyncIterable[ModelBulkTransfer | dict]
+        ),
+    ) -> AsyncIterator[ModelBulkTransferOutcome]:
+        """Submit the transfers, yielding the outcome of each one as it completes.
+
+        Parameters
+        ----------
+        transfers : Iterable[ModelBulkTransfer | dict] | AsyncIterable[ModelBulkTransfer | dict]
+            The transfers to submit.
+
+        Yields
+        ------
+        ModelBulkTransferOutcome
+            The outcome of each transfer, with the throughput of the run so far.
+        """
+        journal = BulkTransferJournal(location=self.journal_loc)
+        start = time.monotonic()
+        completed = 0
+        in_flight: set[asyncio.Task] = set()
+
+        def finish(outcome: ModelBulkTransferOutcome) -> ModelBulkTransferOutcome:
+            nonlocal completed
+            completed += 1
+            outcome.completed = completed
+            outcome.throughput = completed / max(time.monotonic() - start, 1e-9)
+            return outcome
+
+        try:
+            async for transfer in _aiter(transfers):
+                if not isinstance(transfer, ModelBulkTransfer):
+                    transfer = ModelBulkTransfer(**transfer)
+
+                fingerprint = transfer.fingerprint()
+                record = journal.records.get(transfer.key)
+                if (
+                    record is not None
+                    and record.get("fingerprint", fingerprint) != fingerprint
+                ):
+                    # The key was journaled for another payment: never resubmit it
+                    yield finish(
+                        ModelBulkTransferOutcome(
+                            key=transfer.key,
+                            request_id=record["request_id"],
+                            status="failed",
+                            error="The journal has a different transfer with this key",
+                        )
+                    )
+                    continue
+                if record is not None and (
+                    record["event"] == "succeeded"
+                    or (record["event"] == "failed" and not self.retry_failed)
+                ):
+                    yield finish(
+                        ModelBulkTransferOutcome(
+                            key=transfer.key,
+                            request_id=record["request_id"],
+                            status="skipped",
+                            transfer_id=record.get("transfer_id"),
+                            state=record.get("state"),
+                            error=record.get("error"),
+                        )
+                    )
+                    continue
+
+                request_id = (
+                    record["request_id"]
+                    if record is not None
+                    else transfer.stable_request_id(namespace=self.batch_id)
+                )
+                journal.append(
+                    {
+                        "key": transfer.key,
+                        "request_id": request_id,
+                        "event": "submitted",
+                        "fingerprint": fingerprint,
+                    }
+                )
+                in_flight.add(
+                    asyncio.create_task(self.submit(transfer, request_id, journal))
+                )
+
+                if len(in_flight) >= self.max_concurrency:
+                    done, in_flight = await asyncio.wait(
+                        in_flight, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    for task in done:
+                        yield finish(task.result())
+
+            for task in asyncio.as_completed(in_flight):
+                yield finish(await task)
+            in_flight = set()
+        finally:
+            for task in in_flight:
+                task.cancel()
+            journal.close()
+
+    async def submit(
+        self,
+        transfer: ModelBulkTransfer,
+        request_id: str,
+        journal: BulkTransferJournal,
+    ) -> ModelBulkTransferOutcome:
+        """Submit a single transfer (with retries) and journal the result.
+
+        Parameters
+        ----------
+        transfer : ModelBulkTransfer
+            The transfer to submit.
+        request_id : str
+            The request ID of the transfer.
+        journal : BulkTransferJournal
+            The journal to write the result to.
+
+        Returns
+        -------
+        ModelBulkTransferOutcome
+            The outcome of the transfer.
+        """
+        attempts = 0
+
+        async def create():
+            nonlocal attempts
+            attempts += 1
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire()
+            try:
+                return await self.client.Transfers.create_transfer_to_another_account(
+                    request_id=request_id,
+                    account_id=transfer.account_id,
+                    counterparty_id=transfer.counterparty_id,
+                    amount=transfer.amount,
+                    currency=transfer.currency,
+                    counterparty_account_id=transfer.counterparty_account_id,
+                    counterparty_card_id=transfer.counterparty_card_id,
+                    reference=transfer.reference,
+                    charge_bearer=transfer.charge_bearer,
+                    transfer_reason_code=transfer.transfer_reason_code,
+                )
+            except PyRevolutConflict:
+                # Already submitted by a previous (crashed) run or attempt, unless
+                # the request ID was used for another payment
+                transaction = await self.client.Transactions.get_transaction(
+                    request_id=request_id
+                )
+                if not transfer.matches(as_dict(transaction)):
+                    raise PyRevolutConflict(
+                        f"The request ID {request_id} was used by another transaction"
+                    )
+                return transaction
+
+        try:
+            response, _ = await retry_async(
+                create, max_retries=self.max_retries, backoff=self.backoff
+            )
+        except Exception as exc:
+            error = f"{type(exc).__name__}: {exc}"
+            journal.append(
+                {
+                    "key": transfer.key,
+                    "request_id": request_id,
+                    "event": "failed",
+                    "fingerprint": transfer.fingerprint(),
+                    "error": error,
+                }
+            )
+            return ModelBulkTransferOutcome(
+                key=transfer.key,
+                request_id=request_id,
+                status="failed",
+                error=error,
+                attempts=attempts,
+            )
+
+        response = as_dict(response)
+        transfer_id = str(response["id"])
+        state = EnumTransactionState(response["state"])
+        journal.append(
+            {
+                "key": transfer.key,
+                "request_id": request_id,
+                "event": "succeeded",
+                "fingerprint": transfer.fingerprint(),
+                "transfer_id": transfer_id,
+                "state": state.value,
+            }
+        )
+        return ModelBulkTransferOutcome(
+            key=transfer.key,
+            request_id=request_id,
+            status="succeeded",
+            transfer_id=transfer_id,
+            state=state,
+            attempts=attempts,
+        )
+
+
+async def _aiter(items: Iterable | AsyncIterable) -> AsyncIterator:
+    """Iterate over a sync or async iterable asynchronously
+
+    Parameters
+    ----------
+    items : Iterable | AsyncIterable
+        The items to iterate over
+
+    Yields
+    ------
+    Any
+        The items
+    """
+    if hasattr(items, "__aiter__"):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
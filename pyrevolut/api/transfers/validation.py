@@ -0,0 +1,402 @@
+from typing import Annotated, Iterator, Literal, Type
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, Future
+import csv
+import json
+import os
+import time
+
+from pydantic import BaseModel, Field, ValidationError
+
+from pyrevolut.api.transfers.post import (
+    CreateTransferToAnotherAccount,
+    MoveMoneyBetweenAccounts,
+)
+from pyrevolut.api.payment_drafts.post import CreatePaymentDraft
+
+BatchKind = Literal["transfer", "move", "payment_draft"]
+
+BATCH_MODELS: dict[str, Type[BaseModel]] = {
+    "transfer": CreateTransferToAnotherAccount.Body,
+    "move": MoveMoneyBetweenAccounts.Body,
+    "payment_draft": CreatePaymentDraft.Body.ModelPayment,
+}
+"""The model each row of a batch file is validated against, per kind of batch.
+A row of a payment draft batch is a single payment of the draft."""
+
+
+class ModelBatchRowError(BaseModel):
+    """The validation errors of a single row of a batch file."""
+
+    class ModelFieldError(BaseModel):
+        """A single validation error"""
+
+        loc: Annotated[
+            str, Field(description="The dotted location of the field in the row.")
+        ]
+        msg: Annotated[str, Field(description="The error message.")]
+        type: Annotated[str, Field(description="The type of the error.")]
+
+    row: Annotated[
+        int,
+        Field(
+            description="The 1-based number of the row in the file (excluding the CSV header)."
+        ),
+    ]
+    errors: Annotated[
+        list[ModelFieldError], Field(description="The validation errors of the row.")
+    ]
+
+
+class ModelBatchValidationSummary(BaseModel):
+    """The summary of the validation of a batch file."""
+
+    rows: Annotated[int, Field(description="The number of rows validated.")] = 0
+    invalid: Annotated[int, Field(description="The number of invalid rows.")] = 0
+    errors: Annotated[
+        list[ModelBatchRowError],
+        Field(description="The errors of the invalid rows (up to max_errors)."),
+    ] = []
+    elapsed: Annotated[
+        float, Field(description="The number of seconds the validation took.")
+    ] = 0.0
+
+    @property
+    def valid(self) -> bool:
+        """Whether all rows are valid
+
+        Returns
+        -------
+        bool
+            True if there are no invalid rows
+        """
+        return self.invalid == 0
+
+
+def iter_batch_errors(
+    location: str,
+    kind: BatchKind,
+    file_format: Literal["csv", "jsonl"] | None = None,
+    workers: int | None = None,
+    chunk_size: int = 2000,
+    fail_fast: bool = False,
+) -> Iterator[ModelBatchRowError]:
+    """Validate a CSV or JSONL batch file of payments without touching the network,
+    yielding the errors of the invalid rows in file order.
+
+    The file is streamed in chunks of `chunk_size` rows that are validated in a
+    pool of `workers` processes, with at most two chunks per worker pending so the
+    memory use does not depend on the size of the file.
+
+    In a CSV file, nested fields use dotted column names, for example
+    `receiver.counterparty_id`, and empty cells are treated as missing values.
+    Request IDs must be unique across the file: Revolut would process only one
+    of the payments that share a request ID.
+
+    Parameters
+    ----------
+    location : str
+        The location of the batch file.
+    kind : Literal["transfer", "move", "payment_draft"]
+        The kind of payments in the file:
+        `transfer` rows are validated against `CreateTransferToAnotherAccount.Body`,
+        `move` rows against `MoveMoneyBetweenAccounts.Body` and
+        `payment_draft` rows against a payment of `CreatePaymentDraft.Body`.
+    file_format : Literal["csv", "jsonl"], optional
+        The format of the file, by default derived from the file extension.
+    workers : int, optional
+        The number of worker processes, by default the number of CPUs.
+    chunk_size : int, optional
+        The number of rows validated per chunk, by default 2000.
+    fail_fast : bool, optional
+        Whether to stop after the first chunk with an invalid row, by default False.
+
+    Yields
+    ------
+    ModelBatchRowError
+        The errors of each invalid row.
+    """
+    for _, row_errors in _iter_chunk_results(
+        location=location,
+        kind=kind,
+        file_format=file_format,
+        workers=workers,
+        chunk_size=chunk_size,
+        fail_fast=fail_fast,
+    ):
+        yield from row_errors
+
+
+def validate_batch_file(
+    location: str,
+    kind: BatchKind,
+    file_format: Literal["csv", "jsonl"] | None = None,
+    workers: int | None = None,
+    chunk_size: int = 2000,
+    fail_fast: bool = False,
+    max_errors: int | None = 1000,
+) -> ModelBatchValidationSummary:
+    """Validate a CSV or JSONL batch file of payments without touching the network.
+    See `iter_batch_errors` for the details.
+
+    Parameters
+    ----------
+    location : str
+        The location of the batch file.
+    kind : Literal["transfer", "move", "payment_draft"]
+        The kind of payments in the file.
+    file_format : Literal["csv", "jsonl"], optional
+        The format of the file, by default derived from the file extension.
+    workers : int, optional
+        The number of worker processes, by default the number of CPUs.
+    chunk_size : int, optional
+        The number of rows validated per chunk, by default 2000.
+    fail_fast : bool, optional
+        Whether to stop after the first chunk with an invalid row, by default False.
+    max_errors : int | None, optional
+        The maximum number of row errors kept in the summary, by default 1000.
+        All invalid rows are counted.
+
+    Returns
+    -------
+    ModelBatchValidationSummary
+        The number of rows, the number of invalid rows and their errors.
+    """
+    start = time.perf_counter()
+    summary = ModelBatchValidationSummary()
+    for rows, row_errors in _iter_chunk_results(
+        location=location,
+        kind=kind,
+        file_format=file_format,
+        workers=workers,
+        chunk_size=chunk_size,
+        fail_fast=fail_fast,
+    ):
+        summary.rows += rows
+        summary.invalid += len(row_errors)
+        if max_errors is None:
+            summary.errors.extend(row_errors)
+        else:
+            summary.errors.extend(row_errors[: max_errors - len(summary.errors)])
+    summary.elapsed = time.perf_counter() - start
+    return summary
+
+
+def _iter_chunk_results(
+    location: str,
+    kind: BatchKind,
+    file_format: Literal["csv", "jsonl"] | None,
+    workers: int | None,
+    chunk_size: int,
+    fail_fast: bool,
+) -> Iterator[tuple[int, list[ModelBatchRowError]]]:
+    """Validate a batch file chunk by chunk in a process pool
+
+    Parameters
+    ----------
+    location : str
+        The location of the batch file
+    kind : BatchKind
+        The kind of payments in the file
+    file_format : Literal["csv", "jsonl"] | None
+        The format of the file, or None to derive it from the file extension
+    workers : int | None
+        The number of worker processes, or None for the number of CPUs
+    chunk_size : int
+        The number of rows validated per chunk
+    fail_fast : bool
+        Whether to stop after the first chunk with an invalid row
+
+    Yields
+    ------
+    tuple[int, list[ModelBatchRowError]]
+        The number of rows of each chunk and the errors of its invalid rows,
+        in file order
+    """
+    assert kind in BATCH_MODELS, f"kind must be one of {list(BATCH_MODELS)}"
+    assert chunk_size >= 1, "chunk_size must be at least 1"
+    if file_format is None:
+        file_format = "csv" if location.lower().endswith(".csv") else "jsonl"
+    assert file_format in ("csv", "jsonl"), "file_format must be 'csv' or 'jsonl'"
+
+    workers = workers or os.cpu_count() or 1
+    request_id_rows: dict[str, int] = {}
+    pending: deque[Future] = deque()
+
+    def collect(future: Future) -> tuple[int, list[ModelBatchRowError]]:
+        rows, errors, request_ids = future.result()
+        row_errors = {
+            row: ModelBatchRowError(row=row, errors=row_error)
+            for row, row_error in errors
+        }
+        for row, request_id in request_ids:
+            first_row = request_id_rows.setdefault(request_id, row)
+            if first_row != row:
+                row_errors.setdefault(
+                    row, ModelBatchRowError(row=row, errors=[])
+                ).errors.append(
+                    ModelBatchRowError.ModelFieldError(
+                        loc="request_id",
+                        msg=f"Duplicate request_id, also used on row {first_row}",
+                        type="duplicate",
+                    )
+                )
+        return rows, [row_errors[row] for row in sorted(row_errors)]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        try:
+            for start_row, header, rows in _iter_chunks(
+                location=location, file_format=file_format, chunk_size=chunk_size
+            ):
+                pending.append(
+                    executor.submit(
+                        _validate_chunk, kind, file_format, header, start_row, rows
+                    )
+                )
+                while len(pending) >= 2 * workers or (pending and pending[0].done()):
+                    result = collect(pending.popleft())
+                    yield result
+                    if fail_fast and result[1]:
+                        return
+            while pending:
+                result = collect(pending.popleft())
+                yield result
+                if fail_fast and result[1]:
+                    return
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def _iter_chunks(
+    location: str, file_format: str, chunk_size: int
+) -> Iterator[tuple[int, list[str] | None, list]]:
+    """Read a batch file in chunks of rows
+
+    Parameters
+    ----------
+    location : str
+        The location of the batch file
+    file_format : str
+        The format of the file, "csv" or "jsonl"
+    chunk_size : int
+        The number of rows per chunk
+
+    Yields
+    ------
+    tuple[int, list[str] | None, list]
+        The number of the first row of the chunk, the CSV header (None for JSONL)
+        and the rows (lists of cells for CSV, raw lines for JSONL).
+    """
+    with open(location, "r", newline="") as file:
+        if file_format == "csv":
+            reader = csv.reader(file)
+            header = next(reader, None)
+            rows_iter = reader
+        else:
+            header = None
+            rows_iter = file
+
+        start_row = 1
+        rows = []
+        for row in rows_iter:
+            rows.append(row)
+            if len(rows) >= chunk_size:
+                yield start_row, header, rows
+                start_row += len(rows)
+                rows = []
+        if rows:
+            yield start_row, header, rows
+
+
+def _validate_chunk(
+    kind: str,
+    file_format: str,
+    header: list[str] | None,
+    start_row: int,
+    rows: list,
+) -> tuple[int, list[tuple[int, list[dict]]], list[tuple[int, str]]]:
+    """Validate a chunk of rows (in a worker process)
+
+    Parameters
+    ----------
+    kind : str
+        The kind of payments in the file
+    file_format : str
+        The format of the file, "csv" or "jsonl"
+    header : list[str] | None
+        The CSV header
+    start_row : int
+        The number of the first row of the chunk
+    rows : list
+        The rows of the chunk
+
+    Returns
+    -------
+    tuple[int, list[tuple[int, list[dict]]], list[tuple[int, str]]]
+        The number of rows, the errors per invalid row and the request IDs per row
+    """
+    model = BATCH_MODELS[kind]
+    errors = []
+    request_ids = []
+    for row, raw_row in enumerate(rows, start=start_row):
+        try:
+            if file_format == "csv":
+                data = _unflatten(header, raw_row)
+            else:
+                if not raw_row.strip():
+                    continue
+                data = json.loads(raw_row)
+            item = model.model_validate(data)
+        except ValidationError as exc:
+            errors.append(
+                (
+                    row,
+                    [
+                        {
+                            "loc": ".".join(str(part) for part in error["loc"]),
+                            "msg": error["msg"],
+                            "type": error["type"],
+                        }
+                        for error in exc.errors()
+                    ],
+                )
+            )
+            continue
+        except ValueError as exc:
+            errors.append((row, [{"loc": "", "msg": str(exc), "type": "parse"}]))
+            continue
+        request_id = getattr(item, "request_id", None)
+        if request_id is not None:
+            request_ids.append((row, request_id))
+    return len(rows), errors, request_ids
+
+
+def _unflatten(header: list[str], cells: list[str]) -> dict:
+    """Convert a CSV row with dotted column names to a nested dictionary.
+    Empty cells are left out.
+
+    Parameters
+    ----------
+    header : list[str]
+        The column names
+    cells : list[str]
+        The cells of the row
+
+    Returns
+    -------
+    dict
+        The nested row
+    """
+    if len(cells) != len(header):
+        raise ValueError(f"Expected {len(header)} columns, got {len(cells)}")
+    data: dict = {}
+    for column, cell in zip(header, cells):
+        if cell == "":
+            continue
+        *parents, name = column.strip().split(".")
+        node = data
+        for parent in parents:
+            node = node.setdefault(parent, {})
+        node[name] = cell
+    return data
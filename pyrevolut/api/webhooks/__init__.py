@@ -18,3 +18,16 @@ Reference link: https://developer.revolut.com/docs/business/webhooks-v-2
 
 # flake8: noqa: F401
 from .endpoint import EndpointWebhooksSync, EndpointWebhooksAsync
+from .verifier import WebhookVerifier
+from .registry import WebhookHandlerRegistry
+from .dedupe import (
+    BaseWebhookDedupeStore,
+    WebhookDedupeMemoryStore,
+    WebhookDedupeSQLiteStore,
+)
+from .receiver import WebhookReceiver
+from .recovery import (
+    WebhookRecovery,
+    ModelRecoveryCheckpoint,
+    ModelRecoverySummary,
+)
@@ -0,0 +1,261 @@
+from collections import OrderedDict
+import sqlite3
+import threading
+import time
+
+from pyrevolut.api.webhooks.resources import ResourceWebhookPayload
+
+
+class BaseWebhookDedupeStore:
+    """Base class for the stores that remember which webhook events have been seen.
+
+    Revolut retries failed deliveries and slow responses can lead to the same
+    event being delivered more than once. A dedupe store remembers the key of
+    every event for `ttl` seconds so duplicates can be dropped before they
+    reach the handlers.
+    """
+
+    ttl: float
+    blocking: bool = False
+    """Whether `add` can block, in which case it is called from a thread."""
+
+    @staticmethod
+    def key(payload: ResourceWebhookPayload) -> str:
+        """The dedupe key of a webhook event: the event type, the ID of the
+        transaction or payout link and the event timestamp.
+
+        Parameters
+        ----------
+        payload : ResourceWebhookPayload
+            The parsed webhook payload.
+
+        Returns
+        -------
+        str
+            The dedupe key.
+        """
+        return f"{payload.event}:{payload.data.id}:{payload.timestamp.isoformat()}"
+
+    def add(self, key: str) -> bool:
+        """Mark a key as seen.
+
+        Parameters
+        ----------
+        key : str
+            The dedupe key of the event.
+
+        Returns
+        -------
+        bool
+            True if the key was not seen within the TTL (the event is new),
+            False if the event is a duplicate.
+        """
+        raise NotImplementedError("add method must be implemented")
+
+    def add_payload(self, payload: ResourceWebhookPayload) -> bool:
+        """Mark a webhook event as seen.
+
+        Parameters
+        ----------
+        payload : ResourceWebhookPayload
+            The parsed webhook payload.
+
+        Returns
+        -------
+        bool
+            True if the event is new, False if it is a duplicate.
+        """
+        return self.add(self.key(payload))
+
+    def __contains__(self, key: str) -> bool:
+        """Whether a key has been seen within the TTL"""
+        raise NotImplementedError("__contains__ method must be implemented")
+
+
+class WebhookDedupeMemoryStore(BaseWebhookDedupeStore):
+    """In-memory dedupe store with a TTL and a maximum size.
+
+    Keys are kept in insertion order, so expired keys are purged from the
+    front and, once `max_size` is reached, the oldest key is evicted.
+    Both `add` and the membership check are O(1) (amortized).
+    """
+
+    def __init__(self, ttl: float = 60 * 60, max_size: int = 100_000):
+        """Create a new in-memory dedupe store
+
+        Parameters
+        ----------
+        ttl : float, optional
+            The number of seconds a key is remembered, by default 1 hour
+            (Revolut retries a failed delivery 3 times with 10 minute intervals).
+        max_size : int, optional
+            The maximum number of keys to remember, by default 100,000.
+        """
+        assert ttl > 0, "ttl must be positive"
+        assert max_size >= 1, "max_size must be at least 1"
+
+        self.ttl = ttl
+        self.max_size = max_size
+        self._seen: OrderedDict[str, float] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """The number of remembered keys (including keys not purged yet)"""
+        return len(self._seen)
+
+    def __contains__(self, key: str) -> bool:
+        """Whether a key has been seen within the TTL"""
+        expires_at = self._seen.get(key)
+        return expires_at is not None and expires_at > time.monotonic()
+
+    def add(self, key: str) -> bool:
+        """Mark a key as seen.
+
+        Parameters
+        ----------
+        key : str
+            The dedupe key of the event.
+
+        Returns
+        -------
+        bool
+            True if the event is new, False if it is a duplicate.
+        """
+        now = time.monotonic()
+        with self._lock:
+            self.__purge(now=now)
+            if key in self._seen:
+                return False
+            if len(self._seen) >= self.max_size:
+                self._seen.popitem(last=False)
+            self._seen[key] = now + self.ttl
+            return True
+
+    def clear(self):
+        """Forget all keys"""
+        with self._lock:
+            self._seen.clear()
+
+    def __purge(self, now: float):
+        """Remove the expired keys from the front of the store
+
+        Parameters
+        ----------
+        now : float
+            The current monotonic time
+
+        Returns
+        -------
+        None
+        """
+        while self._seen:
+            key, expires_at = next(iter(self._seen.items()))
+            if expires_at > now:
+                break
+            del self._seen[key]
+
+
+class WebhookDedupeSQLiteStore(BaseWebhookDedupeStore):
+    """SQLite backed dedupe store that can be shared by several worker processes.
+
+    Keys are stored in a table with their expiry time and the check-and-add is
+    a single `INSERT OR IGNORE` on the primary key, so it is atomic across
+    processes. Expired keys are purged every `purge_every` additions.
+    """
+
+    blocking = True
+
+    def __init__(
+        self,
+        location: str = "webhook_dedupe.sqlite3",
+        ttl: float = 60 * 60,
+        purge_every: int = 1000,
+        timeout: float = 5.0,
+    ):
+        """Create a new SQLite dedupe store
+
+        Parameters
+        ----------
+        location : str, optional
+            The location of the SQLite database file, by default "webhook_dedupe.sqlite3".
+        ttl : float, optional
+            The number of seconds a key is remembered, by default 1 hour.
+        purge_every : int, optional
+            Purge the expired keys every this many additions, by default 1000.
+        timeout : float, optional
+            The number of seconds to wait for a lock held by another process,
+            by default 5.0.
+        """
+        assert ttl > 0, "ttl must be positive"
+
+        self.location = location
+        self.ttl = ttl
+        self.purge_every = purge_every
+        self._additions = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            location,
+            timeout=timeout,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS webhook_events "
+            "(key TEXT PRIMARY KEY, expires_at REAL NOT NULL) WITHOUT ROWID"
+        )
+
+    def __contains__(self, key: str) -> bool:
+        """Whether a key has been seen within the TTL"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM webhook_events WHERE key = ? AND expires_at > ?",
+                (key, time.time()),
+            ).fetchone()
+        return row is not None
+
+    def add(self, key: str) -> bool:
+        """Mark a key as seen.
+
+        Parameters
+        ----------
+        key : str
+            The dedupe key of the event.
+
+        Returns
+        -------
+        bool
+            True if the event is new, False if it is a duplicate.
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "DELETE FROM webhook_events WHERE key = ? AND expires_at <= ?",
+                    (key, now),
+                )
+                cursor = self._conn.execute(
+                    "INSERT OR IGNORE INTO webhook_events (key, expires_at) VALUES (?, ?)",
+                    (key, now + self.ttl),
+                )
+                self._additions += 1
+                if self._additions % self.purge_every == 0:
+                    self._conn.execute(
+                        "DELETE FROM webhook_events WHERE expires_at <= ?", (now,)
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return cursor.rowcount == 1
+
+    def clear(self):
+        """Forget all keys"""
+        with self._lock:
+            self._conn.execute("DELETE FROM webhook_events")
+
+    def close(self):
+        """Close the database connection"""
+        self._conn.close()
@@ -59,6 +59,7 @@ class EndpointWebhooksAsync(BaseEndpointWebhooks):
 
         return await self.client.get(
             path=path,
+            route=endpoint.ROUTE,
             response_model=endpoint.Response,
             params=params,
             **kwargs,
@@ -88,6 +89,7 @@ class EndpointWebhooksAsync(BaseEndpointWebhooks):
 
         return await self.client.get(
             path=path,
+            route=endpoint.ROUTE,
             response_model=endpoint.Response,
             params=params,
             **kwargs,
@@ -140,6 +142,7 @@ class EndpointWebhooksAsync(BaseEndpointWebhooks):
 
         return await self.client.get(
             path=path,
+            route=endpoint.ROUTE,
             response_model=endpoint.Response,
             params=params,
             **kwargs,
@@ -181,6 +184,7 @@ class EndpointWebhooksAsync(BaseEndpointWebhooks):
 
         return await self.client.post(
             path=path,
+            route=endpoint.ROUTE,
             response_model=endpoint.Response,
             body=body,
             **kwargs,
@@ -219,6 +223,7 @@ class EndpointWebhooksAsync(BaseEndpointWebhooks):
 
         return await self.client.post(
             path=path,
+            route=endpoint.ROUTE,
             response_model=endpoint.Response,
             body=body,
             **kwargs,
@@ -262,6 +267,7 @@ class EndpointWebhooksAsync(BaseEndpointWebhooks):
 
         return await self.client.patch(
             path=path,
+            route=endpoint.ROUTE,
             response_model=endpoint.Response,
             body=body,
             **kwargs,
@@ -293,6 +299,7 @@ class EndpointWebhooksAsync(BaseEndpointWebhooks):
 
         return await self.client.delete(
             path=path,
+            route=endpoint.ROUTE,
             response_model=endpoint.Response,
             params=params,
             **kwargs,
@@ -2,11 +2,9 @@ import hmac
 import hashlib
 import json
 
-import pendulum
-
 from pyrevolut.api.common import BaseEndpointSync
-from pyrevolut.exceptions import PyRevolutInvalidPayload
 from pyrevolut.api.webhooks.resources import ResourceWebhookPayload
+from pyrevolut.api.webhooks.verifier import WebhookVerifier
 
 
 class BaseEndpointWebhooks(BaseEndpointSync):
@@ -30,9 +28,9 @@ class BaseEndpointWebhooks(BaseEndpointSync):
 
     def receive_webhook_event(
         self,
-        raw_payload: str,
-        signing_secret: str,
-        header_timestamp: int,
+        raw_payload: str | bytes,
+        signing_secret: str | list[str] | WebhookVerifier,
+        header_timestamp: int | str,
         header_signature: str,
         **kwargs,
     ):
@@ -42,11 +40,13 @@ class BaseEndpointWebhooks(BaseEndpointSync):
 
         Parameters
         ----------
-        raw_payload : str
-            The raw payload string received from the webhook event.
-        signing_secret : str
+        raw_payload : str | bytes
+            The raw payload received from the webhook event.
+        signing_secret : str | list[str] | WebhookVerifier
             The signing secret provided by Revolut for the webhook endpoint.
-        header_timestamp : int
+            Can also be a list of the currently active signing secrets, or a
+            `WebhookVerifier` that is reused across events.
+        header_timestamp : int | str
             The timestamp string received from the webhook event. It
             will be in the header of the request under the key `Revolut-Requested-Timestamp`.
             For example: 1683650202360
@@ -77,15 +77,12 @@ class BaseEndpointWebhooks(BaseEndpointSync):
             raw_payload, signing_secret, header_timestamp, header_signature
         )
 
-        # Parse the raw payload
-        raw_payload = json.loads(raw_payload)
-
         # Raw response
         if self.client.return_type == "raw":
-            return raw_payload
+            return json.loads(raw_payload)
 
-        # Dict response
-        model_response = ResourceWebhookPayload(**raw_payload)
+        # Dict response (validated straight from the JSON, discriminated on the event)
+        model_response = ResourceWebhookPayload.from_raw(raw_payload)
         if self.client.return_type == "dict":
             return model_response.model_dump()
 
@@ -95,20 +92,22 @@ class BaseEndpointWebhooks(BaseEndpointSync):
 
     def verify_payload_signature(
         self,
-        raw_payload: str,
-        signing_secret: str,
-        header_timestamp: int,
+        raw_payload: str | bytes,
+        signing_secret: str | list[str] | WebhookVerifier,
+        header_timestamp: int | str,
         header_signature: str,
     ):
         """Verifies the webhook payload signature.
 
         Parameters
         ----------
-        raw_payload : str
-            The raw payload string received from the webhook event.
-        signing_secret : str
+        raw_payload : str | bytes
+            The raw payload received from the webhook event.
+        signing_secret : str | list[str] | WebhookVerifier
             The signing secret provided by Revolut for the webhook endpoint.
-        header_timestamp : int
+            Can also be a list of the currently active signing secrets, or a
+            `WebhookVerifier` that is reused across events.
+        header_timestamp : int | str
             The timestamp string received from the webhook event. It
             will be in the header of the request under the key `Revolut-Requested-Timestamp`.
             For example: 1683650202360
@@ -133,33 +132,15 @@ class BaseEndpointWebhooks(BaseEndpointSync):
         -------
         None
         """
-        # Get the revolut signature version from the signature
-        revolut_signature_version = header_signature.split("=")[0]
+        if not isinstance(signing_secret, WebhookVerifier):
+            signing_secret = WebhookVerifier(signing_secrets=signing_secret)
 
-        # Check the timestamp
-        current_dt = pendulum.now(tz="UTC")
-        timestamp_dt = pendulum.from_timestamp(header_timestamp / 1000, tz="UTC")
-
-        # Check if the timestamp is too old
-        if current_dt.diff(timestamp_dt).in_minutes() > 5:
-            raise PyRevolutInvalidPayload("The webhook payload timestamp is too old.")
-
-        # Sign the payload
-        valid_signature = self.sign_payload(
+        signing_secret.verify(
             raw_payload=raw_payload,
-            signing_secret=signing_secret,
             header_timestamp=header_timestamp,
-            signature_version=revolut_signature_version,
+            header_signature=header_signature,
         )
 
-        # Get the multiple signatures
-        multiple_signatures = header_signature.split(",")
-
-        # The computed signature must match exactly the signature (or one of the multiple signatures)
-        # sent in that header.
-        if valid_signature not in multiple_signatures:
-            raise PyRevolutInvalidPayload("The webhook payload signature is invalid.")
-
     def sign_payload(
         self,
         raw_payload: str,
@@ -4,7 +4,7 @@ from uuid import UUID
 from pydantic import BaseModel, Field, HttpUrl
 
 from pyrevolut.utils import DateTime
-from pyrevolut.api.webhooks.resources import ResourceWebhookPayload
+from pyrevolut.api.webhooks.resources import WebhookPayload
 
 
 class RetrieveListOfFailedWebhooks:
@@ -84,7 +84,7 @@ class RetrieveListOfFailedWebhooks:
             ),
         ]
         payload: Annotated[
-            ResourceWebhookPayload,
+            WebhookPayload,
             Field(description="The details of the failed event."),
         ]
         last_sent_date: Annotated[
@@ -0,0 +1,434 @@
+from typing import Any, Awaitable, Callable, MutableMapping
+import asyncio
+import json
+import logging
+import sqlite3
+
+from pydantic import ValidationError
+
+from pyrevolut.exceptions import PyRevolutInvalidPayload
+from pyrevolut.api.webhooks.resources import ResourceWebhookPayload
+from pyrevolut.api.webhooks.endpoint.base import BaseEndpointWebhooks
+from pyrevolut.api.webhooks.registry import WebhookHandlerRegistry
+from pyrevolut.api.webhooks.dedupe import BaseWebhookDedupeStore
+from pyrevolut.api.webhooks.verifier import WebhookVerifier
+
+Scope = MutableMapping[str, Any]
+Message = MutableMapping[str, Any]
+Receive = Callable[[], Awaitable[Message]]
+Send = Callable[[Message], Awaitable[None]]
+
+
+class WebhookReceiver:
+    """ASGI application that receives Revolut webhook events.
+
+    The signature of each event is verified in the request, after which the
+    request is acknowledged immediately with a 200 response. The raw payload
+    is then put on a bounded queue that is drained by a pool of workers.
+    The workers parse the payload, drop it if the dedupe store has already seen
+    the event, and dispatch it to the handlers registered for its event type.
+
+    When the queue is full, the request waits up to `enqueue_timeout` seconds
+    for space. If there is still no space, the request is answered with a 503
+    so that Revolut delivers the event again later.
+
+    The workers are started on the ASGI lifespan startup event (or on the first
+    request if the server does not support lifespan) and the queue is drained
+    on shutdown.
+
+    Example
+    -------
+    ```python
+    import uvicorn
+    from pyrevolut.client import Client
+    from pyrevolut.api import EnumWebhookEvent
+    from pyrevolut.api.webhooks import WebhookReceiver
+
+    client = Client(creds_loc="path/to/creds.json")
+    receiver = WebhookReceiver(
+        webhooks=client.Webhooks,
+        signing_secret="wsk_...",
+        workers=8,
+    )
+
+
+    @receiver.registry.on(EnumWebhookEvent.TRANSACTION_STATE_CHANGED)
+    async def on_state_changed(payload):
+        ...
+
+
+    uvicorn.run(receiver, port=8000)
+    ```
+    """
+
+    def __init__(
+        self,
+        webhooks: BaseEndpointWebhooks,
+        signing_secret: str | list[str] | WebhookVerifier,
+        registry: WebhookHandlerRegistry | None = None,
+        dedupe_store: BaseWebhookDedupeStore | None = None,
+        path: str = "/webhook",
+        workers: int = 4,
+        max_queue_size: int = 1000,
+        enqueue_timeout: float = 1.0,
+        max_body_size: int = 1024 * 1024,
+    ):
+        """Create a new webhook receiver
+
+        Parameters
+        ----------
+        webhooks : BaseEndpointWebhooks
+            The webhooks endpoint used to verify the payload signatures,
+            for example `client.Webhooks`.
+        signing_secret : str | list[str] | WebhookVerifier
+            The signing secret(s) of the webhook, or a `WebhookVerifier`.
+        registry : WebhookHandlerRegistry, optional
+            The registry of event handlers, by default a new empty registry.
+        dedupe_store : BaseWebhookDedupeStore, optional
+            The store used to drop duplicate deliveries of the same event,
+            by default None (no deduplication).
+        path : str, optional
+            The path on which the webhook events are received, by default "/webhook".
+        workers : int, optional
+            The number of workers processing the queued events, by default 4.
+        max_queue_size : int, optional
+            The maximum number of events waiting to be processed, by default 1000.
+        enqueue_timeout : float, optional
+            The number of seconds a request waits for space in a full queue
+            before it is answered with a 503, by default 1.0.
+        max_body_size : int, optional
+            The maximum size of a payload in bytes, by default 1 MiB.
+        """
+        assert workers >= 1, "workers must be at least 1"
+        assert max_queue_size >= 1, "max_queue_size must be at least 1"
+
+        self.webhooks = webhooks
+        self.verifier = (
+            signing_secret
+            if isinstance(signing_secret, WebhookVerifier)
+            else WebhookVerifier(signing_secrets=signing_secret)
+        )
+        self.registry = registry if registry is not None else WebhookHandlerRegistry()
+        self.dedupe_store = dedupe_store
+        self.path = path
+        self.workers = workers
+        self.max_queue_size = max_queue_size
+        self.enqueue_timeout = enqueue_timeout
+        self.max_body_size = max_body_size
+
+        self.received = 0
+        self.rejected = 0
+        self.dropped = 0
+        self.duplicates = 0
+        self.processed = 0
+        self.failed = 0
+
+        self._queue: asyncio.Queue[bytes] | None = None
+        self._tasks: list[asyncio.Task] = []
+
+    @property
+    def queue_size(self) -> int:
+        """The number of events waiting to be processed
+
+        Returns
+        -------
+        int
+            The number of queued events
+        """
+        return self._queue.qsize() if self._queue is not None else 0
+
+    @property
+    def running(self) -> bool:
+        """Whether the workers are running
+
+        Returns
+        -------
+        bool
+            True if the workers are running
+        """
+        return bool(self._tasks)
+
+    async def start(self):
+        """Start the worker pool. Does nothing if the workers are already running."""
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._tasks = [
+            asyncio.create_task(self.__worker(), name=f"pyrevolut-webhook-worker-{i}")
+            for i in range(self.workers)
+        ]
+
+    async def stop(self, drain: bool = True):
+        """Stop the worker pool.
+
+        Parameters
+        ----------
+        drain : bool, optional
+            Whether to process the queued events before stopping, by default True.
+
+        Returns
+        -------
+        None
+        """
+        if not self._tasks:
+            return
+        if drain:
+            await self._queue.join()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+
+    async def join(self):
+        """Wait until all queued events have been processed."""
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        """The ASGI entrypoint
+
+        Parameters
+        ----------
+        scope : Scope
+            The ASGI connection scope
+        receive : Receive
+            The ASGI receive callable
+        send : Send
+            The ASGI send callable
+
+        Returns
+        -------
+        None
+        """
+        if scope["type"] == "lifespan":
+            await self.__lifespan(receive=receive, send=send)
+        elif scope["type"] == "http":
+            await self.__http(scope=scope, receive=receive, send=send)
+
+    async def accept(
+        self,
+        raw_payload: bytes,
+        header_timestamp: str | int,
+        header_signature: str,
+    ) -> tuple[int, str]:
+        """Verify a webhook event and queue it for processing.
+
+        This is what the ASGI application does for each request, exposed so the
+        receiver can be mounted in any web framework.
+
+        Parameters
+        ----------
+        raw_payload : bytes
+            The raw request body.
+        header_timestamp : str | int
+            The `Revolut-Request-Timestamp` header value.
+        header_signature : str
+            The `Revolut-Signature` header value.
+
+        Returns
+        -------
+        tuple[int, str]
+            The HTTP status code and message to respond with.
+        """
+        if not self._tasks:
+            await self.start()
+
+        self.received += 1
+        try:
+            self.webhooks.verify_payload_signature(
+                raw_payload=raw_payload,
+                signing_secret=self.verifier,
+                header_timestamp=header_timestamp,
+                header_signature=header_signature,
+            )
+        except PyRevolutInvalidPayload as exc:
+            self.rejected += 1
+            return 401, str(exc)
+
+        try:
+            await asyncio.wait_for(
+                self._queue.put(raw_payload), timeout=self.enqueue_timeout
+            )
+        except asyncio.TimeoutError:
+            self.dropped += 1
+            logging.warning("Webhook queue is full, asking Revolut to retry later.")
+            return 503, "Webhook queue is full, please retry later."
+        return 200, "Webhook received successfully!"
+
+    async def process(self, raw_payload: bytes):
+        """Parse a verified webhook payload and dispatch it to the registered handlers.
+        Duplicate events are dropped before the handlers are called.
+
+        Parameters
+        ----------
+        raw_payload : bytes
+            The raw, verified, payload of the event.
+
+        Returns
+        -------
+        None
+        """
+        try:
+            payload = ResourceWebhookPayload.from_raw(raw_payload)
+        except ValidationError:
+            self.failed += 1
+            logging.exception("Could not parse the webhook payload.")
+            return
+
+        if self.dedupe_store is not None and not await self.__is_new(payload):
+            self.duplicates += 1
+            return
+
+        if await self.registry.dispatch(payload):
+            self.failed += 1
+        else:
+            self.processed += 1
+
+    async def __is_new(self, payload: ResourceWebhookPayload) -> bool:
+        """Mark an event as seen in the dedupe store.
+
+        Stores that block (such as the SQLite store waiting for a lock held by
+        another process) are called from a thread so they do not stall the event
+        loop. If the store fails, the event is processed anyway: a duplicate
+        is better than a lost event.
+
+        Parameters
+        ----------
+        payload : ResourceWebhookPayload
+            The parsed webhook payload.
+
+        Returns
+        -------
+        bool
+            True if the event is new (or the store failed), False if it is a duplicate.
+        """
+        try:
+            if self.dedupe_store.blocking:
+                return await asyncio.to_thread(self.dedupe_store.add_payload, payload)
+            return self.dedupe_store.add_payload(payload)
+        except sqlite3.OperationalError:
+            logging.exception(
+                "Could not check the webhook dedupe store, processing the event anyway."
+            )
+            return True
+
+    async def __worker(self):
+        """Process queued events until cancelled.
+        An event that cannot be processed is logged and counted as failed,
+        so one bad event never stops the worker."""
+        while True:
+            raw_payload = await self._queue.get()
+            try:
+                await self.process(raw_payload)
+            except Exception:
+                self.failed += 1
+                logging.exception("Could not process the webhook event.")
+            finally:
+                self._queue.task_done()
+
+    async def __lifespan(self, receive: Receive, send: Send):
+        """Handle the ASGI lifespan protocol
+
+        Parameters
+        ----------
+        receive : Receive
+            The ASGI receive callable
+        send : Send
+            The ASGI send callable
+
+        Returns
+        -------
+        None
+        """
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await self.start()
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self.stop(drain=True)
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def __http(self, scope: Scope, receive: Receive, send: Send):
+        """Handle an ASGI HTTP request
+
+        Parameters
+        ----------
+        scope : Scope
+            The ASGI connection scope
+        receive : Receive
+            The ASGI receive callable
+        send : Send
+            The ASGI send callable
+
+        Returns
+        -------
+        None
+        """
+        if scope["path"].rstrip("/") != self.path.rstrip("/"):
+            return await self.__respond(send=send, status=404, message="Not Found")
+        if scope["method"] != "POST":
+            return await self.__respond(
+                send=send, status=405, message="Method Not Allowed"
+            )
+
+        headers = dict(scope["headers"])
+        header_signature = headers.get(b"revolut-signature")
+        header_timestamp = headers.get(b"revolut-request-timestamp")
+        if header_signature is None or header_timestamp is None:
+            return await self.__respond(
+                send=send, status=400, message="Missing Revolut signature headers."
+            )
+
+        chunks: list[bytes] = []
+        size = 0
+        more_body = True
+        while more_body:
+            message = await receive()
+            chunk = message.get("body", b"")
+            size += len(chunk)
+            if size > self.max_body_size:
+                return await self.__respond(
+                    send=send, status=413, message="Payload Too Large"
+                )
+            chunks.append(chunk)
+            more_body = message.get("more_body", False)
+
+        status, response_message = await self.accept(
+            raw_payload=b"".join(chunks),
+            header_timestamp=header_timestamp.decode("latin-1"),
+            header_signature=header_signature.decode("latin-1"),
+        )
+        await self.__respond(send=send, status=status, message=response_message)
+
+    @staticmethod
+    async def __respond(send: Send, status: int, message: str):
+        """Send a JSON response with a message
+
+        Parameters
+        ----------
+        send : Send
+            The ASGI send callable
+        status : int
+            The HTTP status code
+        message : str
+            The message to put in the response body
+
+        Returns
+        -------
+        None
+        """
+        body = json.dumps({"message": message}).encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,380 @@
+from typing import TYPE_CHECKING, Annotated
+from uuid import UUID
+import asyncio
+import logging
+import os
+import sqlite3
+
+from pydantic import BaseModel, Field, ValidationError
+
+from pyrevolut.utils import DateTime
+from pyrevolut.utils.datetime import to_datetime
+from pyrevolut.utils.retry import as_dict
+from pyrevolut.api.common import EnumWebhookEvent
+from pyrevolut.api.webhooks.resources import ResourceWebhookPayload
+from pyrevolut.api.webhooks.registry import WebhookHandlerRegistry
+from pyrevolut.api.webhooks.dedupe import BaseWebhookDedupeStore
+
+if TYPE_CHECKING:
+    from pyrevolut.client import AsyncClient
+
+
+class ModelRecoveryCheckpoint(BaseModel):
+    """The model that represents the webhook recovery checkpoint JSON file."""
+
+    class ModelWebhookCheckpoint(BaseModel):
+        """The recovery progress of a single webhook"""
+
+        completed_until: Annotated[
+            DateTime | None,
+            Field(
+                description="All failed events created at or before this datetime have been recovered."
+            ),
+        ] = None
+        processed: Annotated[
+            set[UUID],
+            Field(
+                description="The failed events recovered since completed_until, by ID."
+            ),
+        ] = set()
+
+    webhooks: Annotated[
+        dict[UUID, ModelWebhookCheckpoint],
+        Field(description="The recovery progress per webhook ID."),
+    ] = {}
+
+
+class ModelRecoverySummary(BaseModel):
+    """The model that summarises a webhook recovery run."""
+
+    recovered: Annotated[
+        int, Field(description="The number of events dispatched to the handlers.")
+    ] = 0
+    skipped: Annotated[
+        int,
+        Field(description="The number of events already recovered or seen before."),
+    ] = 0
+    failed: Annotated[
+        int,
+        Field(description="The number of events for which a handler failed."),
+    ] = 0
+
+
+class WebhookRecovery:
+    """Recovers the webhook events that Revolut could not deliver.
+
+    For every webhook, the failed events are paged through concurrently. For each
+    page, the referenced transactions or payout links are re-fetched in a
+    concurrent batch so the handlers see their current state, after which the
+    events are dispatched to the same `WebhookHandlerRegistry` as the live events.
+
+    The progress is written to a checkpoint file after every page, so a restarted
+    recovery only processes the events it has not recovered yet. Events for which
+    a handler failed are not marked as recovered and are retried on the next run.
+
+    Example
+    -------
+    ```python
+    async with AsyncClient(creds_loc="path/to/creds.json") as client:
+        recovery = WebhookRecovery(client=client, registry=receiver.registry)
+        summary = await recovery.run()
+    ```
+    """
+
+    def __init__(
+        self,
+        client: "AsyncClient",
+        registry: WebhookHandlerRegistry,
+        checkpoint_loc: str | None = "webhook_recovery.json",
+        dedupe_store: BaseWebhookDedupeStore | None = None,
+        page_size: int = 100,
+        max_concurrency: int = 10,
+        refresh: bool = True,
+    ):
+        """Create a new webhook recovery job
+
+        Parameters
+        ----------
+        client : AsyncClient
+            The (open) async client used to call the API.
+        registry : WebhookHandlerRegistry
+            The registry of event handlers to dispatch the recovered events to.
+        checkpoint_loc : str | None, optional
+            The location of the checkpoint JSON file, by default "webhook_recovery.json".
+            If None, no checkpoint is kept.
+        dedupe_store : BaseWebhookDedupeStore, optional
+            The dedupe store shared with the live receiver, by default None.
+            Events that were already seen are skipped.
+        page_size : int, optional
+            The number of failed events fetched per page, by default 100.
+        max_concurrency : int, optional
+            The maximum number of concurrent API requests, by default 10.
+        refresh : bool, optional
+            Whether to re-fetch the referenced transactions and payout links and
+            update the event data with their current state, by default True.
+        """
+        assert 1 <= page_size <= 1000, "page_size must be between 1 and 1000"
+        assert max_concurrency >= 1, "max_concurrency must be at least 1"
+
+        self.client = client
+        self.registry = registry
+        self.checkpoint_loc = checkpoint_loc
+        self.dedupe_store = dedupe_store
+        self.page_size = page_size
+        self.max_concurrency = max_concurrency
+        self.refresh = refresh
+        self.checkpoint = self.load_checkpoint()
+
+        self._semaphore: asyncio.Semaphore | None = None
+        self._checkpoint_lock: asyncio.Lock | None = None
+
+    async def run(self, webhook_ids: list[UUID] | None = None) -> ModelRecoverySummary:
+        """Recover the failed events of the given webhooks.
+
+        Parameters
+        ----------
+        webhook_ids : list[UUID], optional
+            The IDs of the webhooks to recover, by default all webhooks.
+
+        Returns
+        -------
+        ModelRecoverySummary
+            The number of recovered, skipped and failed events.
+        """
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._checkpoint_lock = asyncio.Lock()
+
+        if webhook_ids is None:
+            webhooks = await self.client.Webhooks.get_all_webhooks()
+            webhook_ids = [_as_dict(webhook)["id"] for webhook in webhooks]
+
+        summaries = await asyncio.gather(
+            *[self.recover_webhook(webhook_id=UUID(str(wid))) for wid in webhook_ids]
+        )
+
+        summary = ModelRecoverySummary()
+        for webhook_summary in summaries:
+            summary.recovered += webhook_summary.recovered
+            summary.skipped += webhook_summary.skipped
+            summary.failed += webhook_summary.failed
+        return summary
+
+    async def recover_webhook(self, webhook_id: UUID) -> ModelRecoverySummary:
+        """Recover the failed events of a single webhook.
+
+        Parameters
+        ----------
+        webhook_id : UUID
+            The ID of the webhook.
+
+        Returns
+        -------
+        ModelRecoverySummary
+            The number of recovered, skipped and failed events.
+        """
+        summary = ModelRecoverySummary()
+        progress = self.checkpoint.webhooks.setdefault(
+            webhook_id, ModelRecoveryCheckpoint.ModelWebhookCheckpoint()
+        )
+        newest: DateTime | None = None
+        created_before: DateTime | None = None
+
+        while True:
+            async with self._semaphore:
+                page = await self.client.Webhooks.get_failed_webhook_events(
+                    webhook_id=webhook_id,
+                    limit=self.page_size,
+                    created_before=created_before,
+                )
+            events = as_dict(page)
+            if not events:
+                break
+
+            pending: list[tuple[UUID, ResourceWebhookPayload]] = []
+            reached_checkpoint = False
+            for event in events:
+                event_id = UUID(str(event["id"]))
+                created_at = to_datetime(event["created_at"])
+                newest = created_at if newest is None else max(newest, created_at)
+                if (
+                    progress.completed_until is not None
+                    and created_at <= progress.completed_until
+                ):
+                    reached_checkpoint = True
+                    break
+                if event_id in progress.processed:
+                    summary.skipped += 1
+                    continue
+                pending.append(
+                    (event_id, ResourceWebhookPayload.from_dict(event["payload"]))
+                )
+
+            if self.refresh:
+                payloads = await asyncio.gather(
+                    *[self.refresh_payload(payload) for _, payload in pending]
+                )
+            else:
+                payloads = [payload for _, payload in pending]
+
+            for (event_id, _), payload in zip(pending, payloads):
+                if await self.__is_seen(payload):
+                    summary.skipped += 1
+                elif await self.registry.dispatch(payload):
+                    # Not marked as processed or seen, so the next run retries it
+                    summary.failed += 1
+                    continue
+                else:
+                    await self.__mark_seen(payload)
+                    summary.recovered += 1
+                progress.processed.add(event_id)
+            await self.save_checkpoint()
+
+            if reached_checkpoint or len(events) < self.page_size:
+                break
+            created_before = to_datetime(events[-1]["created_at"])
+
+        # Every failed event up to the newest one has now been recovered.
+        # If a handler failed, the checkpoint is not moved past the failed events:
+        # the next run pages back to the same point, skips the processed events
+        # and retries the failed ones.
+        if newest is not None and not summary.failed:
+            if progress.completed_until is None or newest > progress.completed_until:
+                progress.completed_until = newest
+            progress.processed = set()
+            await self.save_checkpoint()
+        return summary
+
+    async def refresh_payload(
+        self, payload: ResourceWebhookPayload
+    ) -> ResourceWebhookPayload:
+        """Re-fetch the transaction or payout link of a webhook event and update
+        the event data with its current state.
+
+        If the resource cannot be fetched, or does not match the model of the event,
+        the original payload is returned.
+
+        Parameters
+        ----------
+        payload : ResourceWebhookPayload
+            The payload of the failed event.
+
+        Returns
+        -------
+        ResourceWebhookPayload
+            The payload with the current state of the resource.
+        """
+        try:
+            async with self._semaphore:
+                if payload.event in (
+                    EnumWebhookEvent.TRANSACTION_CREATED,
+                    EnumWebhookEvent.TRANSACTION_STATE_CHANGED,
+                ):
+                    resource = await self.client.Transactions.get_transaction(
+                        transaction_id=payload.data.id
+                    )
+                else:
+                    resource = await self.client.PayoutLinks.get_payout_link(
+                        payout_link_id=payload.data.id
+                    )
+        except Exception as exc:
+            logging.warning(
+                f"Could not refresh {payload.event} {payload.data.id}, "
+                f"dispatching the original event: {exc}"
+            )
+            return payload
+
+        resource = as_dict(resource)
+        data = payload.data.model_dump()
+        if payload.event == EnumWebhookEvent.TRANSACTION_CREATED:
+            data = resource
+        elif payload.event == EnumWebhookEvent.PAYOUT_LINK_CREATED:
+            data["state"] = resource["state"]
+        else:
+            data["new_state"] = resource["state"]
+
+        try:
+            return ResourceWebhookPayload.from_dict(
+                {"event": payload.event, "timestamp": payload.timestamp, "data": data}
+            )
+        except ValidationError as exc:
+            logging.warning(
+                f"Could not refresh {payload.event} {payload.data.id}, "
+                f"dispatching the original event: {exc}"
+            )
+            return payload
+
+    async def __is_seen(self, payload: ResourceWebhookPayload) -> bool:
+        """Whether an event has already been seen by the dedupe store.
+
+        Stores that block (such as the SQLite store) are called from a thread so
+        they do not stall the event loop. If the store fails, the event is
+        dispatched anyway: a duplicate is better than a lost event.
+
+        Parameters
+        ----------
+        payload : ResourceWebhookPayload
+            The payload of the failed event.
+
+        Returns
+        -------
+        bool
+            True if the event was seen, False if it is new, the store failed
+            or there is no dedupe store.
+        """
+        if self.dedupe_store is None:
+            return False
+        key = self.dedupe_store.key(payload)
+        try:
+            if self.dedupe_store.blocking:
+                return await asyncio.to_thread(self.dedupe_store.__contains__, key)
+            return key in self.dedupe_store
+        except sqlite3.OperationalError:
+            logging.exception(
+                "Could not check the webhook dedupe store, dispatching the event anyway."
+            )
+            return False
+
+    async def __mark_seen(self, payload: ResourceWebhookPayload):
+        """Mark an event as seen in the dedupe store, once its handlers succeeded.
+
+        Parameters
+        ----------
+        payload : ResourceWebhookPayload
+            The payload of the recovered event.
+
+        Returns
+        -------
+        None
+        """
+        if self.dedupe_store is None:
+            return
+        try:
+            if self.dedupe_store.blocking:
+                await asyncio.to_thread(self.dedupe_store.add_payload, payload)
+            else:
+                self.dedupe_store.add_payload(payload)
+        except sqlite3.OperationalError:
+            logging.exception("Could not mark the webhook event as seen.")
+
+    def load_checkpoint(self) -> ModelRecoveryCheckpoint:
+        """Load the checkpoint from the checkpoint file, if it exists.
+
+        Returns
+        -------
+        ModelRecoveryCheckpoint
+            The loaded (or a new, empty) checkpoint.
+        """
+        if self.checkpoint_loc is None or not os.path.exists(self.checkpoint_loc):
+            return ModelRecoveryCheckpoint()
+        with open(self.checkpoint_loc, "r") as file:
+            return ModelRecoveryCheckpoint.model_validate_json(file.read())
+
+    async def save_checkpoint(self):
+        """Atomically write the checkpoint to the checkpoint file."""
+        if self.checkpoint_loc is None:
+            return
+        async with self._checkpoint_lock:
+            tmp_loc = f"{self.checkpoint_loc}.tmp"
+            with open(tmp_loc, "w") as file:
+                file.write(self.checkpoint.model_dump_json(indent=4))
+            os.replace(tmp_loc, self.checkpoint_loc)
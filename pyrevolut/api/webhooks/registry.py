@@ -0,0 +1,145 @@
+from typing import Any, Awaitable, Callable
+import asyncio
+import inspect
+import logging
+
+from pyrevolut.api.common import EnumWebhookEvent
+from pyrevolut.api.webhooks.resources import ResourceWebhookPayload
+
+WebhookHandler = Callable[[ResourceWebhookPayload], Awaitable[Any] | Any]
+
+
+class WebhookHandlerRegistry:
+    """Registry of the handlers to call for each webhook event type.
+
+    Handlers receive the parsed `ResourceWebhookPayload` of the event. They can be
+    coroutine functions, which are awaited, or plain functions, which are run in a
+    worker thread so they do not block the event loop.
+
+    Example
+    -------
+    ```python
+    registry = WebhookHandlerRegistry()
+
+
+    @registry.on(EnumWebhookEvent.TRANSACTION_STATE_CHANGED)
+    async def on_state_changed(payload: ResourceWebhookPayload):
+        print(payload.data.new_state)
+    ```
+    """
+
+    def __init__(self):
+        """Create a new, empty, webhook handler registry"""
+        self._handlers: dict[EnumWebhookEvent, list[WebhookHandler]] = {
+            event: [] for event in EnumWebhookEvent
+        }
+
+    def register(
+        self,
+        event: EnumWebhookEvent | str,
+        handler: WebhookHandler,
+    ) -> WebhookHandler:
+        """Register a handler for a webhook event type.
+
+        Parameters
+        ----------
+        event : EnumWebhookEvent | str
+            The event type to handle.
+        handler : WebhookHandler
+            The function to call with the parsed payload of each event.
+
+        Returns
+        -------
+        WebhookHandler
+            The registered handler.
+        """
+        self._handlers[EnumWebhookEvent(event)].append(handler)
+        return handler
+
+    def on(
+        self,
+        *events: EnumWebhookEvent | str,
+    ) -> Callable[[WebhookHandler], WebhookHandler]:
+        """Decorator to register a handler for one or more webhook event types.
+        If no event type is provided, the handler is registered for all events.
+
+        Parameters
+        ----------
+        *events : EnumWebhookEvent | str
+            The event types to handle.
+
+        Returns
+        -------
+        Callable[[WebhookHandler], WebhookHandler]
+            The decorator.
+        """
+
+        def decorator(handler: WebhookHandler) -> WebhookHandler:
+            for event in events or list(EnumWebhookEvent):
+                self.register(event=event, handler=handler)
+            return handler
+
+        return decorator
+
+    def unregister(self, event: EnumWebhookEvent | str, handler: WebhookHandler):
+        """Remove a handler for a webhook event type.
+
+        Parameters
+        ----------
+        event : EnumWebhookEvent | str
+            The event type.
+        handler : WebhookHandler
+            The handler to remove.
+
+        Returns
+        -------
+        None
+        """
+        self._handlers[EnumWebhookEvent(event)].remove(handler)
+
+    def handlers(self, event: EnumWebhookEvent | str) -> list[WebhookHandler]:
+        """Get the handlers registered for a webhook event type.
+
+        Parameters
+        ----------
+        event : EnumWebhookEvent | str
+            The event type.
+
+        Returns
+        -------
+        list[WebhookHandler]
+            The registered handlers, in registration order.
+        """
+        return list(self._handlers[EnumWebhookEvent(event)])
+
+    async def dispatch(self, payload: ResourceWebhookPayload) -> int:
+        """Call all handlers registered for the event of the payload.
+
+        A failing handler is logged and does not prevent the other
+        handlers from running.
+
+        Parameters
+        ----------
+        payload : ResourceWebhookPayload
+            The parsed webhook payload.
+
+        Returns
+        -------
+        int
+            The number of handlers that failed.
+        """
+        failed = 0
+        for handler in self._handlers[payload.event]:
+            try:
+                if inspect.iscoroutinefunction(handler):
+                    await handler(payload)
+                else:
+                    result = await asyncio.to_thread(handler, payload)
+                    if inspect.isawaitable(result):
+                        await result
+            except Exception:
+                failed += 1
+                logging.exception(
+                    f"Webhook handler {handler!r} failed for event {payload.event}"
+                )
+        return failed
@@ -1,6 +1,6 @@
-from typing import Annotated
+from typing import Annotated, Literal, Union
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
 
 from pyrevolut.utils import DateTime
 from pyrevolut.api.common import EnumWebhookEvent
@@ -14,6 +14,10 @@ from .transaction_state_changed import ResourceTransactionStateChanged
 class ResourceWebhookPayload(BaseModel):
     """
     Webhook payload resource model.
+
+    Use `ResourceWebhookPayload.from_raw` to parse an incoming payload. It
+    selects the event specific payload model from the `event` field, so the
+    `data` field is validated against exactly one resource model.
     """
 
     event: Annotated[
@@ -31,3 +35,113 @@ class ResourceWebhookPayload(BaseModel):
         | ResourceTransactionStateChanged,
         Field(description="The event data."),
     ]
+
+    @classmethod
+    def from_raw(cls, raw_payload: str | bytes) -> "ResourceWebhookPayload":
+        """Parse a raw webhook payload (JSON string or bytes) into the
+        event specific payload model.
+
+        Parameters
+        ----------
+        raw_payload : str | bytes
+            The raw JSON payload received from the webhook event.
+
+        Returns
+        -------
+        ResourceWebhookPayload
+            The payload model matching the `event` field of the payload.
+        """
+        return _WEBHOOK_PAYLOAD_ADAPTER.validate_json(raw_payload)
+
+    @classmethod
+    def from_dict(cls, payload: dict) -> "ResourceWebhookPayload":
+        """Parse an already decoded webhook payload into the event specific
+        payload model.
+
+        Parameters
+        ----------
+        payload : dict
+            The decoded webhook payload.
+
+        Returns
+        -------
+        ResourceWebhookPayload
+            The payload model matching the `event` field of the payload.
+        """
+        return _WEBHOOK_PAYLOAD_ADAPTER.validate_python(payload)
+
+
+class ResourceWebhookPayloadTransactionCreated(ResourceWebhookPayload):
+    """
+    Webhook payload resource model for the `TransactionCreated` event.
+    """
+
+    event: Annotated[
+        Literal[EnumWebhookEvent.TRANSACTION_CREATED],
+        Field(description="The event type."),
+    ]
+    data: Annotated[
+        ResourceTransactionCreated,
+        Field(description="The event data."),
+    ]
+
+
+class ResourceWebhookPayloadTransactionStateChanged(ResourceWebhookPayload):
+    """
+    Webhook payload resource model for the `TransactionStateChanged` event.
+    """
+
+    event: Annotated[
+        Literal[EnumWebhookEvent.TRANSACTION_STATE_CHANGED],
+        Field(description="The event type."),
+    ]
+    data: Annotated[
+        ResourceTransactionStateChanged,
+        Field(description="The event data."),
+    ]
+
+
+class ResourceWebhookPayloadPayoutLinkCreated(ResourceWebhookPayload):
+    """
+    Webhook payload resource model for the `PayoutLinkCreated` event.
+    """
+
+    event: Annotated[
+        Literal[EnumWebhookEvent.PAYOUT_LINK_CREATED],
+        Field(description="The event type."),
+    ]
+    data: Annotated[
+        ResourcePayoutLinkCreated,
+        Field(description="The event data."),
+    ]
+
+
+class ResourceWebhookPayloadPayoutLinkStateChanged(ResourceWebhookPayload):
+    """
+    Webhook payload resource model for the `PayoutLinkStateChanged` event.
+    """
+
+    event: Annotated[
+        Literal[EnumWebhookEvent.PAYOUT_LINK_STATE_CHANGED],
+        Field(description="The event type."),
+    ]
+    data: Annotated[
+        ResourcePayoutLinkStateChanged,
+        Field(description="The event data."),
+    ]
+
+
+WebhookPayload = Annotated[
+    Union[
+        ResourceWebhookPayloadTransactionCreated,
+        ResourceWebhookPayloadTransactionStateChanged,
+        ResourceWebhookPayloadPayoutLinkCreated,
+        ResourceWebhookPayloadPayoutLinkStateChanged,
+    ],
+    Field(discriminator="event"),
+]
+"""Webhook payload type discriminated on the `event` field."""
+
+_WEBHOOK_PAYLOAD_ADAPTER: TypeAdapter[ResourceWebhookPayload] = TypeAdapter(
+    WebhookPayload
+)
@@ -0,0 +1,333 @@
+from typing import Iterable
+import hmac
+import hashlib
+import time
+
+from pyrevolut.exceptions import PyRevolutInvalidPayload
+
+
+class WebhookVerifier:
+    """Verifies the `Revolut-Signature` header of webhook events.
+
+    The verifier holds a pre-keyed HMAC-SHA256 state for each active signing
+    secret, so verifying an event only hashes the payload. Multiple secrets can
+    be active at the same time (for example while a rotated secret has not
+    expired yet), in which case an event is valid if any of the `v1=`
+    signatures in the header matches any of the secrets.
+
+    Example
+    -------
+    ```python
+    verifier = WebhookVerifier(signing_secrets=["wsk_old", "wsk_new"])
+
+    verifier.verify(
+        raw_payload=request_body,
+        header_timestamp=request.headers["Revolut-Request-Timestamp"],
+        header_signature=request.headers["Revolut-Signature"],
+    )
+    ```
+    """
+
+    SIGNATURE_VERSION = "v1"
+
+    def __init__(
+        self,
+        signing_secrets: str | Iterable[str],
+        tolerance_ms: int = 5 * 60 * 1000,
+    ):
+        """Create a new webhook signature verifier
+
+        Parameters
+        ----------
+        signing_secrets : str | Iterable[str]
+            The signing secret(s) provided by Revolut for the webhook endpoint.
+        tolerance_ms : int, optional
+            The maximum allowed difference in milliseconds between the
+            `Revolut-Request-Timestamp` header and the current time,
+            by default 5 minutes.
+        """
+        self.tolerance_ms = tolerance_ms
+        self._keys: dict[str, "hmac.HMAC"] = {}
+        self.set_secrets(signing_secrets)
+
+    @property
+    def secrets(self) -> list[str]:
+        """The currently active signing secrets
+
+        Returns
+        -------
+        list[str]
+            The active signing secrets
+        """
+        return list(self._keys)
+
+    def set_secrets(self, signing_secrets: str | Iterable[str]):
+        """Replace the active signing secrets.
+
+        Parameters
+        ----------
+        signing_secrets : str | Iterable[str]
+            The signing secret(s) to use from now on.
+
+        Returns
+        -------
+        None
+        """
+        if isinstance(signing_secrets, str):
+            signing_secrets = [signing_secrets]
+        keys = {secret: self.__key(secret) for secret in signing_secrets}
+        if not keys:
+            raise ValueError("At least one signing secret must be provided.")
+        self._keys = keys
+
+    def add_secret(self, signing_secret: str):
+        """Add a signing secret, for example right after rotating the webhook secret.
+
+        Parameters
+        ----------
+        signing_secret : str
+            The signing secret to add.
+
+        Returns
+        -------
+        None
+        """
+        if signing_secret not in self._keys:
+            self._keys = {**self._keys, signing_secret: self.__key(signing_secret)}
+
+    def remove_secret(self, signing_secret: str):
+        """Remove a signing secret, for example once a rotated secret has expired.
+
+        Parameters
+        ----------
+        signing_secret : str
+            The signing secret to remove.
+
+        Returns
+        -------
+        None
+        """
+        keys = {k: v for k, v in self._keys.items() if k != signing_secret}
+        if not keys:
+            raise ValueError("Cannot remove the last active signing secret.")
+        self._keys = keys
+
+    def sign(
+        self,
+        raw_payload: str | bytes,
+        header_timestamp: int | str | bytes,
+    ) -> list[str]:
+        """Compute the signatures of a payload for all active signing secrets.
+
+        Parameters
+        ----------
+        raw_payload : str | bytes
+            The raw payload received from the webhook event.
+        header_timestamp : int | str | bytes
+            The `Revolut-Request-Timestamp` header value, in milliseconds.
+
+        Returns
+        -------
+        list[str]
+            The `v1=` signatures, one per active signing secret.
+        """
+        return [
+            f"{self.SIGNATURE_VERSION}={digest.hex()}"
+            for digest in self.__digests(raw_payload, header_timestamp)
+        ]
+
+    def is_valid(
+        self,
+        raw_payload: str | bytes,
+        header_timestamp: int | str | bytes,
+        header_signature: str | bytes,
+        now_ms: int | None = None,
+        check_timestamp: bool = True,
+    ) -> bool:
+        """Check whether a webhook event is valid without raising.
+
+        Parameters
+        ----------
+        raw_payload : str | bytes
+            The raw payload received from the webhook event.
+        header_timestamp : int | str | bytes
+            The `Revolut-Request-Timestamp` header value, in milliseconds.
+        header_signature : str | bytes
+            The `Revolut-Signature` header value.
+        now_ms : int, optional
+            The current time in milliseconds, by default the system time.
+        check_timestamp : bool, optional
+            Whether to check that the timestamp is within the tolerance,
+            by default True.
+
+        Returns
+        -------
+        bool
+            True if the timestamp and the signature are valid.
+        """
+        try:
+            self.verify(
+                raw_payload=raw_payload,
+                header_timestamp=header_timestamp,
+                header_signature=header_signature,
+                now_ms=now_ms,
+                check_timestamp=check_timestamp,
+            )
+        except PyRevolutInvalidPayload:
+            return False
+        return True
+
+    def verify(
+        self,
+        raw_payload: str | bytes,
+        header_timestamp: int | str | bytes,
+        header_signature: str | bytes,
+        now_ms: int | None = None,
+        check_timestamp: bool = True,
+    ):
+        """Verify the timestamp and signature of a webhook event.
+
+        Parameters
+        ----------
+        raw_payload : str | bytes
+            The raw payload received from the webhook event.
+        header_timestamp : int | str | bytes
+            The `Revolut-Request-Timestamp` header value, in milliseconds.
+            For example: 1683650202360
+        header_signature : str | bytes
+            The `Revolut-Signature` header value. Can contain multiple
+            comma separated signatures, for example:
+            v1=4fce70bd...,v1=6ffbb59b...
+        now_ms : int, optional
+            The current time in milliseconds, by default the system time.
+        check_timestamp : bool, optional
+            Whether to check that the timestamp is within the tolerance,
+            by default True.
+
+        Raises
+        ------
+        PyRevolutInvalidPayload
+            If the payload signature is invalid or if the payload timestamp is too old.
+
+        Returns
+        -------
+        None
+        """
+        try:
+            timestamp_ms = int(header_timestamp)
+        except ValueError as exc:
+            raise PyRevolutInvalidPayload(
+                "The webhook payload timestamp is invalid."
+            ) from exc
+
+        if check_timestamp:
+            if now_ms is None:
+                now_ms = time.time_ns() // 1_000_000
+            if abs(now_ms - timestamp_ms) > self.tolerance_ms:
+                raise PyRevolutInvalidPayload(
+                    "The webhook payload timestamp is too old."
+                )
+
+        if isinstance(header_signature, str):
+            header_signature = header_signature.encode("ascii", errors="replace")
+        prefix = f"{self.SIGNATURE_VERSION}=".encode()
+        signatures = [
+            signature.strip()[len(prefix) :]
+            for signature in header_signature.split(b",")
+            if signature.strip().startswith(prefix)
+        ]
+
+        valid = False
+        for digest in self.__digests(raw_payload, header_timestamp):
+            expected = digest.hex().encode()
+            for signature in signatures:
+                # Compare against every signature to keep the timing independent
+                # of the position of the matching signature.
+                valid |= hmac.compare_digest(expected, signature)
+        if not valid:
+            raise PyRevolutInvalidPayload("The webhook payload signature is invalid.")
+
+    def verify_batch(
+        self,
+        events: Iterable[tuple[str | bytes, int | str | bytes, str | bytes]],
+        now_ms: int | None = None,
+        check_timestamp: bool = False,
+    ) -> list[bool]:
+        """Verify many webhook events, for example when replaying archived events.
+
+        Parameters
+        ----------
+        events : Iterable[tuple[str | bytes, int | str | bytes, str | bytes]]
+            The events to verify as (raw_payload, header_timestamp, header_signature) tuples.
+        now_ms : int, optional
+            The current time in milliseconds, by default the system time.
+        check_timestamp : bool, optional
+            Whether to check that the timestamps are within the tolerance,
+            by default False since archived events are usually older than the tolerance.
+
+        Returns
+        -------
+        list[bool]
+            Whether each event is valid, in the order of the input.
+        """
+        if check_timestamp and now_ms is None:
+            now_ms = time.time_ns() // 1_000_000
+        return [
+            self.is_valid(
+                raw_payload=raw_payload,
+                header_timestamp=header_timestamp,
+                header_signature=header_signature,
+                now_ms=now_ms,
+                check_timestamp=check_timestamp,
+            )
+            for raw_payload, header_timestamp, header_signature in events
+        ]
+
+    def __digests(
+        self,
+        raw_payload: str | bytes,
+        header_timestamp: int | str | bytes,
+    ) -> list[bytes]:
+        """Compute the raw HMAC digests of a payload for all active signing secrets.
+
+        Parameters
+        ----------
+        raw_payload : str | bytes
+            The raw payload received from the webhook event.
+        header_timestamp : int | str | bytes
+            The `Revolut-Request-Timestamp` header value, in milliseconds.
+
+        Returns
+        -------
+        list[bytes]
+            The digests, one per active signing secret.
+        """
+        if isinstance(raw_payload, str):
+            raw_payload = raw_payload.encode("utf-8")
+        if not isinstance(header_timestamp, bytes):
+            header_timestamp = str(header_timestamp).encode()
+        header = b"%s.%s." % (self.SIGNATURE_VERSION.encode(), header_timestamp)
+
+        digests = []
+        for key in self._keys.values():
+            mac = key.copy()
+            mac.update(header)
+            mac.update(raw_payload)
+            digests.append(mac.digest())
+        return digests
+
+    @staticmethod
+    def __key(signing_secret: str) -> "hmac.HMAC":
+        """Create the pre-keyed HMAC state for a signing secret.
+
+        Parameters
+        ----------
+        signing_secret : str
+            The signing secret.
+
+        Returns
+        -------
+        hmac.HMAC
+            The keyed HMAC state to copy for each payload.
+        """
+        return hmac.new(signing_secret.encode("utf-8"), digestmod=hashlib.sha256)
@@ -1,9 +1,20 @@
 import os
+import json
+import asyncio
+import logging
 from typing import Annotated
 
 import typer
 
 from pydantic import BaseModel
+from pyrevolut.client import AsyncClient
+from pyrevolut.testing import FakeRevolut, fake_credentials
+from pyrevolut.testing.loadtest import (
+    DEFAULT_MIX,
+    WRITE_OPERATIONS,
+    LoadTest,
+    parse_mix,
+)
 from pyrevolut.utils.auth import EnumAuthScope, auth_manual_flow
 
 app = typer.Typer()
@@ -84,3 +95,191 @@ def auth_manual(
         sandbox=params.sandbox,
         scopes=params.scopes,
     )
+
+
+@app.command(name="loadtest")
+def loadtest(
+    mix: Annotated[
+        str,
+        typer.Option(help="The operations with their relative weights."),
+    ] = DEFAULT_MIX,
+    concurrency: Annotated[int, typer.Option(help="The concurrent calls.")] = 10,
+    rate: Annotated[
+        float, typer.Option(help="The target calls per second, 0 for no target.")
+    ] = 0.0,
+    duration: Annotated[float, typer.Option(help="The duration in seconds.")] = 30.0,
+    calls: Annotated[
+        int, typer.Option(help="The maximum number of calls, 0 for no maximum.")
+    ] = 0,
+    credentials_json: str = "credentials/creds.json",
+    sandbox: bool = True,
+    base_url: Annotated[
+        str, typer.Option(help="The URL of a local stand-in of the API.")
+    ] = "",
+    fake: Annotated[
+        bool, typer.Option(help="Run against an in-process fake of the API.")
+    ] = False,
+    currency: str = "GBP",
+    amount: float = 0.01,
+    account_id: str = "",
+    counterparty_id: str = "",
+    seed: int = 0,
+    report: Annotated[str, typer.Option(help="The JSON report file.")] = "",
+    allow_production_writes: Annotated[
+        bool,
+        typer.Option(help="Allow the operations moving money against production."),
+    ] = False,
+):
+    """
+    Method to load test the Revolut Business API (or a local stand-in of it) with a mix
+    of endpoint calls, and print the latency percentiles, error rates and throughput.
+
+    Parameters
+    ----------
+    mix : str, optional
+        The comma-separated operations with their relative weights.
+        The operations are get_all_accounts, get_account, get_all_transactions,
+        get_transaction, get_all_counterparties and create_transfer_to_another_account.
+        Default is "get_all_transactions=70,get_transaction=20,create_transfer_to_another_account=10".
+    concurrency : int, optional
+        The number of concurrent calls.
+        Default is 10.
+    rate : float, optional
+        The target number of calls per second, 0 to call as fast as the concurrency allows.
+        Default is 0.
+    duration : float, optional
+        The duration of the load test in seconds.
+        Default is 30.
+    calls : int, optional
+        The maximum number of calls, 0 for no maximum.
+        Default is 0.
+    credentials_json : str, optional
+        The location of the credentials JSON file.
+        Default is "credentials/creds.json".
+    sandbox : bool, optional
+        Whether to use the sandbox environment.
+        Default is True.
+    base_url : str, optional
+        The URL of a local stand-in of the API, such as "http://localhost:8000".
+        Default is "" (the Revolut API).
+    fake : bool, optional
+        Whether to run against an in-process fake of the API with fake credentials,
+        seeded with a counterparty and a few transactions.
+        Default is False.
+    currency : str, optional
+        The currency of the transfers.
+        Default is "GBP".
+    amount : float, optional
+        The amount of each transfer.
+        Default is 0.01.
+    account_id : str, optional
+        The account the transfers are made from.
+        Default is "" (the first active account in the currency).
+    counterparty_id : str, optional
+        The counterparty the transfers are made to.
+        Default is "" (the first counterparty).
+    seed : int, optional
+        The seed of the choice of the operations.
+        Default is 0.
+    report : str, optional
+        The location to write the JSON report to.
+        Default is "" (no report).
+    allow_production_writes : bool, optional
+        Whether to allow the operations moving money (the transfers) against the
+        production environment, after a confirmation. Without it, a mix with these
+        operations is refused when neither sandbox, base_url nor fake is used.
+        Default is False.
+
+    Returns
+    -------
+    None
+    """
+    shares = parse_mix(mix)
+    writes = sorted(set(shares) & set(WRITE_OPERATIONS))
+    if writes and not (sandbox or base_url or fake):
+        if not allow_production_writes:
+            typer.echo(
+                f"Refusing to call {', '.join(writes)} against production, use "
+                "--sandbox, --base-url or --fake, or pass --allow-production-writes",
+                err=True,
+            )
+            raise typer.Exit(code=1)
+        typer.confirm(
+            f"This load test calls {', '.join(writes)} against production and "
+            "moves real money. Continue?",
+            abort=True,
+        )
+
+    # The client logs every error response, which are counted in the report
+    logging.disable(logging.ERROR)
+
+    if fake:
+        client = AsyncClient(
+            creds=fake_credentials(),
+            return_type="dict",
+            transport=FakeRevolut(seed=seed).transport(),
+        )
+    else:
+        client = AsyncClient(
+            creds_loc=credentials_json,
+            sandbox=sandbox,
+            return_type="dict",
+            base_url=base_url or None,
+        )
+
+    async def run() -> dict:
+        async with client:
+            if fake:
+                accounts = await client.Accounts.get_all_accounts()
+                for account in accounts:
+                    await client.Simulations.simulate_account_topup(
+                        account_id=account["id"],
+                        amount=1000,
+                        currency=account["currency"],
+                    )
+                await client.Counterparties.create_counterparty(
+                    profile_type="personal",
+                    name="Load Test",
+                    revtag="loadtest",
+                )
+            load_test = LoadTest(
+                client=client,
+                mix=shares,
+                concurrency=concurrency,
+                rate=rate or None,
+                duration=duration,
+                calls=calls or None,
+                currency=currency,
+                amount=amount,
+                account_id=account_id or None,
+                counterparty_id=counterparty_id or None,
+                seed=seed,
+            )
+            return await load_test.run()
+
+    results = asyncio.run(run())
+
+    target = "fake" if fake else base_url or ("sandbox" if sandbox else "production")
+    typer.echo(
+        f"{results['calls']} calls against {target} in {results['elapsed_s']}s: "
+        f"{results['throughput']} calls/s, {results['error_rate']:.2%} errors\n"
+    )
+    columns = ["calls", "error_rate", "throughput", "p50_ms", "p95_ms", "p99_ms"]
+    rows = [
+        [name] + [str(stats[column]) for column in columns]
+        for name, stats in [*results["operations"].items(), ("total", results)]
+    ]
+    header = ["operation"] + columns
+    widths = [max(len(row[i]) for row in [header] + rows) for i in range(len(header))]
+    for row in [header] + rows:
+        typer.echo("  ".join(value.ljust(width) for value, width in zip(row, widths)))
+    for name, stats in results["operations"].items():
+        for error, count in stats["errors_by_type"].items():
+            typer.echo(f"{name}: {count} x {error}")
+
+    if report:
+        if os.path.dirname(report):
+            os.makedirs(os.path.dirname(report), exist_ok=True)
+        with open(report, "w") as file:
+            json.dump({"target": target, **results}, file, indent=2)
+        typer.echo(f"\nReport written to {report}")
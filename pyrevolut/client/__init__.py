@@ -2,5 +2,8 @@
 
 # flake8: noqa: F401
 from .base import ModelError
+from .instrumentation import ModelRequestTiming, SpanTimingHook, route_template
+from .metrics import MetricsRegistry, render_prometheus
+from .profiling import SampledProfiler
 from .synchronous import Client
 from .asynchronous import AsyncClient
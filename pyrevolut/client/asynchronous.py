@@ -42,7 +42,7 @@ class AsyncClient(BaseClient):
         if self.client is not None:
             return
 
-        self.client = HTTPClient()
+        self.client = HTTPClient(transport=self.transport)
 
     async def close(self):
         """Closes the client connection"""
@@ -57,6 +57,7 @@ class AsyncClient(BaseClient):
         path: str,
         response_model: Type[BaseModel],
         params: Type[BaseModel] | None = None,
+        route: str | None = None,
         **kwargs,
     ):
         """Send an async GET request to the Revolut API
@@ -69,31 +70,37 @@ class AsyncClient(BaseClient):
             The model to use for the response
         params : Type[BaseModel] | None
             The parameters to send in the request
+        route : str | None
+            The route template of the path, such as "/1.0/transaction/{id}", used
+            to label the request in the metrics and timings. By default the IDs
+            in the path are replaced by {id}.
 
         Returns
         -------
         Response
             The response from the request
         """
-        resp = await self.client.get(
-            **self._prep_get(
+        with self._instrument(method="GET", path=path, route=route):
+            request = self._prep_get(
                 path=path,
                 params=params,
-                **kwargs,
+                **self._trace(kwargs, asynchronous=True),
+            )
+            with self._phase("transport"):
+                resp = await self.client.get(**request)
+            return self.process_response(
+                response=resp,
+                response_model=response_model,
+                return_type=None,
+                error_response=None,
             )
-        )
-        return self.process_response(
-            response=resp,
-            response_model=response_model,
-            return_type=None,
-            error_response=None,
-        )
 
     async def post(
         self,
         path: str,
         response_model: Type[BaseModel],
         body: Type[BaseModel] | None = None,
+        route: str | None = None,
         **kwargs,
     ):
         """Send an async POST request to the Revolut API
@@ -106,31 +113,37 @@ class AsyncClient(BaseClient):
             The model to use for the response
         body : Type[BaseModel] | None
             The body to send in the request
+        route : str | None
+            The route template of the path, such as "/1.0/transaction/{id}", used
+            to label the request in the metrics and timings. By default the IDs
+            in the path are replaced by {id}.
 
         Returns
         -------
         Response
             The response from the request
         """
-        resp = await self.client.post(
-            **self._prep_post(
+        with self._instrument(method="POST", path=path, route=route):
+            request = self._prep_post(
                 path=path,
                 body=body,
-                **kwargs,
+                **self._trace(kwargs, asynchronous=True),
+            )
+            with self._phase("transport"):
+                resp = await self.client.post(**request)
+            return self.process_response(
+                response=resp,
+                response_model=response_model,
+                return_type=None,
+                error_response=None,
             )
-        )
-        return self.process_response(
-            response=resp,
-            response_model=response_model,
-            return_type=None,
-            error_response=None,
-        )
 
     async def patch(
         self,
         path: str,
         response_model: Type[BaseModel],
         body: Type[BaseModel] | None = None,
+        route: str | None = None,
         **kwargs,
     ):
         """Send an async PATCH request to the Revolut API
@@ -143,31 +156,37 @@ class AsyncClient(BaseClient):
             The model to use for the response
         body : Type[BaseModel] | None
             The body to send in the request
+        route : str | None
+            The route template of the path, such as "/1.0/transaction/{id}", used
+            to label the request in the metrics and timings. By default the IDs
+            in the path are replaced by {id}.
 
         Returns
         -------
         Response
             The response from the request
         """
-        resp = await self.client.patch(
-            **self._prep_patch(
+        with self._instrument(method="PATCH", path=path, route=route):
+            request = self._prep_patch(
                 path=path,
                 body=body,
-                **kwargs,
+                **self._trace(kwargs, asynchronous=True),
+            )
+            with self._phase("transport"):
+                resp = await self.client.patch(**request)
+            return self.process_response(
+                response=resp,
+                response_model=response_model,
+                return_type=None,
+                error_response=None,
             )
-        )
-        return self.process_response(
-            response=resp,
-            response_model=response_model,
-            return_type=None,
-            error_response=None,
-        )
 
     async def delete(
         self,
         path: str,
         response_model: Type[BaseModel],
         params: Type[BaseModel] | None = None,
+        route: str | None = None,
         **kwargs,
     ):
         """Send an async DELETE request to the Revolut API
@@ -180,31 +199,37 @@ class AsyncClient(BaseClient):
             The model to use for the response
         params : Type[BaseModel] | None
             The parameters to add to the request route
+        route : str | None
+            The route template of the path, such as "/1.0/transaction/{id}", used
+            to label the request in the metrics and timings. By default the IDs
+            in the path are replaced by {id}.
 
         Returns
         -------
         Response
             The response from the request
         """
-        resp = await self.client.delete(
-            **self._prep_delete(
+        with self._instrument(method="DELETE", path=path, route=route):
+            request = self._prep_delete(
                 path=path,
                 params=params,
-                **kwargs,
+                **self._trace(kwargs, asynchronous=True),
+            )
+            with self._phase("transport"):
+                resp = await self.client.delete(**request)
+            return self.process_response(
+                response=resp,
+                response_model=response_model,
+                return_type=None,
+                error_response=None,
             )
-        )
-        return self.process_response(
-            response=resp,
-            response_model=response_model,
-            return_type=None,
-            error_response=None,
-        )
 
     async def put(
         self,
         path: str,
         response_model: Type[BaseModel],
         body: Type[BaseModel] | None = None,
+        route: str | None = None,
         **kwargs,
     ):
         """Send an async PUT request to the Revolut API
@@ -217,25 +242,30 @@ class AsyncClient(BaseClient):
             The model to use for the response
         body : Type[BaseModel] | None
             The body to send in the request
+        route : str | None
+            The route template of the path, such as "/1.0/transaction/{id}", used
+            to label the request in the metrics and timings. By default the IDs
+            in the path are replaced by {id}.
 
         Returns
         -------
         Response
             The response from the request
         """
-        resp = await self.client.put(
-            **self._prep_put(
+        with self._instrument(method="PUT", path=path, route=route):
+            request = self._prep_put(
                 path=path,
                 body=body,
-                **kwargs,
+                **self._trace(kwargs, asynchronous=True),
+            )
+            with self._phase("transport"):
+                resp = await self.client.put(**request)
+            return self.process_response(
+                response=resp,
+                response_model=response_model,
+                return_type=None,
+                error_response=None,
             )
-        )
-        return self.process_response(
-            response=resp,
-            response_model=response_model,
-            return_type=None,
-            error_response=None,
-        )
 
     def load_endpoints(self):
         """Loads all the endpoints from the api directory"""
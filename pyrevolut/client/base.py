@@ -1,4 +1,5 @@
-from typing import Type, TypeVar, Literal, Annotated, Callable
+from typing import Type, TypeVar, Literal, Annotated, Callable, Iterator
+from contextlib import contextmanager, nullcontext
 import logging
 import json
 import base64
@@ -8,6 +9,8 @@ import pendulum
 
 from httpx import (
     AsyncClient,
+    AsyncBaseTransport,
+    BaseTransport,
     Client as SyncClient,
     Request,
     Response,
@@ -22,6 +25,15 @@ from pyrevolut.utils.auth import (
     save_creds as save_creds_fn,
     load_creds as load_creds_fn,
 )
+from pyrevolut.client.instrumentation import (
+    RequestTimer,
+    TimingHook,
+    status_class,
+    route_template,
+    _current_timer,
+)
+from pyrevolut.client.metrics import MetricsRegistry
+from pyrevolut.client.profiling import SampledProfiler
 from pyrevolut.exceptions import (
     PyRevolutBaseException,
     PyRevolutTimeoutError,
@@ -58,11 +70,16 @@ class BaseClient:
     credentials: ModelCreds
     domain: str
     sandbox: bool
+    base_url: str | None = None
     return_type: Literal["raw", "dict", "model"] = "dict"
     error_response: Literal["raw", "raise", "dict", "model"] = "raise"
     custom_save_fn: Callable[[ModelCreds], None] | None = None
     custom_load_fn: Callable[..., ModelCreds] | None = None
     client: SyncClient | AsyncClient | None = None
+    timing_hooks: list[TimingHook]
+    metrics: MetricsRegistry | None = None
+    profiler: SampledProfiler | None = None
+    transport: BaseTransport | AsyncBaseTransport | None = None
 
     def __init__(
         self,
@@ -73,6 +90,11 @@ class BaseClient:
         error_response: Literal["raw", "raise", "dict", "model"] = "raise",
         custom_save_fn: Callable[[ModelCreds], None] | None = None,
         custom_load_fn: Callable[..., ModelCreds] | None = None,
+        timing_hooks: list[TimingHook] | None = None,
+        metrics: MetricsRegistry | None = None,
+        profiler: SampledProfiler | None = None,
+        transport: BaseTransport | AsyncBaseTransport | None = None,
+        base_url: str | None = None,
     ):
         """Create a new Revolut client
 
@@ -110,6 +132,21 @@ class BaseClient:
             A custom function to save the credentials, by default None
         custom_load_fn : Callable[..., ModelCreds], optional
             A custom function to load the credentials, by default None
+        timing_hooks : list[Callable[[ModelRequestTiming], None]], optional
+            The functions called with the timing of each request, by default None.
+            Requests are only timed if there is at least one hook.
+        metrics : MetricsRegistry, optional
+            The registry that records the metrics of the requests, by default None.
+            The exchange rate and account name caches of the client are tracked too.
+        profiler : SampledProfiler, optional
+            The profiler of a sample of the requests, by default None.
+        transport : BaseTransport | AsyncBaseTransport, optional
+            The HTTPX transport of the HTTP client, by default the HTTPX default.
+            Use a synchronous transport with Client and an asynchronous one with
+            AsyncClient (httpx.MockTransport works with both).
+        base_url : str, optional
+            The root URL of the API, such as "http://localhost:8000/api" for a local
+            stand-in of the API, by default the URL of the (sandbox) environment.
         """
         assert return_type in [
             "raw",
@@ -130,9 +167,16 @@ class BaseClient:
         self.error_response = error_response
         self.custom_save_fn = custom_save_fn
         self.custom_load_fn = custom_load_fn
+        self.timing_hooks = list(timing_hooks or [])
+        self.metrics = metrics
+        self.profiler = profiler
+        self.transport = transport
+        self.base_url = base_url
 
         # Set domain based on environment
-        if self.sandbox:
+        if self.base_url is not None:
+            self.domain = self.base_url.rstrip("/")
+        elif self.sandbox:
             self.domain = "https://sandbox-b2b.revolut.com/api"
         else:
             self.domain = "https://b2b.revolut.com/api"
@@ -143,6 +187,15 @@ class BaseClient:
         # Load the endpoints
         self.load_endpoints()
 
+        # Track the caches of the endpoints
+        if self.metrics is not None:
+            self.metrics.track_cache(
+                name="exchange_rates", cache=self.ForeignExchange.rate_cache
+            )
+            self.metrics.track_cache(
+                name="account_names", cache=self.Counterparties.account_name_cache
+            )
+
     def process_response(
         self,
         response: Response,
@@ -199,6 +252,11 @@ class BaseClient:
         # Log the response
         self.log_response(response=response)
 
+        # Record the response in the timing of the request
+        timer = _current_timer.get()
+        if timer is not None:
+            timer.record_response(response=response)
+
         # Check for error response
         if response.is_error:
             if error_response == "raise":
@@ -240,27 +298,196 @@ class BaseClient:
                 raise ValueError(f"Invalid error response type: {error_response}")
 
         # Raw response
-        try:
-            raw_response = response.json()
-        except json.JSONDecodeError:
-            raw_response = {}
+        with self._phase("decode"):
+            try:
+                raw_response = response.json()
+            except json.JSONDecodeError:
+                raw_response = {}
         if return_type == "raw":
             return raw_response
 
         # Dict response
-        if isinstance(raw_response, list):
-            model_response = [response_model(**resp) for resp in raw_response]
-        else:
-            model_response = response_model(**raw_response)
+        with self._phase("validate"):
+            if isinstance(raw_response, list):
+                model_response = [response_model(**resp) for resp in raw_response]
+            else:
+                model_response = response_model(**raw_response)
         if return_type == "dict":
-            if isinstance(model_response, list):
-                return [resp.model_dump() for resp in model_response]
-            return model_response.model_dump()
+            with self._phase("dump"):
+                if isinstance(model_response, list):
+                    return [resp.model_dump() for resp in model_response]
+                return model_response.model_dump()
 
         # Model response
         if return_type == "model":
             return model_response
 
+    def add_timing_hook(self, hook: TimingHook):
+        """Add a function that is called with the timing of each request
+
+        Parameters
+        ----------
+        hook : Callable[[ModelRequestTiming], None]
+            The function. It is called in the thread (or task) that made the request,
+            after the response was processed or the request failed.
+
+        Returns
+        -------
+        None
+        """
+        self.timing_hooks.append(hook)
+
+    def remove_timing_hook(self, hook: TimingHook):
+        """Remove a function added with `add_timing_hook`
+
+        Parameters
+        ----------
+        hook : Callable[[ModelRequestTiming], None]
+            The function.
+
+        Returns
+        -------
+        None
+        """
+        self.timing_hooks.remove(hook)
+
+    @contextmanager
+    def _instrument(
+        self, method: str, path: str, route: str | None = None
+    ) -> Iterator[RequestTimer | None]:
+        """Profile the request if it is sampled by the profiler, and time it.
+        The timeouts and network errors of the transport are raised as
+        PyRevolutTimeoutError and PyRevolutNetworkError.
+
+        Parameters
+        ----------
+        method : str
+            The HTTP method of the request
+        path : str
+            The path of the request
+        route : str | None, optional
+            The route template of the request, by default the path with its IDs
+            replaced by {id}
+
+        Yields
+        ------
+        RequestTimer | None
+            The timer of the request, None if there are no timing hooks or metrics
+        """
+        profiler = self.profiler
+        try:
+            if profiler is not None and profiler.should_sample():
+                with profiler.profile(route=route_template(route or path)):
+                    with self._time(method=method, path=path, route=route) as timer:
+                        yield timer
+            else:
+                with self._time(method=method, path=path, route=route) as timer:
+                    yield timer
+        except TimeoutException as exc:
+            raise PyRevolutTimeoutError() from exc
+        except NetworkError as exc:
+            raise PyRevolutNetworkError() from exc
+
+    @contextmanager
+    def _time(
+        self, method: str, path: str, route: str | None = None
+    ) -> Iterator[RequestTimer | None]:
+        """Time a request if there are timing hooks or metrics, then record it in
+        the metrics and pass its timing to the hooks.
+        The phases of the request are only timed if there are timing hooks.
+
+        Parameters
+        ----------
+        method : str
+            The HTTP method of the request
+        path : str
+            The path of the request
+        route : str | None, optional
+            The route template of the request, by default the path with its IDs
+            replaced by {id}
+
+        Yields
+        ------
+        RequestTimer | None
+            The timer of the request, None if there are no timing hooks or metrics
+        """
+        metrics = self.metrics
+        if not self.timing_hooks and metrics is None:
+            yield None
+            return
+
+        timer = RequestTimer(
+            method=method, path=route or path, detailed=bool(self.timing_hooks)
+        )
+        token = _current_timer.set(timer)
+        if metrics is not None:
+            metrics.request_started()
+        try:
+            yield timer
+        except BaseException as exc:
+            timer.error = type(exc).__name__
+            raise
+        finally:
+            _current_timer.reset(token)
+            duration = timer.stop()
+            if metrics is not None:
+                metrics.request_finished(
+                    method=method,
+                    route=timer.route,
+                    status_class=status_class(timer.status_code),
+                    duration=duration,
+                )
+            if timer.detailed:
+                timing = timer.finish()
+                for hook in list(self.timing_hooks):
+                    try:
+                        hook(timing)
+                    except Exception:
+                        logging.exception("Timing hook failed")
+
+    def _phase(self, name: str):
+        """Time a phase of the current request, if it is timed
+
+        Parameters
+        ----------
+        name : str
+            The name of the phase
+
+        Returns
+        -------
+        ContextManager
+            The context manager timing the phase
+        """
+        timer = _current_timer.get()
+        if timer is None or not timer.detailed:
+            return nullcontext()
+        return timer.phase(name)
+
+    def _trace(self, kwargs: dict, asynchronous: bool = False) -> dict:
+        """Add the httpx `trace` extension of the current request to its keyword
+        arguments, if it is timed
+
+        Parameters
+        ----------
+        kwargs : dict
+            The keyword arguments of the request
+        asynchronous : bool, optional
+            Whether the request is sent by an async HTTPX client, by default False
+
+        Returns
+        -------
+        dict
+            The keyword arguments of the request
+        """
+        timer = _current_timer.get()
+        if timer is None or not timer.detailed:
+            return kwargs
+        trace = timer.atrace if asynchronous else timer.trace
+        return {
+            **kwargs,
+            "extensions": {**kwargs.get("extensions", {}), "trace": trace},
+        }
+
     def log_request(self, request: Request):
         """Log the request to the API
 
@@ -553,7 +780,8 @@ class BaseClient:
             )
 
         if self.credentials.access_token_expired:
-            self.refresh_access_token()
+            with self._phase("token_refresh"):
+                self.refresh_access_token()
 
     def __process_path(self, path: str) -> str:
         """Process the path.
@@ -706,16 +934,25 @@ class BaseClient:
         """
         try:
             resp = refresh_access_token(
-                client=SyncClient(),
+                client=SyncClient(
+                    transport=(
+                        self.transport
+                        if isinstance(self.transport, BaseTransport)
+                        else None
+                    )
+                ),
                 refresh_token=self.credentials.tokens.refresh_token.get_secret_value(),
                 client_assert_jwt=self.credentials.client_assert_jwt.jwt.get_secret_value(),
                 sandbox=self.sandbox,
+                base_url=self.base_url,
             )
             self.credentials.tokens.access_token = resp.access_token.get_secret_value()
             self.credentials.tokens.token_type = resp.token_type
             self.credentials.tokens.access_token_expiration_dt = pendulum.now(
                 tz="UTC"
             ).add(seconds=resp.expires_in)
+            if self.metrics is not None:
+                self.metrics.token_refreshed()
 
             # Save the new credentials
             self.save_credentials()
@@ -0,0 +1,407 @@
+from typing import Annotated, Any, Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from urllib.parse import urlsplit
+import re
+import time
+
+from pydantic import BaseModel, Field
+from httpx import Response
+
+
+# Segments of a path that are resource IDs (UUIDs or numbers)
+_ID_SEGMENT = re.compile(
+    r"(?<=/)(?:[0-9a-fA-F]{8}-(?:[0-9a-fA-F]{4}-){3}[0-9a-fA-F]{12}|\d+)(?=/|$)"
+)
+
+# The placeholders of a route template, such as {account_id}
+_PLACEHOLDER = re.compile(r"\{[^/{}]+\}")
+
+# The httpcore trace steps of each transport phase
+_TRACE_PHASES = {
+    "connect_tcp": "connect",
+    "connect_unix_socket": "connect",
+    "start_tls": "tls",
+    "send_connection_init": "send",
+    "send_request_headers": "send",
+    "send_request_body": "send",
+    "receive_response_headers": "server_wait",
+    "receive_response_body": "body_read",
+}
+
+# The timer of the request being sent in the current thread or task
+_current_timer: ContextVar["RequestTimer | None"] = ContextVar(
+    "pyrevolut_request_timer", default=None
+)
+
+
+class ModelRequestTiming(BaseModel):
+    """The timing of a single request to the Revolut API.
+
+    The phases (in seconds) are only present if they happened:
+
+    - token_refresh: refreshing the expired access token before the request
+    - transport: sending the request and reading the response, which contains:
+        - queue_wait: waiting for a connection from the connection pool
+        - connect: opening the TCP connection
+        - tls: the TLS handshake
+        - send: sending the request headers and body
+        - server_wait: waiting for the response headers (time to first byte)
+        - body_read: reading the response body
+    - decode: decoding the JSON of the response
+    - validate: validating the response with its Pydantic model
+    - dump: dumping the model to a dictionary (for the "dict" return type)
+
+    The phases within transport are reported by the httpx `trace` extension,
+    so they are missing for transports that do not emit trace events
+    (such as `httpx.MockTransport`).
+    """
+
+    method: Annotated[str, Field(description="The HTTP method of the request.")]
+    route: Annotated[
+        str,
+        Field(
+            description="The route template of the request, with the IDs replaced by {id}."
+        ),
+    ]
+    url: Annotated[str, Field(description="The URL of the request.")] = ""
+    status_code: Annotated[
+        int | None,
+        Field(description="The status code of the response, None if there was none."),
+    ] = None
+    request_size: Annotated[
+        int, Field(description="The size of the request body in bytes.")
+    ] = 0
+    response_size: Annotated[
+        int, Field(description="The size of the response body in bytes.")
+    ] = 0
+    start_time_ns: Annotated[
+        int,
+        Field(description="The start of the request in nanoseconds since the epoch."),
+    ]
+    duration: Annotated[
+        float, Field(description="The total duration of the request in seconds.")
+    ]
+    phases: Annotated[
+        dict[str, float],
+        Field(description="The duration of each phase of the request in seconds."),
+    ] = {}
+    phase_offsets: Annotated[
+        dict[str, float],
+        Field(
+            description="The start of each phase in seconds since the start of the request."
+        ),
+    ] = {}
+    error: Annotated[
+        str | None,
+        Field(description="The name of the exception raised by the request, if any."),
+    ] = None
+
+    @property
+    def status_class(self) -> str:
+        """The class of the status code, such as "2xx", or "error" if there was no response
+
+        Returns
+        -------
+        str
+            The status class
+        """
+        return status_class(self.status_code)
+
+
+class RequestTimer:
+    """Collects the phase timings of a single request."""
+
+    def __init__(self, method: str, path: str, detailed: bool = True):
+        """Start timing a request
+
+        Parameters
+        ----------
+        method : str
+            The HTTP method of the request.
+        path : str
+            The path (or URL) of the request, or its route template.
+        detailed : bool, optional
+            Whether to time the phases of the request, by default True.
+            If False, only the total duration and the response are recorded.
+        """
+        self.method = method
+        self.detailed = detailed
+        self.route = route_template(path)
+        self.url = ""
+        self.status_code: int | None = None
+        self.request_size = 0
+        self.response_size = 0
+        self.error: str | None = None
+        self.phases: dict[str, float] = {}
+        self.phase_offsets: dict[str, float] = {}
+        self.start_time_ns = time.time_ns()
+        self.duration = 0.0
+        self._start = time.perf_counter()
+        self._open: dict[str, float] = {}
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time a phase of the request
+
+        Parameters
+        ----------
+        name : str
+            The name of the phase.
+
+        Yields
+        ------
+        None
+        """
+        start = self._open[name] = time.perf_counter()
+        try:
+            yield
+        finally:
+            del self._open[name]
+            self.add(name=name, start=start, end=time.perf_counter())
+
+    def add(self, name: str, start: float, end: float):
+        """Add the time spent in a phase. Repeated phases are summed.
+
+        Parameters
+        ----------
+        name : str
+            The name of the phase.
+        start : float
+            The start of the phase (from `time.perf_counter`).
+        end : float
+            The end of the phase (from `time.perf_counter`).
+
+        Returns
+        -------
+        None
+        """
+        self.phase_offsets.setdefault(name, start - self._start)
+        self.phases[name] = self.phases.get(name, 0.0) + end - start
+
+    def trace(self, event_name: str, info: dict[str, Any]):
+        """The httpx `trace` extension of a synchronous request
+
+        Parameters
+        ----------
+        event_name : str
+            The name of the httpcore event, such as "http11.send_request_headers.started".
+        info : dict[str, Any]
+            The information of the event.
+
+        Returns
+        -------
+        None
+        """
+        now = time.perf_counter()
+        step, _, state = event_name.rpartition(".")
+        phase = _TRACE_PHASES.get(step.rpartition(".")[2])
+        if phase is None:
+            return
+        if state == "started":
+            transport_start = self._open.get("transport")
+            if transport_start is not None and "queue_wait" not in self.phases:
+                self.add(name="queue_wait", start=transport_start, end=now)
+            self._open[step] = now
+        elif step in self._open:
+            self.add(name=phase, start=self._open.pop(step), end=now)
+
+    async def atrace(self, event_name: str, info: dict[str, Any]):
+        """The httpx `trace` extension of an asynchronous request
+
+        Parameters
+        ----------
+        event_name : str
+            The name of the httpcore event, such as "http11.send_request_headers.started".
+        info : dict[str, Any]
+            The information of the event.
+
+        Returns
+        -------
+        None
+        """
+        self.trace(event_name=event_name, info=info)
+
+    def record_response(self, response: Response):
+        """Record the status and sizes of the response
+
+        Parameters
+        ----------
+        response : Response
+            The HTTPX response of the request.
+
+        Returns
+        -------
+        None
+        """
+        self.url = str(response.request.url)
+        self.status_code = response.status_code
+        self.request_size = len(response.request.content)
+        self.response_size = len(response.content)
+
+    def stop(self) -> float:
+        """Stop timing the request
+
+        Returns
+        -------
+        float
+            The total duration of the request in seconds
+        """
+        self.duration = time.perf_counter() - self._start
+        return self.duration
+
+    def finish(self) -> ModelRequestTiming:
+        """The timing of the stopped request
+
+        Returns
+        -------
+        ModelRequestTiming
+            The timing of the request
+        """
+        return ModelRequestTiming(
+            method=self.method,
+            route=self.route,
+            url=self.url,
+            status_code=self.status_code,
+            request_size=self.request_size,
+            response_size=self.response_size,
+            start_time_ns=self.start_time_ns,
+            duration=self.duration,
+            phases=self.phases,
+            phase_offsets=self.phase_offsets,
+            error=self.error,
+        )
+
+
+class SpanTimingHook:
+    """A timing hook that records each request as an OpenTelemetry span,
+    with a child span per phase.
+
+    The request span is a child of the span that is current when the request
+    is made. Requires the `opentelemetry-api` package.
+
+    Examples
+    --------
+    >>> from opentelemetry import trace
+    >>> client.add_timing_hook(SpanTimingHook(trace.get_tracer("pyrevolut")))
+    """
+
+    def __init__(self, tracer: Any):
+        """Create a new span timing hook
+
+        Parameters
+        ----------
+        tracer : opentelemetry.trace.Tracer
+            The tracer that starts the spans.
+        """
+        self.tracer = tracer
+
+    def __call__(self, timing: ModelRequestTiming):
+        """Record the spans of a request
+
+        Parameters
+        ----------
+        timing : ModelRequestTiming
+            The timing of the request.
+
+        Returns
+        -------
+        None
+        """
+        trace = _opentelemetry_trace()
+        attributes = {
+            "http.request.method": timing.method,
+            "http.route": timing.route,
+            "url.full": timing.url,
+            "http.request.body.size": timing.request_size,
+            "http.response.body.size": timing.response_size,
+        }
+        if timing.status_code is not None:
+            attributes["http.response.status_code"] = timing.status_code
+        if timing.error is not None:
+            attributes["error.type"] = timing.error
+
+        span = self.tracer.start_span(
+            f"{timing.method} {timing.route}",
+            kind=trace.SpanKind.CLIENT,
+            start_time=timing.start_time_ns,
+            attributes=attributes,
+        )
+        context = trace.set_span_in_context(span)
+        for name, duration in timing.phases.items():
+            start = timing.start_time_ns + int(timing.phase_offsets[name] * 1e9)
+            child = self.tracer.start_span(name, context=context, start_time=start)
+            child.end(end_time=start + int(duration * 1e9))
+        if timing.error is not None:
+            span.set_status(trace.Status(trace.StatusCode.ERROR, timing.error))
+        span.end(end_time=timing.start_time_ns + int(timing.duration * 1e9))
+
+
+TimingHook = Callable[[ModelRequestTiming], None]
+
+
+def route_template(path: str) -> str:
+    """The route template of a request path, with the IDs replaced by {id}
+
+    The IDs are only recognised if they are UUIDs or numbers, so the route
+    templates of the endpoints (such as "/1.0/accounts/{account_id}") should be
+    passed instead of their paths where they are known: their placeholders are
+    replaced by {id} as well.
+
+    Parameters
+    ----------
+    path : str
+        The path (or URL) of the request, such as "/1.0/accounts/<uuid>/bank-details",
+        or its route template, such as "/1.0/accounts/{account_id}/bank-details".
+
+    Returns
+    -------
+    str
+        The route template, such as "/1.0/accounts/{id}/bank-details".
+    """
+    if "://" in path:
+        path = urlsplit(path).path
+    if not path.startswith("/"):
+        path = f"/{path}"
+    return _PLACEHOLDER.sub("{id}", _ID_SEGMENT.sub("{id}", path))
+
+
+def status_class(status_code: int | None) -> str:
+    """The class of a status code, such as "2xx", or "error" if there was no response
+
+    Parameters
+    ----------
+    status_code : int | None
+        The status code of the response, None if there was none.
+
+    Returns
+    -------
+    str
+        The status class
+    """
+    if status_code is None:
+        return "error"
+    return f"{status_code // 100}xx"
+
+
+def _opentelemetry_trace() -> Any:
+    """Import the OpenTelemetry tracing API, which is needed for the span hook
+
+    Returns
+    -------
+    module
+        The opentelemetry.trace module
+
+    Raises
+    ------
+    ImportError
+        If the OpenTelemetry API is not installed
+    """
+    try:
+        from opentelemetry import trace
+    except ImportError as exc:
+        raise ImportError(
+            "The OpenTelemetry API is required for the span timing hook. "
+            "Install it with `pip install opentelemetry-api`."
+        ) from exc
+    return trace
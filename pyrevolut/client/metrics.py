@@ -0,0 +1,300 @@
+from typing import Any
+from bisect import bisect_left
+import threading
+import weakref
+
+from pyrevolut.utils.rate_limit import RateLimiter
+
+
+# The default upper bounds of the latency histogram buckets in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class MetricsRegistry:
+    """Prometheus-style metrics of the requests made by one or more clients.
+
+    - Requests: a counter and a fixed-bucket latency histogram per method,
+      route template (such as `/1.0/transactions/{id}`) and status class
+      (such as `2xx`, or `error` if no response was received).
+    - In-flight requests: a gauge of the requests being sent.
+    - Token refreshes: a counter of the access token refreshes.
+    - Rate limiters: a gauge of the callers waiting for each (named) rate limiter.
+    - Caches: gauges of the hit ratio of the tracked caches, and counters of
+      their hits and misses.
+
+    Recording a request takes a lock and updates a few integers, so metrics
+    can be left on in production. Use `render_prometheus` to export them.
+
+    Example
+    -------
+    ```python
+    metrics = MetricsRegistry()
+    client = Client(creds_loc=..., metrics=metrics)
+
+    with client:
+        client.Accounts.get_all_accounts()
+
+    print(render_prometheus(metrics))
+    ```
+    """
+
+    def __init__(
+        self,
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+        namespace: str = "pyrevolut",
+    ):
+        """Create a new metrics registry
+
+        Parameters
+        ----------
+        buckets : tuple[float, ...], optional
+            The upper bounds of the latency histogram buckets in seconds,
+            by default from 5 ms to 10 s. A +Inf bucket is always added.
+        namespace : str, optional
+            The prefix of the metric names, by default "pyrevolut".
+        """
+        assert len(buckets) >= 1, "buckets must not be empty"
+
+        self.buckets = tuple(sorted(float(bucket) for bucket in buckets))
+        self.namespace = namespace
+        self.in_flight = 0
+        self.token_refreshes = 0
+        self._requests: dict[tuple[str, str, str], list] = {}
+        self._caches: weakref.WeakValueDictionary[str, Any] = (
+            weakref.WeakValueDictionary()
+        )
+        self._lock = threading.Lock()
+
+    def request_started(self):
+        """Record the start of a request
+
+        Returns
+        -------
+        None
+        """
+        with self._lock:
+            self.in_flight += 1
+
+    def request_finished(
+        self, method: str, route: str, status_class: str, duration: float
+    ):
+        """Record the end of a request
+
+        Parameters
+        ----------
+        method : str
+            The HTTP method of the request.
+        route : str
+            The route template of the request.
+        status_class : str
+            The class of the status code of the response, such as "2xx".
+        duration : float
+            The duration of the request in seconds.
+
+        Returns
+        -------
+        None
+        """
+        bucket = bisect_left(self.buckets, duration)
+        key = (method, route, status_class)
+        with self._lock:
+            self.in_flight -= 1
+            series = self._requests.get(key)
+            if series is None:
+                # [count, sum, count per bucket (the last one is +Inf)]
+                series = self._requests[key] = [
+                    0,
+                    0.0,
+                    [0] * (len(self.buckets) + 1),
+                ]
+            series[0] += 1
+            series[1] += duration
+            series[2][bucket] += 1
+
+    def token_refreshed(self):
+        """Record a refresh of the access token
+
+        Returns
+        -------
+        None
+        """
+        with self._lock:
+            self.token_refreshes += 1
+
+    def track_cache(self, name: str, cache: Any):
+        """Track the hits and misses of a cache. Only a weak reference is kept.
+
+        Parameters
+        ----------
+        name : str
+            The name of the cache in the metrics.
+        cache : Any
+            The cache, with `hits` and `misses` attributes (such as an
+            `ExchangeRateCache` or an `AccountNameCache`).
+
+        Returns
+        -------
+        None
+        """
+        self._caches[name] = cache
+
+    def requests(self) -> dict[tuple[str, str, str], dict]:
+        """A snapshot of the request metrics
+
+        Returns
+        -------
+        dict[tuple[str, str, str], dict]
+            For each (method, route, status class): the "count", the "sum" of the
+            durations and the cumulative "buckets" as (upper bound, count) pairs.
+        """
+        with self._lock:
+            series = [
+                (key, count, total, list(counts))
+                for key, (count, total, counts) in self._requests.items()
+            ]
+        snapshot = {}
+        for key, count, total, counts in series:
+            cumulative, buckets = 0, []
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                buckets.append((bound, cumulative))
+            snapshot[key] = {"count": count, "sum": total, "buckets": buckets}
+        return snapshot
+
+    def rate_limiters(self) -> dict[str, int]:
+        """The number of callers waiting for the live rate limiters, by name
+
+        Returns
+        -------
+        dict[str, int]
+            The queue depth of each rate limiter name
+        """
+        depths: dict[str, int] = {}
+        for limiter in list(RateLimiter.instances):
+            depths[limiter.name] = depths.get(limiter.name, 0) + limiter.waiting
+        return depths
+
+    def caches(self) -> dict[str, tuple[int, int]]:
+        """The hits and misses of the tracked caches
+
+        Returns
+        -------
+        dict[str, tuple[int, int]]
+            The (hits, misses) of each cache
+        """
+        return {
+            name: (cache.hits, cache.misses) for name, cache in self._caches.items()
+        }
+
+    def reset(self):
+        """Reset the request and token refresh metrics
+
+        Returns
+        -------
+        None
+        """
+        with self._lock:
+            self._requests.clear()
+            self.token_refreshes = 0
+
+
+def render_prometheus(registry: MetricsRegistry) -> str:
+    """Render the metrics in the Prometheus text exposition format (version 0.0.4)
+
+    Parameters
+    ----------
+    registry : MetricsRegistry
+        The metrics registry.
+
+    Returns
+    -------
+    str
+        The metrics, to be served with the content type
+        `text/plain; version=0.0.4; charset=utf-8`.
+    """
+    prefix = registry.namespace
+    requests = registry.requests()
+    lines = []
+
+    lines.append(f"# HELP {prefix}_requests_total The number of requests.")
+    lines.append(f"# TYPE {prefix}_requests_total counter")
+    for (method, route, status), series in requests.items():
+        labels = _labels(method=method, route=route, status_class=status)
+        lines.append(f"{prefix}_requests_total{{{labels}}} {series['count']}")
+
+    lines.append(
+        f"# HELP {prefix}_request_duration_seconds The duration of the requests."
+    )
+    lines.append(f"# TYPE {prefix}_request_duration_seconds histogram")
+    for (method, route, status), series in requests.items():
+        labels = _labels(method=method, route=route, status_class=status)
+        for bound, count in series["buckets"]:
+            le = "+Inf" if bound == float("inf") else repr(bound)
+            lines.append(
+                f'{prefix}_request_duration_seconds_bucket{{{labels},le="{le}"}} {count}'
+            )
+        lines.append(
+            f"{prefix}_request_duration_seconds_sum{{{labels}}} {series['sum']!r}"
+        )
+        lines.append(
+            f"{prefix}_request_duration_seconds_count{{{labels}}} {series['count']}"
+        )
+
+    lines.append(f"# HELP {prefix}_requests_in_flight The number of requests sent.")
+    lines.append(f"# TYPE {prefix}_requests_in_flight gauge")
+    lines.append(f"{prefix}_requests_in_flight {registry.in_flight}")
+
+    lines.append(
+        f"# HELP {prefix}_token_refreshes_total The number of access token refreshes."
+    )
+    lines.append(f"# TYPE {prefix}_token_refreshes_total counter")
+    lines.append(f"{prefix}_token_refreshes_total {registry.token_refreshes}")
+
+    lines.append(
+        f"# HELP {prefix}_rate_limiter_queue_depth "
+        "The number of callers waiting for a rate limiter."
+    )
+    lines.append(f"# TYPE {prefix}_rate_limiter_queue_depth gauge")
+    for name, depth in sorted(registry.rate_limiters().items()):
+        lines.append(
+            f"{prefix}_rate_limiter_queue_depth{{{_labels(limiter=name)}}} {depth}"
+        )
+
+    caches = sorted(registry.caches().items())
+    for metric, help_text, index in (
+        ("cache_hits_total", "The number of cache hits.", 0),
+        ("cache_misses_total", "The number of cache misses.", 1),
+    ):
+        lines.append(f"# HELP {prefix}_{metric} {help_text}")
+        lines.append(f"# TYPE {prefix}_{metric} counter")
+        for name, counts in caches:
+            lines.append(f"{prefix}_{metric}{{{_labels(cache=name)}}} {counts[index]}")
+    lines.append(f"# HELP {prefix}_cache_hit_ratio The ratio of cache lookups hit.")
+    lines.append(f"# TYPE {prefix}_cache_hit_ratio gauge")
+    for name, (hits, misses) in caches:
+        ratio = hits / (hits + misses) if hits + misses else 0.0
+        lines.append(f"{prefix}_cache_hit_ratio{{{_labels(cache=name)}}} {ratio!r}")
+
+    return "\n".join(lines) + "\n"
+
+
+def _labels(**labels: str) -> str:
+    """Format Prometheus labels, escaping their values
+
+    Parameters
+    ----------
+    **labels : str
+        The label names and values
+
+    Returns
+    -------
+    str
+        The labels, such as `method="GET",route="/1.0/accounts"`
+    """
+    return ",".join(
+        '{}="{}"'.format(
+            name,
+            str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"'),
+        )
+        for name, value in labels.items()
+    )
@@ -0,0 +1,295 @@
+from typing import Iterator, Literal
+from collections import Counter
+from contextlib import contextmanager
+import cProfile
+import io
+import os
+import pstats
+import random
+import sys
+import threading
+import time
+
+
+class SampledProfiler:
+    """Profiles a random sample of the requests of a client, aggregated per
+    route template.
+
+    Two modes are supported:
+
+    - "cprofile": each sampled request runs under `cProfile`, and the stats of
+      the requests of a route are added together (exact call counts, but with
+      the overhead of deterministic profiling on the sampled requests only).
+    - "wall": a background thread samples the stack of the thread sending each
+      sampled request every `interval` seconds, and counts the collapsed stacks
+      (low overhead, includes the time spent waiting for the network).
+
+    Only one request per thread is profiled at a time. With the async client,
+    the profile of a request also covers the other tasks that run on the event
+    loop while the request awaits.
+
+    Example
+    -------
+    ```python
+    profiler = SampledProfiler(sample_rate=1 / 1000)
+    client = Client(creds_loc=..., profiler=profiler)
+
+    ...
+
+    print(profiler.report(route="/1.0/transactions"))
+    profiler.dump(directory="profiles")
+    ```
+    """
+
+    def __init__(
+        self,
+        sample_rate: float = 0.001,
+        mode: Literal["cprofile", "wall"] = "cprofile",
+        interval: float = 0.001,
+        seed: int | None = None,
+    ):
+        """Create a new sampled profiler
+
+        Parameters
+        ----------
+        sample_rate : float, optional
+            The fraction of the requests that are profiled, by default 0.001
+            (1 in 1,000).
+        mode : Literal["cprofile", "wall"], optional
+            The profiler to use, by default "cprofile".
+        interval : float, optional
+            The sampling interval in seconds of the "wall" mode, by default 0.001.
+        seed : int, optional
+            The seed of the random sampling of the requests.
+        """
+        assert 0 <= sample_rate <= 1, "sample_rate must be between 0 and 1"
+        assert mode in ["cprofile", "wall"], "mode must be 'cprofile' or 'wall'"
+        assert interval > 0, "interval must be positive"
+
+        self.sample_rate = sample_rate
+        self.mode = mode
+        self.interval = interval
+        self.samples: Counter[str] = Counter()
+        self._random = random.Random(seed)
+        self._stats: dict[str, pstats.Stats] = {}
+        self._stacks: dict[str, Counter[tuple[str, ...]]] = {}
+        self._active: dict[int, str] = {}
+        self._sampler: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def should_sample(self) -> bool:
+        """Whether to profile the next request
+
+        Returns
+        -------
+        bool
+            True for a random `sample_rate` fraction of the calls
+        """
+        return self._random.random() < self.sample_rate
+
+    @contextmanager
+    def profile(self, route: str) -> Iterator[None]:
+        """Profile a request
+
+        Parameters
+        ----------
+        route : str
+            The route template of the request.
+
+        Yields
+        ------
+        None
+        """
+        thread_id = threading.get_ident()
+        with self._lock:
+            profiled = thread_id in self._active
+            if not profiled:
+                self._active[thread_id] = route
+        if profiled:
+            # A request of this thread is already being profiled
+            yield
+            return
+
+        try:
+            if self.mode == "cprofile":
+                with self.__cprofile(route=route):
+                    yield
+            else:
+                self.__start_sampler()
+                yield
+        finally:
+            with self._lock:
+                del self._active[thread_id]
+                self.samples[route] += 1
+
+    @contextmanager
+    def __cprofile(self, route: str) -> Iterator[None]:
+        """Run the request under cProfile and add its stats to those of the route
+
+        Parameters
+        ----------
+        route : str
+            The route template of the request.
+
+        Yields
+        ------
+        None
+        """
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Another profiler is active (Python 3.12+)
+            yield
+            return
+        try:
+            yield
+        finally:
+            profile.disable()
+            with self._lock:
+                if route in self._stats:
+                    self._stats[route].add(profile)
+                else:
+                    self._stats[route] = pstats.Stats(profile)
+
+    def __start_sampler(self):
+        """Start the thread sampling the stacks of the profiled requests,
+        if it is not running"""
+        with self._lock:
+            if self._sampler is not None:
+                return
+            self._sampler = threading.Thread(
+                target=self.__sample_stacks, name="pyrevolut-profiler", daemon=True
+            )
+            self._sampler.start()
+
+    def __sample_stacks(self):
+        """Sample the stacks of the profiled requests until there are none"""
+        while True:
+            frames = sys._current_frames()
+            with self._lock:
+                if not self._active:
+                    self._sampler = None
+                    return
+                for thread_id, route in self._active.items():
+                    frame = frames.get(thread_id)
+                    if frame is None:
+                        continue
+                    stack = []
+                    while frame is not None:
+                        code = frame.f_code
+                        stack.append(
+                            f"{code.co_name} ({os.path.basename(code.co_filename)}"
+                            f":{frame.f_lineno})"
+                        )
+                        frame = frame.f_back
+                    self._stacks.setdefault(route, Counter())[
+                        tuple(reversed(stack))
+                    ] += 1
+            del frames
+            time.sleep(self.interval)
+
+    @property
+    def routes(self) -> list[str]:
+        """The route templates with at least one profiled request
+
+        Returns
+        -------
+        list[str]
+            The routes
+        """
+        return sorted(self.samples)
+
+    def report(
+        self,
+        route: str | None = None,
+        sort: str = "cumulative",
+        limit: int = 30,
+    ) -> str:
+        """A text report of the profiles
+
+        Parameters
+        ----------
+        route : str, optional
+            The route template to report, by default all the routes.
+        sort : str, optional
+            The pstats sort key of the "cprofile" mode, by default "cumulative".
+        limit : int, optional
+            The number of functions (or stacks) reported per route, by default 30.
+
+        Returns
+        -------
+        str
+            For each route: the number of profiled requests, then the pstats
+            table ("cprofile") or the most frequent collapsed stacks ("wall").
+        """
+        routes = [route] if route is not None else self.routes
+        output = io.StringIO()
+        for name in routes:
+            output.write(f"=== {name} ({self.samples[name]} profiled requests) ===\n")
+            with self._lock:
+                stats = self._stats.get(name)
+                if stats is not None:
+                    stats.stream = output
+                    stats.sort_stats(sort).print_stats(limit)
+                stacks = Counter(self._stacks.get(name, {}))
+            for stack, count in stacks.most_common(limit):
+                output.write(f"{count} {';'.join(stack)}\n")
+            output.write("\n")
+        return output.getvalue()
+
+    def dump(self, directory: str) -> list[str]:
+        """Write the profiles to a directory, one file per route: a `.prof` file
+        readable by pstats or snakeviz ("cprofile"), or a collapsed stacks `.txt`
+        file readable by flamegraph tools ("wall").
+
+        Parameters
+        ----------
+        directory : str
+            The directory, created if it does not exist.
+
+        Returns
+        -------
+        list[str]
+            The paths of the files written
+        """
+        os.makedirs(directory, exist_ok=True)
+        paths = []
+        with self._lock:
+            stats = dict(self._stats)
+            stacks = {route: Counter(counts) for route, counts in self._stacks.items()}
+        for route, route_stats in stats.items():
+            path = os.path.join(directory, f"{_file_name(route)}.prof")
+            route_stats.dump_stats(path)
+            paths.append(path)
+        for route, counts in stacks.items():
+            path = os.path.join(directory, f"{_file_name(route)}.txt")
+            with open(path, "w") as file:
+                for stack, count in counts.items():
+                    file.write(f"{';'.join(stack)} {count}\n")
+            paths.append(path)
+        return paths
+
+    def reset(self):
+        """Remove all the profiles"""
+        with self._lock:
+            self.samples.clear()
+            self._stats.clear()
+            self._stacks.clear()
+
+
+def _file_name(route: str) -> str:
+    """The file name of the profile of a route
+
+    Parameters
+    ----------
+    route : str
+        The route template, such as "/1.0/transaction/{id}"
+
+    Returns
+    -------
+    str
+        The file name, such as "1.0_transaction_id"
+    """
+    name = route.strip("/").replace("/", "_").replace("{", "").replace("}", "")
+    return name or "root"
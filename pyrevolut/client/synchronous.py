@@ -41,7 +41,7 @@ class Client(BaseClient):
         if self.client is not None:
             return
 
-        self.client = HTTPClient()
+        self.client = HTTPClient(transport=self.transport)
 
     def close(self):
         """Closes the client connection"""
@@ -56,6 +56,7 @@ class Client(BaseClient):
         path: str,
         response_model: Type[BaseModel],
         params: Type[BaseModel] | None = None,
+        route: str | None = None,
         **kwargs,
     ):
         """Send a GET request to the Revolut API
@@ -68,31 +69,37 @@ class Client(BaseClient):
             The model to use for the response
         params : Type[BaseModel] | None
             The parameters to add to the request route
+        route : str | None
+            The route template of the path, such as "/1.0/transaction/{id}", used
+            to label the request in the metrics and timings. By default the IDs
+            in the path are replaced by {id}.
 
         Returns
         -------
         Response
             The response from the request
         """
-        resp = self.client.get(
-            **self._prep_get(
+        with self._instrument(method="GET", path=path, route=route):
+            request = self._prep_get(
                 path=path,
                 params=params,
-                **kwargs,
+                **self._trace(kwargs),
+            )
+            with self._phase("transport"):
+                resp = self.client.get(**request)
+            return self.process_response(
+                response=resp,
+                response_model=response_model,
+                return_type=None,
+                error_response=None,
             )
-        )
-        return self.process_response(
-            response=resp,
-            response_model=response_model,
-            return_type=None,
-            error_response=None,
-        )
 
     def post(
         self,
         path: str,
         response_model: Type[BaseModel],
         body: Type[BaseModel] | None = None,
+        route: str | None = None,
         **kwargs,
     ):
         """Send a POST request to the Revolut API
@@ -105,31 +112,37 @@ class Client(BaseClient):
             The model to use for the response
         body : Type[BaseModel] | None
             The body to send in the request
+        route : str | None
+            The route template of the path, such as "/1.0/transaction/{id}", used
+            to label the request in the metrics and timings. By default the IDs
+            in the path are replaced by {id}.
 
         Returns
         -------
         Response
             The response from the request
         """
-        resp = self.client.post(
-            **self._prep_post(
+        with self._instrument(method="POST", path=path, route=route):
+            request = self._prep_post(
                 path=path,
                 body=body,
-                **kwargs,
+                **self._trace(kwargs),
+            )
+            with self._phase("transport"):
+                resp = self.client.post(**request)
+            return self.process_response(
+                response=resp,
+                response_model=response_model,
+                return_type=None,
+                error_response=None,
             )
-        )
-        return self.process_response(
-            response=resp,
-            response_model=response_model,
-            return_type=None,
-            error_response=None,
-        )
 
     def patch(
         self,
         path: str,
         response_model: Type[BaseModel],
         body: Type[BaseModel] | None = None,
+        route: str | None = None,
         **kwargs,
     ):
         """Send a PATCH request to the Revolut API
@@ -142,31 +155,37 @@ class Client(BaseClient):
             The model to use for the response
         body : Type[BaseModel]
             The body to send in the request
+        route : str | None
+            The route template of the path, such as "/1.0/transaction/{id}", used
+            to label the request in the metrics and timings. By default the IDs
+            in the path are replaced by {id}.
 
         Returns
         -------
         Response
             The response from the request
         """
-        resp = self.client.patch(
-            **self._prep_patch(
+        with self._instrument(method="PATCH", path=path, route=route):
+            request = self._prep_patch(
                 path=path,
                 body=body,
-                **kwargs,
+                **self._trace(kwargs),
+            )
+            with self._phase("transport"):
+                resp = self.client.patch(**request)
+            return self.process_response(
+                response=resp,
+                response_model=response_model,
+                return_type=None,
+                error_response=None,
             )
-        )
-        return self.process_response(
-            response=resp,
-            response_model=response_model,
-            return_type=None,
-            error_response=None,
-        )
 
     def delete(
         self,
         path: str,
         response_model: Type[BaseModel],
         params: Type[BaseModel] | None = None,
+        route: str | None = None,
         **kwargs,
     ):
         """Send a DELETE request to the Revolut API
@@ -179,31 +198,37 @@ class Client(BaseClient):
             The model to use for the response
         params : Type[BaseModel] | None
             The parameters to add to the request route
+        route : str | None
+            The route template of the path, such as "/1.0/transaction/{id}", used
+            to label the request in the metrics and timings. By default the IDs
+            in the path are replaced by {id}.
 
         Returns
         -------
         Response
             The response from the request
         """
-        resp = self.client.delete(
-            **self._prep_delete(
+        with self._instrument(method="DELETE", path=path, route=route):
+            request = self._prep_delete(
                 path=path,
                 params=params,
-                **kwargs,
+                **self._trace(kwargs),
+            )
+            with self._phase("transport"):
+                resp = self.client.delete(**request)
+            return self.process_response(
+                response=resp,
+                response_model=response_model,
+                return_type=None,
+                error_response=None,
             )
-        )
-        return self.process_response(
-            response=resp,
-            response_model=response_model,
-            return_type=None,
-            error_response=None,
-        )
 
     def put(
         self,
         response_model: Type[BaseModel],
         path: str,
         body: Type[BaseModel] | None = None,
+        route: str | None = None,
         **kwargs,
     ):
         """Send a PUT request to the Revolut API
@@ -216,25 +241,30 @@ class Client(BaseClient):
             The model to use for the response
         body : Type[BaseModel] | None
             The body to send in the request
+        route : str | None
+            The route template of the path, such as "/1.0/transaction/{id}", used
+            to label the request in the metrics and timings. By default the IDs
+            in the path are replaced by {id}.
 
         Returns
         -------
         Response
             The response from the request
         """
-        resp = self.client.put(
-            **self._prep_put(
+        with self._instrument(method="PUT", path=path, route=route):
+            request = self._prep_put(
                 path=path,
                 body=body,
-                **kwargs,
+                **self._trace(kwargs),
+            )
+            with self._phase("transport"):
+                resp = self.client.put(**request)
+            return self.process_response(
+                response=resp,
+                response_model=response_model,
+                return_type=None,
+                error_response=None,
             )
-        )
-        return self.process_response(
-            response=resp,
-            response_model=response_model,
-            return_type=None,
-            error_response=None,
-        )
 
     def load_endpoints(self):
         """Loads all the endpoints from the api directory"""
@@ -0,0 +1,21 @@
+"""Tools to test and benchmark code using pyrevolut without the Revolut API."""
+
+# flake8: noqa: F401
+from .payloads import PayloadGenerator, generate_payload
+from .endpoints import EndpointSpec, discover_endpoints
+from .mock import MockRevolut, fake_credentials
+from .fake import FakeRevolut, FakeRevolutError
+from .faults import (
+    FaultInjectingTransport,
+    constant_latency,
+    uniform_latency,
+    lognormal_latency,
+    pareto_latency,
+)
+from .cassette import (
+    Cassette,
+    CassetteMismatchError,
+    RecordingTransport,
+    ReplayTransport,
+)
+from .loadtest import LoadTest, parse_mix
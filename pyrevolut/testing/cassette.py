@@ -0,0 +1,532 @@
+from typing import Annotated, Any, Literal
+from collections import deque
+from urllib.parse import parse_qsl, urlencode
+import asyncio
+import base64
+import gzip
+import json
+import threading
+import time
+
+import httpx
+import pendulum
+from pydantic import BaseModel, Field
+
+import pyrevolut
+
+REDACTED = "REDACTED"
+
+REDACTED_HEADERS = frozenset(
+    {"authorization", "proxy-authorization", "cookie", "set-cookie"}
+)
+"""The headers whose values are redacted in the cassettes"""
+
+REDACTED_FIELDS = frozenset(
+    {
+        "access_token",
+        "refresh_token",
+        "client_assertion",
+        "jwt",
+        "signing_secret",
+        "pan",
+        "cvv",
+        "expiry",
+    }
+)
+"""The JSON and form fields whose values are redacted in the cassettes"""
+
+
+class CassetteMismatchError(Exception):
+    """A request replayed from a cassette was not recorded in it"""
+
+
+class ModelExchange(BaseModel):
+    """A request and its response, as recorded in a cassette"""
+
+    method: Annotated[str, Field(description="The HTTP method of the request.")]
+    path: Annotated[str, Field(description="The path and query string of the request.")]
+    request_body: Annotated[
+        str, Field(description="The body of the request, redacted.")
+    ] = ""
+    status_code: Annotated[int, Field(description="The status code of the response.")]
+    headers: Annotated[
+        dict[str, str], Field(description="The headers of the response, redacted.")
+    ] = {}
+    body: Annotated[str, Field(description="The body of the response, redacted.")] = ""
+    base64: Annotated[
+        bool,
+        Field(description="Whether the body of the response is base64 encoded."),
+    ] = False
+    elapsed: Annotated[
+        float, Field(description="The duration of the exchange in seconds.")
+    ] = 0.0
+
+    @property
+    def key(self) -> tuple[str, str]:
+        """The key matching a replayed request with this exchange
+
+        Returns
+        -------
+        tuple[str, str]
+            The method and the path with the query string
+        """
+        return self.method, self.path
+
+    def content(self) -> bytes:
+        """The body of the response
+
+        Returns
+        -------
+        bytes
+            The body
+        """
+        if self.base64:
+            return base64.b64decode(self.body)
+        return self.body.encode()
+
+
+class Cassette:
+    """The HTTP exchanges of a session with the Revolut API, as recorded by
+    `RecordingTransport` and replayed by `ReplayTransport`.
+
+    On disk, a cassette is a gzip compressed JSON Lines file: a header line with
+    the version of pyrevolut and the date of the recording, then one line per
+    exchange. The secrets (authorization headers, tokens, signing secrets and
+    card details) are redacted when the exchanges are recorded.
+    """
+
+    VERSION = 1
+
+    def __init__(self, exchanges: list[ModelExchange] | None = None):
+        """Create a new cassette
+
+        Parameters
+        ----------
+        exchanges : list[ModelExchange], optional
+            The recorded exchanges, by default none.
+        """
+        self.exchanges = list(exchanges or [])
+        self.pyrevolut_version = pyrevolut.__version__
+        self.recorded_at = pendulum.now(tz="UTC").to_iso8601_string()
+
+    def __len__(self) -> int:
+        return len(self.exchanges)
+
+    @classmethod
+    def load(cls, path: str) -> "Cassette":
+        """Load a cassette from a file
+
+        Parameters
+        ----------
+        path : str
+            The path of the cassette, such as "cassettes/sandbox.jsonl.gz".
+
+        Returns
+        -------
+        Cassette
+            The cassette
+        """
+        with gzip.open(path, "rt", encoding="utf-8") as file:
+            header = json.loads(file.readline())
+            assert (
+                header.get("version") == cls.VERSION
+            ), f"Unsupported cassette version {header.get('version')}"
+            cassette = cls(
+                exchanges=[
+                    ModelExchange.model_validate_json(line) for line in file if line
+                ]
+            )
+        cassette.pyrevolut_version = header.get("pyrevolut")
+        cassette.recorded_at = header.get("recorded_at")
+        return cassette
+
+    def save(self, path: str) -> str:
+        """Save the cassette to a file
+
+        Parameters
+        ----------
+        path : str
+            The path of the cassette, such as "cassettes/sandbox.jsonl.gz".
+
+        Returns
+        -------
+        str
+            The path of the cassette
+        """
+        with gzip.open(path, "wt", encoding="utf-8") as file:
+            header = {
+                "version": self.VERSION,
+                "pyrevolut": self.pyrevolut_version,
+                "recorded_at": self.recorded_at,
+            }
+            file.write(json.dumps(header) + "\n")
+            for exchange in self.exchanges:
+                file.write(exchange.model_dump_json(exclude_defaults=True) + "\n")
+        return path
+
+
+class RecordingTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """An HTTPX transport that sends the requests with another transport and
+    records the exchanges, redacted, in a cassette.
+
+    Example
+    -------
+    ```python
+    transport = RecordingTransport()
+    with Client(creds_loc="credentials/creds.json", transport=transport) as client:
+        client.Transactions.get_all_transactions()
+    transport.cassette.save("cassettes/sandbox.jsonl.gz")
+    ```
+    """
+
+    def __init__(
+        self,
+        transport: httpx.BaseTransport | httpx.AsyncBaseTransport | None = None,
+        cassette: Cassette | None = None,
+        redacted_headers: frozenset[str] = REDACTED_HEADERS,
+        redacted_fields: frozenset[str] = REDACTED_FIELDS,
+    ):
+        """Create a new recording transport
+
+        Parameters
+        ----------
+        transport : httpx.BaseTransport | httpx.AsyncBaseTransport, optional
+            The transport sending the requests, by default the HTTPX transport
+            (sync or async, depending on the client).
+        cassette : Cassette, optional
+            The cassette the exchanges are added to, by default a new one.
+        redacted_headers : frozenset[str], optional
+            The (lowercase) headers whose values are redacted, by default
+            the authorization and cookie headers.
+        redacted_fields : frozenset[str], optional
+            The JSON and form fields whose values are redacted, by default
+            the tokens, signing secrets and card details.
+        """
+        self.transport = transport
+        self.cassette = cassette if cassette is not None else Cassette()
+        self.redacted_headers = redacted_headers
+        self.redacted_fields = redacted_fields
+        self._lock = threading.Lock()
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        """Send a request and record the exchange
+
+        Parameters
+        ----------
+        request : httpx.Request
+            The request
+
+        Returns
+        -------
+        httpx.Response
+            The response
+        """
+        if self.transport is None:
+            self.transport = httpx.HTTPTransport()
+        start = time.perf_counter()
+        response = self.transport.handle_request(request)
+        response.read()
+        self.__record(request, response, elapsed=time.perf_counter() - start)
+        return response
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        """Send a request and record the exchange
+
+        Parameters
+        ----------
+        request : httpx.Request
+            The request
+
+        Returns
+        -------
+        httpx.Response
+            The response
+        """
+        if self.transport is None:
+            self.transport = httpx.AsyncHTTPTransport()
+        start = time.perf_counter()
+        response = await self.transport.handle_async_request(request)
+        await response.aread()
+        self.__record(request, response, elapsed=time.perf_counter() - start)
+        return response
+
+    def close(self):
+        """Close the transport sending the requests"""
+        if self.transport is not None:
+            self.transport.close()
+
+    async def aclose(self):
+        """Close the transport sending the requests"""
+        if self.transport is not None:
+            await self.transport.aclose()
+
+    def __record(
+        self, request: httpx.Request, response: httpx.Response, elapsed: float
+    ):
+        """Redact an exchange and add it to the cassette
+
+        Parameters
+        ----------
+        request : httpx.Request
+            The request
+        response : httpx.Response
+            The response, read
+        elapsed : float
+            The duration of the exchange in seconds
+        """
+        content = self.__redact_body(
+            content=response.content,
+            content_type=response.headers.get("content-type", ""),
+        )
+        try:
+            body, encoded = content.decode("utf-8"), False
+        except UnicodeDecodeError:
+            body, encoded = base64.b64encode(content).decode("ascii"), True
+
+        exchange = ModelExchange(
+            method=request.method,
+            path=request.url.raw_path.decode("ascii"),
+            request_body=self.__redact_body(
+                content=request.content,
+                content_type=request.headers.get("content-type", ""),
+            ).decode("utf-8", errors="replace"),
+            status_code=response.status_code,
+            headers={
+                key: REDACTED if key.lower() in self.redacted_headers else value
+                for key, value in response.headers.items()
+                if key.lower() not in ("content-encoding", "content-length")
+            },
+            body=body,
+            base64=encoded,
+            elapsed=round(elapsed, 6),
+        )
+        with self._lock:
+            self.cassette.exchanges.append(exchange)
+
+    def __redact_body(self, content: bytes, content_type: str) -> bytes:
+        """Redact the secret fields of a JSON or form body
+
+        Parameters
+        ----------
+        content : bytes
+            The body
+        content_type : str
+            The content type of the body
+
+        Returns
+        -------
+        bytes
+            The redacted body
+        """
+        if not content:
+            return content
+        if "application/x-www-form-urlencoded" in content_type:
+            fields = parse_qsl(content.decode("utf-8"), keep_blank_values=True)
+            return urlencode(
+                [
+                    (key, REDACTED if key in self.redacted_fields else value)
+                    for key, value in fields
+                ]
+            ).encode()
+        if "json" in content_type:
+            try:
+                data = json.loads(content)
+            except ValueError:
+                return content
+            return json.dumps(self.__redact_json(data)).encode()
+        return content
+
+    def __redact_json(self, data: Any) -> Any:
+        """Redact the secret fields of JSON data
+
+        Parameters
+        ----------
+        data : Any
+            The JSON data
+
+        Returns
+        -------
+        Any
+            The redacted data
+        """
+        if isinstance(data, dict):
+            return {
+                key: (
+                    REDACTED
+                    if key in self.redacted_fields and value is not None
+                    else self.__redact_json(value)
+                )
+                for key, value in data.items()
+            }
+        if isinstance(data, list):
+            return [self.__redact_json(item) for item in data]
+        return data
+
+
+class ReplayTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """An HTTPX transport answering the requests with the responses recorded in
+    a cassette, to rerun the same traffic deterministically and offline.
+
+    The requests are matched with the exchanges by method, path and query string,
+    in the order of the recording. Once all the exchanges of a request have been
+    replayed, they are replayed again from the first one, so the traffic of a
+    session can be replayed many times.
+
+    Example
+    -------
+    ```python
+    transport = ReplayTransport(Cassette.load("cassettes/sandbox.jsonl.gz"))
+    with Client(creds=fake_credentials(), transport=transport) as client:
+        client.Transactions.get_all_transactions()
+    ```
+    """
+
+    def __init__(
+        self,
+        cassette: Cassette,
+        latency: Literal["original", "zero"] = "zero",
+        match_query: bool = True,
+    ):
+        """Create a new replay transport
+
+        Parameters
+        ----------
+        cassette : Cassette
+            The cassette to replay.
+        latency : Literal["original", "zero"], optional
+            Whether the responses are delayed by their recorded duration
+            ("original") or returned at once ("zero"), by default "zero".
+        match_query : bool, optional
+            Whether the query string must match, by default True.
+            Disable it if the queries change between runs (such as dates
+            relative to the current time).
+        """
+        assert latency in ("original", "zero"), "latency must be 'original' or 'zero'"
+
+        self.cassette = cassette
+        self.latency = latency
+        self.match_query = match_query
+        self.replayed = 0
+        self._lock = threading.Lock()
+        self._queues: dict[tuple[str, str], deque[ModelExchange]] = {}
+        self._exchanges: dict[tuple[str, str], list[ModelExchange]] = {}
+        for exchange in cassette.exchanges:
+            self._exchanges.setdefault(self.__key(*exchange.key), []).append(exchange)
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        """Answer a request with its recorded response
+
+        Parameters
+        ----------
+        request : httpx.Request
+            The request
+
+        Returns
+        -------
+        httpx.Response
+            The recorded response
+        """
+        exchange = self.__next(request)
+        if self.latency == "original" and exchange.elapsed:
+            time.sleep(exchange.elapsed)
+        return self.__response(request=request, exchange=exchange)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        """Answer a request with its recorded response
+
+        Parameters
+        ----------
+        request : httpx.Request
+            The request
+
+        Returns
+        -------
+        httpx.Response
+            The recorded response
+        """
+        exchange = self.__next(request)
+        if self.latency == "original" and exchange.elapsed:
+            await asyncio.sleep(exchange.elapsed)
+        return self.__response(request=request, exchange=exchange)
+
+    def rewind(self):
+        """Replay the exchanges from the start again
+
+        Returns
+        -------
+        None
+        """
+        with self._lock:
+            self._queues.clear()
+            self.replayed = 0
+
+    def __key(self, method: str, path: str) -> tuple[str, str]:
+        """The key of a request
+
+        Parameters
+        ----------
+        method : str
+            The HTTP method
+        path : str
+            The path, with the query string
+
+        Returns
+        -------
+        tuple[str, str]
+            The method and the path, with the query string if it is matched
+        """
+        return method, path if self.match_query else path.split("?", 1)[0]
+
+    def __next(self, request: httpx.Request) -> ModelExchange:
+        """The next recorded exchange of a request
+
+        Parameters
+        ----------
+        request : httpx.Request
+            The request
+
+        Returns
+        -------
+        ModelExchange
+            The exchange
+
+        Raises
+        ------
+        CassetteMismatchError
+            If the request was not recorded
+        """
+        key = self.__key(request.method, request.url.raw_path.decode("ascii"))
+        with self._lock:
+            queue = self._queues.get(key)
+            if not queue:
+                exchanges = self._exchanges.get(key)
+                if exchanges is None:
+                    raise CassetteMismatchError(
+                        f"No recorded exchange for {key[0]} {key[1]}"
+                    )
+                queue = self._queues[key] = deque(exchanges)
+            self.replayed += 1
+            return queue.popleft()
+
+    @staticmethod
+    def __response(request: httpx.Request, exchange: ModelExchange) -> httpx.Response:
+        """The recorded response of an exchange
+
+        Parameters
+        ----------
+        request : httpx.Request
+            The request
+        exchange : ModelExchange
+            The exchange
+
+        Returns
+        -------
+        httpx.Response
+            The response
+        """
+        return httpx.Response(
+            status_code=exchange.status_code,
+            headers=exchange.headers,
+            content=exchange.content(),
+            request=request,
+        )
@@ -0,0 +1,185 @@
+from typing import Any, Type, get_args
+from functools import lru_cache
+import importlib
+import inspect
+import pkgutil
+import re
+
+from pydantic import BaseModel
+
+import pyrevolut.api
+
+
+HTTP_METHODS = ("get", "post", "patch", "delete", "put")
+
+
+class EndpointSpec:
+    """The description of an endpoint of the Revolut API, as defined by its
+    class in `pyrevolut/api/<resource>/<method>`."""
+
+    def __init__(
+        self,
+        resource: str,
+        method: str,
+        endpoint: type,
+        returns_list: bool = False,
+    ):
+        """Create a new endpoint description
+
+        Parameters
+        ----------
+        resource : str
+            The name of the resource package, such as "transactions".
+        method : str
+            The HTTP method, such as "GET".
+        endpoint : type
+            The endpoint class, with its ROUTE and Params, Body or Response models.
+        returns_list : bool, optional
+            Whether the endpoint returns a list of Response items, by default False.
+        """
+        self.resource = resource
+        self.method = method
+        self.endpoint = endpoint
+        self.returns_list = returns_list
+        self.name = endpoint.__name__
+        self.route = endpoint.ROUTE
+        self.pattern = re.compile(
+            "^/?"
+            + re.sub(
+                r"\\{(\w+)\\}",
+                r"(?P<\1>[^/]+)",
+                re.escape(self.route.lstrip("/")),
+            )
+            + "$"
+        )
+
+    @property
+    def response_model(self) -> Type[BaseModel] | None:
+        """The Response model of the endpoint
+
+        Returns
+        -------
+        Type[BaseModel] | None
+            The model, None if the endpoint has none
+        """
+        return getattr(self.endpoint, "Response", None)
+
+    @property
+    def body_model(self) -> Type[BaseModel] | None:
+        """The Body model of the endpoint
+
+        Returns
+        -------
+        Type[BaseModel] | None
+            The model, None if the endpoint has none
+        """
+        return getattr(self.endpoint, "Body", None)
+
+    def matches(self, method: str, path: str) -> bool:
+        """Whether a request is for this endpoint
+
+        Parameters
+        ----------
+        method : str
+            The HTTP method of the request.
+        path : str
+            The path of the request, relative to the API root (such as
+            "/1.0/transactions").
+
+        Returns
+        -------
+        bool
+            True if the method and the path match
+        """
+        return method.upper() == self.method and bool(self.pattern.match(path))
+
+    def path_params(self, path: str) -> dict[str, str] | None:
+        """The parameters of the route in the path of a request
+
+        Parameters
+        ----------
+        path : str
+            The path of the request, relative to the API root (such as
+            "/1.0/accounts/7d9f3b5e-...").
+
+        Returns
+        -------
+        dict[str, str] | None
+            The parameters by name (such as {"account_id": "7d9f3b5e-..."}),
+            None if the path does not match the route
+        """
+        match = self.pattern.match(path)
+        return None if match is None else match.groupdict()
+
+    def __repr__(self) -> str:
+        return f"EndpointSpec({self.method} {self.route} -> {self.name})"
+
+
+@lru_cache(maxsize=1)
+def discover_endpoints() -> tuple[EndpointSpec, ...]:
+    """Discover all the endpoints of the package
+
+    The endpoints are the classes with a ROUTE in the `get`, `post`, `patch`,
+    `delete` and `put` subpackages of each resource. An endpoint returns a list
+    when a method of the synchronous endpoint handler of its resource is
+    annotated to return a list of its Response.
+
+    Returns
+    -------
+    tuple[EndpointSpec, ...]
+        The endpoints, sorted by resource, method and route
+    """
+    specs = []
+    for resource in pkgutil.iter_modules(pyrevolut.api.__path__):
+        list_responses = _list_responses(resource=resource.name)
+        for method in HTTP_METHODS:
+            try:
+                module = importlib.import_module(
+                    f"pyrevolut.api.{resource.name}.{method}"
+                )
+            except ModuleNotFoundError:
+                continue
+            for _, endpoint in inspect.getmembers(module, inspect.isclass):
+                if not hasattr(endpoint, "ROUTE"):
+                    continue
+                specs.append(
+                    EndpointSpec(
+                        resource=resource.name,
+                        method=method.upper(),
+                        endpoint=endpoint,
+                        returns_list=getattr(endpoint, "Response", None)
+                        in list_responses,
+                    )
+                )
+    return tuple(
+        sorted(specs, key=lambda spec: (spec.resource, spec.method, spec.route))
+    )
+
+
+def _list_responses(resource: str) -> set[Any]:
+    """The Response models returned as lists by the endpoint handler of a resource
+
+    Parameters
+    ----------
+    resource : str
+        The name of the resource package
+
+    Returns
+    -------
+    set[Any]
+        The Response models
+    """
+    try:
+        module = importlib.import_module(f"pyrevolut.api.{resource}.endpoint")
+    except ModuleNotFoundError:
+        return set()
+    responses = set()
+    for name, handler in inspect.getmembers(module, inspect.isclass):
+        if not name.endswith("Sync"):
+            continue
+        for _, function in inspect.getmembers(handler, inspect.isfunction):
+            returns = function.__annotations__.get("return")
+            for member in get_args(returns) or (returns,):
+                if getattr(member, "__origin__", None) is list:
+                    responses.update(get_args(member))
+    return responses
@@ -0,0 +1,1374 @@
+from typing import Any, Awaitable, Callable, MutableMapping
+from collections import Counter, deque
+from datetime import date, datetime, timedelta, timezone
+import json
+import logging
+import queue
+import re
+import secrets
+import threading
+import time
+
+import httpx
+from pydantic import BaseModel, ValidationError
+
+from pyrevolut.api.common import EnumWebhookEvent
+from pyrevolut.api.webhooks.verifier import WebhookVerifier
+from pyrevolut.testing.endpoints import EndpointSpec, discover_endpoints
+from pyrevolut.testing.mock import MockRevolut
+from pyrevolut.testing.payloads import PayloadGenerator, _format_datetime
+
+Scope = MutableMapping[str, Any]
+Message = MutableMapping[str, Any]
+Receive = Callable[[], Awaitable[Message]]
+Send = Callable[[Message], Awaitable[None]]
+
+# The transfer states reached by the sandbox simulation actions
+_SIMULATION_ACTIONS = {
+    "complete": "completed",
+    "revert": "reverted",
+    "decline": "declined",
+    "fail": "failed",
+}
+# The allowed transaction state changes
+_TRANSITIONS = {
+    "created": {"pending", "completed", "declined", "failed", "cancelled"},
+    "pending": {"completed", "declined", "failed", "cancelled"},
+    "completed": {"reverted"},
+}
+# The states in which the money of a transaction is returned
+_REFUNDED_STATES = {"declined", "failed", "reverted", "cancelled"}
+_DEFAULT_WEBHOOK_EVENTS = [
+    EnumWebhookEvent.TRANSACTION_CREATED.value,
+    EnumWebhookEvent.TRANSACTION_STATE_CHANGED.value,
+]
+
+
+class FakeRevolutError(Exception):
+    """An error answered by the fake Revolut API"""
+
+    def __init__(self, status_code: int, message: str):
+        """Create a new error
+
+        Parameters
+        ----------
+        status_code : int
+            The HTTP status code of the response.
+        message : str
+            The error message.
+        """
+        super().__init__(message)
+        self.status_code = status_code
+        self.message = message
+
+
+class FakeRevolut:
+    """A stateful, in-process stand-in for the Revolut Business API.
+
+    It keeps accounts with balances, counterparties, transactions with legs,
+    payout links and webhooks, and answers the endpoints of the package from that
+    state: request bodies and query parameters are validated with the Body and
+    Params models of the endpoints, transfers move money between the balances and
+    through the transaction states, and every transaction and payout link event is
+    delivered to the subscribed webhooks with valid `Revolut-Signature` headers.
+    The endpoints without state (cards, team members, payment drafts, exchange
+    rates, ...) are answered with generated payloads by `MockRevolut`.
+
+    Transfers to counterparties are pending until they are completed, declined,
+    failed or reverted with the sandbox simulation endpoint, with
+    `update_transaction_state`, or automatically `settle_after` seconds after
+    their creation.
+
+    The fake can be used in-process, as an HTTPX transport, or served as an ASGI
+    application (with uvicorn for example) and reached with the `base_url` of the
+    client.
+
+    Example
+    -------
+    ```python
+    fake = FakeRevolut(settle_after=0.5)
+    client = Client(creds=fake_credentials(), transport=fake.transport())
+
+    # Or, out of process: uvicorn.run(fake, port=8000)
+    client = Client(creds=fake_credentials(), base_url="http://localhost:8000/api")
+    ```
+    """
+
+    def __init__(
+        self,
+        balances: dict[str, float] | None = None,
+        settle_after: float | None = None,
+        deliver: Callable[[httpx.Request], httpx.Response | None] | None = None,
+        max_deliveries: int = 10_000,
+        validate_responses: bool = False,
+        page_size: int = 100,
+        seed: int = 0,
+    ):
+        """Create a new fake of the Revolut API
+
+        Parameters
+        ----------
+        balances : dict[str, float], optional
+            The balance of the initial account in each currency, by default
+            100,000 in GBP, EUR and USD.
+        settle_after : float, optional
+            The number of seconds after which pending transfers are completed,
+            by default None (they stay pending until their state is updated).
+        deliver : Callable[[httpx.Request], httpx.Response | None], optional
+            The function sending the webhook events, such as `httpx.Client().send`,
+            by default None (the events are only recorded in `deliveries`).
+            The events are sent in order from a background thread, so that slow
+            deliveries do not hold up the requests (use `flush_deliveries` to wait
+            for them). The events whose delivery raises or answers with an error
+            are listed as failed events of their webhook.
+        max_deliveries : int, optional
+            The number of webhook events kept in `deliveries`, by default 10,000.
+        validate_responses : bool, optional
+            Whether to validate each response with the Response model of its
+            endpoint, by default False.
+        page_size : int, optional
+            The number of items returned by the list endpoints without state,
+            by default 100.
+        seed : int, optional
+            The seed of the generated IDs and payloads, by default 0.
+        """
+        assert settle_after is None or settle_after >= 0, "settle_after must be >= 0"
+        assert max_deliveries > 0, "max_deliveries must be positive"
+
+        self.settle_after = settle_after
+        self.deliver = deliver
+        self.validate_responses = validate_responses
+        self.specs = discover_endpoints()
+        self.calls: Counter[str] = Counter()
+        self.deliveries: deque[httpx.Request] = deque(maxlen=max_deliveries)
+
+        self.accounts: dict[str, dict[str, Any]] = {}
+        self.counterparties: dict[str, dict[str, Any]] = {}
+        self.transactions: dict[str, dict[str, Any]] = {}
+        self.payout_links: dict[str, dict[str, Any]] = {}
+        self.webhooks: dict[str, dict[str, Any]] = {}
+        self.failed_events: dict[str, list[dict[str, Any]]] = {}
+
+        self._lock = threading.RLock()
+        self._generator = PayloadGenerator(seed=seed)
+        self._mock = MockRevolut(page_size=page_size, seed=seed)
+        self._transaction_ids: list[str] = []
+        self._request_ids: dict[tuple[str, str], str] = {}
+        self._pending: deque[tuple[float, str]] = deque()
+        self._signing_secrets: dict[str, list[tuple[str, float | None]]] = {}
+        self._outbox: queue.Queue[tuple[dict[str, Any], httpx.Request, str]] = (
+            queue.Queue()
+        )
+        self._sender: threading.Thread | None = None
+        self._handlers: dict[str, Callable[..., tuple[int, Any]]] = {
+            "RetrieveAllAccounts": self.__list_accounts,
+            "RetrieveAnAccount": self.__get_account,
+            "RetrieveListOfCounterparties": self.__list_counterparties,
+            "RetrieveCounterparty": self.__get_counterparty,
+            "CreateCounterparty": self.__create_counterparty,
+            "DeleteCounterparty": self.__delete_counterparty,
+            "ValidateAccountName": self.__validate_account_name,
+            "MoveMoneyBetweenAccounts": self.__move_money,
+            "CreateTransferToAnotherAccount": self.__pay,
+            "RetrieveListOfTransactions": self.__list_transactions,
+            "RetrieveTransaction": self.__get_transaction,
+            "SimulateAccountTopup": self.__topup,
+            "SimulateTransferStateUpdate": self.__simulate_state_update,
+            "RetrieveListOfPayoutLinks": self.__list_payout_links,
+            "RetrievePayoutLink": self.__get_payout_link,
+            "CreatePayoutLink": self.__create_payout_link,
+            "CancelPayoutLink": self.__cancel_payout_link,
+            "RetrieveListOfWebhooks": self.__list_webhooks,
+            "RetrieveWebhook": self.__get_webhook,
+            "CreateWebhook": self.__create_webhook,
+            "UpdateWebhook": self.__update_webhook,
+            "DeleteWebhook": self.__delete_webhook,
+            "RotateWebhookSecret": self.__rotate_webhook_secret,
+            "RetrieveListOfFailedWebhooks": self.__list_failed_webhooks,
+        }
+
+        for currency, balance in (
+            balances or {"GBP": 100_000.0, "EUR": 100_000.0, "USD": 100_000.0}
+        ).items():
+            self.add_account(currency=currency, balance=balance)
+
+    def add_account(
+        self, currency: str, balance: float = 0.0, name: str | None = None
+    ) -> dict[str, Any]:
+        """Add an account
+
+        Parameters
+        ----------
+        currency : str
+            The currency of the account, such as "GBP".
+        balance : float, optional
+            The initial balance, by default 0.
+        name : str, optional
+            The name of the account, by default "Main <currency>".
+
+        Returns
+        -------
+        dict[str, Any]
+            The account, as the API returns it
+        """
+        now = _now()
+        account = {
+            "id": self.__id(),
+            "name": name or f"Main {currency}",
+            "balance": round(balance, 2),
+            "currency": currency,
+            "state": "active",
+            "public": False,
+            "created_at": now,
+            "updated_at": now,
+        }
+        with self._lock:
+            self.accounts[account["id"]] = account
+        return account
+
+    def update_transaction_state(
+        self, transaction_id: str, state: str
+    ) -> dict[str, Any]:
+        """Move a transaction to a new state, as Revolut does when a transfer is
+        processed. The money of declined, failed, reverted and cancelled
+        transactions is returned to the accounts.
+
+        Parameters
+        ----------
+        transaction_id : str
+            The ID of the transaction.
+        state : str
+            The new state, such as "completed".
+
+        Returns
+        -------
+        dict[str, Any]
+            The transaction
+
+        Raises
+        ------
+        FakeRevolutError
+            If the transaction does not exist or cannot reach the state
+        """
+        with self._lock:
+            transaction = self.transactions.get(str(transaction_id))
+            if transaction is None:
+                raise FakeRevolutError(404, "Transaction not found")
+            old_state = transaction["state"]
+            if state not in _TRANSITIONS.get(old_state, set()):
+                raise FakeRevolutError(
+                    400, f"Cannot change the transaction from {old_state} to {state}"
+                )
+
+            now = _now()
+            if state in _REFUNDED_STATES:
+                for leg in transaction["legs"]:
+                    account = self.accounts[leg["account_id"]]
+                    self.__credit(account=account, amount=-leg["amount"], now=now)
+            transaction["state"] = state
+            transaction["updated_at"] = now
+            if state == "completed":
+                transaction["completed_at"] = now
+            self.__emit(
+                event=EnumWebhookEvent.TRANSACTION_STATE_CHANGED,
+                data={
+                    "id": transaction["id"],
+                    "request_id": transaction.get("request_id"),
+                    "old_state": old_state,
+                    "new_state": state,
+                },
+            )
+            return transaction
+
+    def claim_payout_link(self, payout_link_id: str) -> dict[str, Any]:
+        """Claim a payout link, as its recipient does. The money is sent with a
+        completed transfer, or the link fails if the balance is too low.
+
+        Parameters
+        ----------
+        payout_link_id : str
+            The ID of the payout link.
+
+        Returns
+        -------
+        dict[str, Any]
+            The payout link
+
+        Raises
+        ------
+        FakeRevolutError
+            If the payout link does not exist or is not active
+        """
+        with self._lock:
+            link = self.__payout_link(payout_link_id=str(payout_link_id))
+            if link["state"] != "active":
+                raise FakeRevolutError(400, f"The payout link is {link['state']}")
+
+            self.__set_payout_link_state(link=link, state="processing")
+            account = self.accounts[link["account_id"]]
+            if account["balance"] < link["amount"]:
+                self.__set_payout_link_state(link=link, state="failed")
+                return link
+
+            transaction = self.__create_transaction(
+                transaction_type="transfer",
+                state="completed",
+                request_id=link["request_id"],
+                reference=link["reference"],
+                legs=[
+                    self.__leg(
+                        account=account,
+                        amount=-link["amount"],
+                        description=f"To {link['counterparty_name']}",
+                        counterparty={"account_type": "external"},
+                    )
+                ],
+            )
+            link["transaction_id"] = transaction["id"]
+            self.__set_payout_link_state(link=link, state="processed")
+            return link
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        """Answer a request
+
+        Parameters
+        ----------
+        request : httpx.Request
+            The request.
+
+        Returns
+        -------
+        httpx.Response
+            The response
+        """
+        path = "/" + re.sub(r"^/*(api/+)?", "", request.url.path)
+        if "authorization" not in request.headers and path != "/1.0/auth/token":
+            return _json_response(401, {"code": 401, "message": "Unauthorized"})
+        if request.method == "POST" and path == "/1.0/auth/token":
+            return _json_response(
+                200,
+                {
+                    "access_token": f"fake-access-token-{secrets.token_hex(8)}",
+                    "token_type": "bearer",
+                    "expires_in": 2399,
+                },
+            )
+
+        spec, params = self.__match(method=request.method, path=path)
+        if spec is None:
+            return _json_response(404, {"code": 404, "message": "Not found"})
+        handler = self._handlers.get(spec.name)
+        if handler is None:
+            return self._mock.handler(request)
+
+        with self._lock:
+            self.calls[spec.name] += 1
+            self.__settle()
+            try:
+                query = body = None
+                if hasattr(spec.endpoint, "Params"):
+                    query = _validate(spec.endpoint.Params, dict(request.url.params))
+                if spec.body_model is not None and request.content:
+                    body = _validate(spec.body_model, request.content)
+                status_code, data = handler(params=params, query=query, body=body)
+            except FakeRevolutError as exc:
+                return _json_response(
+                    exc.status_code, {"code": exc.status_code, "message": exc.message}
+                )
+            if self.validate_responses and data is not None:
+                for item in data if isinstance(data, list) else [data]:
+                    spec.response_model.model_validate(item)
+        if data is None:
+            return httpx.Response(status_code=204)
+        return _json_response(status_code, data)
+
+    def flush_deliveries(self):
+        """Wait until the queued webhook events have been sent
+
+        Returns
+        -------
+        None
+        """
+        self._outbox.join()
+
+    def transport(self) -> httpx.MockTransport:
+        """An HTTPX transport answering the requests with this fake.
+        It works with both the synchronous and the asynchronous clients.
+
+        Returns
+        -------
+        httpx.MockTransport
+            The transport
+        """
+        return httpx.MockTransport(self.handler)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        """The ASGI entrypoint
+
+        Parameters
+        ----------
+        scope : Scope
+            The ASGI connection scope
+        receive : Receive
+            The ASGI receive callable
+        send : Send
+            The ASGI send callable
+
+        Returns
+        -------
+        None
+        """
+        if scope["type"] == "lifespan":
+            while True:
+                message = await receive()
+                if message["type"] == "lifespan.startup":
+                    await send({"type": "lifespan.startup.complete"})
+                elif message["type"] == "lifespan.shutdown":
+                    await send({"type": "lifespan.shutdown.complete"})
+                    return
+        if scope["type"] != "http":
+            return
+
+        chunks: list[bytes] = []
+        more_body = True
+        while more_body:
+            message = await receive()
+            chunks.append(message.get("body", b""))
+            more_body = message.get("more_body", False)
+
+        query = scope.get("query_string", b"").decode("latin-1")
+        request = httpx.Request(
+            method=scope["method"],
+            url=f"http://fake{scope['path']}" + (f"?{query}" if query else ""),
+            headers=[
+                (key.decode("latin-1"), value.decode("latin-1"))
+                for key, value in scope["headers"]
+            ],
+            content=b"".join(chunks),
+        )
+        response = self.handler(request)
+        await send(
+            {
+                "type": "http.response.start",
+                "status": response.status_code,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(response.content)).encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": response.content})
+
+    def __match(
+        self, method: str, path: str
+    ) -> tuple[EndpointSpec | None, dict[str, str]]:
+        """The endpoint of a request and the parameters of its route
+
+        Parameters
+        ----------
+        method : str
+            The HTTP method of the request
+        path : str
+            The path of the request, relative to the API root
+
+        Returns
+        -------
+        tuple[EndpointSpec | None, dict[str, str]]
+            The endpoint (None if no endpoint matches) and the route parameters
+        """
+        for spec in self.specs:
+            if spec.method != method.upper():
+                continue
+            params = spec.path_params(path)
+            if params is not None:
+                return spec, params
+        return None, {}
+
+    def __settle(self):
+        """Complete the pending transfers created more than `settle_after`
+        seconds ago
+
+        Returns
+        -------
+        None
+        """
+        if self.settle_after is None:
+            return
+        now = time.monotonic()
+        while self._pending and self._pending[0][0] <= now:
+            _, transaction_id = self._pending.popleft()
+            if self.transactions[transaction_id]["state"] == "pending":
+                self.update_transaction_state(
+                    transaction_id=transaction_id, state="completed"
+                )
+
+    def __id(self) -> str:
+        """A new ID
+
+        Returns
+        -------
+        str
+            The ID, a version 4 UUID
+        """
+        return str(self._generator.uuid())
+
+    def __idempotent(self, kind: str, request_id: str) -> dict[str, Any] | None:
+        """The resource already created for a request ID
+
+        Parameters
+        ----------
+        kind : str
+            The kind of resource, "transaction" or "payout_link"
+        request_id : str
+            The request ID of the creation request
+
+        Returns
+        -------
+        dict[str, Any] | None
+            The resource, None if none was created for the request ID
+        """
+        resource_id = self._request_ids.get((kind, request_id))
+        if resource_id is None:
+            return None
+        if kind == "transaction":
+            return self.transactions[resource_id]
+        return self.payout_links[resource_id]
+
+    def __account(self, account_id: Any, currency: str | None = None) -> dict:
+        """An account, checking its currency
+
+        Parameters
+        ----------
+        account_id : Any
+            The ID of the account
+        currency : str, optional
+            The currency the account must have
+
+        Returns
+        -------
+        dict
+            The account
+
+        Raises
+        ------
+        FakeRevolutError
+            If the account does not exist or has another currency
+        """
+        account = self.accounts.get(str(account_id))
+        if account is None:
+            raise FakeRevolutError(404, "Account not found")
+        if currency is not None and account["currency"] != currency:
+            raise FakeRevolutError(
+                400, f"The account currency is {account['currency']}, not {currency}"
+            )
+        return account
+
+    def __debit(self, account: dict, amount: float, now: str):
+        """Take money from an account
+
+        Parameters
+        ----------
+        account : dict
+            The account
+        amount : float
+            The amount
+        now : str
+            The date of the operation
+
+        Raises
+        ------
+        FakeRevolutError
+            If the amount is not positive or the balance is too low
+        """
+        if amount <= 0:
+            raise FakeRevolutError(400, "The amount must be positive")
+        if account["balance"] < amount:
+            raise FakeRevolutError(400, "Insufficient balance")
+        self.__credit(account=account, amount=-amount, now=now)
+
+    @staticmethod
+    def __credit(account: dict, amount: float, now: str):
+        """Add money to an account
+
+        Parameters
+        ----------
+        account : dict
+            The account
+        amount : float
+            The amount, negative to take money
+        now : str
+            The date of the operation
+        """
+        account["balance"] = round(account["balance"] + amount, 2)
+        account["updated_at"] = now
+
+    def __leg(
+        self,
+        account: dict,
+        amount: float,
+        description: str,
+        counterparty: dict[str, Any] | None = None,
+    ) -> dict[str, Any]:
+        """A leg of a transaction, after its amount was applied to the account
+
+        Parameters
+        ----------
+        account : dict
+            The account
+        amount : float
+            The amount, negative for money leaving the account
+        description : str
+            The description of the leg
+        counterparty : dict[str, Any], optional
+            The counterparty of the leg
+
+        Returns
+        -------
+        dict[str, Any]
+            The leg
+        """
+        leg = {
+            "leg_id": self.__id(),
+            "account_id": account["id"],
+            "amount": amount,
+            "fee": 0.0,
+            "currency": account["currency"],
+            "description": description,
+            "balance": account["balance"],
+        }
+        if counterparty is not None:
+            leg["counterparty"] = counterparty
+        return leg
+
+    def __create_transaction(
+        self,
+        transaction_type: str,
+        state: str,
+        legs: list[dict[str, Any]],
+        request_id: str | None = None,
+        reference: str | None = None,
+    ) -> dict[str, Any]:
+        """Record a transaction and notify the webhooks
+
+        Parameters
+        ----------
+        transaction_type : str
+            The type of the transaction, such as "transfer"
+        state : str
+            The state of the transaction
+        legs : list[dict[str, Any]]
+            The legs of the transaction
+        request_id : str, optional
+            The request ID of the transaction
+        reference : str, optional
+            The reference of the transaction
+
+        Returns
+        -------
+        dict[str, Any]
+            The transaction
+        """
+        now = _now()
+        transaction = {
+            "id": self.__id(),
+            "type": transaction_type,
+            "state": state,
+            "created_at": now,
+            "updated_at": now,
+            "legs": legs,
+        }
+        if state == "completed":
+            transaction["completed_at"] = now
+        if request_id is not None:
+            transaction["request_id"] = request_id
+            self._request_ids[("transaction", request_id)] = transaction["id"]
+        if reference is not None:
+            transaction["reference"] = reference
+        self.transactions[transaction["id"]] = transaction
+        self._transaction_ids.append(transaction["id"])
+
+        self.__emit(
+            event=EnumWebhookEvent.TRANSACTION_CREATED,
+            data=dict(transaction),
+        )
+        return transaction
+
+    @staticmethod
+    def __transfer_response(transaction: dict[str, Any]) -> dict[str, Any]:
+        """The response of an endpoint creating a transfer
+
+        Parameters
+        ----------
+        transaction : dict[str, Any]
+            The transaction
+
+        Returns
+        -------
+        dict[str, Any]
+            The ID, state and dates of the transaction
+        """
+        response = {
+            "id": transaction["id"],
+            "state": transaction["state"],
+            "created_at": transaction["created_at"],
+        }
+        if "completed_at" in transaction:
+            response["completed_at"] = transaction["completed_at"]
+        return response
+
+    def __payout_link(self, payout_link_id: str) -> dict[str, Any]:
+        """A payout link, expired if its expiry date has passed
+
+        Parameters
+        ----------
+        payout_link_id : str
+            The ID of the payout link
+
+        Returns
+        -------
+        dict[str, Any]
+            The payout link
+
+        Raises
+        ------
+        FakeRevolutError
+            If the payout link does not exist
+        """
+        link = self.payout_links.get(payout_link_id)
+        if link is None:
+            raise FakeRevolutError(404, "Payout link not found")
+        if link["state"] == "active" and link["expiry_date"] <= _now():
+            self.__set_payout_link_state(link=link, state="expired")
+        return link
+
+    def __set_payout_link_state(self, link: dict[str, Any], state: str):
+        """Move a payout link to a new state and notify the webhooks
+
+        Parameters
+        ----------
+        link : dict[str, Any]
+            The payout link
+        state : str
+            The new state
+        """
+        old_state = link["state"]
+        link["state"] = state
+        link["updated_at"] = _now()
+        self.__emit(
+            event=EnumWebhookEvent.PAYOUT_LINK_STATE_CHANGED,
+            data={
+                "id": link["id"],
+                "request_id": link["request_id"],
+                "old_state": old_state,
+                "new_state": state,
+            },
+        )
+
+    def __emit(self, event: EnumWebhookEvent, data: dict[str, Any]):
+        """Send an event to the webhooks subscribed to it, signed with their
+        active signing secrets
+
+        Parameters
+        ----------
+        event : EnumWebhookEvent
+            The event
+        data : dict[str, Any]
+            The data of the event
+        """
+        timestamp = _now()
+        for webhook in self.webhooks.values():
+            if event.value not in webhook["events"]:
+                continue
+            raw_payload = json.dumps(
+                {"event": event.value, "timestamp": timestamp, "data": data}
+            ).encode()
+            header_timestamp = str(int(time.time() * 1000))
+            now = time.monotonic()
+            verifier = WebhookVerifier(
+                signing_secrets=[
+                    secret
+                    for secret, expires_at in self._signing_secrets[webhook["id"]]
+                    if expires_at is None or expires_at > now
+                ]
+            )
+            request = httpx.Request(
+                method="POST",
+                url=webhook["url"],
+                content=raw_payload,
+                headers={
+                    "Content-Type": "application/json",
+                    "Revolut-Request-Timestamp": header_timestamp,
+                    "Revolut-Signature": ",".join(
+                        verifier.sign(
+                            raw_payload=raw_payload, header_timestamp=header_timestamp
+                        )
+                    ),
+                },
+            )
+            self.deliveries.append(request)
+            if self.deliver is None:
+                continue
+
+            self._outbox.put((webhook, request, timestamp))
+            if self._sender is None:
+                self._sender = threading.Thread(
+                    target=self.__send_deliveries,
+                    name="fake-revolut-webhooks",
+                    daemon=True,
+                )
+                self._sender.start()
+
+    def __send_deliveries(self):
+        """Send the queued webhook events, outside of the lock of the requests,
+        and list the events that could not be delivered as failed events
+
+        Returns
+        -------
+        None
+        """
+        while True:
+            webhook, request, timestamp = self._outbox.get()
+            try:
+                response = self.deliver(request)
+                delivered = response is None or response.is_success
+            except Exception as exc:
+                logging.warning(
+                    f"Webhook event delivery to {webhook['url']} failed: {exc}"
+                )
+                delivered = False
+            with self._lock:
+                if not delivered and webhook["id"] in self.webhooks:
+                    self.failed_events.setdefault(webhook["id"], []).append(
+                        {
+                            "id": self.__id(),
+                            "created_at": timestamp,
+                            "updated_at": timestamp,
+                            "webhook_id": webhook["id"],
+                            "webhook_url": webhook["url"],
+                            "payload": json.loads(request.content),
+                            "last_sent_date": timestamp,
+                        }
+                    )
+            self._outbox.task_done()
+
+    # The endpoint handlers take the route parameters and the validated Params and
+    # Body models of the request, and return the status code and the JSON data.
+
+    def __list_accounts(self, params: dict, query: Any, body: Any):
+        """Answer RetrieveAllAccounts"""
+        return 200, list(self.accounts.values())
+
+    def __get_account(self, params: dict, query: Any, body: Any):
+        """Answer RetrieveAnAccount"""
+        return 200, self.__account(account_id=params["account_id"])
+
+    def __list_counterparties(self, params: dict, query: Any, body: Any):
+        """Answer RetrieveListOfCounterparties"""
+        created_before = _timestamp(query.created_before)
+        counterparties = []
+        for counterparty in reversed(self.counterparties.values()):
+            if created_before and counterparty["created_at"] >= created_before:
+                continue
+            if query.name and query.name.lower() not in counterparty["name"].lower():
+                continue
+            details = {
+                field: value
+                for field, value in (
+                    ("account_no", query.account_no),
+                    ("sort_code", query.sort_code),
+                    ("iban", query.iban),
+                    ("bic", query.bic),
+                )
+                if value
+            }
+            if details and not any(
+                all(account.get(field) == value for field, value in details.items())
+                for account in counterparty.get("accounts", [])
+            ):
+                continue
+            counterparties.append(counterparty)
+            if len(counterparties) == (query.limit or 100):
+                break
+        return 200, counterparties
+
+    def __get_counterparty(self, params: dict, query: Any, body: Any):
+        """Answer RetrieveCounterparty"""
+        counterparty = self.counterparties.get(params["counterparty_id"])
+        if counterparty is None:
+            raise FakeRevolutError(404, "Counterparty not found")
+        return 200, counterparty
+
+    def __create_counterparty(self, params: dict, query: Any, body: Any):
+        """Answer CreateCounterparty"""
+        now = _now()
+        name = body.name or body.company_name
+        if name is None and body.individual_name is not None:
+            name = f"{body.individual_name.first_name} {body.individual_name.last_name}"
+        counterparty = {
+            "id": self.__id(),
+            "name": name or body.revtag,
+            "profile_type": (
+                body.profile_type.value
+                if body.profile_type is not None
+                else ("business" if body.company_name else "personal")
+            ),
+            "state": "created",
+            "created_at": now,
+            "updated_at": now,
+        }
+        if body.revtag:
+            counterparty["revtag"] = body.revtag
+            account = {"type": "revolut", "bank_country": None}
+        else:
+            counterparty["country"] = body.bank_country
+            account = {
+                "type": "external",
+                "name": counterparty["name"],
+                "bank_country": body.bank_country,
+                "account_no": body.account_no,
+                "iban": body.iban,
+                "sort_code": body.sort_code,
+                "routing_number": body.routing_number,
+                "bic": body.bic,
+                "clabe": body.clabe,
+                "ifsc": body.isfc,
+                "bsb_code": body.bsb_code,
+                "recipient_charges": "no",
+            }
+        account = {key: value for key, value in account.items() if value is not None}
+        account.update(id=self.__id(), currency=body.currency or "GBP")
+        account.setdefault("bank_country", None)
+        counterparty["accounts"] = [account]
+        self.counterparties[counterparty["id"]] = counterparty
+        return 200, counterparty
+
+    def __delete_counterparty(self, params: dict, query: Any, body: Any):
+        """Answer DeleteCounterparty"""
+        if self.counterparties.pop(params["counterparty_id"], None) is None:
+            raise FakeRevolutError(404, "Counterparty not found")
+        return 204, None
+
+    def __validate_account_name(self, params: dict, query: Any, body: Any):
+        """Answer ValidateAccountName"""
+        if body.individual_name is not None:
+            name = f"{body.individual_name.first_name} {body.individual_name.last_name}"
+        else:
+            name = body.company_name
+        for counterparty in self.counterparties.values():
+            for account in counterparty.get("accounts", []):
+                if (
+                    account.get("account_no") != body.account_no
+                    or account.get("sort_code") != body.sort_code
+                ):
+                    continue
+                if counterparty["name"].lower() == name.lower():
+                    result = {"result_code": "matched"}
+                else:
+                    result = {
+                        "result_code": "not_matched",
+                        "reason": {"type": "uk_cop", "code": "not_matched"},
+                    }
+                if body.individual_name is not None:
+                    first, _, last = counterparty["name"].partition(" ")
+                    result["individual_name"] = {"first_name": first, "last_name": last}
+                else:
+                    result["company_name"] = counterparty["name"]
+                return 200, result
+        return 200, {
+            "result_code": "cannot_be_checked",
+            "reason": {"type": "uk_cop", "code": "account_does_not_exist"},
+        }
+
+    def __move_money(self, params: dict, query: Any, body: Any):
+        """Answer MoveMoneyBetweenAccounts"""
+        transaction = self.__idempotent(kind="transaction", request_id=body.request_id)
+        if transaction is None:
+            source = self.__account(body.source_account_id, currency=body.currency)
+            target = self.__account(body.target_account_id, currency=body.currency)
+            if source is target:
+                raise FakeRevolutError(
+                    400, "The source and target accounts are the same"
+                )
+            now = _now()
+            self.__debit(account=source, amount=body.amount, now=now)
+            source_leg = self.__leg(
+                account=source, amount=-body.amount, description=f"To {target['name']}"
+            )
+            self.__credit(account=target, amount=body.amount, now=now)
+            target_leg = self.__leg(
+                account=target, amount=body.amount, description=f"From {source['name']}"
+            )
+            transaction = self.__create_transaction(
+                transaction_type="transfer",
+                state="completed",
+                request_id=body.request_id,
+                reference=body.reference,
+                legs=[source_leg, target_leg],
+            )
+        return 200, self.__transfer_response(transaction)
+
+    def __pay(self, params: dict, query: Any, body: Any):
+        """Answer CreateTransferToAnotherAccount"""
+        transaction = self.__idempotent(kind="transaction", request_id=body.request_id)
+        if transaction is None:
+            account = self.__account(body.account_id, currency=body.currency)
+            counterparty = self.counterparties.get(str(body.receiver.counterparty_id))
+            if counterparty is None:
+                raise FakeRevolutError(404, "Counterparty not found")
+            accounts = counterparty.get("accounts", [])
+            if body.receiver.account_id is not None:
+                accounts = [
+                    item
+                    for item in accounts
+                    if item["id"] == str(body.receiver.account_id)
+                ]
+                if not accounts:
+                    raise FakeRevolutError(404, "Counterparty account not found")
+
+            self.__debit(account=account, amount=body.amount, now=_now())
+            transaction = self.__create_transaction(
+                transaction_type="transfer",
+                state="pending",
+                request_id=body.request_id,
+                reference=body.reference,
+                legs=[
+                    self.__leg(
+                        account=account,
+                        amount=-body.amount,
+                        description=f"To {counterparty['name']}",
+                        counterparty={
+                            "id": counterparty["id"],
+                            "account_type": (
+                                accounts[0]["type"] if accounts else "external"
+                            ),
+                            **({"account_id": accounts[0]["id"]} if accounts else {}),
+                        },
+                    )
+                ],
+            )
+            if self.settle_after is not None:
+                self._pending.append(
+                    (time.monotonic() + self.settle_after, transaction["id"])
+                )
+        return 200, self.__transfer_response(transaction)
+
+    def __list_transactions(self, params: dict, query: Any, body: Any):
+        """Answer RetrieveListOfTransactions"""
+        start = _timestamp(query.from_)
+        end = _timestamp(query.to)
+        account_id = str(query.account) if query.account is not None else None
+        transaction_type = query.type.value if query.type is not None else None
+        count = min(query.count or 100, 1000)
+
+        transactions = []
+        for transaction_id in reversed(self._transaction_ids):
+            transaction = self.transactions[transaction_id]
+            if end and transaction["created_at"] >= end:
+                continue
+            if start and transaction["created_at"] < start:
+                break
+            if transaction_type and transaction["type"] != transaction_type:
+                continue
+            if account_id and not any(
+                leg["account_id"] == account_id for leg in transaction["legs"]
+            ):
+                continue
+            transactions.append(transaction)
+            if len(transactions) == count:
+                break
+        return 200, transactions
+
+    def __get_transaction(self, params: dict, query: Any, body: Any):
+        """Answer RetrieveTransaction"""
+        if query.id_type == "request_id":
+            transaction = self.__idempotent(kind="transaction", request_id=params["id"])
+        else:
+            transaction = self.transactions.get(params["id"])
+        if transaction is None:
+            raise FakeRevolutError(404, "Transaction not found")
+        return 200, transaction
+
+    def __topup(self, params: dict, query: Any, body: Any):
+        """Answer SimulateAccountTopup"""
+        account = self.__account(body.account_id, currency=body.currency)
+        if body.amount <= 0:
+            raise FakeRevolutError(400, "The amount must be positive")
+        self.__credit(account=account, amount=body.amount, now=_now())
+        transaction = self.__create_transaction(
+            transaction_type="topup",
+            state=body.state.value if body.state is not None else "completed",
+            reference=body.reference,
+            legs=[
+                self.__leg(
+                    account=account,
+                    amount=body.amount,
+                    description=body.reference or "Top up",
+                )
+            ],
+        )
+        return 200, self.__transfer_response(transaction)
+
+    def __simulate_state_update(self, params: dict, query: Any, body: Any):
+        """Answer SimulateTransferStateUpdate"""
+        state = _SIMULATION_ACTIONS.get(params["action"])
+        if state is None:
+            raise FakeRevolutError(400, f"Unknown action {params['action']}")
+        transaction = self.update_transaction_state(
+            transaction_id=params["transfer_id"], state=state
+        )
+        return 200, self.__transfer_response(transaction)
+
+    def __list_payout_links(self, params: dict, query: Any, body: Any):
+        """Answer RetrieveListOfPayoutLinks"""
+        created_before = _timestamp(query.created_before)
+        links = []
+        for link_id in reversed(self.payout_links):
+            link = self.__payout_link(payout_link_id=link_id)
+            if created_before and link["created_at"] >= created_before:
+                continue
+            if query.state is not None and link["state"] != query.state.value:
+                continue
+            links.append(link)
+            if len(links) == (query.limit or 100):
+                break
+        return 200, links
+
+    def __get_payout_link(self, params: dict, query: Any, body: Any):
+        """Answer RetrievePayoutLink"""
+        return 200, self.__payout_link(payout_link_id=params["payout_link_id"])
+
+    def __create_payout_link(self, params: dict, query: Any, body: Any):
+        """Answer CreatePayoutLink"""
+        link = self.__idempotent(kind="payout_link", request_id=body.request_id)
+        if link is None:
+            account = self.__account(body.account_id, currency=body.currency)
+            if body.amount <= 0:
+                raise FakeRevolutError(400, "The amount must be positive")
+            created_at = datetime.now(timezone.utc)
+            expiry_period = body.expiry_period or timedelta(days=7)
+            link = {
+                "id": self.__id(),
+                "state": "active",
+                "created_at": _format_datetime(created_at),
+                "updated_at": _format_datetime(created_at),
+                "counterparty_name": body.counterparty_name,
+                "save_counterparty": bool(body.save_counterparty),
+                "request_id": body.request_id,
+                "expiry_date": _format_datetime(
+                    created_at + timedelta(seconds=expiry_period.total_seconds())
+                ),
+                "payout_methods": [method.value for method in body.payout_methods],
+                "account_id": account["id"],
+                "amount": body.amount,
+                "currency": body.currency,
+                "url": f"https://business.revolut.com/payout-link/{secrets.token_urlsafe(12)}",
+                "reference": body.reference,
+            }
+            if body.transfer_reason_code is not None:
+                link["transfer_reason_code"] = body.transfer_reason_code.value
+            self.payout_links[link["id"]] = link
+            self._request_ids[("payout_link", body.request_id)] = link["id"]
+            self.__emit(
+                event=EnumWebhookEvent.PAYOUT_LINK_CREATED,
+                data={
+                    "id": link["id"],
+                    "state": link["state"],
+                    "request_id": link["request_id"],
+                },
+            )
+        return 200, link
+
+    def __cancel_payout_link(self, params: dict, query: Any, body: Any):
+        """Answer CancelPayoutLink"""
+        link = self.__payout_link(payout_link_id=params["payout_link_id"])
+        if link["state"] not in ("created", "awaiting", "active"):
+            raise FakeRevolutError(400, f"The payout link is {link['state']}")
+        self.__set_payout_link_state(link=link, state="cancelled")
+        return 204, None
+
+    def __webhook(self, webhook_id: str) -> dict[str, Any]:
+        """A webhook
+
+        Parameters
+        ----------
+        webhook_id : str
+            The ID of the webhook
+
+        Returns
+        -------
+        dict[str, Any]
+            The webhook, with its signing secret
+
+        Raises
+        ------
+        FakeRevolutError
+            If the webhook does not exist
+        """
+        webhook = self.webhooks.get(webhook_id)
+        if webhook is None:
+            raise FakeRevolutError(404, "Webhook not found")
+        return webhook
+
+    @staticmethod
+    def __public_webhook(webhook: dict[str, Any]) -> dict[str, Any]:
+        """A webhook without its signing secret
+
+        Parameters
+        ----------
+        webhook : dict[str, Any]
+            The webhook
+
+        Returns
+        -------
+        dict[str, Any]
+            The ID, URL and events of the webhook
+        """
+        return {key: webhook[key] for key in ("id", "url", "events")}
+
+    def __list_webhooks(self, params: dict, query: Any, body: Any):
+        """Answer RetrieveListOfWebhooks"""
+        return 200, [
+            self.__public_webhook(webhook) for webhook in self.webhooks.values()
+        ]
+
+    def __get_webhook(self, params: dict, query: Any, body: Any):
+        """Answer RetrieveWebhook"""
+        return 200, self.__webhook(webhook_id=params["webhook_id"])
+
+    def __create_webhook(self, params: dict, query: Any, body: Any):
+        """Answer CreateWebhook"""
+        webhook = {
+            "id": self.__id(),
+            "url": str(body.url),
+            "events": (
+                [event.value for event in body.events]
+                if body.events
+                else list(_DEFAULT_WEBHOOK_EVENTS)
+            ),
+            "signing_secret": f"wsk_{secrets.token_urlsafe(24)}",
+        }
+        self.webhooks[webhook["id"]] = webhook
+        self._signing_secrets[webhook["id"]] = [(webhook["signing_secret"], None)]
+        return 200, webhook
+
+    def __update_webhook(self, params: dict, query: Any, body: Any):
+        """Answer UpdateWebhook"""
+        webhook = self.__webhook(webhook_id=params["webhook_id"])
+        if body.url is not None:
+            webhook["url"] = str(body.url)
+        if body.events is not None:
+            webhook["events"] = [event.value for event in body.events]
+        return 200, self.__public_webhook(webhook)
+
+    def __delete_webhook(self, params: dict, query: Any, body: Any):
+        """Answer DeleteWebhook"""
+        self.__webhook(webhook_id=params["webhook_id"])
+        del self.webhooks[params["webhook_id"]]
+        del self._signing_secrets[params["webhook_id"]]
+        self.failed_events.pop(params["webhook_id"], None)
+        return 204, None
+
+    def __rotate_webhook_secret(self, params: dict, query: Any, body: Any):
+        """Answer RotateWebhookSecret"""
+        webhook = self.__webhook(webhook_id=params["webhook_id"])
+        previous = webhook["signing_secret"]
+        webhook["signing_secret"] = f"wsk_{secrets.token_urlsafe(24)}"
+        self._signing_secrets[webhook["id"]] = [(webhook["signing_secret"], None)]
+        if body is not None and body.expiration_period is not None:
+            # The previous secret stays valid for the expiration period
+            self._signing_secrets[webhook["id"]].append(
+                (previous, time.monotonic() + body.expiration_period.total_seconds())
+            )
+        return 200, webhook
+
+    def __list_failed_webhooks(self, params: dict, query: Any, body: Any):
+        """Answer RetrieveListOfFailedWebhooks"""
+        self.__webhook(webhook_id=params["webhook_id"])
+        created_before = _timestamp(query.created_before)
+        events = [
+            event
+            for event in reversed(self.failed_events.get(params["webhook_id"], []))
+            if not created_before or event["created_at"] < created_before
+        ]
+        return 200, events[: query.limit or 100]
+
+
+def _now() -> str:
+    """The current date, formatted as the Revolut API does
+
+    Returns
+    -------
+    str
+        The date
+    """
+    return _format_datetime(datetime.now(timezone.utc))
+
+
+def _timestamp(value: datetime | date | None) -> str | None:
+    """A date of a query parameter, formatted to be compared with the stored dates
+
+    Parameters
+    ----------
+    value : datetime | date | None
+        The date
+
+    Returns
+    -------
+    str | None
+        The formatted date in UTC, None if there is no date
+    """
+    if value is None:
+        return None
+    if not isinstance(value, datetime):
+        value = datetime(value.year, value.month, value.day, tzinfo=timezone.utc)
+    return _format_datetime(value.astimezone(timezone.utc))
+
+
+def _validate(model: type[BaseModel], data: dict[str, Any] | bytes) -> BaseModel:
+    """Validate the query parameters or the body of a request
+
+    Parameters
+    ----------
+    model : type[BaseModel]
+        The Params or Body model of the endpoint
+    data : dict[str, Any] | bytes
+        The query parameters, or the JSON body
+
+    Returns
+    -------
+    BaseModel
+        The validated model
+
+    Raises
+    ------
+    FakeRevolutError
+        If the data is not valid
+    """
+    try:
+        if isinstance(data, bytes):
+            return model.model_validate_json(data)
+        return model.model_validate(data)
+    except (ValidationError, ValueError) as exc:
+        raise FakeRevolutError(400, f"Invalid request: {exc}") from exc
+
+
+def _json_response(status_code: int, data: Any) -> httpx.Response:
+    """A JSON response
+
+    Parameters
+    ----------
+    status_code : int
+        The HTTP status code
+    data : Any
+        The JSON data
+
+    Returns
+    -------
+    httpx.Response
+        The response
+    """
+    return httpx.Response(
+        status_code=status_code,
+        content=json.dumps(data).encode(),
+        headers={"Content-Type": "application/json"},
+    )
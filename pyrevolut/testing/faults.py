@@ -0,0 +1,321 @@
+from typing import Callable
+from collections import Counter
+import asyncio
+import json
+import math
+import random
+import threading
+import time
+
+import httpx
+
+LatencyDistribution = Callable[[random.Random], float]
+"""A function drawing a latency in seconds with a random number generator"""
+
+FAULTS = ("reset", "timeout", "rate_limited", "server_error", "unavailable")
+"""The kinds of faults injected by `FaultInjectingTransport`"""
+
+
+def constant_latency(seconds: float) -> LatencyDistribution:
+    """A constant latency
+
+    Parameters
+    ----------
+    seconds : float
+        The latency in seconds
+
+    Returns
+    -------
+    LatencyDistribution
+        The latency distribution
+    """
+    assert seconds >= 0, "seconds must not be negative"
+    return lambda rng: seconds
+
+
+def uniform_latency(low: float, high: float) -> LatencyDistribution:
+    """A latency uniformly distributed between two bounds
+
+    Parameters
+    ----------
+    low : float
+        The lowest latency in seconds
+    high : float
+        The highest latency in seconds
+
+    Returns
+    -------
+    LatencyDistribution
+        The latency distribution
+    """
+    assert 0 <= low <= high, "the bounds must satisfy 0 <= low <= high"
+    return lambda rng: rng.uniform(low, high)
+
+
+def lognormal_latency(median: float, sigma: float = 0.5) -> LatencyDistribution:
+    """A log-normally distributed latency, the usual shape of network latencies:
+    most requests are close to the median with a long tail of slow ones
+
+    Parameters
+    ----------
+    median : float
+        The median latency in seconds
+    sigma : float, optional
+        The standard deviation of the log of the latency, by default 0.5.
+        The p99 latency is about median * exp(2.33 * sigma).
+
+    Returns
+    -------
+    LatencyDistribution
+        The latency distribution
+    """
+    assert median > 0, "median must be positive"
+    assert sigma >= 0, "sigma must not be negative"
+    return lambda rng: rng.lognormvariate(math.log(median), sigma)
+
+
+def pareto_latency(minimum: float, alpha: float = 2.0) -> LatencyDistribution:
+    """A Pareto distributed latency, with a heavier tail than the log-normal one
+
+    Parameters
+    ----------
+    minimum : float
+        The minimum latency in seconds
+    alpha : float, optional
+        The shape of the distribution, by default 2.0. The smaller, the heavier
+        the tail.
+
+    Returns
+    -------
+    LatencyDistribution
+        The latency distribution
+    """
+    assert minimum > 0, "minimum must be positive"
+    assert alpha > 0, "alpha must be positive"
+    return lambda rng: minimum * rng.paretovariate(alpha)
+
+
+class FaultInjectingTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """An HTTPX transport wrapper that degrades another transport, to see how
+    the client and the code using it behave when Revolut is slow or failing.
+
+    Each request is delayed by a latency drawn from a distribution, then fails
+    with one of the faults at its rate, or is sent with the wrapped transport:
+
+    - reset: the connection is reset (an `httpx.ReadError`)
+    - timeout: the request times out (an `httpx.ReadTimeout`) after `timeout_delay`
+    - rate_limited: a 429 response with a `Retry-After` header
+    - server_error: a 500 response
+    - unavailable: a 503 response
+
+    It works with both the synchronous and the asynchronous clients if the
+    wrapped transport does (as `httpx.MockTransport` does).
+
+    Example
+    -------
+    ```python
+    transport = FaultInjectingTransport(
+        transport=MockRevolut().transport(),
+        latency=lognormal_latency(median=0.05),
+        unavailable_rate=0.02,
+        rate_limited_rate=0.01,
+    )
+    client = Client(creds=fake_credentials(), transport=transport)
+    ```
+    """
+
+    def __init__(
+        self,
+        transport: httpx.BaseTransport | httpx.AsyncBaseTransport,
+        latency: LatencyDistribution | None = None,
+        reset_rate: float = 0.0,
+        timeout_rate: float = 0.0,
+        rate_limited_rate: float = 0.0,
+        server_error_rate: float = 0.0,
+        unavailable_rate: float = 0.0,
+        retry_after: float = 1.0,
+        timeout_delay: float = 0.0,
+        seed: int | None = None,
+    ):
+        """Create a new fault injecting transport
+
+        Parameters
+        ----------
+        transport : httpx.BaseTransport | httpx.AsyncBaseTransport
+            The transport sending the requests that do not fail.
+        latency : LatencyDistribution, optional
+            The distribution of the latency added to each request, by default None
+            (no latency is added).
+        reset_rate : float, optional
+            The share of the requests whose connection is reset, by default 0.
+        timeout_rate : float, optional
+            The share of the requests that time out, by default 0.
+        rate_limited_rate : float, optional
+            The share of the requests answered with a 429, by default 0.
+        server_error_rate : float, optional
+            The share of the requests answered with a 500, by default 0.
+        unavailable_rate : float, optional
+            The share of the requests answered with a 503, by default 0.
+        retry_after : float, optional
+            The number of seconds of the `Retry-After` header of the 429
+            responses, by default 1.
+        timeout_delay : float, optional
+            The number of seconds before a timeout is raised, on top of the
+            latency, by default 0. Use the timeout of the client to be realistic.
+        seed : int, optional
+            The seed of the random latencies and faults, for reproducible runs.
+        """
+        rates = [
+            reset_rate,
+            timeout_rate,
+            rate_limited_rate,
+            server_error_rate,
+            unavailable_rate,
+        ]
+        assert all(rate >= 0 for rate in rates), "the rates must not be negative"
+        assert sum(rates) <= 1, "the rates must not add up to more than 1"
+        assert retry_after >= 0, "retry_after must not be negative"
+        assert timeout_delay >= 0, "timeout_delay must not be negative"
+
+        self.transport = transport
+        self.latency = latency
+        self.rates = dict(zip(FAULTS, rates))
+        self.retry_after = retry_after
+        self.timeout_delay = timeout_delay
+        self.requests = 0
+        self.injected: Counter[str] = Counter()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        """Send a request with the synchronous transport, or fail it
+
+        Parameters
+        ----------
+        request : httpx.Request
+            The request
+
+        Returns
+        -------
+        httpx.Response
+            The response
+        """
+        delay, fault = self.__draw()
+        if delay:
+            time.sleep(delay)
+        if fault == "timeout" and self.timeout_delay:
+            time.sleep(self.timeout_delay)
+        response = self.__fault(request=request, fault=fault)
+        if response is not None:
+            return response
+        return self.transport.handle_request(request)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        """Send a request with the asynchronous transport, or fail it
+
+        Parameters
+        ----------
+        request : httpx.Request
+            The request
+
+        Returns
+        -------
+        httpx.Response
+            The response
+        """
+        delay, fault = self.__draw()
+        if delay:
+            await asyncio.sleep(delay)
+        if fault == "timeout" and self.timeout_delay:
+            await asyncio.sleep(self.timeout_delay)
+        response = self.__fault(request=request, fault=fault)
+        if response is not None:
+            return response
+        return await self.transport.handle_async_request(request)
+
+    def close(self):
+        """Close the wrapped synchronous transport"""
+        self.transport.close()
+
+    async def aclose(self):
+        """Close the wrapped asynchronous transport"""
+        await self.transport.aclose()
+
+    def reset(self):
+        """Reset the counts of requests and injected faults
+
+        Returns
+        -------
+        None
+        """
+        with self._lock:
+            self.requests = 0
+            self.injected.clear()
+
+    def __draw(self) -> tuple[float, str | None]:
+        """Draw the latency and the fault of a request
+
+        Returns
+        -------
+        tuple[float, str | None]
+            The latency in seconds and the fault, None if the request is sent
+        """
+        with self._lock:
+            self.requests += 1
+            delay = self.latency(self._random) if self.latency is not None else 0.0
+            draw = self._random.random()
+            for fault, rate in self.rates.items():
+                if draw < rate:
+                    self.injected[fault] += 1
+                    return delay, fault
+                draw -= rate
+        return delay, None
+
+    def __fault(
+        self, request: httpx.Request, fault: str | None
+    ) -> httpx.Response | None:
+        """The response of a failed request
+
+        Parameters
+        ----------
+        request : httpx.Request
+            The request
+        fault : str | None
+            The fault
+
+        Returns
+        -------
+        httpx.Response
+            The error response, None if the request did not fail
+
+        Raises
+        ------
+        httpx.ReadError
+            If the connection is reset
+        httpx.ReadTimeout
+            If the request times out
+        """
+        if fault is None:
+            return None
+        if fault == "reset":
+            raise httpx.ReadError(
+                "[Errno 104] Connection reset by peer", request=request
+            )
+        if fault == "timeout":
+            raise httpx.ReadTimeout("The read operation timed out", request=request)
+
+        status_code, message, headers = {
+            "rate_limited": (
+                429,
+                "Too many requests",
+                {"Retry-After": f"{self.retry_after:g}"},
+            ),
+            "server_error": (500, "Internal server error", {}),
+            "unavailable": (503, "Service unavailable", {}),
+        }[fault]
+        return httpx.Response(
+            status_code=status_code,
+            content=json.dumps({"code": status_code, "message": message}).encode(),
+            headers={"Content-Type": "application/json", **headers},
+            request=request,
+        )
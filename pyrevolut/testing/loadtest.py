@@ -0,0 +1,319 @@
+from typing import Any
+from collections import Counter
+from uuid import uuid4
+import asyncio
+import math
+import random
+import time
+
+from pyrevolut.client import AsyncClient
+from pyrevolut.utils import RateLimiter
+
+OPERATIONS = (
+    "get_all_accounts",
+    "get_account",
+    "get_all_transactions",
+    "get_transaction",
+    "get_all_counterparties",
+    "create_transfer_to_another_account",
+)
+"""The endpoint methods a load test can call"""
+
+WRITE_OPERATIONS = ("create_transfer_to_another_account",)
+"""The operations moving money, which are refused against production by the CLI"""
+
+DEFAULT_MIX = (
+    "get_all_transactions=70,get_transaction=20,create_transfer_to_another_account=10"
+)
+
+
+def parse_mix(mix: str) -> dict[str, float]:
+    """Parse a mix of operations, such as "get_all_transactions=70,get_transaction=30"
+
+    Parameters
+    ----------
+    mix : str
+        The comma-separated operations with their weights. The weights are relative,
+        they do not have to add up to 100.
+
+    Returns
+    -------
+    dict[str, float]
+        The share of each operation, adding up to 1
+    """
+    weights: dict[str, float] = {}
+    for item in mix.split(","):
+        name, _, weight = item.strip().partition("=")
+        assert name in OPERATIONS, f"Unknown operation {name}, use one of {OPERATIONS}"
+        weights[name] = weights.get(name, 0.0) + float(weight or 1)
+    total = sum(weights.values())
+    assert total > 0, "The weights of the mix must add up to more than 0"
+    return {name: weight / total for name, weight in weights.items()}
+
+
+def _percentile(values: list[float], q: float) -> float:
+    """The q-th percentile of values (nearest rank), 0 if there are none"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(math.ceil(q / 100 * len(ordered)), 1) - 1]
+
+
+def _stats(latencies: list[float], errors: Counter[str], elapsed: float) -> dict:
+    """The calls, error rate, throughput and latency percentiles in ms of calls"""
+    calls = len(latencies) + sum(errors.values())
+    return {
+        "calls": calls,
+        "errors": sum(errors.values()),
+        "error_rate": round(sum(errors.values()) / calls, 4) if calls else 0.0,
+        "throughput": round(calls / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(_percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(_percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(_percentile(latencies, 99) * 1000, 2),
+        "max_ms": round(max(latencies, default=0.0) * 1000, 2),
+        "errors_by_type": dict(errors),
+    }
+
+
+class LoadTest:
+    """A load test calling a mix of endpoints of the Revolut API with an
+    asynchronous client, at a target concurrency and optionally a target rate.
+
+    The IDs used by the calls are looked up before the test starts: the accounts,
+    the transactions (to retrieve them one by one) and, for the transfers, the first
+    account in the currency of the transfers and the first counterparty.
+    Until there is a transaction to retrieve, the get_transaction calls are replaced
+    by calls of the other operations of the mix (such as the transfers creating them).
+    The latencies of the successful calls and the errors are reported per operation.
+
+    Example
+    -------
+    ```python
+    async with AsyncClient(creds_loc="credentials/creds.json") as client:
+        load_test = LoadTest(
+            client=client,
+            mix=parse_mix("get_all_transactions=70,get_transaction=30"),
+            concurrency=10,
+            duration=30,
+        )
+        report = await load_test.run()
+    ```
+    """
+
+    def __init__(
+        self,
+        client: AsyncClient,
+        mix: dict[str, float],
+        concurrency: int = 10,
+        rate: float | None = None,
+        duration: float | None = 30.0,
+        calls: int | None = None,
+        currency: str = "GBP",
+        amount: float = 0.01,
+        account_id: str | None = None,
+        counterparty_id: str | None = None,
+        seed: int | None = None,
+    ):
+        """Create a new load test
+
+        Parameters
+        ----------
+        client : AsyncClient
+            The client, with the "dict" return type.
+        mix : dict[str, float]
+            The share of each operation, as returned by `parse_mix`.
+        concurrency : int, optional
+            The number of concurrent calls, by default 10.
+        rate : float, optional
+            The target number of calls per second, by default None (as fast as
+            the concurrency allows).
+        duration : float, optional
+            The duration of the test in seconds, by default 30.
+        calls : int, optional
+            The number of calls of the test, by default None. If set, the test
+            stops after these calls even if the duration is not over.
+        currency : str, optional
+            The currency of the transfers, by default "GBP".
+        amount : float, optional
+            The amount of each transfer, by default 0.01.
+        account_id : str, optional
+            The account the transfers are made from, by default the first active
+            account in the currency.
+        counterparty_id : str, optional
+            The counterparty the transfers are made to, by default the first one.
+        seed : int, optional
+            The seed of the choice of the operations, for reproducible runs.
+        """
+        assert client.return_type == "dict", "The client must return dictionaries"
+        assert all(name in OPERATIONS for name in mix), "Unknown operation in the mix"
+        assert concurrency >= 1, "concurrency must be at least 1"
+        assert rate is None or rate > 0, "rate must be positive"
+        assert duration or calls, "Either duration or calls must be set"
+
+        self.client = client
+        self.mix = mix
+        self.concurrency = concurrency
+        self.rate = rate
+        self.duration = duration
+        self.calls = calls
+        self.currency = currency
+        self.amount = amount
+        self.account_id = account_id
+        self.counterparty_id = counterparty_id
+        self.counterparty_account_id: str | None = None
+        self.account_ids: list[str] = []
+        self.transaction_ids: list[str] = []
+        self._random = random.Random(seed)
+
+    async def setup(self):
+        """Look up the IDs used by the operations of the mix
+
+        Returns
+        -------
+        None
+        """
+        accounts = await self.client.Accounts.get_all_accounts()
+        self.account_ids = [str(account["id"]) for account in accounts]
+        assert self.account_ids, "There are no accounts"
+
+        if "get_transaction" in self.mix:
+            transactions = await self.client.Transactions.get_all_transactions(
+                limit=1000
+            )
+            self.transaction_ids = [str(item["id"]) for item in transactions]
+            assert (
+                self.transaction_ids or "create_transfer_to_another_account" in self.mix
+            ), "There are no transactions to retrieve"
+
+        if "create_transfer_to_another_account" in self.mix:
+            if self.account_id is None:
+                self.account_id = next(
+                    (
+                        str(account["id"])
+                        for account in accounts
+                        if account["currency"] == self.currency
+                        and account["state"] == "active"
+                    ),
+                    None,
+                )
+                assert self.account_id, f"There is no active {self.currency} account"
+            if self.counterparty_id is None:
+                counterparties = (
+                    await self.client.Counterparties.get_all_counterparties(limit=1)
+                )
+                assert counterparties, "There are no counterparties to transfer to"
+                self.counterparty_id = str(counterparties[0]["id"])
+            counterparty = await self.client.Counterparties.get_counterparty(
+                counterparty_id=self.counterparty_id
+            )
+            self.counterparty_account_id = next(
+                (
+                    str(account["id"])
+                    for account in counterparty.get("accounts") or []
+                    if account.get("currency") == self.currency
+                ),
+                None,
+            )
+
+    async def run(self) -> dict[str, Any]:
+        """Set up and run the load test
+
+        Returns
+        -------
+        dict[str, Any]
+            The report of the test: the settings, the totals and the calls, error
+            rate, throughput and latency percentiles (in ms) of each operation
+        """
+        await self.setup()
+
+        names = list(self.mix)
+        weights = list(self.mix.values())
+        # The operations to call while there are no transactions to retrieve
+        others = [name for name in names if name != "get_transaction"]
+        other_weights = [self.mix[name] for name in others]
+        limiter = (
+            RateLimiter(rate=self.rate, name="loadtest")
+            if self.rate is not None
+            else None
+        )
+        latencies: dict[str, list[float]] = {name: [] for name in names}
+        errors: dict[str, Counter[str]] = {name: Counter() for name in names}
+        remaining = iter(range(self.calls)) if self.calls else None
+        start = time.perf_counter()
+        deadline = start + self.duration if self.duration else math.inf
+
+        async def worker():
+            while time.perf_counter() < deadline:
+                if remaining is not None and next(remaining, None) is None:
+                    return
+                if limiter is not None:
+                    await limiter.acquire()
+                name = self._random.choices(names, weights)[0]
+                if name == "get_transaction" and not self.transaction_ids:
+                    name = self._random.choices(others, other_weights)[0]
+                call_start = time.perf_counter()
+                try:
+                    await self.__call(name)
+                except Exception as exc:
+                    errors[name][type(exc).__name__] += 1
+                    continue
+                latencies[name].append(time.perf_counter() - call_start)
+
+        await asyncio.gather(*(worker() for _ in range(self.concurrency)))
+        elapsed = time.perf_counter() - start
+
+        return {
+            "concurrency": self.concurrency,
+            "rate": self.rate,
+            "mix": self.mix,
+            "elapsed_s": round(elapsed, 3),
+            **_stats(
+                latencies=[value for values in latencies.values() for value in values],
+                errors=sum(errors.values(), Counter()),
+                elapsed=elapsed,
+            ),
+            "operations": {
+                name: _stats(
+                    latencies=latencies[name], errors=errors[name], elapsed=elapsed
+                )
+                for name in names
+            },
+        }
+
+    async def __call(self, name: str):
+        """Make one call of an operation
+
+        Parameters
+        ----------
+        name : str
+            The operation
+
+        Returns
+        -------
+        None
+        """
+        if name == "get_all_accounts":
+            await self.client.Accounts.get_all_accounts()
+        elif name == "get_account":
+            await self.client.Accounts.get_account(
+                account_id=self._random.choice(self.account_ids)
+            )
+        elif name == "get_all_transactions":
+            await self.client.Transactions.get_all_transactions(limit=100)
+        elif name == "get_transaction":
+            await self.client.Transactions.get_transaction(
+                transaction_id=self._random.choice(self.transaction_ids)
+            )
+        elif name == "get_all_counterparties":
+            await self.client.Counterparties.get_all_counterparties(limit=100)
+        elif name == "create_transfer_to_another_account":
+            transfer = await self.client.Transfers.create_transfer_to_another_account(
+                request_id=uuid4().hex,
+                account_id=self.account_id,
+                counterparty_id=self.counterparty_id,
+                counterparty_account_id=self.counterparty_account_id,
+                amount=self.amount,
+                currency=self.currency,
+                reference="pyrevolut load test",
+            )
+            self.transaction_ids.append(str(transfer["id"]))
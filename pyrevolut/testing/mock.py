@@ -0,0 +1,176 @@
+from typing import Any
+from collections import Counter
+import json
+
+import httpx
+
+from pyrevolut.testing.endpoints import EndpointSpec, discover_endpoints
+from pyrevolut.testing.payloads import PayloadGenerator
+
+
+class MockRevolut:
+    """A stateless stand-in for the Revolut API that answers every endpoint with
+    generated payloads of the recorded response shapes.
+
+    The payloads are generated (and serialized) once per endpoint and page size,
+    so serving a request costs little more than matching its route; this makes
+    it suited to measuring the overhead of the client itself.
+    List endpoints return `page_size` items, or fewer if the request asks for
+    fewer with its `count` or `limit` query parameter.
+
+    Example
+    -------
+    ```python
+    mock = MockRevolut(page_size=100)
+    client = Client(creds=fake_credentials(), transport=mock.transport())
+
+    with client:
+        transactions = client.Transactions.get_all_transactions()
+    ```
+    """
+
+    def __init__(self, page_size: int = 100, seed: int = 0, list_size: int = 2):
+        """Create a new mock of the Revolut API
+
+        Parameters
+        ----------
+        page_size : int, optional
+            The number of items returned by the list endpoints, by default 100.
+        seed : int, optional
+            The seed of the generated payloads, by default 0.
+        list_size : int, optional
+            The number of items of the list fields of the payloads (such as the legs
+            of a transaction), by default 2.
+        """
+        assert page_size >= 0, "page_size must not be negative"
+
+        self.page_size = page_size
+        self.specs = discover_endpoints()
+        self.calls: Counter[str] = Counter()
+        self._generator = PayloadGenerator(seed=seed, list_size=list_size)
+        self._items: dict[str, list[dict[str, Any]]] = {}
+        self._bodies: dict[tuple[str, int], bytes] = {}
+
+    def match(self, method: str, path: str) -> EndpointSpec | None:
+        """The endpoint of a request
+
+        Parameters
+        ----------
+        method : str
+            The HTTP method of the request.
+        path : str
+            The path of the request, with or without the "/api" prefix.
+
+        Returns
+        -------
+        EndpointSpec | None
+            The endpoint, None if no endpoint matches
+        """
+        path = path.removeprefix("/api")
+        for spec in self.specs:
+            if spec.matches(method=method, path=path):
+                return spec
+        return None
+
+    def body(self, spec: EndpointSpec, count: int | None = None) -> bytes:
+        """The serialized response of an endpoint
+
+        Parameters
+        ----------
+        spec : EndpointSpec
+            The endpoint.
+        count : int, optional
+            The number of items of a list endpoint, by default the page size.
+
+        Returns
+        -------
+        bytes
+            The JSON response body, empty if the endpoint has no response fields
+        """
+        count = self.page_size if count is None else min(count, self.page_size)
+        key = (spec.name, count if spec.returns_list else 1)
+        body = self._bodies.get(key)
+        if body is not None:
+            return body
+
+        model = spec.response_model
+        if model is None or not model.model_fields:
+            body = b""
+        else:
+            items = self._items.get(spec.name)
+            if items is None:
+                items = self._items[spec.name] = self._generator.generate_many(
+                    model=model, count=max(self.page_size, 1)
+                )
+            data = items[:count] if spec.returns_list else items[0]
+            body = json.dumps(data).encode()
+        self._bodies[key] = body
+        return body
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        """Answer a request
+
+        Parameters
+        ----------
+        request : httpx.Request
+            The request.
+
+        Returns
+        -------
+        httpx.Response
+            The response: the generated payload of the endpoint, or a 404 error
+        """
+        spec = self.match(method=request.method, path=request.url.path)
+        if spec is None:
+            return httpx.Response(
+                status_code=404, json={"code": 404, "message": "Not found"}
+            )
+        self.calls[spec.name] += 1
+
+        count = request.url.params.get("count") or request.url.params.get("limit")
+        body = self.body(spec=spec, count=int(count) if count else None)
+        if not body:
+            return httpx.Response(status_code=204)
+        return httpx.Response(
+            status_code=200,
+            content=body,
+            headers={"Content-Type": "application/json"},
+        )
+
+    def transport(self) -> httpx.MockTransport:
+        """An HTTPX transport answering the requests with this mock.
+        It works with both the synchronous and the asynchronous clients.
+
+        Returns
+        -------
+        httpx.MockTransport
+            The transport
+        """
+        return httpx.MockTransport(self.handler)
+
+
+def fake_credentials() -> dict[str, Any]:
+    """Credentials that never expire, for clients sending their requests to a
+    mock or a fake of the Revolut API
+
+    Returns
+    -------
+    dict[str, Any]
+        The credentials, to pass as the `creds` of a client
+    """
+    expiration_dt = "2999-01-01T00:00:00Z"
+    return {
+        "certificate": {
+            "public": "fake-public-key",
+            "private": "fake-private-key",
+            "expiration_dt": expiration_dt,
+        },
+        "client_assert_jwt": {"jwt": "fake-jwt", "expiration_dt": expiration_dt},
+        "tokens": {
+            "access_token": "fake-access-token",
+            "refresh_token": "fake-refresh-token",
+            "token_type": "bearer",
+            "access_token_expiration_dt": expiration_dt,
+            "refresh_token_expiration_dt": expiration_dt,
+        },
+    }
@@ -0,0 +1,411 @@
+from typing import Annotated, Any, Literal, Type, Union, get_args, get_origin
+from datetime import date, datetime, timedelta, timezone
+from enum import Enum
+from types import NoneType, UnionType
+from uuid import UUID
+import inspect
+import random
+
+import annotated_types
+from pydantic import BaseModel, EmailStr, HttpUrl, ValidationError
+from pydantic_extra_types.country import CountryAlpha2, CountryAlpha3
+from pydantic_extra_types.currency_code import Currency
+from pydantic_extra_types.pendulum_dt import Duration
+from pydantic_extra_types.phone_numbers import PhoneNumber
+
+
+# Realistic values of the string fields, by field name
+_STRING_VALUES = {
+    "iban": "GB82WEST12345698765432",
+    "bic": "REVOGB21",
+    "account_no": "12345678",
+    "sort_code": "040075",
+    "routing_number": "021000021",
+    "clabe": "032180000118359719",
+    "ifsc": "SBIN0005943",
+    "bsb_code": "062000",
+    "revtag": "john1pvki",
+    "postcode": "EC1V 2NX",
+    "city": "London",
+    "region": "Greater London",
+    "street_line1": "7 Westferry Circus",
+    "street_line2": "Canary Wharf",
+    "reference": "Invoice 2024-0042",
+    "description": "Payment for services",
+    "merchant_name": "Coffee Shop",
+    "first_name": "Jane",
+    "last_name": "Doe",
+    "company_name": "Acme Ltd",
+    "name": "Jane Doe",
+    "title": "Monthly payouts",
+    "label": "Marketing",
+    "last_digits": "1234",
+    "pan": "4111111111111111",
+    "cvv": "123",
+    "expiry": "12/29",
+    "signing_secret": "wsk_r59a4HfWVAKycbCaNO1RvgCJec02gRd8",
+    "url": "https://example.com/webhooks",
+    "payout_link_url": "https://business.revolut.com/payout-links/ab12cd34",
+}
+
+_CURRENCIES = ["GBP", "EUR", "USD", "CHF", "PLN", "SEK"]
+_EPOCH = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+class PayloadGenerator:
+    """Generates realistic JSON payloads (as the Revolut API sends and accepts
+    them) for the Pydantic models of the package.
+
+    The fields are filled from their types and constraints: UUIDs, ISO 8601 dates,
+    currency and country codes, enum values, amounts within their bounds, and
+    realistic strings for the usual field names (IBANs, sort codes, names, ...).
+    The payloads use the field aliases, so they can be validated by the models.
+
+    Example
+    -------
+    ```python
+    generator = PayloadGenerator(seed=42)
+    payload = generator.generate_valid(ResourceTransaction)
+    transaction = ResourceTransaction(**payload)
+    ```
+    """
+
+    def __init__(self, seed: int | None = None, list_size: int = 2):
+        """Create a new payload generator
+
+        Parameters
+        ----------
+        seed : int, optional
+            The seed of the random values, for reproducible payloads.
+        list_size : int, optional
+            The number of items of the list fields, by default 2.
+        """
+        assert list_size >= 0, "list_size must not be negative"
+
+        self.list_size = list_size
+        self._random = random.Random(seed)
+
+    def generate(self, model: Type[BaseModel], full: bool = True) -> dict[str, Any]:
+        """Generate a payload for a model, without validating it
+
+        Parameters
+        ----------
+        model : Type[BaseModel]
+            The Pydantic model.
+        full : bool, optional
+            Whether to fill all the optional fields, by default True.
+            If False, each optional field is left out at random and a random
+            member of each union is used.
+
+        Returns
+        -------
+        dict[str, Any]
+            The JSON payload
+        """
+        payload = {}
+        for name, field in model.model_fields.items():
+            optional = not field.is_required()
+            if optional and not full and self._random.random() < 0.5:
+                continue
+            key = field.validation_alias or field.alias or name
+            payload[key if isinstance(key, str) else name] = self.__value(
+                annotation=field.annotation,
+                name=name,
+                metadata=list(field.metadata),
+                full=full,
+            )
+        return payload
+
+    def generate_valid(
+        self, model: Type[BaseModel], attempts: int = 100
+    ) -> dict[str, Any]:
+        """Generate a payload that is valid for a model.
+
+        The first attempt fills all the optional fields. As the models can have
+        cross-field validators (such as "either the amount to sell or the amount
+        to buy"), the next attempts leave out optional fields and pick union
+        members at random until the payload is valid.
+
+        Parameters
+        ----------
+        model : Type[BaseModel]
+            The Pydantic model.
+        attempts : int, optional
+            The maximum number of payloads generated, by default 100.
+
+        Returns
+        -------
+        dict[str, Any]
+            The JSON payload
+
+        Raises
+        ------
+        ValueError
+            If no valid payload was generated
+        """
+        error: Exception | None = None
+        for attempt in range(attempts):
+            payload = self.generate(model=model, full=attempt == 0)
+            try:
+                model.model_validate(payload)
+                return payload
+            except (ValidationError, ValueError, AssertionError) as exc:
+                error = exc
+        raise ValueError(
+            f"Could not generate a valid payload for {model.__qualname__}: {error}"
+        )
+
+    def generate_many(
+        self, model: Type[BaseModel], count: int, start: datetime | None = None
+    ) -> list[dict[str, Any]]:
+        """Generate a page of valid payloads with distinct IDs, in reverse
+        chronological order of creation (as the API lists them)
+
+        Parameters
+        ----------
+        model : Type[BaseModel]
+            The Pydantic model.
+        count : int
+            The number of payloads.
+        start : datetime, optional
+            The creation date of the first (most recent) payload, by default 2024-01-01.
+
+        Returns
+        -------
+        list[dict[str, Any]]
+            The JSON payloads
+        """
+        template = self.generate_valid(model=model)
+        start = start or _EPOCH
+        payloads = []
+        for i in range(count):
+            payload = dict(template)
+            if "id" in payload:
+                payload["id"] = str(self.uuid())
+            created_at = _format_datetime(start - timedelta(minutes=i))
+            for key in ("created_at", "updated_at"):
+                if key in payload:
+                    payload[key] = created_at
+            payloads.append(payload)
+        return payloads
+
+    def uuid(self) -> UUID:
+        """A random (version 4) UUID
+
+        Returns
+        -------
+        UUID
+            The UUID
+        """
+        return UUID(int=self._random.getrandbits(128), version=4)
+
+    def __value(
+        self, annotation: Any, name: str, metadata: list[Any], full: bool
+    ) -> Any:
+        """Generate the JSON value of an annotation
+
+        Parameters
+        ----------
+        annotation : Any
+            The type annotation
+        name : str
+            The name of the field
+        metadata : list[Any]
+            The constraints of the field
+        full : bool
+            Whether to fill all the optional fields
+
+        Returns
+        -------
+        Any
+            The JSON value
+        """
+        origin = get_origin(annotation)
+        args = get_args(annotation)
+        if origin is Annotated:
+            return self.__value(
+                annotation=args[0],
+                name=name,
+                metadata=metadata + list(args[1:]),
+                full=full,
+            )
+        if origin in (Union, UnionType):
+            members = [arg for arg in args if arg is not NoneType]
+            if not members:
+                return None
+            member = members[0] if full else self._random.choice(members)
+            return self.__value(
+                annotation=member, name=name, metadata=metadata, full=full
+            )
+        if origin is Literal:
+            values = [arg for arg in args if arg != "null"] or list(args)
+            return self._random.choice(values)
+        if origin in (list, set, frozenset, tuple):
+            return [
+                self.__value(annotation=args[0], name=name, metadata=[], full=full)
+                for _ in range(self.list_size)
+            ]
+        if origin is dict:
+            return {}
+        if annotation is NoneType or annotation is Any:
+            return None
+        return self.__scalar(
+            annotation=annotation, name=name, metadata=metadata, full=full
+        )
+
+    def __scalar(
+        self, annotation: Any, name: str, metadata: list[Any], full: bool
+    ) -> Any:
+        """Generate the JSON value of a non-generic type
+
+        Parameters
+        ----------
+        annotation : Any
+            The type
+        name : str
+            The name of the field
+        metadata : list[Any]
+            The constraints of the field
+        full : bool
+            Whether to fill all the optional fields
+
+        Returns
+        -------
+        Any
+            The JSON value
+        """
+        if not inspect.isclass(annotation):
+            return None
+        if issubclass(annotation, BaseModel):
+            return self.generate(model=annotation, full=full)
+        if issubclass(annotation, Enum):
+            return self._random.choice(list(annotation)).value
+        if issubclass(annotation, bool):
+            return self._random.random() < 0.5
+        if issubclass(annotation, int):
+            low, high = _bounds(metadata=metadata, default=(1, 100))
+            return self._random.randint(int(low), int(high))
+        if issubclass(annotation, float):
+            low, high = _bounds(metadata=metadata, default=(1.0, 1000.0))
+            return round(self._random.uniform(low, high), 2)
+        if issubclass(annotation, UUID):
+            return str(self.uuid())
+        if issubclass(annotation, datetime):
+            moment = _EPOCH + timedelta(seconds=self._random.randint(0, 31_536_000))
+            return _format_datetime(moment)
+        if issubclass(annotation, date):
+            day = _EPOCH.date() + timedelta(days=self._random.randint(0, 365))
+            return day.isoformat()
+        if issubclass(annotation, (timedelta, Duration)):
+            return f"P{self._random.randint(1, 30)}D"
+        if issubclass(annotation, Currency):
+            return self._random.choice(_CURRENCIES)
+        if issubclass(annotation, CountryAlpha2):
+            return "GB"
+        if issubclass(annotation, CountryAlpha3):
+            return "GBR"
+        if issubclass(annotation, PhoneNumber):
+            return "+442071234567"
+        if annotation is EmailStr:
+            return f"{name.split('_')[0]}{self._random.randint(1, 999)}@example.com"
+        if annotation is HttpUrl:
+            return _STRING_VALUES["url"]
+        if issubclass(annotation, str):
+            return _string(name=name, metadata=metadata, n=self._random.randint(1, 99))
+        return None
+
+
+def generate_payload(
+    model: Type[BaseModel], seed: int | None = None, list_size: int = 2
+) -> dict[str, Any]:
+    """Generate a realistic, valid JSON payload for a model
+
+    Parameters
+    ----------
+    model : Type[BaseModel]
+        The Pydantic model.
+    seed : int, optional
+        The seed of the random values, for reproducible payloads.
+    list_size : int, optional
+        The number of items of the list fields, by default 2.
+
+    Returns
+    -------
+    dict[str, Any]
+        The JSON payload
+    """
+    return PayloadGenerator(seed=seed, list_size=list_size).generate_valid(model=model)
+
+
+def _bounds(metadata: list[Any], default: tuple[float, float]) -> tuple[float, float]:
+    """The range of a number from its constraints
+
+    Parameters
+    ----------
+    metadata : list[Any]
+        The constraints of the field
+    default : tuple[float, float]
+        The range without constraints
+
+    Returns
+    -------
+    tuple[float, float]
+        The lowest and highest values
+    """
+    low, high = default
+    for constraint in metadata:
+        if isinstance(constraint, annotated_types.Ge):
+            low = constraint.ge
+        elif isinstance(constraint, annotated_types.Gt):
+            low = constraint.gt + 1
+        elif isinstance(constraint, annotated_types.Le):
+            high = constraint.le
+        elif isinstance(constraint, annotated_types.Lt):
+            high = constraint.lt - 1
+    if high < low:
+        high = low
+    return low, min(high, max(low, default[1]))
+
+
+def _string(name: str, metadata: list[Any], n: int) -> str:
+    """A realistic string for a field
+
+    Parameters
+    ----------
+    name : str
+        The name of the field
+    metadata : list[Any]
+        The constraints of the field
+    n : int
+        A random number to make the string unique
+
+    Returns
+    -------
+    str
+        The string
+    """
+    value = _STRING_VALUES.get(name)
+    if value is None:
+        value = f"{name.replace('_', ' ').strip().capitalize()} {n}"
+    for constraint in metadata:
+        if isinstance(constraint, annotated_types.MaxLen):
+            value = value[: constraint.max_length]
+        elif isinstance(constraint, annotated_types.MinLen):
+            value = value.ljust(constraint.min_length, "x")
+    return value
+
+
+def _format_datetime(moment: datetime) -> str:
+    """Format a date as the Revolut API does
+
+    Parameters
+    ----------
+    moment : datetime
+        The date in UTC
+
+    Returns
+    -------
+    str
+        The date in ISO 8601 format, such as "2024-01-01T10:00:00.000000Z"
+    """
+    return moment.strftime("%Y-%m-%dT%H:%M:%S.%fZ")
@@ -1,3 +1,4 @@
 # flake8: noqa: F401
 from .date import Date
 from .datetime import DateTime
+from .rate_limit import RateLimiter
@@ -17,6 +17,7 @@ def refresh_access_token(
     refresh_token: str,
     client_assert_jwt: str,
     sandbox: bool = True,
+    base_url: str | None = None,
 ):
     """
     Method to get a new access token via the refresh token.
@@ -32,6 +33,9 @@ def refresh_access_token(
     sandbox : bool, optional
         Whether to use the sandbox environment.
         Default is True.
+    base_url : str, optional
+        The root URL of the API, such as "http://localhost:8000/api".
+        Default is the URL of the environment.
 
     Returns
     -------
@@ -43,6 +47,7 @@ def refresh_access_token(
             refresh_token=refresh_token,
             client_assert_jwt=client_assert_jwt,
             sandbox=sandbox,
+            base_url=base_url,
         )
     )
     return ModelRefreshAccessTokenResponse(**response.json())
@@ -53,6 +58,7 @@ async def arefresh_access_token(
     refresh_token: str,
     client_assert_jwt: str,
     sandbox: bool = True,
+    base_url: str | None = None,
 ):
     """
     Method to get a new access token via the refresh token.
@@ -68,6 +74,9 @@ async def arefresh_access_token(
     sandbox : bool, optional
         Whether to use the sandbox environment.
         Default is True.
+    base_url : str, optional
+        The root URL of the API, such as "http://localhost:8000/api".
+        Default is the URL of the environment.
 
     Returns
     -------
@@ -79,6 +88,7 @@ async def arefresh_access_token(
             refresh_token=refresh_token,
             client_assert_jwt=client_assert_jwt,
             sandbox=sandbox,
+            base_url=base_url,
         )
     )
     return ModelRefreshAccessTokenResponse(**response.json())
@@ -88,6 +98,7 @@ def prep_refresh_access_token(
     refresh_token: str,
     client_assert_jwt: str,
     sandbox: bool = True,
+    base_url: str | None = None,
 ):
     """
     Method to prepare the arguments for refreshing the access token functions.
@@ -101,13 +112,18 @@ def prep_refresh_access_token(
     sandbox : bool, optional
         Whether to use the sandbox environment.
         Default is True.
+    base_url : str, optional
+        The root URL of the API, such as "http://localhost:8000/api".
+        Default is the URL of the environment.
 
     Returns
     -------
     dict
         The arguments to be passed to the HTTPX client POST method.
     """
-    if sandbox:
+    if base_url is not None:
+        url = f"{base_url.rstrip('/')}/1.0/auth/token"
+    elif sandbox:
         url = "https://sandbox-b2b.revolut.com/api/1.0/auth/token"
     else:
         url = "https://b2b.revolut.com/api/1.0/auth/token"
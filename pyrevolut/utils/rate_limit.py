@@ -0,0 +1,101 @@
+import asyncio
+import threading
+import time
+import weakref
+
+
+class RateLimiter:
+    """A token bucket rate limiter shared by sync threads and async tasks.
+
+    Every call reserves the next free slot under a lock and then sleeps until
+    that slot outside of the lock, so waiting callers are served in order and
+    the lock is never held while sleeping.
+
+    Example
+    -------
+    ```python
+    limiter = RateLimiter(rate=10, burst=5)
+
+    async def call():
+        await limiter.acquire()
+        return await client.Transactions.get_transaction(transaction_id=...)
+    ```
+    """
+
+    # All the live rate limiters, for the queue depth metrics
+    instances: "weakref.WeakSet[RateLimiter]" = weakref.WeakSet()
+
+    def __init__(self, rate: float, burst: int = 1, name: str = "default"):
+        """Create a new rate limiter
+
+        Parameters
+        ----------
+        rate : float
+            The maximum number of calls per second.
+        burst : int, optional
+            The number of calls that can be made at once after an idle period,
+            by default 1.
+        name : str, optional
+            The name of the rate limiter in the metrics, by default "default".
+        """
+        assert rate > 0, "rate must be positive"
+        assert burst >= 1, "burst must be at least 1"
+
+        self.rate = rate
+        self.burst = burst
+        self.name = name
+        self._tokens = float(burst)
+        self._updated_at = time.monotonic()
+        self._waiting = 0
+        self._lock = threading.Lock()
+        RateLimiter.instances.add(self)
+
+    @property
+    def waiting(self) -> int:
+        """The number of callers waiting for a slot (the queue depth)
+
+        Returns
+        -------
+        int
+            The number of waiting callers
+        """
+        return self._waiting
+
+    def reserve(self) -> float:
+        """Reserve the next slot without waiting for it
+
+        Returns
+        -------
+        float
+            The number of seconds until the reserved slot
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                float(self.burst), self._tokens + (now - self._updated_at) * self.rate
+            )
+            self._updated_at = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    async def acquire(self):
+        """Wait (asynchronously) for the next slot"""
+        delay = self.reserve()
+        if delay > 0:
+            self._waiting += 1
+            try:
+                await asyncio.sleep(delay)
+            finally:
+                self._waiting -= 1
+
+    def acquire_sync(self):
+        """Wait (blocking) for the next slot"""
+        delay = self.reserve()
+        if delay > 0:
+            self._waiting += 1
+            try:
+                time.sleep(delay)
+            finally:
+                self._waiting -= 1
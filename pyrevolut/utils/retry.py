@@ -0,0 +1,144 @@
+from typing import Any, Awaitable, Callable, TypeVar
+import asyncio
+import random
+import time
+
+from pydantic import BaseModel
+
+from pyrevolut.exceptions import (
+    PyRevolutTimeoutError,
+    PyRevolutNetworkError,
+    PyRevolutTooManyRequests,
+    PyRevolutInternalServerError,
+    PyRevolutServerUnavailable,
+)
+
+T = TypeVar("T")
+
+RETRYABLE_ERRORS = (
+    PyRevolutTimeoutError,
+    PyRevolutNetworkError,
+    PyRevolutTooManyRequests,
+    PyRevolutInternalServerError,
+    PyRevolutServerUnavailable,
+)
+"""The transient errors after which a request can be sent again (with backoff)."""
+
+
+def backoff_delay(
+    attempt: int, backoff: float = 1.0, max_backoff: float = 30.0
+) -> float:
+    """The delay before a retry, using exponential backoff with full jitter
+
+    Parameters
+    ----------
+    attempt : int
+        The number of the attempt that failed, starting at 1
+    backoff : float, optional
+        The base delay in seconds, by default 1.0
+    max_backoff : float, optional
+        The maximum delay in seconds, by default 30.0
+
+    Returns
+    -------
+    float
+        The number of seconds to wait
+    """
+    return random.uniform(0, min(max_backoff, backoff * 2 ** (attempt - 1)))
+
+
+async def retry_async(
+    fn: Callable[[], Awaitable[T]],
+    max_retries: int = 3,
+    backoff: float = 1.0,
+    max_backoff: float = 30.0,
+    retry_on: tuple[type[Exception], ...] = RETRYABLE_ERRORS,
+) -> tuple[T, int]:
+    """Await a coroutine function, retrying it with backoff on transient errors
+
+    Parameters
+    ----------
+    fn : Callable[[], Awaitable[T]]
+        The coroutine function to call
+    max_retries : int, optional
+        The maximum number of retries, by default 3
+    backoff : float, optional
+        The base delay in seconds, by default 1.0
+    max_backoff : float, optional
+        The maximum delay in seconds, by default 30.0
+    retry_on : tuple[type[Exception], ...], optional
+        The errors to retry on, by default the transient API errors
+
+    Returns
+    -------
+    tuple[T, int]
+        The result and the number of attempts it took
+    """
+    attempt = 1
+    while True:
+        try:
+            return await fn(), attempt
+        except retry_on:
+            if attempt > max_retries:
+                raise
+        await asyncio.sleep(backoff_delay(attempt, backoff, max_backoff))
+        attempt += 1
+
+
+def retry_sync(
+    fn: Callable[[], T],
+    max_retries: int = 3,
+    backoff: float = 1.0,
+    max_backoff: float = 30.0,
+    retry_on: tuple[type[Exception], ...] = RETRYABLE_ERRORS,
+) -> tuple[T, int]:
+    """Call a function, retrying it with backoff on transient errors
+
+    Parameters
+    ----------
+    fn : Callable[[], T]
+        The function to call
+    max_retries : int, optional
+        The maximum number of retries, by default 3
+    backoff : float, optional
+        The base delay in seconds, by default 1.0
+    max_backoff : float, optional
+        The maximum delay in seconds, by default 30.0
+    retry_on : tuple[type[Exception], ...], optional
+        The errors to retry on, by default the transient API errors
+
+    Returns
+    -------
+    tuple[T, int]
+        The result and the number of attempts it took
+    """
+    attempt = 1
+    while True:
+        try:
+            return fn(), attempt
+        except retry_on:
+            if attempt > max_retries:
+                raise
+        time.sleep(backoff_delay(attempt, backoff, max_backoff))
+        attempt += 1
+
+
+def as_dict(response: Any) -> Any:
+    """Convert an API response in any of the client return types to a dictionary
+    (or a list of dictionaries)
+
+    Parameters
+    ----------
+    response : Any
+        The response as a raw dict, a dict or a Pydantic model (or a list of them)
+
+    Returns
+    -------
+    Any
+        The response as a dictionary (or a list of dictionaries)
+    """
+    if isinstance(response, BaseModel):
+        return response.model_dump()
+    if isinstance(response, list):
+        return [as_dict(item) for item in response]
+    return response
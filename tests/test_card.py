@@ -3,8 +3,15 @@ import asyncio
 import pytest
 import random
 
+from uuid import uuid4
+
 from pyrevolut.client import Client, AsyncClient
-from pyrevolut.exceptions import PyRevolutInvalidEnvironment
+from pyrevolut.api.cards import EndpointCardsSync, EndpointCardsAsync
+from pyrevolut.exceptions import (
+    PyRevolutInvalidEnvironment,
+    PyRevolutNotFound,
+    PyRevolutServerUnavailable,
+)
 
 
 def test_sync_get_all_cards(sync_client: Client):
@@ -189,3 +196,129 @@ async def test_async_update_card(async_client: AsyncClient):
 async def test_async_delete_card(async_client: AsyncClient):
     """Test the async `delete_card` cards method"""
     # TODO: Implement this test
+
+
+@pytest.mark.asyncio
+async def test_bulk_card_operations():
+    """Test the bulk card operations select, retry and report per card offline"""
+    holder_id = str(uuid4())
+    missing_id = str(uuid4())
+
+    class FakeClient:
+        """Serves 150 cards, fails every first request on a card once with a 503
+        and does not find the missing card."""
+
+        sandbox = False
+
+        def __init__(self):
+            self.cards = [
+                {
+                    "id": str(uuid4()),
+                    "state": "active" if i % 3 else "frozen",
+                    "holder_id": holder_id if i % 2 else str(uuid4()),
+                    "virtual": True,
+                    "accounts": [],
+                    "created_at": f"2024-01-01T00:{i // 60:02d}:{i % 60:02d}Z",
+                }
+                for i in range(150)
+            ][::-1]
+            self.failed = set()
+            self.requests = []
+
+        def __request(self, method: str, path: str, body=None):
+            self.requests.append((method, path))
+            if path not in self.failed:
+                self.failed.add(path)
+                raise PyRevolutServerUnavailable()
+            if path.endswith(missing_id):
+                raise PyRevolutNotFound()
+            if method == "post" and path.endswith("/cards"):
+                return {"id": str(uuid4()), "label": body.label}
+            if method == "patch":
+                return {"id": path.split("/")[-1], "label": body.label}
+            return {}
+
+        def get(self, path: str, params, **kwargs):
+            return [
+                card
+                for card in self.cards
+                if params.created_before is None
+                or card["created_at"] < params.created_before.to_iso8601_string()
+            ][: params.limit]
+
+        def post(self, path: str, body, **kwargs):
+            return self.__request("post", path, body)
+
+        def patch(self, path: str, body, **kwargs):
+            return self.__request("patch", path, body)
+
+        def delete(self, path: str, **kwargs):
+            return self.__request("delete", path)
+
+    class FakeAsyncClient(FakeClient):
+        """The async version of the fake client"""
+
+        async def get(self, path: str, params, **kwargs):
+            return FakeClient.get(self, path=path, params=params, **kwargs)
+
+        async def post(self, path: str, body, **kwargs):
+            return FakeClient.post(self, path=path, body=body, **kwargs)
+
+        async def patch(self, path: str, body, **kwargs):
+            return FakeClient.patch(self, path=path, body=body, **kwargs)
+
+        async def delete(self, path: str, **kwargs):
+            return FakeClient.delete(self, path=path, **kwargs)
+
+    for client in (FakeClient(), FakeAsyncClient()):
+        if isinstance(client, FakeAsyncClient):
+            endpoint = EndpointCardsAsync(client=client)
+
+            async def run(method: str, **kwargs):
+                return await asyncio.wait_for(
+                    getattr(endpoint, method)(backoff=0.0, **kwargs), timeout=10
+                )
+
+        else:
+            endpoint = EndpointCardsSync(client=client)
+
+            async def run(method: str, **kwargs):
+                return getattr(endpoint, method)(backoff=0.0, **kwargs)
+
+        # Freeze the active cards of the holder
+        results = await run(
+            "freeze_cards", card_filter={"state": "active", "holder_id": holder_id}
+        )
+        expected = [
+            card["id"]
+            for card in client.cards
+            if card["state"] == "active" and card["holder_id"] == holder_id
+        ]
+        assert [str(result.card_id) for result in results] == expected
+        assert all(result.status == "succeeded" for result in results)
+        assert all(result.attempts == 2 for result in results)
+
+        # Update by ID, with a missing card
+        card_ids = [client.cards[0]["id"], missing_id]
+        results = await run("update_cards", card_ids=card_ids, label="Ops")
+        assert results[0].status == "succeeded"
+        assert results[0].card["label"] == "Ops"
+        assert results[1].status == "failed"
+        assert results[1].error.startswith("PyRevolutNotFound")
+
+        # Create cards with their own request IDs
+        results = await run(
+            "create_cards",
+            cards=[
+                {"holder_id": holder_id, "label": "New 1", "request_id": "card-1"},
+                {"holder_id": holder_id, "label": "New 2"},
+            ],
+            max_concurrency=1,
+        )
+        assert [result.status for result in results] == ["succeeded"] * 2
+        assert results[0].request_id == "card-1"
+        assert results[1].request_id is not None
+        assert [result.card["label"] for result in results] == ["New 1", "New 2"]
+
+        with pytest.raises(AssertionError):
+            await run("delete_cards")
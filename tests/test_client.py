@@ -1,11 +1,54 @@
+import json
+import os
 import time
 import asyncio
 import pytest
 import random
+import threading
+from uuid import uuid4
 
-from pyrevolut.client import Client, AsyncClient
+import httpx
+from typer.testing import CliRunner
+
+from benchmarks.memory import measure as measure_memory
+from pyrevolut.client import (
+    Client,
+    AsyncClient,
+    MetricsRegistry,
+    SampledProfiler,
+    render_prometheus,
+    route_template,
+)
 from pyrevolut.api.accounts.get import RetrieveAllAccounts, RetrieveAnAccount
 from pyrevolut.utils.auth.creds import ModelCreds
+from pyrevolut.utils import RateLimiter
+from pyrevolut.exceptions import (
+    PyRevolutBadRequest,
+    PyRevolutInternalServerError,
+    PyRevolutNetworkError,
+    PyRevolutNotFound,
+    PyRevolutServerUnavailable,
+    PyRevolutTimeoutError,
+    PyRevolutTooManyRequests,
+)
+from pyrevolut.utils.retry import retry_sync
+from pyrevolut.api.webhooks import WebhookVerifier
+from pyrevolut.cli.main import app as cli_app
+from pyrevolut.testing import (
+    Cassette,
+    CassetteMismatchError,
+    FakeRevolut,
+    FaultInjectingTransport,
+    constant_latency,
+    LoadTest,
+    MockRevolut,
+    RecordingTransport,
+    ReplayTransport,
+    discover_endpoints,
+    fake_credentials,
+    generate_payload,
+    parse_mix,
+)
 
 
 def test_sync_return_type(sync_client: Client):
@@ -139,3 +182,515 @@ def test_custom_save_and_load_functions():
 
     # Assert that the loaded credentials match the saved credentials
     assert client.credentials == custom_load_fn()
+
+
+FAKE_CREDS = {
+    "certificate": {
+        "public": "some-public-key",
+        "private": "some-private-key",
+        "expiration_dt": "2500-01-01T00:00:00Z",
+    },
+    "client_assert_jwt": {
+        "jwt": "some-jwt",
+        "expiration_dt": "2500-01-01T00:00:00Z",
+    },
+    "tokens": {
+        "access_token": "some-access-token",
+        "refresh_token": "some-refresh-token",
+        "token_type": "bearer",
+        "access_token_expiration_dt": "2500-01-01T00:00:00Z",
+        "refresh_token_expiration_dt": "2500-01-01T00:00:00Z",
+    },
+}
+
+
+def test_timing_hooks():
+    """Test the per-request timing hooks, offline"""
+    account_id = str(uuid4())
+    account = {
+        "id": account_id,
+        "name": "Main",
+        "balance": 100.0,
+        "currency": "EUR",
+        "state": "active",
+        "public": True,
+        "created_at": "2024-01-01T00:00:00Z",
+        "updated_at": "2024-01-01T00:00:00Z",
+    }
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith(account_id):
+            return httpx.Response(200, json=account)
+        if request.url.path.endswith("accounts"):
+            return httpx.Response(200, json=[account, account])
+        return httpx.Response(404, json={"code": 404, "message": "Not found"})
+
+    timings = []
+
+    # Sync client
+    client = Client(creds=FAKE_CREDS, timing_hooks=[timings.append])
+    client.client = httpx.Client(transport=httpx.MockTransport(handler))
+    client.Accounts.get_all_accounts()
+    client.Accounts.get_account(account_id)
+    with pytest.raises(PyRevolutNotFound):
+        client.Accounts.get_account(uuid4())
+    client.close()
+
+    assert [timing.route for timing in timings] == [
+        "/1.0/accounts",
+        "/1.0/accounts/{id}",
+        "/1.0/accounts/{id}",
+    ]
+    assert all(timing.method == "GET" for timing in timings)
+    assert [timing.status_class for timing in timings] == ["2xx", "2xx", "4xx"]
+    assert timings[0].response_size > timings[1].response_size > 0
+    assert {"transport", "decode", "validate", "dump"} <= set(timings[0].phases)
+    assert timings[0].duration >= sum(
+        timings[0].phases[phase] for phase in ("transport", "decode", "validate")
+    )
+    assert timings[2].error == "PyRevolutNotFound"
+    assert "decode" not in timings[2].phases
+
+    # A failing hook does not fail the request, and hooks can be removed
+    def failing_hook(timing):
+        raise RuntimeError("hook failed")
+
+    client.add_timing_hook(failing_hook)
+    client.client = httpx.Client(transport=httpx.MockTransport(handler))
+    client.return_type = "raw"
+    assert client.Accounts.get_account(account_id)["id"] == account_id
+    assert "validate" not in timings[-1].phases
+    client.remove_timing_hook(failing_hook)
+    client.remove_timing_hook(timings.append)
+    client.Accounts.get_account(account_id)
+    assert len(timings) == 4
+    client.close()
+
+    # Async client, with concurrent requests
+    timings.clear()
+
+    async def run():
+        async_client = AsyncClient(creds=FAKE_CREDS, timing_hooks=[timings.append])
+        async_client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        await asyncio.gather(
+            *[async_client.Accounts.get_account(account_id) for _ in range(5)]
+        )
+        await async_client.close()
+
+    asyncio.run(run())
+    assert len(timings) == 5
+    assert all(timing.route == "/1.0/accounts/{id}" for timing in timings)
+    assert all(set(timing.phases) >= {"transport", "validate"} for timing in timings)
+
+
+def test_metrics():
+    """Test the metrics registry and the Prometheus exporter, offline"""
+    transaction_id = str(uuid4())
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("transactions"):
+            return httpx.Response(200, json=[])
+        if request.url.path.endswith(transaction_id):
+            return httpx.Response(500, json={"code": 500, "message": "Oops"})
+        return httpx.Response(404, json={"code": 404, "message": "Not found"})
+
+    metrics = MetricsRegistry(buckets=(0.5, 0.1))
+    client = Client(creds=FAKE_CREDS, metrics=metrics)
+    client.client = httpx.Client(transport=httpx.MockTransport(handler))
+    for _ in range(3):
+        client.Transactions.get_all_transactions()
+    for transaction in (transaction_id, uuid4()):
+        with pytest.raises(Exception):
+            client.Transactions.get_transaction(transaction)
+    # Free-form request IDs are labelled with the route template of the endpoint
+    for request_id in ("payout-2024-0001", "payout-2024-0002"):
+        with pytest.raises(Exception):
+            client.Transactions.get_transaction(request_id=request_id)
+    client.close()
+
+    requests = metrics.requests()
+    assert set(requests) == {
+        ("GET", "/1.0/transactions", "2xx"),
+        ("GET", "/1.0/transaction/{id}", "5xx"),
+        ("GET", "/1.0/transaction/{id}", "4xx"),
+    }
+    assert requests[("GET", "/1.0/transaction/{id}", "4xx")]["count"] == 3
+    series = requests[("GET", "/1.0/transactions", "2xx")]
+    assert series["count"] == 3
+    assert [bound for bound, _ in series["buckets"]] == [0.1, 0.5, float("inf")]
+    assert series["buckets"][-1][1] == 3
+    assert metrics.in_flight == 0
+
+    # Gauges of the caches and the rate limiters
+    client.ForeignExchange.rate_cache.hits = 3
+    client.ForeignExchange.rate_cache.misses = 1
+    limiter = RateLimiter(rate=1, name="test_limiter")
+    limiter._waiting = 2
+
+    text = render_prometheus(metrics)
+    assert (
+        'pyrevolut_requests_total{method="GET",route="/1.0/transactions",status_class="2xx"} 3'
+        in text
+    )
+    assert (
+        'pyrevolut_request_duration_seconds_bucket{method="GET",route="/1.0/transactions",'
+        'status_class="2xx",le="+Inf"} 3' in text
+    )
+    assert "pyrevolut_requests_in_flight 0" in text
+    assert "pyrevolut_token_refreshes_total 0" in text
+    assert 'pyrevolut_rate_limiter_queue_depth{limiter="test_limiter"} 2' in text
+    assert 'pyrevolut_cache_hit_ratio{cache="exchange_rates"} 0.75' in text
+    assert 'pyrevolut_cache_hits_total{cache="account_names"} 0' in text
+    assert text.endswith("\n")
+
+    # The paths are only a fallback for requests without a route template
+    assert route_template("https://b2b.revolut.com/api/1.0/accounts/12") == (
+        "/api/1.0/accounts/{id}"
+    )
+    assert route_template("cards/{card_id}") == "/cards/{id}"
+
+
+@pytest.mark.parametrize("mode", ["cprofile", "wall"])
+def test_sampled_profiler(mode: str, tmp_path):
+    """Test the sampled profiler, offline"""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        time.sleep(0.01)
+        return httpx.Response(200, json=[])
+
+    # Never sampled
+    profiler = SampledProfiler(sample_rate=0, mode=mode)
+    client = Client(creds=FAKE_CREDS, profiler=profiler)
+    client.client = httpx.Client(transport=httpx.MockTransport(handler))
+    client.Transactions.get_all_transactions()
+    assert profiler.routes == []
+
+    # Always sampled
+    client.profiler = profiler = SampledProfiler(sample_rate=1, mode=mode)
+    for _ in range(2):
+        client.Transactions.get_all_transactions()
+        client.Accounts.get_account(uuid4())
+    client.close()
+
+    assert profiler.routes == ["/1.0/accounts/{id}", "/1.0/transactions"]
+    assert profiler.samples["/1.0/transactions"] == 2
+
+    report = profiler.report(route="/1.0/transactions")
+    assert report.startswith("=== /1.0/transactions (2 profiled requests) ===")
+    if mode == "cprofile":
+        assert "process_response" in report
+    else:
+        assert "get_all_transactions (synchronous.py" in report
+
+    paths = profiler.dump(directory=str(tmp_path / "profiles"))
+    extension = ".prof" if mode == "cprofile" else ".txt"
+    assert sorted(os.path.basename(path) for path in paths) == [
+        f"1.0_accounts_id{extension}",
+        f"1.0_transactions{extension}",
+    ]
+
+    profiler.reset()
+    assert profiler.routes == []
+
+
+def test_generated_payloads():
+    """Test that a valid payload is generated for every Response and Body model"""
+    specs = discover_endpoints()
+    assert len(specs) > 40
+    for spec in specs:
+        for model in (spec.response_model, spec.body_model):
+            if model is None:
+                continue
+            payload = generate_payload(model=model, seed=0)
+            model.model_validate(payload)
+
+
+def test_mock_transport():
+    """Test the clients against the mock of the Revolut API, offline"""
+    mock = MockRevolut(page_size=10)
+
+    with Client(creds=fake_credentials(), transport=mock.transport()) as client:
+        transactions = client.Transactions.get_all_transactions()
+        assert len(transactions) == 10
+        assert len({transaction["id"] for transaction in transactions}) == 10
+        assert len(client.Transactions.get_all_transactions(limit=3)) == 3
+        client.Webhooks.delete_webhook(webhook_id=uuid4())
+        with pytest.raises(PyRevolutNotFound):
+            client.get(path="/1.0/unknown", response_model=RetrieveAnAccount.Response)
+
+    async def run():
+        async with AsyncClient(
+            creds=fake_credentials(), return_type="model", transport=mock.transport()
+        ) as client:
+            account = await client.Accounts.get_account(account_id=uuid4())
+            assert account.id is not None
+
+    asyncio.run(run())
+    assert mock.calls == {
+        "RetrieveListOfTransactions": 2,
+        "DeleteWebhook": 1,
+        "RetrieveAnAccount": 1,
+    }
+
+
+def test_fake_revolut():
+    """Test the stateful fake of the Revolut API, offline"""
+    senders: list[threading.Thread] = []
+
+    def deliver(request: httpx.Request) -> httpx.Response:
+        senders.append(threading.current_thread())
+        return httpx.Response(500)
+
+    fake = FakeRevolut(
+        balances={"GBP": 1000.0},
+        validate_responses=True,
+        deliver=deliver,
+    )
+
+    with Client(creds=fake_credentials(), transport=fake.transport()) as client:
+        account_id = client.Accounts.get_all_accounts()[0]["id"]
+        webhook = client.Webhooks.create_webhook(url="https://example.com/webhook")
+        counterparty = client.Counterparties.create_counterparty(
+            company_name="Acme Ltd",
+            bank_country="GB",
+            currency="GBP",
+            account_no="12345678",
+            sort_code="040075",
+        )
+
+        # Transfers are pending, and idempotent per request ID
+        for _ in range(2):
+            transfer = client.Transfers.create_transfer_to_another_account(
+                request_id="payout-1",
+                account_id=account_id,
+                counterparty_id=counterparty["id"],
+                amount=400,
+                currency="GBP",
+            )
+        assert transfer["state"] == "pending"
+        assert client.Accounts.get_account(account_id)["balance"] == 600
+        with pytest.raises(PyRevolutBadRequest):
+            client.Transfers.create_transfer_to_another_account(
+                request_id="payout-2",
+                account_id=account_id,
+                counterparty_id=counterparty["id"],
+                amount=4000,
+                currency="GBP",
+            )
+
+        # Declined transfers return the money
+        client.Simulations.simulate_transfer_state_update(
+            transfer_id=transfer["id"], action="decline"
+        )
+        assert client.Accounts.get_account(account_id)["balance"] == 1000
+        transactions = client.Transactions.get_all_transactions(account_id=account_id)
+        assert [transaction["state"] for transaction in transactions] == ["declined"]
+        assert transactions[0]["legs"][0]["amount"] == -400
+
+        # The webhook events are sent in the background, outside of the requests
+        fake.flush_deliveries()
+        assert len(senders) == 2
+        assert threading.main_thread() not in senders
+        failed = client.Webhooks.get_failed_webhook_events(webhook_id=webhook["id"])
+        assert len(failed) == 2
+
+    # The webhook events are signed with the signing secret
+    verifier = WebhookVerifier(webhook["signing_secret"])
+    assert [request.headers["Content-Type"] for request in fake.deliveries] == [
+        "application/json"
+    ] * 2
+    for request in fake.deliveries:
+        verifier.verify(
+            raw_payload=request.content,
+            header_timestamp=request.headers["Revolut-Request-Timestamp"],
+            header_signature=request.headers["Revolut-Signature"],
+        )
+
+    # The fake is an ASGI application too
+    async def run():
+        async with AsyncClient(
+            creds=fake_credentials(),
+            transport=httpx.ASGITransport(app=fake),
+            base_url="http://localhost:8000/api",
+        ) as client:
+            return await client.Counterparties.get_counterparty(counterparty["id"])
+
+    assert asyncio.run(run())["name"] == "Acme Ltd"
+
+
+@pytest.mark.parametrize(
+    "fault, error",
+    [
+        ("reset", PyRevolutNetworkError),
+        ("timeout", PyRevolutTimeoutError),
+        ("rate_limited", PyRevolutTooManyRequests),
+        ("server_error", PyRevolutInternalServerError),
+        ("unavailable", PyRevolutServerUnavailable),
+    ],
+)
+def test_fault_injecting_transport(fault: str, error: type[Exception]):
+    """Test the faults injected in the requests, offline"""
+    transport = FaultInjectingTransport(
+        transport=MockRevolut(page_size=1).transport(),
+        latency=constant_latency(0.001),
+        retry_after=2,
+        **{f"{fault}_rate": 1.0},
+    )
+    with Client(creds=fake_credentials(), transport=transport) as client:
+        with pytest.raises(error) as exc_info:
+            client.Transactions.get_all_transactions()
+    if fault == "rate_limited":
+        assert exc_info.value.__cause__.response.headers["Retry-After"] == "2"
+    assert transport.requests == 1
+    assert transport.injected == {fault: 1}
+
+    async def run():
+        async with AsyncClient(creds=fake_credentials(), transport=transport) as client:
+            await client.Transactions.get_all_transactions()
+
+    with pytest.raises(error):
+        asyncio.run(run())
+    assert transport.injected == {fault: 2}
+
+    # The retry helpers recover from the faults
+    transport = FaultInjectingTransport(
+        transport=MockRevolut(page_size=1).transport(),
+        seed=1,
+        **{f"{fault}_rate": 0.5},
+    )
+    with Client(creds=fake_credentials(), transport=transport) as client:
+        for _ in range(5):
+            transactions, attempts = retry_sync(
+                fn=client.Transactions.get_all_transactions,
+                max_retries=20,
+                backoff=0.001,
+            )
+            assert len(transactions) == 1
+    assert transport.requests == 5 + transport.injected[fault]
+
+
+def test_record_replay(tmp_path):
+    """Test recording exchanges to a cassette and replaying them, offline"""
+    recorder = RecordingTransport(transport=MockRevolut(page_size=5).transport())
+    with Client(creds=fake_credentials(), transport=recorder) as client:
+        recorded = client.Transactions.get_all_transactions(limit=5)
+        client.Transactions.get_transaction(transaction_id=recorded[0]["id"])
+    assert len(recorder.cassette) == 2
+
+    # The secrets are redacted
+    secrets = RecordingTransport(
+        transport=httpx.MockTransport(
+            lambda request: httpx.Response(
+                200,
+                json={"access_token": "secret", "token_type": "bearer"},
+                headers={"Set-Cookie": "session=secret"},
+            )
+        )
+    )
+    with httpx.Client(transport=secrets) as http:
+        http.post("https://example.com/token", data={"client_assertion": "secret"})
+    exchange = secrets.cassette.exchanges[0]
+    assert "secret" not in exchange.model_dump_json()
+    assert exchange.headers["set-cookie"] == "REDACTED"
+
+    path = recorder.cassette.save(str(tmp_path / "cassette.jsonl.gz"))
+    cassette = Cassette.load(path)
+    assert [exchange.path for exchange in cassette.exchanges] == [
+        exchange.path for exchange in recorder.cassette.exchanges
+    ]
+
+    transport = ReplayTransport(cassette=cassette, latency="zero")
+    with Client(creds=fake_credentials(), transport=transport) as client:
+        for _ in range(2):
+            assert client.Transactions.get_all_transactions(limit=5) == recorded
+        with pytest.raises(CassetteMismatchError):
+            client.Transactions.get_all_transactions(limit=6)
+
+    async def run():
+        transport = ReplayTransport(cassette=cassette, latency="original")
+        async with AsyncClient(creds=fake_credentials(), transport=transport) as client:
+            return await client.Transactions.get_all_transactions(limit=5)
+
+    assert asyncio.run(run()) == recorded
+
+
+def test_loadtest_cli(tmp_path):
+    """Test the load test command against the fake of the API"""
+    report = tmp_path / "loadtest.json"
+    result = CliRunner().invoke(
+        cli_app,
+        [
+            "loadtest",
+            "--fake",
+            "--calls",
+            "50",
+            "--concurrency",
+            "5",
+            "--report",
+            str(report),
+        ],
+    )
+    assert result.exit_code == 0, result.output
+    assert "create_transfer_to_another_account" in result.output
+
+    results = json.loads(report.read_text())
+    assert results["target"] == "fake"
+    assert results["calls"] == 50
+    assert results["error_rate"] == 0
+    assert set(results["operations"]) == {
+        "get_all_transactions",
+        "get_transaction",
+        "create_transfer_to_another_account",
+    }
+    assert sum(stats["calls"] for stats in results["operations"].values()) == 50
+
+    # The transfers are refused against production unless allowed and confirmed
+    for args, output in [
+        ([], "Refusing to call create_transfer_to_another_account"),
+        (["--allow-production-writes"], "Aborted"),
+    ]:
+        result = CliRunner().invoke(
+            cli_app, ["loadtest", "--no-sandbox", *args], input="n\n"
+        )
+        assert result.exit_code == 1
+        assert output in result.output
+
+    # The transactions are retrieved once the transfers have created them
+    async def run():
+        async with AsyncClient(
+            creds=fake_credentials(),
+            return_type="dict",
+            transport=FakeRevolut().transport(),
+        ) as client:
+            await client.Counterparties.create_counterparty(
+                profile_type="personal", name="Load Test", revtag="loadtest"
+            )
+            load_test = LoadTest(
+                client=client,
+                mix=parse_mix(
+                    "get_transaction=90,create_transfer_to_another_account=10"
+                ),
+                calls=50,
+                seed=1,
+            )
+            return await load_test.run(), load_test.transaction_ids
+
+    results, transaction_ids = asyncio.run(run())
+    assert results["error_rate"] == 0
+    assert results["operations"]["get_transaction"]["calls"] > 0
+    assert len(transaction_ids) == (
+        results["operations"]["create_transfer_to_another_account"]["calls"]
+    )
+
+
+@pytest.mark.parametrize("scenario", ["backfill", "webhook"])
+def test_memory_benchmark(scenario: str):
+    """Smoke test of the memory benchmark, with a few transactions"""
+    result = measure_memory(
+        scenario=scenario, return_type="dict", items=200, page_size=50
+    )
+    assert result["rss_after_mib"] >= result["rss_before_mib"] > 0
+    assert result["rss_growth_kib_per_1k"] >= 0
+    assert result["alloc_peak_kib"] > 0
+    # The backfill and the parsed webhook payloads are kept until measured
+    assert result["retained_kib_per_1k"] > 0
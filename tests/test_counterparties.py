@@ -2,9 +2,16 @@ import time
 import asyncio
 import pytest
 import random
+from uuid import uuid4
 
 from pyrevolut.client import Client, AsyncClient
 from pyrevolut.api import EnumProfileType
+from pyrevolut.api import EnumAccountNameMatchCode, EnumAccountNameMatchReasonCode
+from pyrevolut.api.counterparties import (
+    EndpointCounterpartiesSync,
+    EndpointCounterpartiesAsync,
+    CounterpartyRegistry,
+)
 
 
 def test_sync_get_all_counterparties(sync_client: Client):
@@ -299,3 +306,185 @@ async def test_async_create_delete_counterparty(async_client: AsyncClient):
         assert counterparty_id not in [
             counterparty["id"] for counterparty in counterparties_all
         ]
+
+
+@pytest.mark.asyncio
+async def test_counterparty_registry():
+    """Test the `CounterpartyRegistry` loads, resolves and creates counterparties offline"""
+
+    def counterparty(i: int, **account) -> dict:
+        return {
+            "id": str(uuid4()),
+            "name": f"Company {i}",
+            "state": "created",
+            "created_at": f"2024-01-01T00:00:{59 - i:02d}Z",
+            "updated_at": "2024-01-01T00:00:00Z",
+            "accounts": [
+                {
+                    "id": str(uuid4()),
+                    "bank_country": "GB",
+                    "currency": "GBP",
+                    "type": "external",
+                    **account,
+                }
+            ],
+        }
+
+    class FakeAsyncClient:
+        """Serves the counterparties page by page and creates new ones"""
+
+        def __init__(self, counterparties: list[dict]):
+            self.counterparties = counterparties
+            self.pages = 0
+            self.created = 0
+            self.Counterparties = EndpointCounterpartiesAsync(client=self)
+
+        async def get(self, path: str, params, **kwargs):
+            self.pages += 1
+            items = [
+                item
+                for item in self.counterparties
+                if params.created_before is None
+                or item["created_at"] < params.created_before.to_iso8601_string()
+            ]
+            return items[: params.limit]
+
+        async def post(self, path: str, body, **kwargs):
+            await asyncio.sleep(0.01)
+            self.created += 1
+            item = counterparty(
+                len(self.counterparties),
+                account_no=body.account_no,
+                sort_code=body.sort_code,
+            )
+            item["name"] = body.company_name
+            self.counterparties.insert(0, item)
+            return item
+
+    existing = [
+        counterparty(0, iban="GB29 NWBK 6016 1331 9268 19"),
+        counterparty(1, account_no="12345678", sort_code="22-33-44"),
+        counterparty(2, account_no="87654321", sort_code="223344"),
+    ]
+    existing[2]["name"] = "Crème  Brûlée, Ltd."
+    client = FakeAsyncClient(counterparties=list(existing))
+
+    registry = CounterpartyRegistry(client=client)
+    assert await asyncio.wait_for(registry.load(page_size=2), timeout=10) == 3
+    assert client.pages == 2
+    assert [item["id"] for item in registry.find_by_name("creme brulee ltd")] == [
+        existing[2]["id"]
+    ]
+
+    new = {
+        "company_name": "New Company",
+        "bank_country": "GB",
+        "currency": "GBP",
+        "account_no": "11112222",
+        "sort_code": "112233",
+    }
+    results = await asyncio.wait_for(
+        registry.resolve(
+            [
+                {"company_name": "Company 0", "iban": "gb29nwbk60161331926819"},
+                new,
+                {
+                    "company_name": "Company 1",
+                    "account_no": "12345678",
+                    "sort_code": "223344",
+                },
+                {**new, "sort_code": "11-22-33"},
+                {"company_name": "Crème Brûlée Ltd"},
+            ]
+        ),
+        timeout=10,
+    )
+
+    assert client.created == 1
+    assert [result.error for result in results] == [None] * 5
+    assert str(results[0].counterparty_id) == existing[0]["id"]
+    assert str(results[0].account_id) == existing[0]["accounts"][0]["id"]
+    assert str(results[2].counterparty_id) == existing[1]["id"]
+    assert str(results[4].counterparty_id) == existing[2]["id"]
+    assert results[1].created and results[3].created
+    assert results[1].counterparty_id == results[3].counterparty_id
+    assert str(results[1].counterparty_id) == client.counterparties[0]["id"]
+
+    # The created counterparty is now resolved locally
+    results = await registry.resolve([new], create_missing=False)
+    assert results[0].counterparty_id is not None and not results[0].created
+
+
+@pytest.mark.asyncio
+async def test_validate_account_names():
+    """Test the batch `validate_account_names` caches and dedupes the checks offline"""
+
+    class FakeClient:
+        """Matches the names starting with "Good" and is unavailable for "Busy" """
+
+        def __init__(self):
+            self.posts = 0
+
+        def post(self, path: str, body, **kwargs):
+            self.posts += 1
+            if body.company_name.startswith("Good"):
+                return {"result_code": "matched"}
+            if body.company_name.startswith("Busy"):
+                return {"result_code": "temporarily_unavailable"}
+            return {
+                "result_code": "close_match",
+                "reason": {"type": "uk_cop", "code": "close_match"},
+                "company_name": "Good Company",
+            }
+
+    class FakeAsyncClient(FakeClient):
+        """The async version of the fake client"""
+
+        async def post(self, path: str, body, **kwargs):
+            await asyncio.sleep(0.01)
+            return FakeClient.post(self, path=path, body=body, **kwargs)
+
+    recipients = [
+        {"account_no": "12345678", "sort_code": "223344", "company_name": name}
+        for name in ["Good Company", "Goo Company", "good  company", "Busy Ltd"]
+    ]
+
+    for client in (FakeClient(), FakeAsyncClient()):
+        if isinstance(client, FakeAsyncClient):
+            endpoint = EndpointCounterpartiesAsync(client=client)
+
+            async def validate():
+                return [
+                    check
+                    async for check in endpoint.validate_account_names(
+                        recipients=recipients, max_concurrency=2
+                    )
+                ]
+
+            checks = await asyncio.wait_for(validate(), timeout=10)
+            checks_again = await asyncio.wait_for(validate(), timeout=10)
+        else:
+            endpoint = EndpointCounterpartiesSync(client=client)
+            checks = list(
+                endpoint.validate_account_names(
+                    recipients=recipients, max_concurrency=2
+                )
+            )
+            checks_again = list(endpoint.validate_account_names(recipients=recipients))
+
+        # The first and third recipient only differ by case and whitespace,
+        # and only the temporarily unavailable check is sent again
+        assert client.posts == 3 + 1
+        checks = sorted(checks, key=lambda check: check.row)
+        assert [check.result_code for check in checks] == [
+            EnumAccountNameMatchCode.MATCHED,
+            EnumAccountNameMatchCode.CLOSE_MATCH,
+            EnumAccountNameMatchCode.MATCHED,
+            EnumAccountNameMatchCode.TEMPORARILY_UNAVAILABLE,
+        ]
+        assert checks[1].reason_code == EnumAccountNameMatchReasonCode.CLOSE_MATCH
+        assert checks[1].company_name == "Good Company"
+
+        # Served from the cache, except the temporarily unavailable check
+        assert sorted(check.row for check in checks_again if check.cached) == [0, 1, 2]
+        assert endpoint.account_name_cache.hits == 3
@@ -1,10 +1,16 @@
 import time
 import asyncio
 from uuid import uuid4
+from concurrent.futures import ThreadPoolExecutor
 import pytest
 import random
 
 from pyrevolut.client import Client, AsyncClient
+from pyrevolut.api.foreign_exchange import (
+    EndpointForeignExchangeSync,
+    EndpointForeignExchangeAsync,
+    ExchangeRateCache,
+)
 from pyrevolut.api import EnumAccountState, EnumTransactionState
 from pyrevolut.exceptions import PyRevolutInternalServerError
 
@@ -251,3 +257,133 @@ async def test_async_exchange_money(async_client: AsyncClient):
     except PyRevolutInternalServerError:
         # This error occurs randomly in the sandbox environment
         pass
+
+
+@pytest.mark.asyncio
+async def test_exchange_rate_cache():
+    """Test the exchange rate cache dedupes and reuses quotes offline"""
+
+    class FakeClient:
+        """Quotes a rate of 2.0 for every pair, slowly"""
+
+        def __init__(self):
+            self.requests = []
+
+        def get(self, path: str, params, **kwargs):
+            time.sleep(0.05)
+            self.requests.append((params.from_, params.to, params.amount))
+            return {"rate": 2.0, "from": params.from_, "to": params.to}
+
+    class FakeAsyncClient(FakeClient):
+        """The async version of the fake client"""
+
+        async def get(self, path: str, params, **kwargs):
+            await asyncio.sleep(0.05)
+            self.requests.append((params.from_, params.to, params.amount))
+            return {"rate": 2.0, "from": params.from_, "to": params.to}
+
+    pairs = [("EUR", "USD"), ("EUR", "GBP"), ("GBP", "USD"), ("EUR", "USD")]
+
+    for client in (FakeClient(), FakeAsyncClient()):
+        if isinstance(client, FakeAsyncClient):
+            endpoint = EndpointForeignExchangeAsync(client=client)
+
+            # Concurrent requests for the same pair and amount share a call
+            quotes = await asyncio.wait_for(
+                asyncio.gather(
+                    endpoint.get_cached_exchange_rate("EUR", "USD", amount=150),
+                    endpoint.get_cached_exchange_rate("eur", "usd", amount=150.0),
+                ),
+                timeout=10,
+            )
+            rates = await asyncio.wait_for(
+                endpoint.get_exchange_rates(pairs, amount=500), timeout=10
+            )
+            await endpoint.get_cached_exchange_rate("EUR", "USD", amount=500)
+            await endpoint.get_cached_exchange_rate("EUR", "USD", amount=150, max_age=0)
+        else:
+            endpoint = EndpointForeignExchangeSync(client=client)
+
+            # Concurrent requests for the same pair and amount share a call
+            quotes = list(
+                ThreadPoolExecutor(max_workers=2).map(
+                    lambda amount: endpoint.get_cached_exchange_rate(
+                        "EUR", "USD", amount=amount
+                    ),
+                    [150, 150.0],
+                )
+            )
+            rates = endpoint.get_exchange_rates(pairs, amount=500)
+            endpoint.get_cached_exchange_rate("EUR", "USD", amount=500)
+            endpoint.get_cached_exchange_rate("EUR", "USD", amount=150, max_age=0)
+
+        assert quotes[0] == quotes[1]
+        assert set(rates) == set(pairs)
+        assert all(rate["rate"] == 2.0 for rate in rates.values())
+
+        # EUR/USD for 150, the three pairs for 500, and a refresh
+        assert len(client.requests) == 5
+        assert client.requests[-1] == ("EUR", "USD", 150)
+        # Only the second EUR/USD for 500 was served from the cache, the
+        # concurrent requests were deduped while in flight
+        assert endpoint.rate_cache.hits == 1
+
+    # A quote is never reused for another amount
+    assert ExchangeRateCache.key("EUR", "USD", 150) == ("EUR", "USD", 150.0)
+    assert ExchangeRateCache.key("EUR", "USD", 150) != ExchangeRateCache.key(
+        "EUR", "USD", 900
+    )
+    assert ExchangeRateCache.key("EUR", "USD") == ExchangeRateCache.key("EUR", "USD", 1)
+
+
+@pytest.mark.asyncio
+async def test_cross_rate_matrix():
+    """Test the cross rate matrix is derived from pivot quotes offline"""
+    np = pytest.importorskip("numpy")
+
+    # Units of each currency per EUR
+    per_eur = {"EUR": 1.0, "USD": 1.1, "GBP": 0.85, "CHF": 0.95, "JPY": 160.0}
+
+    class FakeAsyncClient:
+        """Quotes the rates of `per_eur`, without spread"""
+
+        def __init__(self):
+            self.requests = []
+
+        async def get(self, path: str, params, **kwargs):
+            self.requests.append((params.from_, params.to))
+            return {
+                "rate": per_eur[params.to] / per_eur[params.from_],
+                "rate_date": f"2024-01-01T00:00:0{len(self.requests)}Z",
+            }
+
+    client = FakeAsyncClient()
+    endpoint = EndpointForeignExchangeAsync(client=client)
+    matrix = await asyncio.wait_for(
+        endpoint.get_cross_rate_matrix(
+            currencies=list(per_eur), verify_sample=3, seed=1
+        ),
+        timeout=10,
+    )
+
+    # 4 pivot quotes and 3 direct quotes instead of 20
+    assert len(client.requests) == 4 + 3
+    assert all(from_ == "EUR" for from_, _ in client.requests[:4])
+
+    assert matrix.currencies == list(per_eur)
+    assert matrix.rates.shape == (5, 5)
+    assert np.allclose(np.diag(matrix.rates), 1.0)
+    assert matrix.rate("GBP", "JPY") == pytest.approx(160.0 / 0.85)
+    assert matrix.rate("usd", "eur") == pytest.approx(1 / 1.1)
+    assert matrix.to_dict()["CHF"]["GBP"] == pytest.approx(0.85 / 0.95)
+
+    # A cross rate has the date of the older of its two quotes
+    assert matrix.timestamp("EUR", "GBP") > matrix.timestamp("EUR", "USD")
+    assert matrix.timestamp("GBP", "JPY") == matrix.timestamp("EUR", "GBP")
+    assert matrix.timestamps.dtype == np.dtype("datetime64[ms]")
+
+    assert len(matrix.checks) == 3
+    assert matrix.max_deviation == pytest.approx(0.0, abs=1e-12)
+    assert all(
+        "EUR" not in (check.from_currency, check.to_currency) for check in matrix.checks
+    )
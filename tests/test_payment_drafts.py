@@ -2,10 +2,19 @@ import time
 import asyncio
 import pytest
 import random
+from uuid import uuid4
 
 from pyrevolut.client import Client
 from pyrevolut.api import EnumAccountState
-from pyrevolut.exceptions import PyRevolutInternalServerError
+from pyrevolut.api.payment_drafts import (
+    EndpointPaymentDraftsSync,
+    EndpointPaymentDraftsAsync,
+)
+from pyrevolut.exceptions import (
+    PyRevolutInternalServerError,
+    PyRevolutTooManyRequests,
+    PyRevolutBadRequest,
+)
 
 
 def test_sync_get_all_payment_drafts(sync_client: Client):
@@ -163,3 +172,119 @@ async def test_async_create_delete_payment_draft(async_client: Client):
     except PyRevolutInternalServerError:
         # This error occurs randomly in the sandbox environment
         pass
+
+
+@pytest.mark.asyncio
+async def test_create_payment_drafts():
+    """Test `create_payment_drafts` splits, retries and maps the payments offline"""
+
+    class FakeClient:
+        """Stores the drafts, rate limiting the first draft of the second account
+        and rejecting drafts with a reference of "bad"."""
+
+        def __init__(self, throttled_account: str):
+            self.drafts = {}
+            self.throttled_account = throttled_account
+            self.posts = 0
+
+        def post(self, path: str, body, **kwargs):
+            self.posts += 1
+            account_id = str(body.payments[0].account_id)
+            if account_id == self.throttled_account:
+                self.throttled_account = None
+                raise PyRevolutTooManyRequests()
+            if any(payment.reference == "bad" for payment in body.payments):
+                raise PyRevolutBadRequest("Invalid reference")
+            draft_id = str(uuid4())
+            self.drafts[draft_id] = {
+                "title": body.title,
+                "payments": [
+                    {
+                        # Returned in reverse order to test the matching
+                        "id": str(uuid4()),
+                        "amount": {
+                            "amount": payment.amount,
+                            "currency": str(payment.currency),
+                        },
+                        "receiver": {
+                            "counterparty_id": str(payment.receiver.counterparty_id)
+                        },
+                        "reference": payment.reference,
+                    }
+                    for payment in reversed(body.payments)
+                ],
+            }
+            return {"id": draft_id}
+
+        def get(self, path: str, **kwargs):
+            return self.drafts[path.split("/")[-1]]
+
+    class FakeAsyncClient(FakeClient):
+        """The async version of the fake client"""
+
+        async def post(self, path: str, body, **kwargs):
+            return FakeClient.post(self, path=path, body=body, **kwargs)
+
+        async def get(self, path: str, **kwargs):
+            return FakeClient.get(self, path=path, **kwargs)
+
+    account_ids = [str(uuid4()), str(uuid4())]
+    counterparty_ids = [str(uuid4()) for _ in range(3)]
+    payments = [
+        {
+            "account_id": account_ids[i % 2],
+            "receiver": {"counterparty_id": counterparty_ids[i % 3]},
+            "amount": 1.0 + i % 2,
+            "currency": "GBP",
+            "reference": "bad" if i == 10 else "Payroll",
+        }
+        for i in range(11)
+    ]
+
+    for client in (FakeClient(account_ids[1]), FakeAsyncClient(account_ids[1])):
+        kwargs = dict(
+            payments=payments,
+            title="Payroll",
+            chunk_size=2,
+            max_concurrency=3,
+            backoff=0.0,
+        )
+        if isinstance(client, FakeAsyncClient):
+            endpoint = EndpointPaymentDraftsAsync(client=client)
+            results = await asyncio.wait_for(
+                endpoint.create_payment_drafts(**kwargs), timeout=10
+            )
+        else:
+            endpoint = EndpointPaymentDraftsSync(client=client)
+            results = endpoint.create_payment_drafts(**kwargs)
+
+        # 6 payments from the first account and 5 from the second, 2 per draft
+        assert [result.row for result in results] == list(range(11))
+        assert len(client.drafts) == 5
+        assert client.posts == 7
+        assert sorted(draft["title"] for draft in client.drafts.values())[0] == (
+            "Payroll (1/6)"
+        )
+
+        # The row with the bad reference failed with the other row of its draft
+        failed = [result.row for result in results if result.error is not None]
+        assert failed == [8, 10]
+        assert all(results[row].draft_id is None for row in failed)
+
+        # Every other row is mapped to its own payment of its draft
+        payment_ids = set()
+        for result, payment in zip(results, payments):
+            if result.error is not None:
+                continue
+            draft_payment = next(
+                draft_payment
+                for draft_payment in client.drafts[str(result.draft_id)]["payments"]
+                if draft_payment["id"] == str(result.payment_id)
+            )
+            assert draft_payment["receiver"]["counterparty_id"] == (
+                payment["receiver"]["counterparty_id"]
+            )
+            assert draft_payment["amount"]["amount"] == payment["amount"]
+            payment_ids.add(result.payment_id)
+        assert len(payment_ids) == 9
+        assert max(result.attempts for result in results) == 2
@@ -1,12 +1,22 @@
 import time
 import asyncio
 import random
+import itertools
+from uuid import UUID
 
 import pendulum
 import pytest
 
 from pyrevolut.client import Client
-from pyrevolut.api import EnumTransactionType
+from pyrevolut.exceptions import PyRevolutNotFound
+from pyrevolut.api import EnumTransactionType, EnumTransactionState
+from pyrevolut.api.transactions import (
+    TransactionStateProjection,
+    EndpointTransactionsSync,
+    EndpointTransactionsAsync,
+)
+from pyrevolut.api.webhooks import WebhookHandlerRegistry
+from pyrevolut.api.webhooks.resources import ResourceWebhookPayload
 
 
 def test_sync_get_all_transactions(sync_client: Client):
@@ -113,3 +123,149 @@ async def test_async_get_transaction(async_client: Client):
         await asyncio.sleep(random.randint(1, 3))
         assert isinstance(transaction, dict)
         assert transaction["request_id"] == request_id
+
+
+def _state_changed_payload(
+    transaction_id: str, old_state: str, new_state: str, timestamp: str
+) -> ResourceWebhookPayload:
+    """Build a `TransactionStateChanged` webhook payload"""
+    return ResourceWebhookPayload.from_dict(
+        {
+            "event": "TransactionStateChanged",
+            "timestamp": timestamp,
+            "data": {
+                "id": transaction_id,
+                "request_id": "my_request_id",
+                "old_state": old_state,
+                "new_state": new_state,
+            },
+        }
+    )
+
+
+@pytest.mark.asyncio
+async def test_transaction_state_projection(tmp_path):
+    """Test the `TransactionStateProjection` resolves out of order events and waiters"""
+    transaction_id = "645a7696-22f3-aa47-9c74-cbae0449cc46"
+    projection = TransactionStateProjection(snapshot_loc=str(tmp_path / "tx.json"))
+    registry = WebhookHandlerRegistry()
+    projection.register(registry)
+
+    waiter = asyncio.create_task(projection.wait_for(UUID(transaction_id)))
+    await asyncio.sleep(0)
+
+    # The newer event arrives first, the older one is ignored
+    await registry.dispatch(
+        _state_changed_payload(
+            transaction_id, "pending", "completed", "2023-04-06T12:21:50.000Z"
+        )
+    )
+    assert (
+        projection.apply(
+            _state_changed_payload(
+                transaction_id, "created", "pending", "2023-04-06T12:21:49.000Z"
+            )
+        )
+        is False
+    )
+    assert projection.state(UUID(transaction_id)) == EnumTransactionState.COMPLETED
+    assert projection.get_transaction_id("my_request_id") == UUID(transaction_id)
+    assert await asyncio.wait_for(waiter, timeout=1) == EnumTransactionState.COMPLETED
+
+    # A late event with the same timestamp does not leave the terminal state
+    assert (
+        projection.apply(
+            _state_changed_payload(
+                transaction_id, "created", "pending", "2023-04-06T12:21:50.000Z"
+            )
+        )
+        is False
+    )
+    assert projection.state(UUID(transaction_id)) == EnumTransactionState.COMPLETED
+
+    # Waiting for a state that is not reached times out
+    with pytest.raises(asyncio.TimeoutError):
+        await projection.wait_for(
+            UUID(transaction_id), states={EnumTransactionState.REVERTED}, timeout=0.05
+        )
+
+    # The projection is restored from its snapshot
+    projection.snapshot()
+    restored = TransactionStateProjection(snapshot_loc=projection.snapshot_loc)
+    assert restored.get(UUID(transaction_id)) == projection.get(UUID(transaction_id))
+    assert restored.get_transaction_id("my_request_id") == UUID(transaction_id)
+
+    # Terminal transactions are evicted after the TTL
+    restored.terminal_ttl = 0
+    restored.evict_expired()
+    assert UUID(transaction_id) not in restored
+    assert restored.get_transaction_id("my_request_id") is None
+
+
+@pytest.mark.asyncio
+async def test_wait_for_transactions():
+    """Test `wait_for_transactions` polls until every transaction is done"""
+
+    class FakeClient:
+        """Returns the next state of a transaction on every poll"""
+
+        def __init__(self):
+            self.states = {
+                "tx-1": iter(["pending", "completed"]),
+                "tx-2": iter(["pending", "pending", "pending", "failed"]),
+                "tx-3": iter(["created", "pending", "pending", "completed"]),
+            }
+
+        def get(self, path: str, **kwargs):
+            transaction_id = path.split("/")[-1]
+            if transaction_id not in self.states:
+                raise PyRevolutNotFound()
+            return {"id": transaction_id, "state": next(self.states[transaction_id])}
+
+    class FakeAsyncClient(FakeClient):
+        """The async version of the fake client"""
+
+        async def get(self, path: str, **kwargs):
+            return FakeClient.get(self, path=path, **kwargs)
+
+    endpoint = EndpointTransactionsSync(client=FakeClient())
+    results = dict(
+        endpoint.wait_for_transactions(
+            ids=["tx-1", "tx-2", "tx-3"],
+            target_states=[EnumTransactionState.COMPLETED],
+            initial_interval=0.01,
+            max_interval=0.02,
+            timeout=5,
+        )
+    )
+    assert {k: v["state"] for k, v in results.items()} == {
+        "tx-1": "completed",
+        "tx-2": "failed",
+        "tx-3": "completed",
+    }
+
+    endpoint = EndpointTransactionsAsync(client=FakeAsyncClient())
+    results = {
+        key: transaction
+        async for key, transaction in endpoint.wait_for_transactions(
+            ids=["tx-1", "tx-2", "tx-3", "unknown"],
+            initial_interval=0.01,
+            max_interval=0.02,
+            max_concurrency=2,
+            not_found_timeout=0.1,
+            timeout=5,
+        )
+    }
+    assert sorted(results) == ["tx-1", "tx-2", "tx-3", "unknown"]
+    # Transactions that are never found are yielded without details
+    assert results["unknown"] is None
+
+    # Transactions that do not reach the target states in time raise
+    client = FakeAsyncClient()
+    client.states["tx-1"] = itertools.repeat("pending")
+    endpoint = EndpointTransactionsAsync(client=client)
+    with pytest.raises(TimeoutError):
+        async for _ in endpoint.wait_for_transactions(
+            ids=["tx-1"], initial_interval=0.01, timeout=0.1
+        ):
+            pass
@@ -1,7 +1,9 @@
+import os
 import time
 import asyncio
 from uuid import uuid4
 import random
+import json
 
 import pytest
 
@@ -11,6 +13,14 @@ from pyrevolut.api import (
     EnumTransactionState,
     EnumTransferReasonCode,
 )
+from pyrevolut.api.transfers import (
+    BulkTransferEngine,
+    BulkTransferJournal,
+    ModelBulkTransfer,
+    iter_batch_errors,
+    validate_batch_file,
+)
+from pyrevolut.exceptions import PyRevolutBadRequest, PyRevolutConflict
 
 
 def test_sync_get_transfer_reasons(sync_client: Client):
@@ -448,3 +458,167 @@ async def test_async_create_transfer_to_another_account(async_client: Client):
     )
     await asyncio.sleep(random.randint(1, 3))
     assert response["state"] == EnumTransactionState.COMPLETED
+
+
+@pytest.mark.asyncio
+async def test_bulk_transfer_engine_resumes_from_journal(tmp_path):
+    """Test the `BulkTransferEngine` journals transfers and resumes a crashed run"""
+    account_id, counterparty_id = uuid4(), uuid4()
+    transfers = [
+        ModelBulkTransfer(
+            key=str(i),
+            account_id=account_id,
+            counterparty_id=counterparty_id,
+            amount=1.0 + i,
+            currency="GBP",
+        )
+        for i in range(5)
+    ]
+    journal_loc = str(tmp_path / "journal.jsonl")
+    request_ids = [
+        transfer.stable_request_id(namespace=os.path.abspath(journal_loc))
+        for transfer in transfers
+    ]
+
+    class FakeTransfers:
+        def __init__(self):
+            self.request_ids: list[str] = []
+
+        async def create_transfer_to_another_account(self, request_id: str, **kwargs):
+            self.request_ids.append(request_id)
+            if request_id == request_ids[1]:
+                raise PyRevolutBadRequest()
+            if request_id in conflicts:
+                raise PyRevolutConflict()
+            return {"id": f"tx-{request_id}", "state": "pending"}
+
+    class FakeTransactions:
+        async def get_transaction(self, request_id: str):
+            return {
+                "id": f"tx-{request_id}",
+                "state": "completed",
+                "legs": [
+                    {
+                        "amount": -conflicts[request_id],
+                        "currency": "GBP",
+                        "counterparty": {"id": str(counterparty_id)},
+                    }
+                ],
+            }
+
+    class FakeClient:
+        def __init__(self):
+            self.Transfers = FakeTransfers()
+            self.Transactions = FakeTransactions()
+
+    # The third transfer was already made with the same request ID
+    conflicts = {request_ids[2]: transfers[2].amount}
+    # A previous run crashed after submitting the third transfer
+    journal = BulkTransferJournal(location=journal_loc)
+    journal.append(
+        {
+            "key": "2",
+            "request_id": request_ids[2],
+            "event": "submitted",
+        }
+    )
+    journal.close()
+
+    client = FakeClient()
+    engine = BulkTransferEngine(client=client, journal_loc=journal_loc)
+    outcomes = {o.key: o async for o in engine.run(transfers[:3])}
+    assert outcomes["0"].status == "succeeded"
+    assert outcomes["1"].status == "failed"
+    # The crashed transfer is resubmitted with the same request ID
+    assert outcomes["2"].status == "succeeded"
+    assert outcomes["2"].state == EnumTransactionState.COMPLETED
+    assert outcomes["2"].request_id == request_ids[2]
+    assert outcomes["2"].completed == 3
+
+    # A new run only submits the transfers it has not handled yet
+    client = FakeClient()
+    engine = BulkTransferEngine(client=client, journal_loc=journal_loc, rate=1000)
+    outcomes = {o.key: o async for o in engine.run(t.model_dump() for t in transfers)}
+    assert [outcomes[str(i)].status for i in range(5)] == [
+        "skipped",
+        "skipped",
+        "skipped",
+        "succeeded",
+        "succeeded",
+    ]
+    assert len(client.Transfers.request_ids) == 2
+
+    # A key journaled for another payment is never resubmitted
+    changed = transfers[0].model_copy(update={"amount": 99.0})
+    outcomes = [o async for o in engine.run([changed])]
+    assert outcomes[0].status == "failed"
+    assert len(client.Transfers.request_ids) == 2
+
+    # A later batch reusing the keys gets new request IDs
+    client = FakeClient()
+    engine = BulkTransferEngine(client=client, journal_loc=str(tmp_path / "next.jsonl"))
+    outcomes = [o async for o in engine.run(transfers[3:])]
+    assert all(o.status == "succeeded" for o in outcomes)
+    assert not set(client.Transfers.request_ids) & set(request_ids)
+
+    # A conflicting request ID used by another payment is not reported as a success
+    conflicts[transfers[4].stable_request_id(namespace="batch")] = 1234.0
+    engine = BulkTransferEngine(
+        client=FakeClient(), journal_loc=str(tmp_path / "other.jsonl"), batch_id="batch"
+    )
+    outcomes = [o async for o in engine.run(transfers[4:])]
+    assert outcomes[0].status == "failed"
+    assert "another transaction" in outcomes[0].error
+
+
+def test_validate_batch_file(tmp_path):
+    """Test the offline validation of CSV and JSONL batch files"""
+    account_id, counterparty_id = uuid4(), uuid4()
+    csv_loc = tmp_path / "transfers.csv"
+    csv_loc.write_text(
+        "request_id,account_id,receiver.counterparty_id,amount,currency,charge_bearer\n"
+        f"req-1,{account_id},{counterparty_id},10.5,GBP,shared\n"
+        f"req-2,{account_id},{counterparty_id},-1,GBP,\n"
+        f"req-3,{account_id},{counterparty_id},10,XXXX,\n"
+        f"req-1,{account_id},{counterparty_id},10,EUR,debtor\n"
+        f"req-5,{account_id},{counterparty_id},10,EUR,nobody\n"
+    )
+    summary = validate_batch_file(
+        location=str(csv_loc), kind="transfer", workers=2, chunk_size=2
+    )
+    assert summary.rows == 5
+    assert summary.invalid == 4
+    assert [error.row for error in summary.errors] == [2, 3, 4, 5]
+    assert summary.errors[0].errors[0].loc == "amount"
+    assert summary.errors[1].errors[0].loc == "currency"
+    assert summary.errors[2].errors[0].type == "duplicate"
+    assert summary.errors[3].errors[0].loc == "charge_bearer"
+
+    # Stop at the first chunk with an invalid row
+    errors = list(
+        iter_batch_errors(
+            location=str(csv_loc),
+            kind="transfer",
+            workers=1,
+            chunk_size=2,
+            fail_fast=True,
+        )
+    )
+    assert [error.row for error in errors] == [2]
+
+    jsonl_loc = tmp_path / "payments.jsonl"
+    payment = {
+        "account_id": str(account_id),
+        "receiver": {"counterparty_id": str(counterparty_id)},
+        "amount": 10,
+        "currency": "GBP",
+        "reference": "Invoice 1",
+    }
+    jsonl_loc.write_text(
+        "\n".join([json.dumps(payment), json.dumps({**payment, "receiver": {}}), "{"])
+    )
+    summary = validate_batch_file(
+        location=str(jsonl_loc), kind="payment_draft", workers=1
+    )
+    assert (summary.rows, summary.invalid) == (3, 2)
+    assert summary.errors[0].errors[0].loc == "receiver.counterparty_id"
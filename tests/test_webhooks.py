@@ -3,10 +3,11 @@ import asyncio
 import random
 from uuid import UUID, uuid4
 import platform
+import sqlite3
 
 import pytest
 import pendulum
-from httpx import AsyncClient as TestHTTPClient
+from httpx import AsyncClient as TestHTTPClient, ASGITransport
 
 from pyrevolut.client import Client
 from pyrevolut.api import (
@@ -15,9 +16,21 @@ from pyrevolut.api import (
     EnumTransactionState,
     EnumTransferReasonCode,
 )
+from pyrevolut.api.webhooks import (
+    EndpointWebhooksSync,
+    WebhookDedupeMemoryStore,
+    WebhookDedupeSQLiteStore,
+    WebhookHandlerRegistry,
+    WebhookReceiver,
+    WebhookRecovery,
+    WebhookVerifier,
+)
 from pyrevolut.api.webhooks.post import CreateWebhook
 from pyrevolut.api.webhooks.resources import (
     ResourceWebhookPayload,
+    ResourceWebhookPayloadPayoutLinkStateChanged,
+    ResourceWebhookPayloadTransactionCreated,
+    ResourcePayoutLinkStateChanged,
     ResourceTransactionCreated,
     ResourceTransactionStateChanged,
 )
@@ -167,6 +180,121 @@ async def test_async_get_failed_webhook_events(async_client: Client):
             assert isinstance(failed_webhook, dict)
 
 
+@pytest.mark.asyncio
+async def test_async_recover_failed_webhook_events(async_client: Client, tmp_path):
+    """Test the `WebhookRecovery` job on the failed webhook events"""
+    registry = WebhookHandlerRegistry()
+    received: list[ResourceWebhookPayload] = []
+
+    @registry.on()
+    async def on_event(payload: ResourceWebhookPayload):
+        received.append(payload)
+
+    checkpoint_loc = str(tmp_path / "webhook_recovery.json")
+    recovery = WebhookRecovery(
+        client=async_client,
+        registry=registry,
+        checkpoint_loc=checkpoint_loc,
+        page_size=10,
+    )
+    summary = await recovery.run()
+    await asyncio.sleep(random.randint(1, 3))
+    assert summary.recovered == len(received)
+    assert summary.failed == 0
+
+    # A second run starts from the checkpoint
+    recovery = WebhookRecovery(
+        client=async_client,
+        registry=registry,
+        checkpoint_loc=checkpoint_loc,
+        page_size=10,
+    )
+    summary = await recovery.run()
+    await asyncio.sleep(random.randint(1, 3))
+    assert summary.recovered == 0
+
+
+@pytest.mark.asyncio
+async def test_webhook_recovery_retries_failed_events(tmp_path):
+    """Test that `WebhookRecovery` retries the events for which a handler failed"""
+    webhook_id = uuid4()
+    events = [
+        {
+            "id": str(uuid4()),
+            "created_at": f"2023-04-06T12:2{i}:00.000Z",
+            "updated_at": f"2023-04-06T12:2{i}:00.000Z",
+            "webhook_id": str(webhook_id),
+            "webhook_url": "https://example.com/webhook",
+            "payload": {
+                "event": "TransactionStateChanged",
+                "timestamp": f"2023-04-06T12:2{i}:00.000Z",
+                "data": {
+                    "id": str(uuid4()),
+                    "old_state": "pending",
+                    "new_state": "completed",
+                },
+            },
+            "last_sent_date": None,
+        }
+        for i in range(3, 0, -1)
+    ]
+
+    class FakeWebhooks:
+        async def get_failed_webhook_events(self, webhook_id, limit, created_before):
+            return [] if created_before is not None else events
+
+    class FakeTransactions:
+        async def get_transaction(self, transaction_id):
+            # Does not validate as the event data
+            return {"id": str(transaction_id), "state": "not_a_state"}
+
+    class FakeClient:
+        Webhooks = FakeWebhooks()
+        Transactions = FakeTransactions()
+
+    registry = WebhookHandlerRegistry()
+    received: list[ResourceWebhookPayload] = []
+    failing = {events[1]["payload"]["data"]["id"]}
+
+    @registry.on()
+    async def on_event(payload: ResourceWebhookPayload):
+        if str(payload.data.id) in failing:
+            raise RuntimeError("Handler failed")
+        received.append(payload)
+
+    checkpoint_loc = str(tmp_path / "webhook_recovery.json")
+    dedupe_store = WebhookDedupeMemoryStore()
+    recovery = WebhookRecovery(
+        client=FakeClient(),
+        registry=registry,
+        checkpoint_loc=checkpoint_loc,
+        dedupe_store=dedupe_store,
+    )
+    summary = await recovery.run(webhook_ids=[webhook_id])
+    assert (summary.recovered, summary.failed) == (2, 1)
+    # Only the events whose handlers succeeded are marked as seen
+    assert len(dedupe_store) == 2
+    # The original payloads are dispatched when the refresh does not validate
+    assert all(p.data.new_state == EnumTransactionState.COMPLETED for p in received)
+
+    # A restarted recovery only retries the failed event
+    failing.clear()
+    recovery = WebhookRecovery(
+        client=FakeClient(),
+        registry=registry,
+        checkpoint_loc=checkpoint_loc,
+        dedupe_store=dedupe_store,
+    )
+    summary = await recovery.run(webhook_ids=[webhook_id])
+    assert (summary.recovered, summary.skipped, summary.failed) == (1, 2, 0)
+    assert len(received) == 3
+    assert len(dedupe_store) == 3
+
+    # Once everything is recovered, nothing is dispatched again
+    summary = await recovery.run(webhook_ids=[webhook_id])
+    assert (summary.recovered, summary.skipped, summary.failed) == (0, 0, 0)
+
+
 @pytest.mark.asyncio
 async def test_async_create_update_rotate_delete_webhook(async_client: Client):
     """Test the async `create`, `update`, `rotate` and `delete` webhooks methods"""
@@ -309,6 +437,257 @@ def test_webhook_verify_payload_signature_invalid_timestamp(sync_client: Client)
         )
 
 
+def test_webhook_verifier_rotation_and_batch():
+    """Test the `WebhookVerifier` with multiple active signing secrets"""
+    raw_payload = b'{"event": "TransactionCreated"}'
+    header_timestamp = 1683650202360
+    old_verifier = WebhookVerifier(signing_secrets="old_signing_secret")
+    new_verifier = WebhookVerifier(signing_secrets="new_signing_secret")
+    old_signature = old_verifier.sign(raw_payload, header_timestamp)[0]
+    new_signature = new_verifier.sign(raw_payload, header_timestamp)[0]
+
+    # The verifier signs the same way as the endpoint
+    assert old_signature == EndpointWebhooksSync(client=None).sign_payload(
+        raw_payload=raw_payload.decode(),
+        signing_secret="old_signing_secret",
+        header_timestamp=header_timestamp,
+    )
+
+    # Both secrets are active during the rotation
+    verifier = WebhookVerifier(
+        signing_secrets=["old_signing_secret", "new_signing_secret"]
+    )
+    for header_signature in [
+        old_signature,
+        new_signature,
+        f"{old_signature},{new_signature}",
+    ]:
+        verifier.verify(
+            raw_payload=raw_payload,
+            header_timestamp=str(header_timestamp),
+            header_signature=header_signature,
+            now_ms=header_timestamp + 1000,
+        )
+
+    # The timestamp must be within the tolerance
+    with pytest.raises(
+        PyRevolutInvalidPayload, match="The webhook payload timestamp is too old."
+    ):
+        verifier.verify(
+            raw_payload=raw_payload,
+            header_timestamp=header_timestamp,
+            header_signature=old_signature,
+        )
+
+    # Once the old secret expires, only the new signature is valid
+    verifier.remove_secret("old_signing_secret")
+    assert verifier.verify_batch(
+        [
+            (raw_payload, header_timestamp, old_signature),
+            (raw_payload, header_timestamp, new_signature),
+            (raw_payload + b" ", header_timestamp, new_signature),
+        ]
+    ) == [False, True, False]
+
+
+def test_webhook_payload_from_raw():
+    """Test that the webhook payload is parsed into the event specific model"""
+    raw_payload = (
+        b'{"event": "TransactionCreated", "timestamp": "2023-04-06T12:21:49.865Z", '
+        b'"data": {"id": "645a7696-22f3-aa47-9c74-cbae0449cc46", "type": "transfer", '
+        b'"state": "pending", "created_at": "2023-05-09T16:38:14.046Z", '
+        b'"updated_at": "2023-05-09T16:38:14.046Z", "legs": [{'
+        b'"leg_id": "645a7696-22f3-aa47-0000-cbae0449cc46", '
+        b'"account_id": "05b2fb61-e9a7-4e7c-ae3c-e0aa7d21e5f5", '
+        b'"amount": -10.0, "currency": "EUR", "description": "To John Doe"}]}}'
+    )
+    payload = ResourceWebhookPayload.from_raw(raw_payload)
+    assert isinstance(payload, ResourceWebhookPayloadTransactionCreated)
+    assert payload.event == EnumWebhookEvent.TRANSACTION_CREATED
+    assert isinstance(payload.data, ResourceTransactionCreated)
+    assert payload.data.state == EnumTransactionState.PENDING
+
+    raw_payload = (
+        '{"event": "PayoutLinkStateChanged", "timestamp": "2023-04-06T12:21:49.865Z", '
+        '"data": {"id": "645a7696-22f3-aa47-9c74-cbae0449cc46", '
+        '"old_state": "created", "new_state": "active"}}'
+    )
+    payload = ResourceWebhookPayload.from_raw(raw_payload)
+    assert isinstance(payload, ResourceWebhookPayloadPayoutLinkStateChanged)
+    assert isinstance(payload.data, ResourcePayoutLinkStateChanged)
+
+    # The data must match the model of the event
+    with pytest.raises(ValueError):
+        ResourceWebhookPayload.from_raw(
+            raw_payload.replace("PayoutLinkStateChanged", "TransactionCreated")
+        )
+
+
+@pytest.mark.asyncio
+async def test_webhook_receiver():
+    """Test the `WebhookReceiver` ASGI app acknowledges and dispatches events"""
+    receiver = WebhookReceiver(
+        webhooks=EndpointWebhooksSync(client=None),
+        signing_secret="my_signing_secret",
+        dedupe_store=WebhookDedupeMemoryStore(),
+        workers=2,
+    )
+    received: list[ResourceWebhookPayload] = []
+
+    @receiver.registry.on(EnumWebhookEvent.PAYOUT_LINK_STATE_CHANGED)
+    async def on_payout_link_state_changed(payload: ResourceWebhookPayload):
+        received.append(payload)
+
+    raw_payload = (
+        b'{"event": "PayoutLinkStateChanged", "timestamp": "2023-04-06T12:21:49.865Z", '
+        b'"data": {"id": "645a7696-22f3-aa47-9c74-cbae0449cc46", '
+        b'"old_state": "created", "new_state": "active"}}'
+    )
+    header_timestamp = str(pendulum.now(tz="UTC").int_timestamp * 1000)
+    header_signature = receiver.verifier.sign(raw_payload, header_timestamp)[0]
+
+    async with TestHTTPClient(
+        transport=ASGITransport(app=receiver), base_url="http://test"
+    ) as http_client:
+        # Valid event, delivered twice
+        for _ in range(2):
+            resp = await http_client.post(
+                url="/webhook",
+                content=raw_payload,
+                headers={
+                    "Revolut-Signature": header_signature,
+                    "Revolut-Request-Timestamp": header_timestamp,
+                },
+            )
+            assert resp.status_code == 200
+
+        # Invalid signature
+        resp = await http_client.post(
+            url="/webhook",
+            content=raw_payload,
+            headers={
+                "Revolut-Signature": "v1=invalid_signature",
+                "Revolut-Request-Timestamp": header_timestamp,
+            },
+        )
+        assert resp.status_code == 401
+
+    await receiver.stop(drain=True)
+    assert len(received) == 1
+    assert isinstance(received[0].data, ResourcePayoutLinkStateChanged)
+    assert receiver.processed == 1
+    assert receiver.duplicates == 1
+    assert receiver.rejected == 1
+
+
+@pytest.mark.asyncio
+async def test_webhook_receiver_worker_survives_errors():
+    """Test that a failing event does not stop the `WebhookReceiver` workers"""
+
+    class FailingDedupeStore(WebhookDedupeMemoryStore):
+        """Fails on the first event only"""
+
+        calls = 0
+
+        def add(self, key: str) -> bool:
+            self.calls += 1
+            if self.calls == 1:
+                raise RuntimeError("Dedupe store is unavailable")
+            return super().add(key)
+
+    receiver = WebhookReceiver(
+        webhooks=EndpointWebhooksSync(client=None),
+        signing_secret="my_signing_secret",
+        dedupe_store=FailingDedupeStore(),
+        workers=1,
+    )
+    raw_payload = (
+        b'{"event": "PayoutLinkStateChanged", "timestamp": "2023-04-06T12:21:49.865Z", '
+        b'"data": {"id": "645a7696-22f3-aa47-9c74-cbae0449cc46", '
+        b'"old_state": "created", "new_state": "active"}}'
+    )
+    header_timestamp = str(pendulum.now(tz="UTC").int_timestamp * 1000)
+    header_signature = receiver.verifier.sign(raw_payload, header_timestamp)[0]
+    for _ in range(2):
+        status, _ = await receiver.accept(
+            raw_payload=raw_payload,
+            header_timestamp=header_timestamp,
+            header_signature=header_signature,
+        )
+        assert status == 200
+
+    await asyncio.wait_for(receiver.stop(drain=True), timeout=5)
+    assert receiver.failed == 1
+    assert receiver.processed == 1
+
+
+@pytest.mark.asyncio
+async def test_webhook_receiver_locked_sqlite_dedupe_store(tmp_path):
+    """Test that a locked SQLite dedupe store neither blocks nor drops events"""
+    store = WebhookDedupeSQLiteStore(
+        location=str(tmp_path / "dedupe.sqlite3"), timeout=0.1
+    )
+    receiver = WebhookReceiver(
+        webhooks=EndpointWebhooksSync(client=None),
+        signing_secret="my_signing_secret",
+        dedupe_store=store,
+        workers=1,
+    )
+    raw_payload = (
+        b'{"event": "PayoutLinkStateChanged", "timestamp": "2023-04-06T12:21:49.865Z", '
+        b'"data": {"id": "645a7696-22f3-aa47-9c74-cbae0449cc46", '
+        b'"old_state": "created", "new_state": "active"}}'
+    )
+
+    # Another process holds the write lock
+    other_conn = sqlite3.connect(store.location, isolation_level=None)
+    other_conn.execute("BEGIN IMMEDIATE")
+    try:
+        await asyncio.wait_for(receiver.process(raw_payload), timeout=5)
+    finally:
+        other_conn.execute("ROLLBACK")
+        other_conn.close()
+    assert receiver.processed == 1
+
+    # Once the lock is released, duplicates are dropped again
+    await receiver.process(raw_payload)
+    await receiver.process(raw_payload)
+    assert receiver.processed == 2
+    assert receiver.duplicates == 1
+    store.close()
+
+
+@pytest.mark.parametrize("store_type", ["memory", "sqlite"])
+def test_webhook_dedupe_store(store_type: str, tmp_path):
+    """Test that the dedupe stores drop duplicates and evict expired keys"""
+    if store_type == "memory":
+        store = WebhookDedupeMemoryStore(ttl=0.2, max_size=2)
+    else:
+        store = WebhookDedupeSQLiteStore(
+            location=str(tmp_path / "dedupe.sqlite3"), ttl=0.2
+        )
+
+    assert store.add("a") is True
+    assert store.add("a") is False
+    assert "a" in store
+    time.sleep(0.3)
+    assert "a" not in store
+    assert store.add("a") is True
+
+    if store_type == "memory":
+        # The oldest key is evicted once the store is full
+        store.add("b")
+        store.add("c")
+        assert "a" not in store
+        assert len(store) == 2
+    else:
+        # The store is shared between connections
+        other_store = WebhookDedupeSQLiteStore(location=store.location, ttl=0.2)
+        assert other_store.add("a") is False
+        other_store.close()
+        store.close()
+
+
 @pytest.mark.asyncio
 @pytest.mark.skipif(
     condition=platform.system() != "Darwin",